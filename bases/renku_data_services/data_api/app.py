@@ -267,6 +267,7 @@ def register_all_handlers(app: Sanic, dm: DependencyManager) -> Sanic:
         solr_config=dm.config.solr,
         authz=dm.authz,
         metrics=dm.metrics,
+        search_cache=dm.search_cache,
     )
     data_connectors = DataConnectorsBP(
         name="data_connectors",
@@ -285,6 +286,7 @@ def register_all_handlers(app: Sanic, dm: DependencyManager) -> Sanic:
         data_service_base_url=dm.config.nb_config.data_service_url,
         k8s_client=dm.k8s_client,
         deposit_config=dm.config.deposit_config,
+        doi_metadata_cache=dm.doi_metadata_cache,
     )
     notifications = NotificationsBP(
         name="notifications",
@@ -26,13 +26,19 @@ from renku_data_services.authn.dummy import DummyAuthenticator, DummyUserStore
 from renku_data_services.authn.gitlab import EmptyGitlabAuthenticator, GitlabAuthenticator
 from renku_data_services.authn.keycloak import KcUserStore, KeycloakAuthenticator
 from renku_data_services.authn.renku import RenkuSelfAuthenticator, RenkuSelfTokenMint
-from renku_data_services.authz.authz import Authz
+from renku_data_services.authz.authz import PLATFORM_ADMINS_CHANNEL, Authz
 from renku_data_services.capacity_reservation.db import CapacityReservationRepository, OccurrenceRepository
 from renku_data_services.connected_services.db import ConnectedServicesRepository
 from renku_data_services.connected_services.oauth_http import DefaultOAuthHttpClientFactory, OAuthHttpClientFactory
 from renku_data_services.crc import models as crc_models
 from renku_data_services.crc.constants import DEFAULT_RUNTIME_PLATFORM
-from renku_data_services.crc.db import ClusterRepository, MemberRepository, QuotaRepository, ResourcePoolRepository
+from renku_data_services.crc.db import (
+    CLUSTERS_CHANNEL,
+    ClusterRepository,
+    MemberRepository,
+    QuotaRepository,
+    ResourcePoolRepository,
+)
 from renku_data_services.data_api.config import Config
 from renku_data_services.data_connectors.db import (
     DataConnectorRepository,
@@ -40,6 +46,8 @@ from renku_data_services.data_connectors.db import (
 )
 from renku_data_services.data_connectors.deposits.envidat import EnvidatClient
 from renku_data_services.data_connectors.deposits.zenodo import ZenodoAPIClient
+from renku_data_services.data_connectors.doi.cache import DOIMetadataCache
+from renku_data_services.db_config.notifications import PgNotificationListener
 from renku_data_services.git.gitlab import DummyGitlabAPI, EmptyGitlabAPI, GitlabAPI
 from renku_data_services.k8s.client_interfaces import K8sClient
 from renku_data_services.k8s.clients import (
@@ -61,7 +69,12 @@ from renku_data_services.notebooks.constants import AMALTHEA_SESSION_GVK, JUPYTE
 from renku_data_services.notebooks.data_sources import DataSourceRepository
 from renku_data_services.notebooks.image_check import ImageCheckRepository
 from renku_data_services.notifications.db import NotificationsRepository
-from renku_data_services.platform.db import PlatformRepository, UrlRedirectRepository
+from renku_data_services.platform.db import (
+    PLATFORM_CONFIG_CHANNEL,
+    URL_REDIRECTS_CHANNEL,
+    PlatformRepository,
+    UrlRedirectRepository,
+)
 from renku_data_services.project.db import (
     ProjectMemberRepository,
     ProjectMigrationRepository,
@@ -72,6 +85,7 @@ from renku_data_services.repositories.db import GitRepositoriesRepository
 from renku_data_services.resource_usage.core import ResourceUsageService
 from renku_data_services.resource_usage.db import ResourceRequestsRepo
 from renku_data_services.search import query_manual
+from renku_data_services.search.cache import SEARCH_INDEX_UPDATED_CHANNEL, SearchCache
 from renku_data_services.search.db import SearchUpdatesRepo
 from renku_data_services.search.reprovision import SearchReprovision
 from renku_data_services.secrets.db import LowLevelUserSecretsRepo, UserSecretsRepo
@@ -79,7 +93,7 @@ from renku_data_services.session.constants import BUILD_RUN_GVK, TASK_RUN_GVK
 from renku_data_services.session.db import SessionRepository
 from renku_data_services.session.k8s_client import ShipwrightClient
 from renku_data_services.storage.db import StorageRepository
-from renku_data_services.users.db import UserPreferencesRepository
+from renku_data_services.users.db import USERNAMES_CHANNEL, UserPreferencesRepository
 from renku_data_services.users.db import UserRepo as KcUserRepo
 from renku_data_services.users.dummy_kc_api import DummyKeycloakAPI
 from renku_data_services.users.kc_api import IKeycloakAPI, KeycloakAPI
@@ -157,6 +171,9 @@ class DependencyManager:
     platform_repo: PlatformRepository
     data_connector_repo: DataConnectorRepository
     data_connector_secret_repo: DataConnectorSecretRepository
+    doi_metadata_cache: DOIMetadataCache
+    search_cache: SearchCache
+    db_notifications: PgNotificationListener
     cluster_repo: ClusterRepository
     data_source_repo: DataSourceRepository
     image_check_repo: ImageCheckRepository
@@ -269,9 +286,10 @@ class DependencyManager:
             authz=authz,
             group_repo=group_repo,
             search_updates_repo=search_updates_repo,
+            read_session_maker=config.db.async_ro_session_maker,
         )
 
-        k8s_db_cache = K8sDbCache(config.db.async_session_maker)
+        k8s_db_cache = K8sDbCache(config.db.async_session_maker, read_session_maker=config.db.async_ro_session_maker)
         default_kubeconfig = KubeConfigEnv()
         client = K8sClusterClientsPool(
             lambda: get_clusters(
@@ -282,6 +300,7 @@ class DependencyManager:
                 kinds_to_cache=[AMALTHEA_SESSION_GVK, JUPYTER_SESSION_GVK, BUILD_RUN_GVK, TASK_RUN_GVK],
             ),
         )
+        cluster_repo.change_listeners.append(client.invalidate)
 
         quota_repo = QuotaRepository(K8sResourceQuotaClient(client), K8sPriorityClassClient(client))
         member_repo = MemberRepository(
@@ -333,17 +352,21 @@ class DependencyManager:
                 realm=config.keycloak.realm,
             )
             if config.builds.enabled:
-                k8s_db_cache = K8sDbCache(config.db.async_session_maker)
-                shipwright_client = ShipwrightClient(
-                    client=K8sClusterClientsPool(
-                        lambda: get_clusters(
-                            kube_conf_root_dir=config.k8s_config_root,
-                            default_kubeconfig=default_kubeconfig,
-                            cluster_repo=cluster_repo,
-                            cache=k8s_db_cache,
-                            kinds_to_cache=[AMALTHEA_SESSION_GVK, JUPYTER_SESSION_GVK, BUILD_RUN_GVK, TASK_RUN_GVK],
-                        ),
+                k8s_db_cache = K8sDbCache(
+                    config.db.async_session_maker, read_session_maker=config.db.async_ro_session_maker
+                )
+                shipwright_k8s_client = K8sClusterClientsPool(
+                    lambda: get_clusters(
+                        kube_conf_root_dir=config.k8s_config_root,
+                        default_kubeconfig=default_kubeconfig,
+                        cluster_repo=cluster_repo,
+                        cache=k8s_db_cache,
+                        kinds_to_cache=[AMALTHEA_SESSION_GVK, JUPYTER_SESSION_GVK, BUILD_RUN_GVK, TASK_RUN_GVK],
                     ),
+                )
+                cluster_repo.change_listeners.append(shipwright_k8s_client.invalidate)
+                shipwright_client = ShipwrightClient(
+                    client=shipwright_k8s_client,
                     namespace=config.k8s_namespace,
                 )
 
@@ -356,6 +379,7 @@ class DependencyManager:
         )
         resource_requests_repo = ResourceRequestsRepo(
             session_maker=config.db.async_session_maker,
+            read_session_maker=config.db.async_ro_session_maker,
         )
         resource_usage_service = ResourceUsageService(repo=resource_requests_repo)
         rp_repo = ResourcePoolRepository(
@@ -436,6 +460,16 @@ class DependencyManager:
             secret_service_public_key=config.secrets.public_key,
             authz=authz,
         )
+        doi_metadata_cache = DOIMetadataCache(session_maker=config.db.async_session_maker)
+        search_cache = SearchCache()
+        db_notifications = PgNotificationListener(config.db)
+        db_notifications.subscribe(SEARCH_INDEX_UPDATED_CHANNEL, search_cache.invalidate)
+        db_notifications.subscribe(PLATFORM_CONFIG_CHANNEL, platform_repo.invalidate_cache)
+        db_notifications.subscribe(URL_REDIRECTS_CHANNEL, url_redirect_repo.invalidate_cache)
+        db_notifications.subscribe(PLATFORM_ADMINS_CHANNEL, authz.invalidate_admin_cache)
+        db_notifications.subscribe(USERNAMES_CHANNEL, kc_user_repo.username_cache.invalidate)
+        db_notifications.subscribe(CLUSTERS_CHANNEL, cluster_repo.clusters_changed)
+        db_notifications.subscribe(CLUSTERS_CHANNEL, config.nb_config.cluster_rp.clusters_changed)
         data_source_repo = DataSourceRepository(
             user_repo=kc_user_repo,
             connected_services_repo=connected_services_repo,
@@ -500,6 +534,9 @@ class DependencyManager:
             platform_repo=platform_repo,
             data_connector_repo=data_connector_repo,
             data_connector_secret_repo=data_connector_secret_repo,
+            doi_metadata_cache=doi_metadata_cache,
+            search_cache=search_cache,
+            db_notifications=db_notifications,
             cluster_repo=cluster_repo,
             data_source_repo=data_source_repo,
             image_check_repo=image_check_repo,
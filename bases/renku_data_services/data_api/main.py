@@ -15,7 +15,7 @@ from sentry_sdk.integrations.grpc import GRPCIntegration
 from sentry_sdk.integrations.sanic import SanicIntegration, _context_enter, _context_exit, _set_transaction
 
 import renku_data_services.solr.entity_schema as entity_schema
-from renku_data_services.app_config import logging
+from renku_data_services.app_config import instrumentation, logging, request_cache
 from renku_data_services.authz.admin_sync import sync_admins_from_keycloak
 from renku_data_services.base_models.core import InternalServiceAdmin, ServiceAdminId
 from renku_data_services.data_api.app import register_all_handlers
@@ -145,6 +145,8 @@ def create_app() -> Sanic:
     @app.on_request
     async def set_request_id(request: Request) -> None:
         logging.set_request_id(str(request.id))
+        instrumentation.set_route(request.name)
+        request_cache.start_request_cache()
         span = sentry_sdk.get_current_span()
         if span and span.trace_id:
             logging.set_trace_id(span.trace_id)
@@ -153,6 +155,10 @@ def create_app() -> Sanic:
     async def set_request_id_header(request: Request, response: BaseHTTPResponse) -> None:
         response.headers["X-Request-ID"] = request.id
 
+    @app.middleware("response")
+    async def end_request_cache(request: Request, response: BaseHTTPResponse) -> None:
+        request_cache.end_request_cache()
+
     @app.middleware("response")
     async def handle_head(request: Request, response: BaseHTTPResponse) -> None:
         """Make sure HEAD requests return an empty body."""
@@ -178,6 +184,13 @@ def create_app() -> Sanic:
     async def setup_rclone_validator(app: Sanic) -> None:
         validator = RCloneValidator()
         app.ext.dependency(validator)
+        app.ctx.rclone_validator = validator
+
+    @app.after_server_stop
+    async def stop_rclone_daemons(app: Sanic) -> None:
+        validator: RCloneValidator | None = getattr(app.ctx, "rclone_validator", None)
+        if validator is not None:
+            await validator.rc_pool.close()
 
     @app.after_server_start
     async def ready(app: Sanic) -> None:
@@ -190,6 +203,7 @@ def create_app() -> Sanic:
                 dependency_manager.config.db.conn_url(async_client=False), dependency_manager.default_resource_pool
             )
         )
+        app.add_task(dependency_manager.db_notifications.run(), name="db_notifications")
 
     return app
 
@@ -52,10 +52,13 @@ class Config:
     short_task_period_s: int
     long_task_period_s: int
     enable_resource_request_tracking: bool
+    resource_requests_log_retention_weeks: int | None
+    resource_requests_log_maintenance_cron: str
     session_quota_alert_check_interval_s: int
     session_quota_alert_remaining_threshold_p: int
     session_quota_alert_critical_m: int
     alertmanager_webhook_role: str
+    metrics_port: int | None
 
     @classmethod
     def from_env(cls) -> Config:
@@ -80,6 +83,10 @@ class Config:
         k8s_config_root = os.environ.get("K8S_CONFIG_ROOT", "/secrets/kube_configs")
 
         enable_resource_request_tracking = os.environ.get("ENABLE_RESOURCE_REQUEST_TRACKING", "false").lower() == "true"
+        retention_weeks = os.environ.get("RESOURCE_REQUESTS_LOG_RETENTION_WEEKS")
+        resource_requests_log_retention_weeks = int(retention_weeks) if retention_weeks else None
+        maintenance_cron = os.environ.get("RESOURCE_REQUESTS_LOG_MAINTENANCE_CRON", "15 3 * * *")
+        metrics_port = os.environ.get("METRICS_PORT")
         authz = AuthzConfig.from_env()
 
         keycloak = None if dummy_stores else KeycloakConfig.from_env()
@@ -99,8 +106,11 @@ class Config:
             long_task_period_s=long_task_period,
             dummy_stores=dummy_stores,
             enable_resource_request_tracking=enable_resource_request_tracking,
+            resource_requests_log_retention_weeks=resource_requests_log_retention_weeks,
+            resource_requests_log_maintenance_cron=maintenance_cron,
             session_quota_alert_check_interval_s=session_quota_alert_check_interval,
             session_quota_alert_remaining_threshold_p=session_quota_alert_remaining_threshold,
             session_quota_alert_critical_m=session_quota_alert_critical,
             alertmanager_webhook_role=os.environ.get("ALERTMANAGER_WEBHOOK_ROLE", "alertmanager-webhook"),
+            metrics_port=int(metrics_port) if metrics_port else None,
         )
@@ -1,14 +1,20 @@
 """Dependency management for data tasks."""
 
 from dataclasses import dataclass
+from datetime import timedelta
 
 from renku_data_services.app_config import logging
 from renku_data_services.authz.authz import Authz
+from renku_data_services.authz.bulk import AuthzBulkSync
+from renku_data_services.authz.outbox import AuthzOutbox
+from renku_data_services.authz.reconciler import ProjectNamespaceReconciler
 from renku_data_services.capacity_reservation.db import CapacityReservationRepository, OccurrenceRepository
 from renku_data_services.capacity_reservation.k8s_client import CapacityReservationK8sClient
 from renku_data_services.capacity_reservation.tasks import CapacityReservationTasks
-from renku_data_services.crc.db import ClusterRepository
+from renku_data_services.crc.db import CLUSTERS_CHANNEL, ClusterRepository
 from renku_data_services.data_tasks.config import Config
+from renku_data_services.data_tasks.scheduling import TaskScheduler
+from renku_data_services.db_config.notifications import PgNotificationListener
 from renku_data_services.k8s.clients import K8sClusterClientsPool
 from renku_data_services.k8s.config import KubeConfigEnv, get_clusters
 from renku_data_services.k8s.db import K8sDbCache
@@ -47,6 +53,9 @@ class DependencyManager:
     group_repo: GroupRepository
     project_repo: ProjectRepository
     authz: Authz
+    authz_bulk_sync: AuthzBulkSync
+    authz_outbox: AuthzOutbox
+    project_namespace_reconciler: ProjectNamespaceReconciler
     syncer: UsersSync
     kc_api: IKeycloakAPI
     session_tasks: SessionTasks
@@ -56,6 +65,8 @@ class DependencyManager:
     notifications_repo: NotificationsRepository
     resource_usage_service: ResourceUsageService
     resource_requests_repo: ResourceRequestsRepo
+    task_scheduler: TaskScheduler
+    db_notifications: PgNotificationListener
 
     @classmethod
     def from_env(cls, cfg: Config | None = None) -> "DependencyManager":
@@ -66,6 +77,15 @@ class DependencyManager:
         metrics_repo = MetricsRepository(cfg.db.async_session_maker)
         metrics = StagingMetricsService(enabled=cfg.posthog.enabled, metrics_repo=metrics_repo)
         authz = Authz(cfg.authz)
+        authz_bulk_sync = AuthzBulkSync(authz, cfg.db.async_session_maker)
+        authz_outbox = AuthzOutbox(authz, cfg.db.async_session_maker)
+        project_namespace_reconciler = ProjectNamespaceReconciler(
+            authz,
+            authz_bulk_sync,
+            cfg.db.async_session_maker,
+            # NOTE: Entries the requests could not write wait for the next run of the outbox data task
+            watch_delay=timedelta(seconds=max(30, 2 * cfg.x_short_task_period_s)),
+        )
         group_repo = GroupRepository(
             cfg.db.async_session_maker,
             group_authz=authz,
@@ -109,6 +129,9 @@ class DependencyManager:
                 kinds_to_cache=[AMALTHEA_SESSION_GVK],
             )
         )
+        cluster_repo.change_listeners.append(k8s_client.invalidate)
+        db_notifications = PgNotificationListener(cfg.db)
+        db_notifications.subscribe(CLUSTERS_CHANNEL, cluster_repo.clusters_changed)
         cr_k8s_client = CapacityReservationK8sClient(client=k8s_client, cluster_repo=cluster_repo)
         capacity_reservation_tasks = CapacityReservationTasks(
             occurrence_repo=OccurrenceRepository(cfg.db.async_session_maker),
@@ -158,6 +181,9 @@ class DependencyManager:
             group_repo=group_repo,
             project_repo=project_repo,
             authz=authz,
+            authz_bulk_sync=authz_bulk_sync,
+            authz_outbox=authz_outbox,
+            project_namespace_reconciler=project_namespace_reconciler,
             syncer=syncer,
             kc_api=kc_api,
             session_tasks=session_tasks,
@@ -167,4 +193,6 @@ class DependencyManager:
             notifications_repo=notifications_repo,
             resource_usage_service=resource_usage_service,
             resource_requests_repo=resource_requests_repo,
+            task_scheduler=TaskScheduler(cfg.db.async_session_maker),
+            db_notifications=db_notifications,
         )
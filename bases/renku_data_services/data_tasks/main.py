@@ -3,10 +3,11 @@
 import asyncio
 
 import uvloop
+from prometheus_client import start_http_server
 
 from renku_data_services.app_config import logging
 from renku_data_services.data_tasks.dependencies import DependencyManager
-from renku_data_services.data_tasks.task_defs import all_tasks
+from renku_data_services.data_tasks.task_defs import all_tasks, manual_tasks
 from renku_data_services.data_tasks.taskman import TaskDefininions, TaskManager
 from renku_data_services.data_tasks.tcp_handler import TcpHandler
 
@@ -28,13 +29,22 @@ async def main() -> None:
     dm = DependencyManager.from_env()
     logger.info(f"Config: {dm.config}")
 
+    if dm.config.metrics_port is not None:
+        logger.info(f"Serving metrics on port {dm.config.metrics_port}")
+        start_http_server(dm.config.metrics_port)
+
     tm = TaskManager(dm.config.max_retry_wait_seconds)
-    internal_tasks = TaskDefininions({"_log_tasks": lambda: log_tasks(logger, tm, dm.config.main_log_interval_seconds)})
+    internal_tasks = TaskDefininions(
+        {
+            "_log_tasks": lambda: log_tasks(logger, tm, dm.config.main_log_interval_seconds),
+            "_db_notifications": dm.db_notifications.run,
+        }
+    )
     logger.info("Tasks starting...")
     tm.start_all(all_tasks(dm).merge(internal_tasks))
 
     logger.info(f"Starting tcp server at {dm.config.tcp_host}:{dm.config.tcp_port}")
-    tcp_handler = TcpHandler(tm)
+    tcp_handler = TcpHandler(tm, manual_tasks(dm))
     server = await asyncio.start_server(tcp_handler.run, dm.config.tcp_host, dm.config.tcp_port)
     async with server:
         await server.serve_forever()
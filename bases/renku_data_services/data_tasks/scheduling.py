@@ -0,0 +1,313 @@
+"""Scheduling of the tasks and their coordination across replicas."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any, Protocol, final
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from renku_data_services.app_config import logging
+from renku_data_services.data_tasks.taskman import TaskDefininions, TaskFactory
+from renku_data_services.errors import errors
+
+logger = logging.getLogger(__name__)
+
+_LOCK_NAMESPACE = 0x7A5C
+"""The first key of the advisory locks of the tasks, the second one is derived from the task name."""
+
+_RUN_DURATION = Histogram(
+    "data_tasks_run_duration_seconds",
+    "Duration of a run of a data task.",
+    ["task"],
+)
+_RUN_LAG = Gauge(
+    "data_tasks_run_lag_seconds",
+    "How late the last run of a scheduled data task started compared to its schedule.",
+    ["task"],
+)
+_RUN_FAILURES = Counter(
+    "data_tasks_run_failures_total",
+    "Number of failed runs of a data task.",
+    ["task"],
+)
+_LEADER = Gauge(
+    "data_tasks_leader",
+    "Whether this replica is the one running the data task.",
+    ["task"],
+)
+
+
+class Schedule(Protocol):
+    """When a scheduled task runs."""
+
+    def first_run(self, now: datetime) -> datetime:
+        """The time of the first run after the task started."""
+        ...
+
+    def next_run(self, last_run: datetime) -> datetime:
+        """The time of the run following the run started at the given time."""
+        ...
+
+
+def _jitter(jitter: timedelta) -> timedelta:
+    return timedelta(seconds=random.uniform(0, jitter.total_seconds()))  # nosec B311
+
+
+@final
+@dataclass(frozen=True)
+class Interval:
+    """Runs a task at a fixed interval, the first run is right after the task starts."""
+
+    period: timedelta
+    jitter: timedelta = timedelta(0)
+
+    def first_run(self, now: datetime) -> datetime:
+        """The time of the first run after the task started."""
+        return now + _jitter(self.jitter)
+
+    def next_run(self, last_run: datetime) -> datetime:
+        """The time of the run following the run started at the given time."""
+        return last_run + self.period + _jitter(self.jitter)
+
+
+def _parse_cron_field(value: str, min_value: int, max_value: int) -> frozenset[int]:
+    """Parse a field of a cron expression: ``*``, numbers, ranges and steps separated by commas."""
+    values: set[int] = set()
+    for part in value.split(","):
+        part_range, _, step_str = part.partition("/")
+        step = int(step_str) if step_str else 1
+        if part_range == "*":
+            start, end = min_value, max_value
+        elif "-" in part_range:
+            start_str, end_str = part_range.split("-", 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(part_range)
+            end = max_value if step_str else start
+        if step < 1 or start < min_value or end > max_value or start > end:
+            raise ValueError(f"'{part}' is not within {min_value}-{max_value}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@final
+@dataclass(frozen=True)
+class Cron:
+    """Runs a task at the times matching a cron expression, in UTC.
+
+    The expression has the five standard fields: minute, hour, day of month, month and day of week (0 or 7 is
+    Sunday). Each field is ``*`` or a comma separated list of numbers and ranges, optionally with a step. As in cron,
+    if both the day of month and the day of week are restricted, a day matching either of them matches.
+    """
+
+    expression: str
+    jitter: timedelta = timedelta(0)
+    _minutes: frozenset[int] = field(init=False, repr=False)
+    _hours: frozenset[int] = field(init=False, repr=False)
+    _days: frozenset[int] = field(init=False, repr=False)
+    _months: frozenset[int] = field(init=False, repr=False)
+    _weekdays: frozenset[int] = field(init=False, repr=False)
+    _any_day: bool = field(init=False, repr=False)
+    _any_weekday: bool = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        fields = self.expression.split()
+        if len(fields) != 5:
+            raise errors.ConfigurationError(message=f"The cron expression '{self.expression}' does not have 5 fields.")
+        try:
+            weekdays = _parse_cron_field(fields[4], 0, 7)
+            parsed = {
+                "_minutes": _parse_cron_field(fields[0], 0, 59),
+                "_hours": _parse_cron_field(fields[1], 0, 23),
+                "_days": _parse_cron_field(fields[2], 1, 31),
+                "_months": _parse_cron_field(fields[3], 1, 12),
+                "_weekdays": frozenset(weekday % 7 for weekday in weekdays),
+            }
+        except ValueError as err:
+            raise errors.ConfigurationError(message=f"Invalid cron expression '{self.expression}': {err}") from err
+        for name, values in parsed.items():
+            object.__setattr__(self, name, values)
+        object.__setattr__(self, "_any_day", fields[2] == "*")
+        object.__setattr__(self, "_any_weekday", fields[4] == "*")
+        # NOTE: Fail on expressions that never match, such as the 31st of February, when they are defined
+        self.__next_match(datetime.now(UTC))
+
+    def first_run(self, now: datetime) -> datetime:
+        """The time of the first run after the task started."""
+        return self.next_run(now)
+
+    def next_run(self, last_run: datetime) -> datetime:
+        """The time of the run following the run started at the given time."""
+        return self.__next_match(last_run) + _jitter(self.jitter)
+
+    def __day_matches(self, value: datetime) -> bool:
+        day_matches = value.day in self._days
+        weekday_matches = (value.weekday() + 1) % 7 in self._weekdays
+        if self._any_day or self._any_weekday:
+            return day_matches and weekday_matches
+        return day_matches or weekday_matches
+
+    def __next_match(self, after: datetime) -> datetime:
+        value = after.astimezone(UTC).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # NOTE: A matching day exists within 4 years for any valid expression, e.g. the 29th of February
+        end = value + timedelta(days=4 * 366)
+        while value < end:
+            if value.month not in self._months:
+                value = (value.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self.__day_matches(value):
+                value = value.replace(hour=0, minute=0) + timedelta(days=1)
+            elif value.hour not in self._hours:
+                value = value.replace(minute=0) + timedelta(hours=1)
+            elif value.minute not in self._minutes:
+                value += timedelta(minutes=1)
+            else:
+                return value
+        raise errors.ConfigurationError(message=f"The cron expression '{self.expression}' never matches.")
+
+
+@final
+@dataclass(frozen=True)
+class TaskSpec:
+    """How a task runs.
+
+    A task with a schedule is a single run that is started at the times of the schedule, otherwise the task runs
+    until it finishes. A task runs on one replica at a time, unless it is sharded: sharded tasks run on all
+    replicas and have to split the work between them, e.g. by locking the rows they process.
+    """
+
+    run: TaskFactory
+    schedule: Schedule | None = None
+    sharded: bool = False
+
+
+class _LeadershipLostError(Exception):
+    """The lock of a task was lost while running it."""
+
+
+def _lock_key(name: str) -> int:
+    """The advisory lock key of a task, a signed 32-bit integer derived from its name."""
+    key = zlib.crc32(name.encode())
+    return key - 2**32 if key >= 2**31 else key
+
+
+@final
+class TaskScheduler:
+    """Runs the tasks according to their schedule, on a single replica unless they are sharded.
+
+    The replica running a task holds a Postgres advisory lock for it. The locks of a replica are all held on one
+    dedicated connection, so that they do not take connections from the pool. The other replicas try to acquire
+    the lock every ``lock_retry_interval`` and take over when the connection of the replica running the task is
+    closed. The connection is checked every ``lock_check_interval``, the tasks are cancelled if it is lost.
+
+    NOTE: Once a task finishes its lock is released, so a replica waiting for it runs it again. Tasks that only
+    run once at startup have to be idempotent, as they were when every replica ran them.
+    """
+
+    def __init__(
+        self,
+        session_maker: Callable[..., AsyncSession],
+        lock_retry_interval: timedelta = timedelta(seconds=30),
+        lock_check_interval: timedelta = timedelta(seconds=10),
+    ) -> None:
+        self.session_maker = session_maker
+        self.lock_retry_interval = lock_retry_interval
+        self.lock_check_interval = lock_check_interval
+        self.__connection: AsyncConnection | None = None
+        self.__connection_lock = asyncio.Lock()
+        self.__generation = 0
+
+    def definitions(self, specs: dict[str, TaskSpec]) -> TaskDefininions:
+        """Create the task definitions for the task manager."""
+        return TaskDefininions({name: self.__task_factory(name, spec) for name, spec in specs.items()})
+
+    def __task_factory(self, name: str, spec: TaskSpec) -> TaskFactory:
+        if spec.sharded:
+            return lambda: self.__run(name, spec)
+        return lambda: self.__lead(name, lambda: self.__run(name, spec))
+
+    async def __run(self, name: str, spec: TaskSpec) -> None:
+        if spec.schedule is None:
+            try:
+                with _RUN_DURATION.labels(name).time():
+                    await spec.run()
+            except Exception:
+                _RUN_FAILURES.labels(name).inc()
+                raise
+            return
+
+        next_run = spec.schedule.first_run(datetime.now(UTC))
+        while True:
+            delay = (next_run - datetime.now(UTC)).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            started = datetime.now(UTC)
+            _RUN_LAG.labels(name).set((started - next_run).total_seconds())
+            try:
+                with _RUN_DURATION.labels(name).time():
+                    await spec.run()
+            except Exception as err:
+                _RUN_FAILURES.labels(name).inc()
+                logger.error(f"{name}: Run failed with {err}", exc_info=err)
+            next_run = spec.schedule.next_run(started)
+
+    async def __lead(self, name: str, tf: TaskFactory) -> None:
+        """Run the task once the lock for it is acquired."""
+        key = _lock_key(name)
+        while True:
+            acquired, generation = await self.__scalar(select(func.pg_try_advisory_lock(_LOCK_NAMESPACE, key)))
+            if acquired:
+                break
+            await asyncio.sleep((self.lock_retry_interval + _jitter(self.lock_retry_interval / 10)).total_seconds())
+
+        logger.info(f"{name}: Running on this replica")
+        _LEADER.labels(name).set(1)
+        task = asyncio.create_task(tf(), name=f"{name}_leader")
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=self.lock_check_interval.total_seconds())
+                if task in done:
+                    task.result()
+                    return
+                _, current_generation = await self.__scalar(select(1))
+                if current_generation != generation:
+                    raise _LeadershipLostError(f"{name}: The connection holding the lock of the task was lost")
+        finally:
+            _LEADER.labels(name).set(0)
+            task.cancel()
+            await asyncio.wait({task}, timeout=self.lock_check_interval.total_seconds())
+            if generation == self.__generation:
+                try:
+                    await asyncio.shield(self.__scalar(select(func.pg_advisory_unlock(_LOCK_NAMESPACE, key))))
+                except Exception as err:
+                    logger.warning(f"{name}: Could not release the lock of the task: {err}")
+
+    async def __scalar(self, stmt: Select[tuple[Any]]) -> tuple[Any, int]:
+        """Run a statement on the connection holding the locks, returns its result and the connection generation.
+
+        A new connection, with a new generation, is opened if the previous one was lost. The locks held on the lost
+        connection are released by Postgres.
+        """
+        async with self.__connection_lock:
+            if self.__connection is None:
+                async with self.session_maker() as session:
+                    bind = session.bind
+                if not isinstance(bind, AsyncEngine):
+                    raise errors.ProgrammingError(message="The task scheduler requires sessions bound to an engine.")
+                self.__connection = await bind.connect()
+                self.__generation += 1
+            try:
+                result = await self.__connection.scalar(stmt)
+                await self.__connection.commit()
+            except Exception:
+                connection, self.__connection = self.__connection, None
+                await connection.invalidate()
+                raise
+            return result, self.__generation
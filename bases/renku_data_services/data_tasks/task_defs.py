@@ -1,34 +1,34 @@
 """The task definitions in form of coroutines."""
 
 import asyncio
-from datetime import timedelta
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
 
 from authzed.api.v1 import (
-    Consistency,
     LookupResourcesRequest,
     ObjectReference,
     ReadRelationshipsRequest,
     Relationship,
     RelationshipFilter,
     RelationshipUpdate,
-    SubjectFilter,
     SubjectReference,
-    WriteRelationshipsRequest,
 )
 from ulid import ULID
 
 import renku_data_services.authz.admin_sync as admin_sync
 import renku_data_services.search.core as search_core
-from renku_data_services import errors
 from renku_data_services.app_config import logging
 from renku_data_services.authz.authz import ResourceType, _AuthzConverter, _Relation
+from renku_data_services.authz.bulk import BulkSyncItem
 from renku_data_services.authz.models import Scope
 from renku_data_services.base_models.core import InternalServiceAdmin, ServiceAdminId
 from renku_data_services.base_models.metrics import MetricsEvent
 from renku_data_services.data_tasks.dependencies import DependencyManager
+from renku_data_services.data_tasks.scheduling import Cron, Interval, TaskSpec
 from renku_data_services.data_tasks.taskman import TaskDefininions
+from renku_data_services.k8s.constants import ClusterId
 from renku_data_services.k8s.models import K8sObject, K8sObjectFilter
-from renku_data_services.namespace.models import NamespaceKind
+from renku_data_services.metrics.orm import MetricsORM
 from renku_data_services.notebooks.constants import AMALTHEA_SESSION_GVK
 from renku_data_services.notifications.models import UnsavedAlert
 from renku_data_services.solr.entity_schema import all_migrations
@@ -38,6 +38,8 @@ from renku_data_services.utils.core import get_effective_quota
 
 logger = logging.getLogger(__name__)
 
+RECORD_RESOURCE_REQUESTS_INTERVAL = timedelta(minutes=10)
+
 
 async def update_search(dm: DependencyManager) -> None:
     """Update the SOLR with data from the search staging table."""
@@ -61,40 +63,38 @@ async def send_metrics_to_posthog(dm: DependencyManager) -> None:
         super_properties={"environment": dm.config.posthog.environment},
     )
 
-    while True:
+    def _send(metric: MetricsORM) -> bool:
         try:
-            metrics = dm.metrics_repo.get_unprocessed_metrics()
-
-            processed_ids = []
-            async for metric in metrics:
-                try:
-                    if metric.event == MetricsEvent.identify_user.value:
-                        posthog.identify(
-                            distinct_id=metric.anonymous_user_id,
-                            timestamp=metric.timestamp,
-                            properties=metric.metadata_ or {},
-                            # This is sent to avoid duplicate events if multiple instances of data service are running.
-                            # Posthog deduplicates events with the same timestamp, distinct_id, event, and uuid fields:
-                            # https://github.com/PostHog/posthog/issues/17211#issuecomment-1723136534
-                            uuid=metric.id.to_uuid4(),
-                        )
-                    else:
-                        posthog.capture(
-                            distinct_id=metric.anonymous_user_id,
-                            timestamp=metric.timestamp,
-                            event=metric.event,
-                            properties=metric.metadata_ or {},
-                            # This is sent to avoid duplicate events if multiple instances of data service are running.
-                            # Posthog deduplicates events with the same timestamp, distinct_id, event, and uuid fields:
-                            # https://github.com/PostHog/posthog/issues/17211#issuecomment-1723136534
-                            uuid=metric.id.to_uuid4(),
-                        )
-                except Exception as e:
-                    logger.error(f"Failed to process metrics event {metric.id}: {e}")
-                else:
-                    processed_ids.append(metric.id)
+            if metric.event == MetricsEvent.identify_user.value:
+                posthog.identify(
+                    distinct_id=metric.anonymous_user_id,
+                    timestamp=metric.timestamp,
+                    properties=metric.metadata_ or {},
+                    # This is sent to avoid duplicate events if multiple instances of data service are running.
+                    # Posthog deduplicates events with the same timestamp, distinct_id, event, and uuid fields:
+                    # https://github.com/PostHog/posthog/issues/17211#issuecomment-1723136534
+                    uuid=metric.id.to_uuid4(),
+                )
+            else:
+                posthog.capture(
+                    distinct_id=metric.anonymous_user_id,
+                    timestamp=metric.timestamp,
+                    event=metric.event,
+                    properties=metric.metadata_ or {},
+                    # This is sent to avoid duplicate events if multiple instances of data service are running.
+                    # Posthog deduplicates events with the same timestamp, distinct_id, event, and uuid fields:
+                    # https://github.com/PostHog/posthog/issues/17211#issuecomment-1723136534
+                    uuid=metric.id.to_uuid4(),
+                )
+        except Exception as e:
+            logger.error(f"Failed to process metrics event {metric.id}: {e}")
+            return False
+        return True
 
-            await dm.metrics_repo.delete_processed_metrics(processed_ids)
+    while True:
+        try:
+            while await dm.metrics_repo.process_unprocessed_metrics(_send) > 0:
+                pass
         except (asyncio.CancelledError, KeyboardInterrupt) as e:
             logger.warning(f"Exiting: {e}")
             return
@@ -104,43 +104,40 @@ async def send_metrics_to_posthog(dm: DependencyManager) -> None:
 
 
 async def generate_user_namespaces(dm: DependencyManager) -> None:
-    """Generate namespaces for users if there are none."""
-    while True:
-        try:
-            await dm.group_repo.generate_user_namespaces()
-        except (asyncio.CancelledError, KeyboardInterrupt) as e:
-            logger.warning(f"Exiting: {e}")
-        else:
-            await asyncio.sleep(dm.config.short_task_period_s)
+    """Generate the namespaces of the users that do not have one."""
+    await dm.group_repo.generate_user_namespaces()
 
 
 async def sync_user_namespaces(dm: DependencyManager) -> None:
-    """Lists all user namespaces in the database and adds them to Authzed and the event queue."""
-    user_namespaces = dm.group_repo._get_user_namespaces()
-    logger.info("Start syncing user namespaces to the authorization DB and message queue")
-    num_authz: int = 0
-    num_events: int = 0
-    num_total: int = 0
-    async for user_namespace in user_namespaces:
-        num_total += 1
-        authz_change = dm.authz._add_user_namespace(user_namespace.namespace)
-        session = dm.config.db.async_session_maker()
-        tx = session.begin()
-        await tx.start()
-        try:
-            await dm.authz.client.WriteRelationships(authz_change.apply)
-            num_authz += 1
-        except Exception as err:
-            # NOTE: We do not roll back the authz changes here because it is OK if something is in Authz DB
-            # but not in the message queue but not vice versa.
-            logger.error(f"Failed to sync user namespace {user_namespace} because {err}")
-            await tx.rollback()
-        else:
-            await tx.commit()
-        finally:
-            await session.close()
-    logger.info(f"Wrote authorization changes for {num_authz}/{num_total} user namespaces")
-    logger.info(f"Wrote to event queue database for {num_events}/{num_total} user namespaces")
+    """Lists all user namespaces in the database and adds them to Authzed."""
+    logger.info("Start syncing user namespaces to the authorization DB")
+
+    async def _user_namespaces(after: str | None) -> AsyncIterator[BulkSyncItem]:
+        async for user_namespace in dm.group_repo._get_user_namespaces(after=ULID.from_str(after) if after else None):
+            authz_change = dm.authz._add_user_namespace(user_namespace.namespace)
+            yield str(user_namespace.namespace.id), list(authz_change.apply.updates)
+
+    progress = await dm.authz_bulk_sync.write("sync_user_namespaces", _user_namespaces)
+    logger.info(f"Wrote authorization changes for {progress.items} user namespaces")
+
+
+def _make_public_updates(resource: ObjectReference) -> list[RelationshipUpdate]:
+    """The relationship updates that make a resource readable by all users, including anonymous ones."""
+    return [
+        RelationshipUpdate(
+            operation=RelationshipUpdate.OPERATION_TOUCH,
+            relationship=Relationship(resource=resource, relation=_Relation.public_viewer.value, subject=subject),
+        )
+        for subject in [
+            SubjectReference(object=_AuthzConverter.all_users()),
+            SubjectReference(object=_AuthzConverter.anonymous_users()),
+        ]
+    ]
+
+
+def _sorted_after(ids: set[str], after: str | None) -> list[str]:
+    """The sorted ids that come after the given checkpoint position."""
+    return sorted(i for i in ids if after is None or i > after)
 
 
 async def bootstrap_user_namespaces(dm: DependencyManager) -> None:
@@ -169,6 +166,7 @@ async def bootstrap_user_namespaces(dm: DependencyManager) -> None:
             await sync_user_namespaces(dm)
         except (asyncio.CancelledError, KeyboardInterrupt) as e:
             logger.warning(f"Exiting: {e}")
+            return
         else:
             if dm.config.dummy_stores:
                 # only run once in tests
@@ -176,90 +174,38 @@ async def bootstrap_user_namespaces(dm: DependencyManager) -> None:
             await asyncio.sleep(dm.config.short_task_period_s)
 
 
-async def fix_mismatched_project_namespace_ids(dm: DependencyManager) -> None:
-    """Fixes a problem where the project namespace relationship for projects has the wrong group ID."""
-    while True:
-        try:
-            api_user = InternalServiceAdmin(id=ServiceAdminId.migrations)
-            res = dm.authz.client.ReadRelationships(
-                ReadRelationshipsRequest(
-                    consistency=Consistency(fully_consistent=True),
-                    relationship_filter=RelationshipFilter(
-                        resource_type=ResourceType.project,
-                        optional_relation=_Relation.project_namespace.value,
-                        optional_subject_filter=SubjectFilter(subject_type=ResourceType.group.value),
-                    ),
-                )
-            )
-            async for rel in res:
-                logger.info(f"Checking project namespace - group relation {rel} for correct group ID")
-                project_id = rel.relationship.resource.object_id
-                try:
-                    project = await dm.project_repo.get_project(api_user, project_id)
-                except errors.MissingResourceError:
-                    logger.info(f"Couldn't find project {project_id}, deleting relation")
-                    await dm.authz.client.WriteRelationships(
-                        WriteRelationshipsRequest(
-                            updates=[
-                                RelationshipUpdate(
-                                    operation=RelationshipUpdate.OPERATION_DELETE,
-                                    relationship=rel.relationship,
-                                ),
-                            ]
-                        )
-                    )
-                    continue
+async def reconcile_project_namespaces(dm: DependencyManager) -> None:
+    """Fix the namespace relationships of projects that changed in the database or the authorization database."""
+    try:
+        await dm.project_namespace_reconciler.run(dm.config.short_task_period_s)
+    except (asyncio.CancelledError, KeyboardInterrupt) as e:
+        logger.warning(f"Exiting: {e}")
 
-                if project.namespace.kind != NamespaceKind.group:
-                    continue
-                correct_group_id = project.namespace.underlying_resource_id
-                authzed_group_id = rel.relationship.subject.object.object_id
-                if authzed_group_id != correct_group_id:
-                    logger.info(
-                        f"The project namespace ID in Authzed {authzed_group_id} "
-                        f"does not match the expected group ID {correct_group_id}, correcting it..."
-                    )
-                    await dm.authz.client.WriteRelationships(
-                        WriteRelationshipsRequest(
-                            updates=[
-                                RelationshipUpdate(
-                                    operation=RelationshipUpdate.OPERATION_TOUCH,
-                                    relationship=Relationship(
-                                        resource=rel.relationship.resource,
-                                        relation=rel.relationship.relation,
-                                        subject=SubjectReference(
-                                            object=ObjectReference(
-                                                object_type=ResourceType.group.value, object_id=str(correct_group_id)
-                                            )
-                                        ),
-                                    ),
-                                ),
-                                RelationshipUpdate(
-                                    operation=RelationshipUpdate.OPERATION_DELETE,
-                                    relationship=rel.relationship,
-                                ),
-                            ]
-                        )
-                    )
-        except (asyncio.CancelledError, KeyboardInterrupt) as e:
-            logger.warning(f"Exiting: {e}")
-        else:
-            if dm.config.dummy_stores:
-                # only run once in tests
-                return
-            await asyncio.sleep(dm.config.short_task_period_s)
+
+async def write_authz_outbox(dm: DependencyManager) -> None:
+    """Write the relationship updates in the outbox that the requests which made them could not write."""
+    num_written = await dm.authz_outbox.write_pending()
+    if num_written > 0:
+        logger.info(f"Wrote {num_written} authorization outbox entries")
+    await dm.authz_outbox.remove_written()
+
+
+async def fix_mismatched_project_namespace_ids(dm: DependencyManager) -> None:
+    """Fixes the namespace relationships of all projects, meant to be run manually from the admin shell."""
+    try:
+        await dm.project_namespace_reconciler.reconcile_all()
+    except (asyncio.CancelledError, KeyboardInterrupt) as e:
+        logger.warning(f"Exiting: {e}")
 
 
 async def migrate_groups_make_all_public(dm: DependencyManager) -> None:
     """Update existing groups to make them public."""
     while True:
         try:
-            all_groups = dm.authz.client.ReadRelationships(
-                ReadRelationshipsRequest(
-                    relationship_filter=RelationshipFilter(
-                        resource_type=ResourceType.group.value,
-                        optional_relation=_Relation.group_platform.value,
-                    )
+            all_groups = dm.authz_bulk_sync.read(
+                RelationshipFilter(
+                    resource_type=ResourceType.group.value,
+                    optional_relation=_Relation.group_platform.value,
                 )
             )
             all_group_ids: set[str] = set()
@@ -284,30 +230,17 @@ async def migrate_groups_make_all_public(dm: DependencyManager) -> None:
             groups_to_process = all_group_ids - public_group_ids
             logger.info(f"Groups to process = {groups_to_process}")
 
-            all_users = SubjectReference(object=_AuthzConverter.all_users())
-            all_anon_users = SubjectReference(object=_AuthzConverter.anonymous_users())
-            for group_id in groups_to_process:
-                group_res = _AuthzConverter.group(ULID.from_str(group_id))
-                all_users_are_viewers = Relationship(
-                    resource=group_res,
-                    relation=_Relation.public_viewer.value,
-                    subject=all_users,
-                )
-                all_anon_users_are_viewers = Relationship(
-                    resource=group_res,
-                    relation=_Relation.public_viewer.value,
-                    subject=all_anon_users,
-                )
-                authz_change = WriteRelationshipsRequest(
-                    updates=[
-                        RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=rel)
-                        for rel in [all_users_are_viewers, all_anon_users_are_viewers]
-                    ]
-                )
-                await dm.authz.client.WriteRelationships(authz_change)
-                logger.info(f"Made group {group_id} public")
+            async def _groups(
+                after: str | None, group_ids: set[str] = groups_to_process
+            ) -> AsyncIterator[BulkSyncItem]:
+                for group_id in _sorted_after(group_ids, after):
+                    yield group_id, _make_public_updates(_AuthzConverter.group(ULID.from_str(group_id)))
+
+            progress = await dm.authz_bulk_sync.write("migrate_groups_make_all_public", _groups)
+            logger.info(f"Made {progress.items} groups public")
         except (asyncio.CancelledError, KeyboardInterrupt) as e:
             logger.warning(f"Exiting: {e}")
+            return
         else:
             if dm.config.dummy_stores:
                 # only run once in tests
@@ -319,12 +252,10 @@ async def migrate_user_namespaces_make_all_public(dm: DependencyManager) -> None
     """Update existing user namespaces to make them public."""
     while True:
         try:
-            all_user_namespaces = dm.authz.client.ReadRelationships(
-                ReadRelationshipsRequest(
-                    relationship_filter=RelationshipFilter(
-                        resource_type=ResourceType.user_namespace.value,
-                        optional_relation=_Relation.user_namespace_platform.value,
-                    )
+            all_user_namespaces = dm.authz_bulk_sync.read(
+                RelationshipFilter(
+                    resource_type=ResourceType.user_namespace.value,
+                    optional_relation=_Relation.user_namespace_platform.value,
                 )
             )
             all_user_namespace_ids: set[str] = set()
@@ -349,30 +280,17 @@ async def migrate_user_namespaces_make_all_public(dm: DependencyManager) -> None
             namespaces_to_process = all_user_namespace_ids - public_user_namespace_ids
             logger.info(f"User namespaces to process = {namespaces_to_process}")
 
-            all_users = SubjectReference(object=_AuthzConverter.all_users())
-            all_anon_users = SubjectReference(object=_AuthzConverter.anonymous_users())
-            for ns_id in namespaces_to_process:
-                namespace_res = _AuthzConverter.user_namespace(ULID.from_str(ns_id))
-                all_users_are_viewers = Relationship(
-                    resource=namespace_res,
-                    relation=_Relation.public_viewer.value,
-                    subject=all_users,
-                )
-                all_anon_users_are_viewers = Relationship(
-                    resource=namespace_res,
-                    relation=_Relation.public_viewer.value,
-                    subject=all_anon_users,
-                )
-                authz_change = WriteRelationshipsRequest(
-                    updates=[
-                        RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=rel)
-                        for rel in [all_users_are_viewers, all_anon_users_are_viewers]
-                    ]
-                )
-                await dm.authz.client.WriteRelationships(authz_change)
-                logger.info(f"Made user namespace {ns_id} public")
+            async def _user_namespaces(
+                after: str | None, namespace_ids: set[str] = namespaces_to_process
+            ) -> AsyncIterator[BulkSyncItem]:
+                for ns_id in _sorted_after(namespace_ids, after):
+                    yield ns_id, _make_public_updates(_AuthzConverter.user_namespace(ULID.from_str(ns_id)))
+
+            progress = await dm.authz_bulk_sync.write("migrate_user_namespaces_make_all_public", _user_namespaces)
+            logger.info(f"Made {progress.items} user namespaces public")
         except (asyncio.CancelledError, KeyboardInterrupt) as e:
             logger.warning(f"Exiting: {e}")
+            return
         else:
             if dm.config.dummy_stores:
                 # only run once in tests
@@ -382,26 +300,12 @@ async def migrate_user_namespaces_make_all_public(dm: DependencyManager) -> None
 
 async def users_sync(dm: DependencyManager) -> None:
     """Sync all users from keycloak."""
-    while True:
-        try:
-            await dm.syncer.users_sync(dm.kc_api)
-
-        except (asyncio.CancelledError, KeyboardInterrupt) as e:
-            logger.warning(f"Exiting: {e}")
-        else:
-            await asyncio.sleep(dm.config.long_task_period_s)
+    await dm.syncer.users_sync(dm.kc_api)
 
 
 async def sync_admins_from_keycloak(dm: DependencyManager) -> None:
-    """Sync all users from keycloak."""
-    while True:
-        try:
-            await admin_sync.sync_admins_from_keycloak(dm.kc_api, dm.authz)
-
-        except (asyncio.CancelledError, KeyboardInterrupt) as e:
-            logger.warning(f"Exiting: {e}")
-        else:
-            await asyncio.sleep(dm.config.long_task_period_s)
+    """Sync the platform admins from keycloak."""
+    await admin_sync.sync_admins_from_keycloak(dm.kc_api, dm.authz, dm.config.db.async_session_maker)
 
 
 async def initialize_session_environments(dm: DependencyManager) -> None:
@@ -412,43 +316,31 @@ async def initialize_session_environments(dm: DependencyManager) -> None:
 
 async def activate_capacity_reservations(dm: DependencyManager) -> None:
     """Activate pending capacity reservation occurrences."""
-    while True:
-        try:
-            await dm.capacity_reservation_tasks.activate_pending_occurrences_task()
-        except (asyncio.CancelledError, KeyboardInterrupt) as e:
-            logger.warning(f"Exiting: {e}")
-        else:
-            await asyncio.sleep(dm.config.x_short_task_period_s)
+    await dm.capacity_reservation_tasks.activate_pending_occurrences_task()
 
 
 async def monitor_capacity_reservations(dm: DependencyManager) -> None:
     """Monitor active capacity reservation occurrences."""
-    while True:
-        try:
-            await dm.capacity_reservation_tasks.monitor_active_occurrences_task()
-        except (asyncio.CancelledError, KeyboardInterrupt) as e:
-            logger.warning(f"Exiting: {e}")
-        else:
-            await asyncio.sleep(dm.config.x_short_task_period_s)
+    await dm.capacity_reservation_tasks.monitor_active_occurrences_task()
 
 
 async def cleanup_orphaned_capacity_reservations(dm: DependencyManager) -> None:
     """Clean up capacity reservation deployments whose occurrences no longer exist."""
-    while True:
-        try:
-            await dm.capacity_reservation_tasks.cleanup_orphaned_deployments_task()
-        except (asyncio.CancelledError, KeyboardInterrupt) as e:
-            logger.warning(f"Exiting: {e}")
-        else:
-            await asyncio.sleep(dm.config.x_short_task_period_s)
+    await dm.capacity_reservation_tasks.cleanup_orphaned_deployments_task()
 
 
 async def record_resource_requests(dm: DependencyManager) -> None:
-    """Periodically record all resource requests."""
-    interval_seconds = 600
-    while True:
-        await dm.resource_requests_recorder.record_resource_requests(timedelta(seconds=interval_seconds))
-        await asyncio.sleep(interval_seconds)
+    """Record all resource requests."""
+    await dm.resource_requests_recorder.record_resource_requests(RECORD_RESOURCE_REQUESTS_INTERVAL)
+
+
+async def maintain_resource_requests_log_partitions(dm: DependencyManager) -> None:
+    """Create the upcoming weekly partitions of the resource requests log and drop the expired ones."""
+    await dm.resource_requests_repo.create_partitions()
+    retention_weeks = dm.config.resource_requests_log_retention_weeks
+    if retention_weeks is not None:
+        cutoff = datetime.now(UTC) - timedelta(weeks=retention_weeks)
+        await dm.resource_requests_repo.drop_partitions_before(cutoff)
 
 
 def _extract_session_quota_metadata(session: K8sObject) -> tuple[str, str, int, int | None] | None:
@@ -480,8 +372,9 @@ async def _check_session_quota_and_send_alerts(dm: DependencyManager) -> None:
     """Check all active sessions and send alerts if the remaining user quota is below threshold."""
     admin_user = InternalServiceAdmin(id=ServiceAdminId.capacity_reservation)
     session_filter = K8sObjectFilter(gvk=AMALTHEA_SESSION_GVK)
+    skipped_clusters: set[ClusterId] = set()
 
-    async for session in dm.k8s_client.list(session_filter):
+    async for session in dm.k8s_client.list(session_filter, skipped_clusters=skipped_clusters):
         try:
             metadata = _extract_session_quota_metadata(session)
             if not metadata:
@@ -565,16 +458,18 @@ async def _check_session_quota_and_send_alerts(dm: DependencyManager) -> None:
             logger.warning(f"Failed to check quota for pod: {e}", exc_info=True)
             continue
 
+    if skipped_clusters:
+        logger.warning(f"The sessions of the clusters {sorted(skipped_clusters)} could not be checked for their quota")
+
 
 async def monitor_session_quota_and_send_alerts(dm: DependencyManager) -> None:
-    """Periodically check session quotas and send alerts when the remaining quota is low."""
-    while True:
-        try:
-            await _check_session_quota_and_send_alerts(dm)
-        except (asyncio.CancelledError, KeyboardInterrupt) as e:
-            logger.warning(f"Exiting: {e}")
-        else:
-            await asyncio.sleep(dm.config.session_quota_alert_check_interval_s)
+    """Check session quotas and send alerts when the remaining quota is low."""
+    await _check_session_quota_and_send_alerts(dm)
+
+
+def _every(seconds: float) -> Interval:
+    """An interval schedule with a jitter of a tenth of the period, so that tasks do not all run at once."""
+    return Interval(period=timedelta(seconds=seconds), jitter=timedelta(seconds=seconds / 10))
 
 
 def all_tasks(dm: DependencyManager) -> TaskDefininions:
@@ -586,22 +481,54 @@ def all_tasks(dm: DependencyManager) -> TaskDefininions:
     # repositories or other services (and they are not stateless) we
     # might capture this state and possibly won't recover by
     # re-entering the coroutine.
+    cfg = dm.config
+    return dm.task_scheduler.definitions(
+        {
+            # NOTE: Search updates and product metrics are locked row by row, so all replicas can process them
+            "update_search": TaskSpec(lambda: update_search(dm), sharded=True),
+            "send_product_metrics": TaskSpec(lambda: send_metrics_to_posthog(dm), sharded=True),
+            "generate_user_namespace": TaskSpec(
+                lambda: generate_user_namespaces(dm), schedule=_every(cfg.short_task_period_s)
+            ),
+            "bootstrap_user_namespaces": TaskSpec(lambda: bootstrap_user_namespaces(dm)),
+            "reconcile_project_namespaces": TaskSpec(lambda: reconcile_project_namespaces(dm)),
+            "write_authz_outbox": TaskSpec(lambda: write_authz_outbox(dm), schedule=_every(cfg.x_short_task_period_s)),
+            "migrate_groups_make_all_public": TaskSpec(lambda: migrate_groups_make_all_public(dm)),
+            "migrate_user_namespaces_make_all_public": TaskSpec(lambda: migrate_user_namespaces_make_all_public(dm)),
+            "users_sync": TaskSpec(lambda: users_sync(dm), schedule=_every(cfg.long_task_period_s)),
+            "sync_admins_from_keycloak": TaskSpec(
+                lambda: sync_admins_from_keycloak(dm), schedule=_every(cfg.long_task_period_s)
+            ),
+            "initialize_session_environments": TaskSpec(lambda: initialize_session_environments(dm)),
+            "activate_capacity_reservations": TaskSpec(
+                lambda: activate_capacity_reservations(dm), schedule=_every(cfg.x_short_task_period_s)
+            ),
+            "monitor_capacity_reservations": TaskSpec(
+                lambda: monitor_capacity_reservations(dm), schedule=_every(cfg.x_short_task_period_s)
+            ),
+            "cleanup_orphaned_capacity_reservations": TaskSpec(
+                lambda: cleanup_orphaned_capacity_reservations(dm), schedule=_every(cfg.x_short_task_period_s)
+            ),
+            "record_resource_requests": TaskSpec(
+                lambda: record_resource_requests(dm),
+                schedule=_every(RECORD_RESOURCE_REQUESTS_INTERVAL.total_seconds()),
+            ),
+            "maintain_resource_requests_log_partitions": TaskSpec(
+                lambda: maintain_resource_requests_log_partitions(dm),
+                schedule=Cron(cfg.resource_requests_log_maintenance_cron, jitter=timedelta(minutes=5)),
+            ),
+            "monitor_session_quota_and_send_alerts": TaskSpec(
+                lambda: monitor_session_quota_and_send_alerts(dm),
+                schedule=_every(cfg.session_quota_alert_check_interval_s),
+            ),
+        }
+    )
+
+
+def manual_tasks(dm: DependencyManager) -> TaskDefininions:
+    """A dict of task factories that are only started on request from the admin shell."""
     return TaskDefininions(
         {
-            "update_search": lambda: update_search(dm),
-            "send_product_metrics": lambda: send_metrics_to_posthog(dm),
-            "generate_user_namespace": lambda: generate_user_namespaces(dm),
-            "bootstrap_user_namespaces": lambda: bootstrap_user_namespaces(dm),
             "fix_mismatched_project_namespace_ids": lambda: fix_mismatched_project_namespace_ids(dm),
-            "migrate_groups_make_all_public": lambda: migrate_groups_make_all_public(dm),
-            "migrate_user_namespaces_make_all_public": lambda: migrate_user_namespaces_make_all_public(dm),
-            "users_sync": lambda: users_sync(dm),
-            "sync_admins_from_keycloak": lambda: sync_admins_from_keycloak(dm),
-            "initialize_session_environments": lambda: initialize_session_environments(dm),
-            "activate_capacity_reservations": lambda: activate_capacity_reservations(dm),
-            "monitor_capacity_reservations": lambda: monitor_capacity_reservations(dm),
-            "cleanup_orphaned_capacity_reservations": lambda: cleanup_orphaned_capacity_reservations(dm),
-            "record_resource_requests": lambda: record_resource_requests(dm),
-            "monitor_session_quota_and_send_alerts": lambda: monitor_session_quota_and_send_alerts(dm),
         }
     )
@@ -3,14 +3,15 @@
 import re
 from asyncio.streams import StreamReader, StreamWriter
 
-from renku_data_services.data_tasks.taskman import TaskManager
+from renku_data_services.data_tasks.taskman import TaskDefininions, TaskManager
 
 
 class TcpHandler:
     """Handles the simple tcp connection."""
 
-    def __init__(self, tm: TaskManager) -> None:
+    def __init__(self, tm: TaskManager, manual_tasks: TaskDefininions | None = None) -> None:
         self.__task_manager = tm
+        self.__manual_tasks = dict((manual_tasks or TaskDefininions({})).tasks)
 
     async def _write_line(self, writer: StreamWriter, line: str) -> None:
         try:
@@ -42,7 +43,8 @@ class TcpHandler:
                             "Commands\r\n"
                             "- help: this help text\r\n"
                             "- tasks: list tasks\r\n"
-                            "- reset_restarts [name]: reset the restarts counter"
+                            "- reset_restarts [name]: reset the restarts counter\r\n"
+                            "- run [name]: start a manual task, lists the manual tasks without a name"
                         ),
                     )
 
@@ -58,6 +60,16 @@ class TcpHandler:
                             self.__task_manager.reset_restarts(t.name)
                     await self._write_line(writer, "Ok")
 
+                case "run":
+                    if rest == []:
+                        for name in self.__manual_tasks:
+                            await self._write_line(writer, f"- {name}")
+                    elif rest[0] in self.__manual_tasks:
+                        self.__task_manager.start(rest[0], self.__manual_tasks[rest[0]])
+                        await self._write_line(writer, "Ok")
+                    else:
+                        await self._write_line(writer, f"Unknown manual task {rest[0]}")
+
                 case _:
                     await self._write_line(writer, "Good Bye.")
                     break
@@ -3,6 +3,8 @@
 from dataclasses import dataclass, field
 
 from renku_data_services.crc.db import ClusterRepository, QuotaRepository, ResourcePoolQueryRepository
+from renku_data_services.data_connectors.db import DepositStatusRepository
+from renku_data_services.data_connectors.deposit_status import DepositJobStatusWriter
 from renku_data_services.k8s.clients import DummyPriorityClassClient, DummyResourceQuotaClient
 from renku_data_services.k8s.db import K8sDbCache
 from renku_data_services.k8s_cache.config import Config
@@ -22,6 +24,8 @@ class DependencyManager:
     _metrics: StagingMetricsService | None = field(default=None, repr=False, init=False)
     _rp_repo: ResourcePoolQueryRepository | None = field(default=None, repr=False, init=False)
     _cluster_repo: ClusterRepository | None = field(default=None, repr=False, init=False)
+    _deposit_status_repo: DepositStatusRepository | None = field(default=None, repr=False, init=False)
+    _deposit_status_writer: DepositJobStatusWriter | None = field(default=None, repr=False, init=False)
 
     def metrics_repo(self) -> MetricsRepository:
         """The DB adapter for metrics."""
@@ -57,6 +61,20 @@ class DependencyManager:
             )
         return self._k8s_cache
 
+    def deposit_status_repo(self) -> DepositStatusRepository:
+        """The repository for updating the status of deposits."""
+        if not self._deposit_status_repo:
+            self._deposit_status_repo = DepositStatusRepository(session_maker=self.config.db.async_session_maker)
+        return self._deposit_status_repo
+
+    def deposit_status_writer(self) -> DepositJobStatusWriter:
+        """Writes the status of deposit upload jobs to the database."""
+        if not self._deposit_status_writer:
+            self._deposit_status_writer = DepositJobStatusWriter(
+                deposit_status_repo=self.deposit_status_repo(), k8s_cache=self.k8s_cache()
+            )
+        return self._deposit_status_writer
+
     def quota_repo(self) -> QuotaRepository:
         """The resource quota repository."""
         if not self._quota_repo:
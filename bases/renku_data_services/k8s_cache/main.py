@@ -7,6 +7,7 @@ from sentry_sdk.integrations.asyncio import AsyncioIntegration
 from sentry_sdk.integrations.grpc import GRPCIntegration
 
 from renku_data_services.app_config import logging
+from renku_data_services.data_connectors.constants import DEPOSIT_JOB_GVK
 from renku_data_services.k8s.clients import K8sClusterClient
 from renku_data_services.k8s.config import KubeConfigEnv, get_clusters
 from renku_data_services.k8s.constants import ClusterId
@@ -47,24 +48,27 @@ async def main() -> None:
     ):
         clusters[client.get_cluster().id] = client
 
-    kinds = [AMALTHEA_SESSION_GVK]
+    kinds = [AMALTHEA_SESSION_GVK, DEPOSIT_JOB_GVK]
     if dm.config.v1_services.enabled:
         kinds.append(JUPYTER_SESSION_GVK)
     if dm.config.image_builders.enabled:
         kinds.extend([BUILD_RUN_GVK, TASK_RUN_GVK])
     logger.info(f"Resources: {kinds}")
     watcher = K8sWatcher(
-        handler=k8s_object_handler(dm.k8s_cache(), dm.metrics(), rp_repo=dm.rp_repo()),
+        handler=k8s_object_handler(
+            dm.k8s_cache(), dm.metrics(), rp_repo=dm.rp_repo(), deposit_status_writer=dm.deposit_status_writer()
+        ),
         clusters=clusters,
         kinds=kinds,
         db_cache=dm.k8s_cache(),
     )
     await watcher.start()
     logger.info("started watching resources")
+    deposit_status_task = asyncio.create_task(dm.deposit_status_writer().run())
     # create file for liveness probe
     with open("/tmp/cache_ready", "w") as f:  # nosec B108
         f.write("ready")
-    await watcher.wait()
+    await asyncio.gather(watcher.wait(), deposit_status_task)
 
 
 if __name__ == "__main__":
@@ -11,7 +11,7 @@ from sanic import Request, Sanic
 from sanic.response import BaseHTTPResponse
 from sanic.worker.loader import AppLoader
 
-from renku_data_services.app_config import logging
+from renku_data_services.app_config import instrumentation, logging
 from renku_data_services.base_models.core import InternalServiceAdmin, ServiceAdminId
 from renku_data_services.secrets_storage_api.app import register_all_handlers
 from renku_data_services.secrets_storage_api.dependencies import DependencyManager
@@ -28,6 +28,7 @@ def create_app() -> Sanic:
     @app.on_request
     async def set_request_id(request: Request) -> None:
         logging.set_request_id(str(request.id))
+        instrumentation.set_route(request.name)
 
     @app.middleware("response")
     async def set_request_id_header(request: Request, response: BaseHTTPResponse) -> None:
@@ -0,0 +1,219 @@
+"""Latency instrumentation of the calls made to the services the data services depend on.
+
+Calls are recorded per dependency (e.g. ``postgres``, ``authz``, ``solr`` or ``kubernetes``), per operation and per
+route of the request that made them. The route is provided with `set_route` and managed by a ContextVar, like the
+request id used for logging. Calls made outside of a request are recorded with the route ``background``.
+
+Database statements that are slower than a threshold are logged with a fingerprint of the statement, which is the
+same for statements that only differ in their parameters.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import re
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar, cast
+
+import httpx
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from renku_data_services.app_config import logging
+
+logger = logging.getLogger(__name__)
+
+_BACKGROUND_ROUTE = "background"
+_route_var: contextvars.ContextVar[str] = contextvars.ContextVar("instrumentation_route", default=_BACKGROUND_ROUTE)
+
+_CALL_DURATION = Histogram(
+    "dependency_call_duration_seconds",
+    "Duration of the calls to a dependency, the count is the number of calls.",
+    ["dependency", "operation", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+_CALL_ERRORS = Counter(
+    "dependency_call_errors_total",
+    "Number of calls to a dependency that failed.",
+    ["dependency", "operation", "route"],
+)
+
+_STRING_LITERALS = re.compile(r"'(?:[^']|'')*'")
+_PARAMETERS = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![\w.])\d+(?:\.\d+)?\b")
+_PLACEHOLDER = r"\?(?:::[\w\[\]]+)?"
+_PARAMETER_LISTS = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_T = TypeVar("_T")
+
+
+def set_route(route: str | None) -> None:
+    """Set the route of the request handled in the current context, calls are recorded under it."""
+    _route_var.set(route or _BACKGROUND_ROUTE)
+
+
+def record(dependency: str, operation: str, duration: float, failed: bool = False) -> None:
+    """Record a call to a dependency that took the given duration in seconds."""
+    route = _route_var.get()
+    _CALL_DURATION.labels(dependency, operation, route).observe(duration)
+    if failed:
+        _CALL_ERRORS.labels(dependency, operation, route).inc()
+
+
+@contextmanager
+def observe(dependency: str, operation: str) -> Iterator[None]:
+    """Record the call to a dependency made in the body of the context manager."""
+    start = time.monotonic()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        record(dependency, operation, time.monotonic() - start, failed)
+
+
+def normalize_statement(statement: str) -> str:
+    """Replace the literals and parameters of an SQL statement with placeholders and collapse the whitespace."""
+    normalized = _STRING_LITERALS.sub("?", statement)
+    normalized = _PARAMETERS.sub("?", normalized)
+    normalized = _PARAMETER_LISTS.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint(statement: str) -> str:
+    """A short hash identifying the statement regardless of its literals and parameters."""
+    return hashlib.sha256(normalize_statement(statement).encode()).hexdigest()[:16]
+
+
+def _statement_operation(statement: str) -> str:
+    words = statement.lstrip("( \n\t").split(None, 1)
+    return words[0].lower() if words else "unknown"
+
+
+def instrument_engine(engine: AsyncEngine, dependency: str, slow_query_threshold_s: float) -> None:
+    """Record the statements executed by the engine and log the ones slower than the threshold.
+
+    Slow statements are not logged if the threshold is not positive. Parameters are never logged.
+    """
+
+    def _start(conn: Connection) -> None:
+        conn.info.setdefault("instrumentation_start", []).append(time.monotonic())
+
+    def _finish(conn: Connection, statement: str, failed: bool) -> None:
+        starts = conn.info.get("instrumentation_start")
+        if not starts:
+            return
+        duration = time.monotonic() - starts.pop()
+        record(dependency, _statement_operation(statement), duration, failed)
+        if 0 < slow_query_threshold_s <= duration:
+            normalized = normalize_statement(statement)
+            logger.warning(
+                f"Slow query {fingerprint(statement)} on {dependency} took {duration:.3f}s "
+                f"in route {_route_var.get()}: {normalized[:2000]}"
+            )
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        _start(conn)
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        _finish(conn, statement, failed=False)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _handle_error(exception_context: ExceptionContext) -> None:
+        if exception_context.connection is not None and exception_context.statement is not None:
+            _finish(exception_context.connection, exception_context.statement, failed=True)
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """An httpx transport that records the requests sent through it, until the headers of the response arrive."""
+
+    def __init__(self, dependency: str, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self.dependency = dependency
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send the request with the wrapped transport."""
+        with observe(self.dependency, request.method):
+            return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self.transport.aclose()
+
+
+class _InstrumentedGrpcClient:
+    """Proxy of a gRPC client that records the calls made through its public methods.
+
+    Streaming calls are recorded when the stream ends.
+    """
+
+    def __init__(self, client: Any, dependency: str) -> None:
+        self.__client = client
+        self.__dependency = dependency
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.__client, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        def _call(*args: Any, **kwargs: Any) -> Any:
+            start = time.monotonic()
+            try:
+                call = attr(*args, **kwargs)
+            except Exception:
+                record(self.__dependency, name, time.monotonic() - start, failed=True)
+                raise
+            if hasattr(call, "__aiter__"):
+                return self.__stream(name, call, start)
+            return self.__unary(name, call, start)
+
+        return _call
+
+    async def __unary(self, operation: str, call: Awaitable[Any], start: float) -> Any:
+        failed = False
+        try:
+            return await call
+        except Exception:
+            failed = True
+            raise
+        finally:
+            record(self.__dependency, operation, time.monotonic() - start, failed)
+
+    async def __stream(self, operation: str, call: AsyncIterable[Any], start: float) -> AsyncIterator[Any]:
+        failed = False
+        try:
+            async for response in call:
+                yield response
+        except Exception:
+            failed = True
+            raise
+        finally:
+            record(self.__dependency, operation, time.monotonic() - start, failed)
+
+
+def instrument_grpc_client(client: _T, dependency: str) -> _T:
+    """Wrap a gRPC client so that the calls made with it are recorded."""
+    return cast(_T, _InstrumentedGrpcClient(client, dependency))
@@ -0,0 +1,152 @@
+"""Memoization of idempotent lookups for the lifetime of a request.
+
+The same project, launcher, resource pool, cluster or permission is often looked up several times while handling
+one request. Functions decorated with `request_memoized` are called at most once per request for the same key, later
+calls get the result of the first one. The cache of the current request is managed by a ContextVar, like the request
+id used for logging, so it does not have to be passed through the repositories. Outside of a request there is no
+cache and decorated functions are always called.
+
+Any write to the database clears the cache, so that a lookup made after a change within the same request does not
+return outdated data.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, ParamSpec, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+from renku_data_services.base_models import APIUser
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+
+class RequestCache:
+    """The results of the lookups made while handling one request."""
+
+    def __init__(self) -> None:
+        self._results: dict[Hashable, asyncio.Future[Any]] = {}
+        self.closed = False
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable[_T]]) -> _T:
+        """Return the result cached under the key or load and cache it.
+
+        Concurrent calls with the same key wait for the first one. Errors are not cached.
+        """
+        if self.closed:
+            return await load()
+        result = self._results.get(key)
+        if result is not None:
+            return await asyncio.shield(result)
+
+        result = asyncio.get_running_loop().create_future()
+        self._results[key] = result
+        try:
+            value = await load()
+        except BaseException as err:
+            if self._results.get(key) is result:
+                del self._results[key]
+            if isinstance(err, Exception):
+                result.set_exception(err)
+                # NOTE: Mark the exception as retrieved, it is raised to the waiting callers if there are any
+                result.exception()
+            else:
+                result.cancel()
+            raise
+        result.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        """Remove all the cached results."""
+        self._results.clear()
+
+    def close(self) -> None:
+        """Clear the cache and stop caching, e.g. for tasks started by the request that outlive it."""
+        self.clear()
+        self.closed = True
+
+
+_cache_var: contextvars.ContextVar[RequestCache | None] = contextvars.ContextVar("request_cache", default=None)
+
+
+def start_request_cache() -> RequestCache:
+    """Start a new cache for the request handled in the current context."""
+    cache = RequestCache()
+    _cache_var.set(cache)
+    return cache
+
+
+def end_request_cache() -> None:
+    """Close the cache of the request handled in the current context."""
+    cache = _cache_var.get()
+    if cache is not None:
+        cache.close()
+    _cache_var.set(None)
+
+
+def clear_request_cache() -> None:
+    """Remove the results cached for the request handled in the current context, if there is one."""
+    cache = _cache_var.get()
+    if cache is not None:
+        cache.clear()
+
+
+def user_key(user: APIUser) -> Hashable:
+    """The part of a cache key that identifies the user a lookup is made for."""
+    return type(user).__name__, user.id, user.is_admin
+
+
+def request_memoized(
+    key: Callable[..., Hashable],
+) -> Callable[[Callable[_P, Awaitable[_T]]], Callable[_P, Awaitable[_T]]]:
+    """Memoize an idempotent async function for the lifetime of the current request.
+
+    The key function is called with the same arguments as the decorated function and should only depend on the
+    arguments that change the result. Results must not be mutated by the callers as they are shared.
+    """
+
+    def decorator(f: Callable[_P, Awaitable[_T]]) -> Callable[_P, Awaitable[_T]]:
+        @functools.wraps(f)
+        async def memoized(*args: _P.args, **kwargs: _P.kwargs) -> _T:
+            cache = _cache_var.get()
+            if cache is None:
+                return await f(*args, **kwargs)
+            return await cache.get_or_load((f.__qualname__, key(*args, **kwargs)), lambda: f(*args, **kwargs))
+
+        return memoized
+
+    return decorator
+
+
+def _on_write(session: Session) -> None:
+    session.info["request_cache_dirty"] = True
+    clear_request_cache()
+
+
+@event.listens_for(Session, "after_flush")
+def _clear_after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    _on_write(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _clear_after_write(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.is_select:
+        _on_write(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_after_commit(session: Session) -> None:
+    # NOTE: Lookups made after a write but before the commit may have cached the data from before the change
+    if session.info.pop("request_cache_dirty", False):
+        clear_request_cache()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_writes(session: Session, previous_transaction: Any) -> None:
+    session.info.pop("request_cache_dirty", None)
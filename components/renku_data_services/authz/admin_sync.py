@@ -1,17 +1,36 @@
 """Functions used to create admins in the authorization database from data in Keycloak."""
 
-from renku_data_services.authz.authz import Authz
+from collections.abc import Callable
+
+from authzed.api.v1 import RelationshipUpdate, WriteRelationshipsRequest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from renku_data_services.authz.authz import PLATFORM_ADMINS_CHANNEL, Authz
+from renku_data_services.db_config.notifications import notify
 from renku_data_services.users.kc_api import IKeycloakAPI
 
 
-async def sync_admins_from_keycloak(kc_api: IKeycloakAPI, authz: Authz) -> None:
-    """Query keycloak for all admin users, add or remove any admins from the authorization database as needed."""
-    kc_admin_user_ids = [payload["id"] for payload in kc_api.get_admin_users()]
-    for admin_id in kc_admin_user_ids:
+async def sync_admins_from_keycloak(
+    kc_api: IKeycloakAPI, authz: Authz, session_maker: Callable[..., AsyncSession] | None = None
+) -> None:
+    """Query keycloak for all admin users, add or remove any admins from the authorization database as needed.
+
+    If the admins changed, the cached admins of this process are refreshed and, given a session maker, the other
+    processes are notified on `PLATFORM_ADMINS_CHANNEL`.
+    """
+    kc_admin_user_ids = {payload["id"] for payload in kc_api.get_admin_users()}
+    authz_admin_ids = set(await authz._get_admin_user_ids())
+    updates: list[RelationshipUpdate] = []
+    for admin_id in sorted(kc_admin_user_ids - authz_admin_ids):
         change = authz._add_admin(admin_id)
-        await authz.client.WriteRelationships(change.apply)
-    authz_admins = await authz._get_admin_user_ids()
-    for admin_id in authz_admins:
-        if admin_id not in kc_admin_user_ids:
-            change = await authz._remove_admin(admin_id)
-            await authz.client.WriteRelationships(change.apply)
+        updates.extend(change.apply.updates)
+    for admin_id in sorted(authz_admin_ids - kc_admin_user_ids):
+        change = await authz._remove_admin(admin_id)
+        updates.extend(change.apply.updates)
+    if not updates:
+        return
+    await authz.client.WriteRelationships(WriteRelationshipsRequest(updates=updates))
+    authz.invalidate_admin_cache()
+    if session_maker is not None:
+        async with session_maker() as session, session.begin():
+            await notify(session, PLATFORM_ADMINS_CHANNEL)
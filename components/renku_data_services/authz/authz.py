@@ -1,6 +1,7 @@
 """Projects authorization adapter."""
 
 import asyncio
+import time
 from collections.abc import AsyncGenerator, AsyncIterable, Awaitable, Callable
 from dataclasses import dataclass, field
 from enum import StrEnum
@@ -35,6 +36,7 @@ from ulid import ULID
 
 from renku_data_services import base_models
 from renku_data_services.app_config import logging
+from renku_data_services.app_config.request_cache import clear_request_cache, request_memoized, user_key
 from renku_data_services.authz.config import AuthzConfig
 from renku_data_services.authz.models import (
     Change,
@@ -46,6 +48,7 @@ from renku_data_services.authz.models import (
     Scope,
     Visibility,
 )
+from renku_data_services.authz.outbox import AuthzOutbox
 from renku_data_services.base_models.core import InternalServiceAdmin, ResourceType
 from renku_data_services.crc.models import (
     DeletedResourcePool,
@@ -76,6 +79,9 @@ from renku_data_services.users.models import DeletedUser, UserInfo, UserInfoUpda
 
 logger = logging.getLogger(__name__)
 
+PLATFORM_ADMINS_CHANNEL = "platform_admins_updated"
+"""The Postgres notification channel used to signal that the platform administrators changed."""
+
 
 _ID = TypeVar("_ID", bound="str | ULID | int")
 
@@ -119,20 +125,13 @@ _WithAuthz = TypeVar("_WithAuthz", bound=WithAuthz)
 
 @dataclass
 class _AuthzChange:
-    """Used to designate relationships to be created/updated/deleted and how those can be undone.
-
-    Sending the apply and undo relationships to the database must always be the equivalent of
-    a no-op.
-    """
+    """Used to designate relationships to be created/updated/deleted."""
 
     apply: WriteRelationshipsRequest = field(default_factory=WriteRelationshipsRequest)
-    undo: WriteRelationshipsRequest = field(default_factory=WriteRelationshipsRequest)
 
     def extend(self, other: "_AuthzChange") -> None:
         self.apply.updates.extend(other.apply.updates)
         self.apply.optional_preconditions.extend(other.apply.optional_preconditions)
-        self.undo.updates.extend(other.undo.updates)
-        self.undo.optional_preconditions.extend(other.undo.optional_preconditions)
 
 
 class _Relation(StrEnum):
@@ -415,12 +414,19 @@ def _is_allowed(
 
 @dataclass
 class Authz:
-    """Authorization decisions and updates."""
+    """Authorization decisions and updates.
+
+    The IDs of the platform administrators are cached in-process. The cache is invalidated by notifications on
+    `PLATFORM_ADMINS_CHANNEL` and expires after ``admin_cache_ttl_seconds`` in case a notification was missed.
+    """
 
     authz_config: AuthzConfig
+    admin_cache_ttl_seconds: float = 60
     _platform: ClassVar[ObjectReference] = field(default=_AuthzConverter.platform())
     _client: AsyncClient | None = field(default=None, init=False)
     _loop: asyncio.AbstractEventLoop | None = field(default=None, init=False)
+    _cached_admin_ids: tuple[float, frozenset[str]] | None = field(default=None, init=False, repr=False)
+    _admin_cache_generation: int = field(default=0, init=False, repr=False)
 
     @property
     def client(self) -> AsyncClient:
@@ -435,6 +441,33 @@ class Authz:
             self._client = self.authz_config.authz_async_client()
         return self._client
 
+    def invalidate_admin_cache(self, _payload: str | None = None) -> None:
+        """Drop the cached platform administrators."""
+        self._cached_admin_ids = None
+        self._admin_cache_generation += 1
+        clear_request_cache()
+
+    async def platform_admin_ids(self) -> frozenset[str]:
+        """The IDs of the users that are platform administrators in the authorization database."""
+        cached = self._cached_admin_ids
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        generation = self._admin_cache_generation
+        result = frozenset(await self._get_admin_user_ids())
+        # NOTE: Do not cache administrators that may have been changed while they were being read
+        if generation == self._admin_cache_generation:
+            self._cached_admin_ids = (time.monotonic() + self.admin_cache_ttl_seconds, result)
+        return result
+
+    async def is_platform_admin(self, user: base_models.APIUser) -> bool:
+        """Whether the user is a platform administrator in the authorization database."""
+        if isinstance(user, InternalServiceAdmin):
+            return True
+        if user.id is None:
+            return False
+        return user.id in await self.platform_admin_ids()
+
     @overload
     async def _has_permission(
         self, user: base_models.APIUser, resource_type: Literal[ResourceType.project], resource_id: ULID, scope: Scope
@@ -580,6 +613,9 @@ class Authz:
         self, user: base_models.APIUser, resource_type: ResourceType, resource_id: _ID, scope: Scope
     ) -> bool: ...
 
+    @request_memoized(
+        lambda _, user, resource_type, resource_id, scope: (user_key(user), resource_type, str(resource_id), scope)
+    )
     async def has_permission(
         self, user: base_models.APIUser, resource_type: ResourceType, resource_id: _ID, scope: Scope
     ) -> bool:
@@ -632,9 +668,7 @@ class Authz:
         The person requesting the information can be the user or someone else. I.e. the admin can request
         what are the resources that a user has access to.
         """
-        is_platform_admin = await self.has_permission(
-            requested_by, ResourceType.platform, self._platform.object_id, Scope.IS_ADMIN
-        )
+        is_platform_admin = await self.is_platform_admin(requested_by)
         if not is_platform_admin and requested_by.id != user_id:
             raise errors.ForbiddenError(
                 message=f"User with ID {requested_by.id} cannot check the permissions of another user with ID {user_id}"
@@ -722,9 +756,7 @@ class Authz:
         Returns a list of tuples: (subject_type, subject_id, relation).
         Skips public_viewer and resource_pool_platform relations.
         """
-        is_platform_admin = await self.has_permission(
-            user, ResourceType.platform, self._platform.object_id, Scope.IS_ADMIN
-        )
+        is_platform_admin = await self.is_platform_admin(user)
         if not is_platform_admin:
             raise errors.UnauthorizedError(message="You do not have the required permissions for this operation.")
 
@@ -1003,33 +1035,20 @@ class Authz:
                         message="The authorization database decorator needs a session with an open transaction."
                     )
 
-                authz_change = _AuthzChange()
                 try:
-                    # NOTE: Here we have to maintain the following order of operations:
-                    # 1. Run decorated function
-                    # 2. Write resources to the Authzed DB
-                    # 3. Commit the open transaction
-                    # 4. If something goes wrong abort the transaction and remove things from Authzed DB
-                    # See https://authzed.com/docs/spicedb/concepts/relationships#writing-relationships
-                    # If this order of operations is changed you can get a case where for a short period of time
-                    # resources exists in the postgres DB without any authorization information in the Authzed DB.
+                    # NOTE: The relationship updates are added to the outbox in the open transaction, so they are
+                    # committed together with the changes of the decorated function and written to the Authzed DB
+                    # afterwards. Nothing is written to the Authzed DB if the transaction is rolled back.
                     result = await f(db_repo, *args, **kwargs)
                     authz_change = await _get_authz_change(db_repo, op, resource, result, *args, **kwargs)
-                    await db_repo.authz.client.WriteRelationships(authz_change.apply)
+                    entry_id = await AuthzOutbox.add(session, authz_change.apply)
                     await session.commit()
-                    return result
-                except Exception as err:
-                    db_rollback_err = None
-                    try:
-                        # NOTE: If the rollback fails do not stop just continue to make sure the resource
-                        # from the Authzed DB is also removed
-                        await asyncio.shield(session.rollback())
-                    except Exception as _db_rollback_err:
-                        db_rollback_err = _db_rollback_err
-                    await asyncio.shield(db_repo.authz.client.WriteRelationships(authz_change.undo))
-                    if db_rollback_err:
-                        raise db_rollback_err from err
-                    raise err
+                except Exception:
+                    await asyncio.shield(session.rollback())
+                    raise
+                if entry_id is not None:
+                    await AuthzOutbox.write_after_commit(db_repo.authz, session, entry_id)
+                return result
 
             return decorated_function
 
@@ -1077,12 +1096,7 @@ class Authz:
                 RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in relationships
             ]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[
-                RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in relationships
-            ]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     @_is_allowed_on_resource(Scope.DELETE, ResourceType.project)
     async def _remove_project(
@@ -1113,10 +1127,7 @@ class Authz:
         apply = WriteRelationshipsRequest(
             updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in rels]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in rels]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     # NOTE changing visibility is the same access level as removal
     @_is_allowed_on_resource(Scope.DELETE, ResourceType.project)
@@ -1192,12 +1203,12 @@ class Authz:
         match project.visibility:
             case Visibility.PUBLIC:
                 if project_already_public:
-                    return _AuthzChange(apply=WriteRelationshipsRequest(), undo=WriteRelationshipsRequest())
-                return _AuthzChange(apply=make_public, undo=make_private)
+                    return _AuthzChange()
+                return _AuthzChange(apply=make_public)
             case Visibility.PRIVATE:
                 if project_already_private:
-                    return _AuthzChange(apply=WriteRelationshipsRequest(), undo=WriteRelationshipsRequest())
-                return _AuthzChange(apply=make_private, undo=make_public)
+                    return _AuthzChange()
+                return _AuthzChange(apply=make_private)
         raise errors.ProgrammingError(
             message=f"Encountered unknown project visibility {project.visibility} when trying to "
             f"make a visibility change for project with ID {project.id}",
@@ -1236,38 +1247,17 @@ class Authz:
             if project.namespace.kind == NamespaceKind.group
             else SubjectReference(object=_AuthzConverter.user_namespace(project.namespace.id))
         )
-        old_namespace_sub = (
-            SubjectReference(
-                object=_AuthzConverter.group(ULID.from_str(current_namespace.relationship.subject.object.object_id))
-            )
-            if current_namespace.relationship.subject.object.object_type == ResourceType.group.value
-            else SubjectReference(
-                object=_AuthzConverter.user_namespace(
-                    ULID.from_str(current_namespace.relationship.subject.object.object_id)
-                )
-            )
-        )
         new_namespace = Relationship(
             resource=project_res,
             relation=_Relation.project_namespace.value,
             subject=new_namespace_sub,
         )
-        old_namespace = Relationship(
-            resource=project_res,
-            relation=_Relation.project_namespace.value,
-            subject=old_namespace_sub,
-        )
         apply_change = WriteRelationshipsRequest(
             updates=[
                 RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=new_namespace),
             ]
         )
-        undo_change = WriteRelationshipsRequest(
-            updates=[
-                RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=old_namespace),
-            ]
-        )
-        return _AuthzChange(apply=apply_change, undo=undo_change)
+        return _AuthzChange(apply=apply_change)
 
     async def _get_resource_owners(
         self, resource_type: ResourceType, resource_id: str, consistency: Consistency
@@ -1306,7 +1296,6 @@ class Authz:
         consistency = Consistency(at_least_as_fresh=zed_token) if zed_token else Consistency(fully_consistent=True)
         project_res = _AuthzConverter.project(resource_id)
         add_members: list[RelationshipUpdate] = []
-        undo: list[RelationshipUpdate] = []
         output: list[MembershipChange] = []
         expected_user_roles = {_Relation.viewer.value, _Relation.owner.value, _Relation.editor.value}
         existing_owners_rels = await self._get_resource_owners(resource_type, resource_id_str, consistency)
@@ -1329,7 +1318,7 @@ class Authz:
             )
             existing_rels = [i async for i in existing_rels_iter if i.relationship.relation in expected_user_roles]
             if len(existing_rels) > 0:
-                # The existing relationships should be deleted if all goes well and added back in if we have to undo
+                # The existing relationships are replaced by the new one
                 existing_rel = existing_rels[0]
                 if existing_rel.relationship != rel:
                     if existing_rel.relationship.relation == _Relation.owner.value:
@@ -1351,17 +1340,6 @@ class Authz:
                             ),
                         ]
                     )
-                    undo.extend(
-                        [
-                            RelationshipUpdate(
-                                operation=RelationshipUpdate.OPERATION_DELETE,
-                                relationship=rel,
-                            ),
-                            RelationshipUpdate(
-                                operation=RelationshipUpdate.OPERATION_TOUCH, relationship=existing_rel.relationship
-                            ),
-                        ]
-                    )
                     output.append(MembershipChange(member, Change.UPDATE))
                 for rel_to_remove in existing_rels[1:]:
                     # NOTE: This means that the user has more than 1 role on the project - which should not happen
@@ -1377,22 +1355,14 @@ class Authz:
                             relationship=rel_to_remove.relationship,
                         ),
                     )
-                    undo.append(
-                        RelationshipUpdate(
-                            operation=RelationshipUpdate.OPERATION_TOUCH, relationship=rel_to_remove.relationship
-                        ),
-                    )
                     output.append(MembershipChange(member, Change.REMOVE))
             else:
                 if rel.relation == _Relation.owner.value:
                     n_existing_owners += 1
-                # The new relationship is added if all goes well and deleted if we have to undo
+                # The new relationship is added
                 add_members.append(
                     RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=rel),
                 )
-                undo.append(
-                    RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=rel),
-                )
                 output.append(MembershipChange(member, Change.ADD))
 
         if n_existing_owners == 0:
@@ -1401,10 +1371,9 @@ class Authz:
                 "Assign at least one user as owner and then retry."
             )
 
-        change = _AuthzChange(
-            apply=WriteRelationshipsRequest(updates=add_members), undo=WriteRelationshipsRequest(updates=undo)
-        )
+        change = _AuthzChange(apply=WriteRelationshipsRequest(updates=add_members))
         await self.client.WriteRelationships(change.apply)
+        clear_request_cache()
         return output
 
     @_is_allowed(Scope.CHANGE_MEMBERSHIP)
@@ -1420,7 +1389,6 @@ class Authz:
         """Remove the specific members from the project, then return the list of members that were removed."""
         resource_id_str = str(resource_id)
         consistency = Consistency(at_least_as_fresh=zed_token) if zed_token else Consistency(fully_consistent=True)
-        add_members: list[RelationshipUpdate] = []
         remove_members: list[RelationshipUpdate] = []
         output: list[MembershipChange] = []
         existing_owners_rels = await self._get_resource_owners(resource_type, resource_id_str, consistency)
@@ -1436,8 +1404,6 @@ class Authz:
             existing_rels: AsyncIterable[ReadRelationshipsResponse] = self.client.ReadRelationships(
                 ReadRelationshipsRequest(consistency=consistency, relationship_filter=existing_rel_filter)
             )
-            # NOTE: We have to make sure that when we undo we only put back relationships that existed already.
-            # Blindly undoing everything that was passed in may result in adding things that weren't there before.
             async for existing_rel in existing_rels:
                 if existing_rel.relationship.relation == _Relation.owner.value and user_id in existing_owners:
                     if len(existing_owners) == 1:
@@ -1446,11 +1412,6 @@ class Authz:
                             "which is not allowed. Assign another user as owner and then retry."
                         )
                     existing_owners.remove(user_id)
-                add_members.append(
-                    RelationshipUpdate(
-                        operation=RelationshipUpdate.OPERATION_TOUCH, relationship=existing_rel.relationship
-                    )
-                )
                 remove_members.append(
                     RelationshipUpdate(
                         operation=RelationshipUpdate.OPERATION_DELETE, relationship=existing_rel.relationship
@@ -1466,10 +1427,9 @@ class Authz:
                         Change.REMOVE,
                     ),
                 )
-        change = _AuthzChange(
-            apply=WriteRelationshipsRequest(updates=remove_members), undo=WriteRelationshipsRequest(updates=add_members)
-        )
+        change = _AuthzChange(apply=WriteRelationshipsRequest(updates=remove_members))
         await self.client.WriteRelationships(change.apply)
+        clear_request_cache()
         return output
 
     async def _get_admin_user_ids(self) -> list[str]:
@@ -1491,6 +1451,7 @@ class Authz:
 
     def _add_admin(self, user_id: str) -> _AuthzChange:
         """Add a deployment-wide administrator in the authorization database."""
+        self.invalidate_admin_cache()
         rel = Relationship(
             resource=_AuthzConverter.platform(),
             relation=_Relation.admin.value,
@@ -1499,10 +1460,7 @@ class Authz:
         apply = WriteRelationshipsRequest(
             updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=rel)]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=rel)]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     def _add_resource_pool(self, resource_pool: ResourcePool) -> _AuthzChange:
         """Create the new resource pool and associated resources and relations in the DB."""
@@ -1532,12 +1490,7 @@ class Authz:
                 RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in relationships
             ]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[
-                RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in relationships
-            ]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     async def _remove_resource_pool(
         self,
@@ -1560,10 +1513,7 @@ class Authz:
         apply = WriteRelationshipsRequest(
             updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in rels]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in rels]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     async def _update_resource_pool_visibility(
         self, user: base_models.APIUser, resource_pool: ResourcePool, *, zed_token: ZedToken | None = None
@@ -1599,10 +1549,9 @@ class Authz:
         )
 
         apply_updates: list[RelationshipUpdate] = []
-        undo_updates: list[RelationshipUpdate] = []
 
         if resource_pool.public:
-            # For undo, only remove wildcards if they didn't exist before
+            # NOTE: Only add the wildcards that do not exist yet
             existing_subjects = {
                 (rel.subject.object.object_type, rel.subject.object.object_id) for rel in existing_rels
             }
@@ -1613,12 +1562,6 @@ class Authz:
                         relationship=all_users_are_public,
                     )
                 )
-                undo_updates.append(
-                    RelationshipUpdate(
-                        operation=RelationshipUpdate.OPERATION_DELETE,
-                        relationship=all_users_are_public,
-                    )
-                )
             if ("anonymous_user", "*") not in existing_subjects:
                 apply_updates.append(
                     RelationshipUpdate(
@@ -1626,12 +1569,6 @@ class Authz:
                         relationship=anon_users_are_public,
                     )
                 )
-                undo_updates.append(
-                    RelationshipUpdate(
-                        operation=RelationshipUpdate.OPERATION_DELETE,
-                        relationship=anon_users_are_public,
-                    )
-                )
         else:
             # Remove public_viewer wildcards
             for existing_rel in existing_rels:
@@ -1641,22 +1578,8 @@ class Authz:
                         relationship=existing_rel,
                     )
                 )
-            if existing_rels:
-                undo_updates.append(
-                    RelationshipUpdate(
-                        operation=RelationshipUpdate.OPERATION_TOUCH,
-                        relationship=all_users_are_public,
-                    )
-                )
-                undo_updates.append(
-                    RelationshipUpdate(
-                        operation=RelationshipUpdate.OPERATION_TOUCH,
-                        relationship=anon_users_are_public,
-                    )
-                )
         apply = WriteRelationshipsRequest(updates=apply_updates)
-        undo = WriteRelationshipsRequest(updates=undo_updates)
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     def _resource_pool_membership_changes_to_authz_change(
         self,
@@ -1670,10 +1593,9 @@ class Authz:
             operation: The authorization operation (create or delete).
 
         Returns:
-            An _AuthzChange with apply and undo WriteRelationshipsRequests.
+            An _AuthzChange with the WriteRelationshipsRequest to apply.
         """
         apply_updates: list[RelationshipUpdate] = []
-        undo_updates: list[RelationshipUpdate] = []
 
         for mc in pool_change.changes:
             member = mc.member
@@ -1698,21 +1620,16 @@ class Authz:
 
             if mc.change == Change.ADD:
                 apply_updates.append(RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=rel))
-                undo_updates.append(RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=rel))
             else:
                 apply_updates.append(
                     RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=rel)
                 )
-                undo_updates.append(RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=rel))
 
-        return _AuthzChange(
-            apply=WriteRelationshipsRequest(updates=apply_updates),
-            undo=WriteRelationshipsRequest(updates=undo_updates),
-        )
+        return _AuthzChange(apply=WriteRelationshipsRequest(updates=apply_updates))
 
     async def _remove_admin(self, user_id: str) -> _AuthzChange:
-        """Add a deployment-wide administrator in the authorization database."""
-        existing_admin_ids = await self._get_admin_user_ids()
+        """Remove a deployment-wide administrator from the authorization database."""
+        self.invalidate_admin_cache()
         rel = Relationship(
             resource=_AuthzConverter.platform(),
             relation=_Relation.admin.value,
@@ -1721,12 +1638,7 @@ class Authz:
         apply = WriteRelationshipsRequest(
             updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=rel)]
         )
-        undo = WriteRelationshipsRequest()
-        if user_id in existing_admin_ids:
-            undo = WriteRelationshipsRequest(
-                updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=rel)]
-            )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     def _add_group(self, group: Group) -> _AuthzChange:
         """Add a group to the authorization database."""
@@ -1765,12 +1677,7 @@ class Authz:
                 RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in relationships
             ]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[
-                RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in relationships
-            ]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     @_is_allowed_on_resource(Scope.DELETE, ResourceType.group)
     async def _remove_group(
@@ -1792,10 +1699,7 @@ class Authz:
         apply = WriteRelationshipsRequest(
             updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in rels]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in rels]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     @_is_allowed(Scope.CHANGE_MEMBERSHIP)
     async def upsert_group_members(
@@ -1811,7 +1715,6 @@ class Authz:
         consistency = Consistency(at_least_as_fresh=zed_token) if zed_token else Consistency(fully_consistent=True)
         group_res = _AuthzConverter.group(resource_id)
         add_members: list[RelationshipUpdate] = []
-        undo: list[RelationshipUpdate] = []
         output: list[MembershipChange] = []
         resource_id_str = str(resource_id)
         expected_user_roles = {_Relation.viewer.value, _Relation.owner.value, _Relation.editor.value}
@@ -1836,7 +1739,7 @@ class Authz:
 
             existing_rels = [i async for i in existing_rels_result if i.relationship.relation in expected_user_roles]
             if len(existing_rels) > 0:
-                # The existing relationships should be deleted if all goes well and added back in if we have to undo
+                # The existing relationships are replaced by the new one
                 existing_rel = existing_rels[0]
                 if existing_rel.relationship != rel:
                     if existing_rel.relationship.relation == _Relation.owner.value:
@@ -1858,18 +1761,6 @@ class Authz:
                             ),
                         ]
                     )
-                    undo.extend(
-                        [
-                            RelationshipUpdate(
-                                operation=RelationshipUpdate.OPERATION_TOUCH,
-                                relationship=existing_rel.relationship,
-                            ),
-                            RelationshipUpdate(
-                                operation=RelationshipUpdate.OPERATION_DELETE,
-                                relationship=rel,
-                            ),
-                        ]
-                    )
                     output.append(MembershipChange(member, Change.UPDATE))
                 for rel_to_remove in existing_rels[1:]:
                     # NOTE: This means that the user has more than 1 role on the group - which should not happen
@@ -1885,23 +1776,15 @@ class Authz:
                             relationship=rel_to_remove.relationship,
                         ),
                     )
-                    undo.append(
-                        RelationshipUpdate(
-                            operation=RelationshipUpdate.OPERATION_TOUCH, relationship=rel_to_remove.relationship
-                        ),
-                    )
                     output.append(MembershipChange(member, Change.REMOVE))
             else:
                 if rel.relation == _Relation.owner.value:
                     n_existing_owners += 1
 
-                # The new relationship is added if all goes well and deleted if we have to undo
+                # The new relationship is added
                 add_members.append(
                     RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=rel),
                 )
-                undo.append(
-                    RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=rel),
-                )
                 output.append(MembershipChange(member, Change.ADD))
 
         if n_existing_owners == 0:
@@ -1910,10 +1793,9 @@ class Authz:
                 "Assign at least one user as owner and then retry."
             )
 
-        change = _AuthzChange(
-            apply=WriteRelationshipsRequest(updates=add_members), undo=WriteRelationshipsRequest(updates=undo)
-        )
+        change = _AuthzChange(apply=WriteRelationshipsRequest(updates=add_members))
         await self.client.WriteRelationships(change.apply)
+        clear_request_cache()
         return output
 
     @_is_allowed(Scope.CHANGE_MEMBERSHIP)
@@ -1928,7 +1810,6 @@ class Authz:
     ) -> list[MembershipChange]:
         """Remove the specific members from the group, then return the list of members that were removed."""
         consistency = Consistency(at_least_as_fresh=zed_token) if zed_token else Consistency(fully_consistent=True)
-        add_members: list[RelationshipUpdate] = []
         remove_members: list[RelationshipUpdate] = []
         output: list[MembershipChange] = []
         existing_owners_rels: list[ReadRelationshipsResponse] | None = None
@@ -1944,8 +1825,6 @@ class Authz:
             existing_rels: AsyncIterable[ReadRelationshipsResponse] = self.client.ReadRelationships(
                 ReadRelationshipsRequest(consistency=consistency, relationship_filter=existing_rel_filter)
             )
-            # NOTE: We have to make sure that when we undo we only put back relationships that existed already.
-            # Blindly undoing everything that was passed in may result in adding things that weren't there before.
             async for existing_rel in existing_rels:
                 if existing_rel.relationship.relation == _Relation.owner.value:
                     if existing_owners_rels is None:
@@ -1957,11 +1836,6 @@ class Authz:
                             message="You are trying to remove the single last owner of the group, "
                             "which is not allowed. Assign another user as owner and then retry."
                         )
-                add_members.append(
-                    RelationshipUpdate(
-                        operation=RelationshipUpdate.OPERATION_TOUCH, relationship=existing_rel.relationship
-                    )
-                )
                 remove_members.append(
                     RelationshipUpdate(
                         operation=RelationshipUpdate.OPERATION_DELETE, relationship=existing_rel.relationship
@@ -1977,10 +1851,9 @@ class Authz:
                         Change.REMOVE,
                     ),
                 )
-        change = _AuthzChange(
-            apply=WriteRelationshipsRequest(updates=remove_members), undo=WriteRelationshipsRequest(updates=add_members)
-        )
+        change = _AuthzChange(apply=WriteRelationshipsRequest(updates=remove_members))
         await self.client.WriteRelationships(change.apply)
+        clear_request_cache()
         return output
 
     def _add_user_namespace(self, namespace: Namespace) -> _AuthzChange:
@@ -2020,12 +1893,7 @@ class Authz:
                 RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in relationships
             ]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[
-                RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in relationships
-            ]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     async def _remove_user_namespace(self, user_id: str, zed_token: ZedToken | None = None) -> _AuthzChange:
         """Remove the user namespace from the authorization database."""
@@ -2040,10 +1908,7 @@ class Authz:
         apply = WriteRelationshipsRequest(
             updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in rels]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in rels]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     def _add_data_connector(self, data_connector: DataConnector) -> _AuthzChange:
         """Create the new data connector and associated resources and relations in the DB."""
@@ -2089,12 +1954,7 @@ class Authz:
                 RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in relationships
             ]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[
-                RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in relationships
-            ]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     def _add_global_data_connector(self, data_connector: GlobalDataConnector) -> _AuthzChange:
         """Create the new global data connector and associated resources and relations in the DB."""
@@ -2125,12 +1985,7 @@ class Authz:
                 RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in relationships
             ]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[
-                RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in relationships
-            ]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     @_is_allowed_on_resource(Scope.DELETE, ResourceType.data_connector)
     async def _remove_data_connector(
@@ -2150,10 +2005,7 @@ class Authz:
         apply = WriteRelationshipsRequest(
             updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in rels]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in rels]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     async def _remove_user(
         self,
@@ -2182,10 +2034,7 @@ class Authz:
         apply = WriteRelationshipsRequest(
             updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in rels]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in rels]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     # NOTE changing visibility is the same access level as removal
     @_is_allowed_on_resource(Scope.DELETE, ResourceType.data_connector)
@@ -2270,12 +2119,12 @@ class Authz:
         match data_connector.visibility:
             case Visibility.PUBLIC:
                 if data_connector_already_public:
-                    return _AuthzChange(apply=WriteRelationshipsRequest(), undo=WriteRelationshipsRequest())
-                return _AuthzChange(apply=make_public, undo=make_private)
+                    return _AuthzChange()
+                return _AuthzChange(apply=make_public)
             case Visibility.PRIVATE:
                 if data_connector_already_private:
-                    return _AuthzChange(apply=WriteRelationshipsRequest(), undo=WriteRelationshipsRequest())
-                return _AuthzChange(apply=make_private, undo=make_public)
+                    return _AuthzChange()
+                return _AuthzChange(apply=make_private)
         raise errors.ProgrammingError(
             message=f"Encountered unknown data connector visibility {data_connector.visibility} when trying to "
             f"make a visibility change for data connector with ID {data_connector.id}",
@@ -2329,38 +2178,17 @@ class Authz:
         if current_namespace.relationship.subject.object.object_id == new_namespace_id:
             return _AuthzChange()
         new_namespace_sub = SubjectReference(object=new_namespace_owner)
-        old_namespace_sub = (
-            SubjectReference(
-                object=_AuthzConverter.group(ULID.from_str(current_namespace.relationship.subject.object.object_id))
-            )
-            if current_namespace.relationship.subject.object.object_type == ResourceType.group.value
-            else SubjectReference(
-                object=_AuthzConverter.user_namespace(
-                    ULID.from_str(current_namespace.relationship.subject.object.object_id)
-                )
-            )
-        )
         new_namespace = Relationship(
             resource=data_connector_res,
             relation=_Relation.data_connector_namespace.value,
             subject=new_namespace_sub,
         )
-        old_namespace = Relationship(
-            resource=data_connector_res,
-            relation=_Relation.data_connector_namespace.value,
-            subject=old_namespace_sub,
-        )
         apply_change = WriteRelationshipsRequest(
             updates=[
                 RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=new_namespace),
             ]
         )
-        undo_change = WriteRelationshipsRequest(
-            updates=[
-                RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=old_namespace),
-            ]
-        )
-        return _AuthzChange(apply=apply_change, undo=undo_change)
+        return _AuthzChange(apply=apply_change)
 
     async def _remove_data_connector_to_project_link(
         self, user: base_models.APIUser, link: DataConnectorToProjectLink
@@ -2395,10 +2223,7 @@ class Authz:
         apply = WriteRelationshipsRequest(
             updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=i) for i in rels]
         )
-        undo = WriteRelationshipsRequest(
-            updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=i) for i in rels]
-        )
-        return _AuthzChange(apply=apply, undo=undo)
+        return _AuthzChange(apply=apply)
 
     async def _relationship_exists(
         self,
@@ -0,0 +1,153 @@
+"""Bulk synchronization of relationships to the authorization database."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Sequence
+from dataclasses import dataclass, field
+
+from authzed.api.v1 import (
+    Consistency,
+    ReadRelationshipsRequest,
+    ReadRelationshipsResponse,
+    RelationshipFilter,
+    RelationshipUpdate,
+    WriteRelationshipsRequest,
+)
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from renku_data_services.app_config import logging
+from renku_data_services.authz.authz import Authz
+from renku_data_services.authz.orm import BulkSyncCheckpointORM
+
+logger = logging.getLogger(__name__)
+
+type BulkSyncItem = tuple[str, Sequence[RelationshipUpdate]]
+"""An item to synchronize: a key used as checkpoint position and the relationship updates for it."""
+
+type BulkSyncSource = Callable[[str | None], AsyncIterable[BulkSyncItem]]
+"""Produces the items to synchronize ordered by key, starting after the given checkpoint position."""
+
+
+@dataclass
+class BulkSyncProgress:
+    """Progress of a bulk synchronization."""
+
+    name: str
+    resumed_from: str | None = None
+    items: int = 0
+    updates: int = 0
+    requests: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def __str__(self) -> str:
+        elapsed = time.monotonic() - self.started_at
+        rate = self.items / elapsed if elapsed > 0 else 0
+        return (
+            f"{self.name}: wrote {self.updates} relationship updates for {self.items} items "
+            f"in {self.requests} requests, {elapsed:.1f}s ({rate:.0f} items/s)"
+        )
+
+
+class AuthzBulkSync:
+    """Writes and reads relationships in large batches.
+
+    Relationship updates are grouped in ``WriteRelationships`` requests of up to ``batch_size`` updates. After each
+    request the key of the last written item is stored as the checkpoint of the synchronization, so that an
+    interrupted synchronization resumes from there. The checkpoint is removed once the synchronization completes.
+
+    NOTE: ``ImportBulkRelationships`` is not used because it fails on relationships that already exist, while
+    synchronizations have to be idempotent. Updates should therefore use ``OPERATION_TOUCH``.
+    """
+
+    def __init__(
+        self,
+        authz: Authz,
+        session_maker: Callable[..., AsyncSession],
+        batch_size: int = 500,
+        page_size: int = 1000,
+    ) -> None:
+        self.authz = authz
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+        self.page_size = page_size
+
+    async def write(self, name: str, source: BulkSyncSource) -> BulkSyncProgress:
+        """Write all the relationship updates produced by the source, resuming from the last checkpoint."""
+        checkpoint = await self.get_checkpoint(name)
+        progress = BulkSyncProgress(name=name, resumed_from=checkpoint)
+        if checkpoint is not None:
+            logger.info(f"{name}: resuming after {checkpoint}")
+
+        batch: list[RelationshipUpdate] = []
+        batch_items = 0
+        last_key: str | None = None
+        async for key, updates in source(checkpoint):
+            batch.extend(updates)
+            batch_items += 1
+            last_key = key
+            if len(batch) >= self.batch_size:
+                await self.__write_batch(progress, batch, batch_items, last_key)
+                batch, batch_items = [], 0
+        if batch_items > 0 and last_key is not None:
+            await self.__write_batch(progress, batch, batch_items, last_key)
+
+        await self.clear_checkpoint(name)
+        logger.info(f"Completed {progress}")
+        return progress
+
+    async def read(
+        self, relationship_filter: RelationshipFilter, consistency: Consistency | None = None
+    ) -> AsyncIterator[ReadRelationshipsResponse]:
+        """Read all the relationships matching the filter, page by page."""
+        cursor = None
+        while True:
+            request = ReadRelationshipsRequest(
+                relationship_filter=relationship_filter,
+                optional_limit=self.page_size,
+                optional_cursor=cursor,
+                consistency=consistency or Consistency(fully_consistent=True),
+            )
+            num_read = 0
+            async for response in self.authz.client.ReadRelationships(request):
+                num_read += 1
+                cursor = response.after_result_cursor
+                yield response
+            if num_read < self.page_size:
+                return
+
+    async def get_checkpoint(self, name: str) -> str | None:
+        """Get the position up to which the synchronization was written, if it did not complete."""
+        async with self.session_maker() as session:
+            position: str | None = await session.scalar(
+                select(BulkSyncCheckpointORM.position).where(BulkSyncCheckpointORM.name == name)
+            )
+        return position
+
+    async def clear_checkpoint(self, name: str) -> None:
+        """Remove the checkpoint so that the next synchronization starts from the beginning."""
+        async with self.session_maker() as session, session.begin():
+            await session.execute(delete(BulkSyncCheckpointORM).where(BulkSyncCheckpointORM.name == name))
+
+    async def save_checkpoint(self, name: str, position: str) -> None:
+        """Store the position up to which the synchronization was written."""
+        stmt = insert(BulkSyncCheckpointORM).values(name=name, position=position)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BulkSyncCheckpointORM.name],
+            set_={"position": stmt.excluded.position, "updated_at": func.now()},
+        )
+        async with self.session_maker() as session, session.begin():
+            await session.execute(stmt)
+
+    async def __write_batch(
+        self, progress: BulkSyncProgress, batch: list[RelationshipUpdate], batch_items: int, last_key: str
+    ) -> None:
+        if batch:
+            await self.authz.client.WriteRelationships(WriteRelationshipsRequest(updates=batch))
+            progress.requests += 1
+        progress.items += batch_items
+        progress.updates += len(batch)
+        await self.save_checkpoint(progress.name, last_key)
+        logger.info(str(progress))
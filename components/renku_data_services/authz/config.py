@@ -6,6 +6,8 @@ from dataclasses import dataclass, field
 from authzed.api.v1 import AsyncClient, SyncClient
 from grpcutil import bearer_token_credentials, insecure_bearer_token_credentials
 
+from renku_data_services.app_config.instrumentation import instrument_grpc_client
+
 
 @dataclass
 class AuthzConfig:
@@ -15,6 +17,8 @@ class AuthzConfig:
     grpc_port: int
     key: str = field(repr=False)
     no_tls_connection: bool = False  # If set to true it means the communication to authzed is unencrypted
+    # If set to true requests do not wait for their relationship updates to be written to authzed
+    outbox_write_in_background: bool = False
 
     @classmethod
     def from_env(cls) -> "AuthzConfig":
@@ -23,7 +27,8 @@ class AuthzConfig:
         grpc_port = os.environ.get("AUTHZ_DB_GRPC_PORT", "50051")
         key = os.environ["AUTHZ_DB_KEY"]
         no_tls_connection = os.environ.get("AUTHZ_DB_NO_TLS_CONNECTION", "false").lower() == "true"
-        return cls(host, int(grpc_port), key, no_tls_connection)
+        outbox_write_in_background = os.environ.get("AUTHZ_OUTBOX_WRITE_IN_BACKGROUND", "false").lower() == "true"
+        return cls(host, int(grpc_port), key, no_tls_connection, outbox_write_in_background)
 
     def authz_client(self) -> SyncClient:
         """Generate an Authzed client."""
@@ -35,10 +40,10 @@ class AuthzConfig:
         return SyncClient(target=target, credentials=credentials)
 
     def authz_async_client(self) -> AsyncClient:
-        """Generate an Authzed client."""
+        """Generate an Authzed client that records the latency of its calls."""
         target = f"{self.host}:{self.grpc_port}"
         if self.no_tls_connection:
             credentials = insecure_bearer_token_credentials(self.key)
         else:
             credentials = bearer_token_credentials(self.key)
-        return AsyncClient(target=target, credentials=credentials)
+        return instrument_grpc_client(AsyncClient(target=target, credentials=credentials), "authz")
@@ -1,8 +1,9 @@
 """SQLAlchemy schemas for the CRC database."""
 
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Identity, Integer, MetaData, String
+from sqlalchemy import BigInteger, DateTime, Identity, Index, Integer, LargeBinary, MetaData, String, func, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, MappedAsDataclass, mapped_column
 
 
@@ -20,3 +21,33 @@ class ProjectUserAuthz(BaseORM):
     role: Mapped[int] = mapped_column(index=True)
     user_id: Mapped[Optional[str]] = mapped_column("user_id", String(36), index=True, default=None)
     id: Mapped[int] = mapped_column(Integer, Identity(always=True), primary_key=True, default=None, init=False)
+
+
+class BulkSyncCheckpointORM(BaseORM):
+    """The position up to which a bulk synchronization to the authorization database has been written."""
+
+    __tablename__ = "bulk_sync_checkpoints"
+    name: Mapped[str] = mapped_column("name", String(100), primary_key=True)
+    position: Mapped[str] = mapped_column("position", String())
+    updated_at: Mapped[datetime] = mapped_column(
+        "updated_at", DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), init=False
+    )
+
+
+class AuthzOutboxORM(BaseORM):
+    """Relationship updates stored in the transaction of a change, to be written to the authorization database."""
+
+    __tablename__ = "outbox"
+    __table_args__ = (Index("ix_authz_outbox_pending", "id", postgresql_where=text("written_at IS NULL")),)
+    updates: Mapped[bytes] = mapped_column("updates", LargeBinary())
+    """The serialized ``WriteRelationshipsRequest``."""
+    id: Mapped[int] = mapped_column(BigInteger, Identity(always=True), primary_key=True, default=None, init=False)
+    created_at: Mapped[datetime] = mapped_column(
+        "created_at", DateTime(timezone=True), server_default=func.now(), init=False
+    )
+    written_at: Mapped[Optional[datetime]] = mapped_column(
+        "written_at", DateTime(timezone=True), default=None, index=True
+    )
+    zed_token: Mapped[Optional[str]] = mapped_column("zed_token", String(), default=None)
+    claimed_until: Mapped[Optional[datetime]] = mapped_column("claimed_until", DateTime(timezone=True), default=None)
+    """Until when a writer has claimed the entry to write it."""
@@ -0,0 +1,250 @@
+"""Transactional outbox for the relationship updates written to the authorization database.
+
+Changes add their relationship updates to the outbox table in the same transaction as the change itself, so the
+updates of a committed change are never lost and the updates of a change that is rolled back are never written. The
+request that made the change writes its entry right after the transaction commits and waits until it is written, a
+data task writes the entries that could not be written by a request, e.g. because it failed or wrote in the
+background.
+
+The token of the last write made in the current context is available with `last_written_zed_token`, so that the
+following reads can ask for ``at_least_as_fresh`` consistency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from collections.abc import Callable, Iterator, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from authzed.api.v1 import Relationship, RelationshipUpdate, WriteRelationshipsRequest, ZedToken
+from prometheus_client import Counter
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from renku_data_services.app_config import logging
+from renku_data_services.authz.orm import AuthzOutboxORM
+from renku_data_services.errors import errors
+
+if TYPE_CHECKING:
+    from renku_data_services.authz.authz import Authz
+
+logger = logging.getLogger(__name__)
+
+_background_writes: set[asyncio.Task[None]] = set()
+_last_zed_token: contextvars.ContextVar[ZedToken | None] = contextvars.ContextVar(
+    "authz_outbox_zed_token", default=None
+)
+
+_WRITE_FAILURES = Counter(
+    "authz_outbox_write_failures_total",
+    "Number of writes of the authorization outbox made after a change that failed, the data task retries them.",
+    ["mode"],
+)
+
+
+def last_written_zed_token() -> ZedToken | None:
+    """The token of the last relationship updates written by a change made in the current context."""
+    return _last_zed_token.get()
+
+
+def _relationship_key(relationship: Relationship) -> tuple[str, ...]:
+    return (
+        relationship.resource.object_type,
+        relationship.resource.object_id,
+        relationship.relation,
+        relationship.subject.object.object_type,
+        relationship.subject.object.object_id,
+        relationship.subject.optional_relation,
+    )
+
+
+def _batches(
+    entries: Sequence[AuthzOutboxORM], batch_size: int
+) -> Iterator[list[tuple[AuthzOutboxORM, list[RelationshipUpdate]]]]:
+    """Group consecutive entries into requests of up to batch_size updates.
+
+    An entry that updates a relationship already updated in the batch starts a new batch, because the
+    authorization database rejects requests that update the same relationship twice.
+    """
+    batch: list[tuple[AuthzOutboxORM, list[RelationshipUpdate]]] = []
+    keys: set[tuple[str, ...]] = set()
+    for entry in entries:
+        updates = list(WriteRelationshipsRequest.FromString(entry.updates).updates)
+        entry_keys = {_relationship_key(update.relationship) for update in updates}
+        if batch and (len(keys) + len(entry_keys) > batch_size or not keys.isdisjoint(entry_keys)):
+            yield batch
+            batch, keys = [], set()
+        batch.append((entry, updates))
+        keys |= entry_keys
+    if batch:
+        yield batch
+
+
+class AuthzOutbox:
+    """Writes the entries of the outbox to the authorization database.
+
+    Entries are written in the order they were added, one ``WriteRelationships`` request of up to ``batch_size``
+    updates at a time. A writer claims the oldest pending entries in a short transaction, writes them outside of any
+    transaction and marks them as written in a second short transaction. While the oldest pending entry is claimed,
+    other writers do not claim any entries, so there is never more than one request in flight and entries are never
+    written out of order. A claim expires after ``claim_timeout`` in case its writer died, which is longer than the
+    timeout of the ``WriteRelationships`` request.
+    """
+
+    def __init__(
+        self,
+        authz: Authz,
+        session_maker: Callable[..., AsyncSession],
+        batch_size: int = 500,
+        retention: timedelta = timedelta(hours=1),
+        write_timeout: timedelta = timedelta(seconds=10),
+        claim_timeout: timedelta = timedelta(seconds=30),
+    ) -> None:
+        if claim_timeout <= write_timeout:
+            raise errors.ConfigurationError(message="The outbox claim timeout must be longer than the write timeout.")
+        self.authz = authz
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+        self.retention = retention
+        self.write_timeout = write_timeout
+        self.claim_timeout = claim_timeout
+
+    @staticmethod
+    async def add(session: AsyncSession, request: WriteRelationshipsRequest) -> int | None:
+        """Add the updates of the request to the outbox in the transaction of the session, returns the entry id."""
+        if not request.updates:
+            return None
+        entry = AuthzOutboxORM(updates=request.SerializeToString())
+        session.add(entry)
+        await session.flush()
+        return entry.id
+
+    @classmethod
+    async def write_after_commit(cls, authz: Authz, session: AsyncSession, entry_id: int) -> ZedToken | None:
+        """Write an entry once the transaction that added it has committed, returns the token of the write.
+
+        Unless the authorization database is configured to write the outbox in the background, this waits until the
+        entry is written, also when it is written by another writer, and raises an error if that does not happen
+        within the timeout. The token is also recorded for `last_written_zed_token`. In the background, failures are
+        logged and counted, the data task writes the entry later, and no token is returned.
+        """
+        outbox = cls(authz, async_sessionmaker(session.bind, expire_on_commit=False))
+        if authz.authz_config.outbox_write_in_background:
+            task = asyncio.create_task(outbox.__write_in_background(entry_id))
+            _background_writes.add(task)
+            task.add_done_callback(_background_writes.discard)
+            return None
+        try:
+            zed_token = await outbox.wait_until_written(entry_id)
+        except Exception as err:
+            _WRITE_FAILURES.labels("request").inc()
+            logger.error(f"Could not write the authorization outbox up to entry {entry_id}", exc_info=err)
+            raise errors.ProgrammingError(
+                message="The change was saved, but its permissions could not be written yet. "
+                "They will be written shortly, please retry in a minute."
+            ) from err
+        if zed_token is not None:
+            _last_zed_token.set(zed_token)
+        return zed_token
+
+    async def wait_until_written(
+        self, entry_id: int, timeout: timedelta = timedelta(seconds=20), interval: float = 0.1
+    ) -> ZedToken | None:
+        """Write the entries up to the given one until it is written, returns the token of its write.
+
+        Raises ``TimeoutError`` if the entry is not written within the timeout.
+        """
+        stmt = select(AuthzOutboxORM.written_at, AuthzOutboxORM.zed_token).where(AuthzOutboxORM.id == entry_id)
+        async with asyncio.timeout(timeout.total_seconds()):
+            while True:
+                await self.write_pending(up_to=entry_id)
+                async with self.session_maker() as session:
+                    row = (await session.execute(stmt)).one_or_none()
+                if row is None:
+                    # NOTE: Only written entries are removed
+                    return None
+                written_at, zed_token = row
+                if written_at is not None:
+                    return ZedToken(token=zed_token) if zed_token else None
+                # NOTE: Another writer has claimed the entries before this one
+                await asyncio.sleep(interval)
+
+    async def write_pending(self, up_to: int | None = None) -> int:
+        """Write the entries that were not written yet, up to the given one, returns the number of entries written.
+
+        Stops early when the oldest pending entry is claimed by another writer.
+        """
+        num_written = 0
+        while True:
+            claimed = await self.__claim(up_to)
+            if claimed is None:
+                return num_written
+            entry_ids, updates = claimed
+            try:
+                response = await self.authz.client.WriteRelationships(
+                    WriteRelationshipsRequest(updates=updates), timeout=self.write_timeout.total_seconds()
+                )
+            except BaseException:
+                await asyncio.shield(self.__release(entry_ids))
+                raise
+            # NOTE: If the entries cannot be marked as written, their claim expires and they are written again. This
+            # is harmless as the updates only touch or delete relationships, so writing them twice has the same result.
+            async with self.session_maker() as session, session.begin():
+                await session.execute(
+                    update(AuthzOutboxORM)
+                    .where(AuthzOutboxORM.id.in_(entry_ids))
+                    .values(written_at=datetime.now(UTC), zed_token=response.written_at.token, claimed_until=None)
+                )
+            num_written += len(entry_ids)
+
+    async def remove_written(self) -> int:
+        """Remove the entries written longer than the retention ago, returns the number of entries removed."""
+        cutoff = datetime.now(UTC) - self.retention
+        stmt = delete(AuthzOutboxORM).where(AuthzOutboxORM.written_at < cutoff).returning(AuthzOutboxORM.id)
+        async with self.session_maker() as session, session.begin():
+            removed = list(await session.scalars(stmt))
+        return len(removed)
+
+    async def __claim(self, up_to: int | None) -> tuple[list[int], list[RelationshipUpdate]] | None:
+        """Claim the oldest pending entries for one request, None if there are none or they are already claimed."""
+        stmt = (
+            select(AuthzOutboxORM)
+            .where(AuthzOutboxORM.written_at.is_(None))
+            .order_by(AuthzOutboxORM.id)
+            .limit(self.batch_size)
+            .with_for_update()
+        )
+        if up_to is not None:
+            stmt = stmt.where(AuthzOutboxORM.id <= up_to)
+        async with self.session_maker() as session, session.begin():
+            now = datetime.now(UTC)
+            entries = list(await session.scalars(stmt))
+            unclaimed: list[AuthzOutboxORM] = []
+            for entry in entries:
+                if entry.claimed_until is not None and entry.claimed_until > now:
+                    break
+                unclaimed.append(entry)
+            if not unclaimed:
+                return None
+            # NOTE: Every entry has at least one update, so the entries read always fill at least one request
+            batch = next(_batches(unclaimed, self.batch_size))
+            for entry, _ in batch:
+                entry.claimed_until = now + self.claim_timeout
+            return [entry.id for entry, _ in batch], [u for _, entry_updates in batch for u in entry_updates]
+
+    async def __release(self, entry_ids: list[int]) -> None:
+        async with self.session_maker() as session, session.begin():
+            await session.execute(
+                update(AuthzOutboxORM)
+                .where(AuthzOutboxORM.id.in_(entry_ids), AuthzOutboxORM.written_at.is_(None))
+                .values(claimed_until=None)
+            )
+
+    async def __write_in_background(self, entry_id: int) -> None:
+        try:
+            await self.wait_until_written(entry_id)
+        except Exception as err:
+            _WRITE_FAILURES.labels("background").inc()
+            logger.error(f"Could not write the authorization outbox up to entry {entry_id}, will retry later: {err}")
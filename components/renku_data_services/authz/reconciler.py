@@ -0,0 +1,283 @@
+"""Reconciliation of the authorization database with the data in the database."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Collection, Sequence
+from datetime import datetime, timedelta
+
+from authzed.api.v1 import (
+    Consistency,
+    ReadRelationshipsRequest,
+    Relationship,
+    RelationshipFilter,
+    RelationshipUpdate,
+    SubjectReference,
+    WatchRequest,
+    WriteRelationshipsRequest,
+    ZedToken,
+)
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ulid import ULID
+
+from renku_data_services.app_config import logging
+from renku_data_services.authz.authz import Authz, _AuthzConverter, _Relation
+from renku_data_services.authz.bulk import AuthzBulkSync, BulkSyncItem
+from renku_data_services.base_models.core import ResourceType
+from renku_data_services.namespace.orm import EntitySlugORM, NamespaceORM
+from renku_data_services.project.orm import ProjectORM
+
+logger = logging.getLogger(__name__)
+
+
+class _WatchedChanges:
+    """Projects reported by the Watch API that still have to be verified, with the position in the watch stream."""
+
+    def __init__(self) -> None:
+        self.__changes: deque[tuple[float, set[str], str]] = deque()
+
+    def add(self, project_ids: set[str], token: str) -> None:
+        """Record the projects of a change received now."""
+        self.__changes.append((time.monotonic(), project_ids, token))
+
+    def pop_older_than(self, cutoff: float) -> tuple[set[str], str | None]:
+        """Remove the changes received before the cutoff, returns their projects and the last position."""
+        project_ids: set[str] = set()
+        token = None
+        while self.__changes and self.__changes[0][0] <= cutoff:
+            _, ids, token = self.__changes.popleft()
+            project_ids |= ids
+        return project_ids, token
+
+
+class ProjectNamespaceReconciler:
+    """Keeps the namespace relationships of projects in the authorization database in line with the database.
+
+    Only projects that changed are verified: projects updated in the database since the last watermark and projects
+    whose namespace relationship changed in the authorization database, as reported by its Watch API. The
+    watermark and the position in the watch stream are stored as bulk sync checkpoints. Corrections are written in
+    batches. A full scan of all projects is available for manual runs.
+
+    NOTE: Projects are verified against a snapshot of the database, a project moved concurrently may be corrected
+    with stale data. The move updates the project in the database and its relationship afterwards, so the project
+    is verified again on the next run.
+    """
+
+    DB_CHECKPOINT = "reconcile_project_namespaces_db"
+    WATCH_CHECKPOINT = "reconcile_project_namespaces_watch"
+    FULL_SCAN_CHECKPOINT = "reconcile_project_namespaces_full_scan"
+
+    def __init__(
+        self,
+        authz: Authz,
+        bulk_sync: AuthzBulkSync,
+        session_maker: Callable[..., AsyncSession],
+        batch_size: int = 100,
+        watermark_overlap: timedelta = timedelta(minutes=5),
+        watch_delay: timedelta = timedelta(seconds=30),
+    ) -> None:
+        self.authz = authz
+        self.bulk_sync = bulk_sync
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+        # NOTE: updated_at is set when a transaction starts, so a project can become visible after projects with
+        # a later updated_at. Projects updated within the overlap before the watermark are verified again.
+        self.watermark_overlap = watermark_overlap
+        self.watch_delay = watch_delay
+
+    async def reconcile(self, project_ids: Collection[str]) -> int:
+        """Verify the namespace relationships of the given projects and correct them, returns the number of updates."""
+        num_updates = 0
+        ids = sorted(set(project_ids))
+        for start in range(0, len(ids), self.batch_size):
+            corrections = await self._corrections(ids[start : start + self.batch_size])
+            updates = [update for _, project_updates in corrections for update in project_updates]
+            if updates:
+                await self.authz.client.WriteRelationships(WriteRelationshipsRequest(updates=updates))
+                num_updates += len(updates)
+        if num_updates > 0:
+            logger.info(f"Corrected {num_updates} project namespace relationships")
+        return num_updates
+
+    async def reconcile_changed_in_db(self) -> int:
+        """Verify the projects updated in the database since the last run."""
+        checkpoint = await self.bulk_sync.get_checkpoint(self.DB_CHECKPOINT)
+        stmt = select(ProjectORM.id, ProjectORM.updated_at).where(ProjectORM.updated_at.is_not(None))
+        if checkpoint is not None:
+            stmt = stmt.where(ProjectORM.updated_at > datetime.fromisoformat(checkpoint) - self.watermark_overlap)
+        async with self.session_maker() as session:
+            rows = (await session.execute(stmt)).all()
+        if not rows:
+            return 0
+        num_updates = await self.reconcile([str(project_id) for project_id, _ in rows])
+        watermark = max(updated_at for _, updated_at in rows if updated_at is not None)
+        await self.bulk_sync.save_checkpoint(self.DB_CHECKPOINT, watermark.isoformat())
+        return num_updates
+
+    async def run(self, period_s: float) -> None:
+        """Verify the projects that changed in the database or in the authorization database until cancelled."""
+        watched = _WatchedChanges()
+        watcher = asyncio.create_task(self._watch(watched))
+        try:
+            while True:
+                if watcher.done():
+                    # NOTE: Raises the error that stopped watching, the task is restarted by the task manager
+                    watcher.result()
+                    return
+                await self.reconcile_changed_in_db()
+                await self._reconcile_watched(watched)
+                await asyncio.sleep(period_s)
+        finally:
+            watcher.cancel()
+
+    async def _watch(self, watched: _WatchedChanges) -> None:
+        """Collect the projects whose namespace relationship changed, as they are reported by the Watch API.
+
+        If the stored position is too old to resume from, watching restarts from now on the next run.
+        """
+        checkpoint = await self.bulk_sync.get_checkpoint(self.WATCH_CHECKPOINT)
+        request = WatchRequest(
+            optional_object_types=[ResourceType.project.value],
+            optional_start_cursor=ZedToken(token=checkpoint) if checkpoint else None,
+        )
+        try:
+            async for response in self.authz.client.Watch(request):
+                project_ids = {
+                    update.relationship.resource.object_id
+                    for update in response.updates
+                    if update.relationship.relation == _Relation.project_namespace.value
+                }
+                watched.add(project_ids, response.changes_through.token)
+        except Exception:
+            if checkpoint is not None:
+                logger.warning("Watching from the stored position failed, the next run will start watching from now")
+                await self.bulk_sync.clear_checkpoint(self.WATCH_CHECKPOINT)
+            raise
+
+    async def _reconcile_watched(self, watched: _WatchedChanges) -> int:
+        """Verify the watched projects whose change is older than the watch delay."""
+        # NOTE: Relationships are written through the outbox after the database transaction commits, and in order,
+        # so a watched change is never ahead of the database. But the later moves of the same projects may still be
+        # in the outbox, which the data task only writes a period later if the request could not. Waiting for the
+        # watch delay lets them be delivered first instead of correcting the projects while they are in flight.
+        project_ids, token = watched.pop_older_than(time.monotonic() - self.watch_delay.total_seconds())
+        num_updates = await self.reconcile(project_ids) if project_ids else 0
+        if token is not None:
+            await self.bulk_sync.save_checkpoint(self.WATCH_CHECKPOINT, token)
+        return num_updates
+
+    async def reconcile_all(self) -> int:
+        """Verify all projects, and remove the namespace relationships of projects that do not exist anymore.
+
+        The scan over the projects resumes from its checkpoint if it was interrupted. Returns the number of updates.
+        """
+
+        async def _all_projects(after: str | None) -> AsyncIterator[BulkSyncItem]:
+            last_id = ULID.from_str(after) if after else None
+            while True:
+                stmt = select(ProjectORM.id).order_by(ProjectORM.id).limit(self.batch_size)
+                if last_id is not None:
+                    stmt = stmt.where(ProjectORM.id > last_id)
+                async with self.session_maker() as session:
+                    project_ids = [str(project_id) for project_id in await session.scalars(stmt)]
+                if not project_ids:
+                    return
+                for item in await self._corrections(project_ids):
+                    yield item
+                last_id = ULID.from_str(project_ids[-1])
+
+        progress = await self.bulk_sync.write(self.FULL_SCAN_CHECKPOINT, _all_projects)
+        num_updates = progress.updates
+
+        relationships = self.bulk_sync.read(
+            RelationshipFilter(
+                resource_type=ResourceType.project.value, optional_relation=_Relation.project_namespace.value
+            )
+        )
+        batch: list[Relationship] = []
+        async for response in relationships:
+            batch.append(response.relationship)
+            if len(batch) >= self.batch_size:
+                num_updates += await self._remove_orphaned(batch)
+                batch = []
+        num_updates += await self._remove_orphaned(batch)
+        logger.info(f"Verified all projects, corrected {num_updates} project namespace relationships")
+        return num_updates
+
+    async def _expected_namespaces(self, project_ids: Sequence[str]) -> dict[str, SubjectReference]:
+        """The namespace each of the given projects should have in the authorization database."""
+        stmt = (
+            select(EntitySlugORM.project_id, NamespaceORM.id, NamespaceORM.group_id)
+            .join(NamespaceORM, NamespaceORM.id == EntitySlugORM.namespace_id)
+            .where(EntitySlugORM.project_id.in_([ULID.from_str(i) for i in project_ids]))
+            .where(EntitySlugORM.data_connector_id.is_(None))
+        )
+        async with self.session_maker() as session:
+            rows = (await session.execute(stmt)).all()
+        return {
+            str(project_id): SubjectReference(
+                object=_AuthzConverter.group(group_id)
+                if group_id is not None
+                else _AuthzConverter.user_namespace(namespace_id)
+            )
+            for project_id, namespace_id, group_id in rows
+        }
+
+    async def _current_namespaces(self, project_id: str) -> list[Relationship]:
+        """The namespace relationships of a project in the authorization database."""
+        request = ReadRelationshipsRequest(
+            consistency=Consistency(fully_consistent=True),
+            relationship_filter=RelationshipFilter(
+                resource_type=ResourceType.project.value,
+                optional_resource_id=project_id,
+                optional_relation=_Relation.project_namespace.value,
+            ),
+        )
+        return [response.relationship async for response in self.authz.client.ReadRelationships(request)]
+
+    async def _corrections(self, project_ids: Sequence[str]) -> list[BulkSyncItem]:
+        """The updates needed to correct the namespace relationships of the given projects."""
+        expected = await self._expected_namespaces(project_ids)
+        current = await asyncio.gather(*(self._current_namespaces(project_id) for project_id in project_ids))
+        items: list[BulkSyncItem] = []
+        for project_id, relationships in zip(project_ids, current, strict=True):
+            updates: list[RelationshipUpdate] = []
+            subject = expected.get(project_id)
+            for relationship in relationships:
+                if subject is None or relationship.subject != subject:
+                    logger.info(f"Removing wrong namespace relationship {relationship} of project {project_id}")
+                    updates.append(
+                        RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=relationship)
+                    )
+            if subject is not None and all(r.subject != subject for r in relationships):
+                relationship = Relationship(
+                    resource=_AuthzConverter.project(ULID.from_str(project_id)),
+                    relation=_Relation.project_namespace.value,
+                    subject=subject,
+                )
+                updates.append(
+                    RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=relationship)
+                )
+            items.append((project_id, updates))
+        return items
+
+    async def _remove_orphaned(self, relationships: list[Relationship]) -> int:
+        """Remove the namespace relationships of projects that are not in the database."""
+        if not relationships:
+            return 0
+        project_ids = {ULID.from_str(r.resource.object_id) for r in relationships}
+        async with self.session_maker() as session:
+            existing = await session.scalars(select(ProjectORM.id).where(ProjectORM.id.in_(project_ids)))
+            existing_ids = {str(project_id) for project_id in existing}
+        updates = [
+            RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=r)
+            for r in relationships
+            if r.resource.object_id not in existing_ids
+        ]
+        if updates:
+            logger.info(f"Removing the namespace relationships of {len(updates)} projects that do not exist")
+            await self.authz.client.WriteRelationships(WriteRelationshipsRequest(updates=updates))
+        return len(updates)
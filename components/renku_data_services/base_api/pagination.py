@@ -1,23 +1,63 @@
-"""Classes and decorators used for paginating long responses."""
+"""Classes and decorators used for paginating long responses.
 
+Two modes are supported. The default one uses page numbers which translate into ``OFFSET``/``LIMIT`` queries and
+exact counts. When the ``cursor`` query parameter is present (empty for the first page) keyset pagination is used
+instead: the position of the last item of the previous page is passed back in an opaque cursor token, so that every
+page costs the same regardless of how deep it is, and the total is only an estimate from the query planner.
+"""
+
+import json as jsonlib
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from collections.abc import Callable, Coroutine, Sequence
+from datetime import datetime
 from functools import wraps
 from math import ceil
 from typing import Any, Concatenate, NamedTuple, ParamSpec, TypeVar, cast
 
 from sanic import Request, json
 from sanic.response import JSONResponse
-from sqlalchemy import Select
+from sqlalchemy import ColumnElement, Select, func, literal, select, tuple_
+from sqlalchemy.exc import CompileError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute
+from ulid import ULID
 
 from renku_data_services import errors
 
 
+class Cursor(NamedTuple):
+    """The position of the last item of a page, used for keyset pagination."""
+
+    id: ULID
+    sort_value: datetime | None = None
+    segment: int = 0
+
+    def encode(self) -> str:
+        """Serialize the cursor into an opaque token."""
+        payload = [str(self.id), self.sort_value.isoformat() if self.sort_value else None, self.segment]
+        return urlsafe_b64encode(jsonlib.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        """Deserialize a cursor from an opaque token."""
+        try:
+            raw_id, raw_sort_value, segment = jsonlib.loads(urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            return cls(
+                id=ULID.from_str(raw_id),
+                sort_value=datetime.fromisoformat(raw_sort_value) if raw_sort_value is not None else None,
+                segment=int(segment),
+            )
+        except (ValueError, TypeError) as err:
+            raise errors.ValidationError(message=f"Invalid value for parameter 'cursor': {token}") from err
+
+
 class PaginationRequest(NamedTuple):
     """Request for a paginated response."""
 
     page: int
     per_page: int
+    keyset: bool = False
+    cursor: Cursor | None = None
 
     def __post_init__(self) -> None:
         # NOTE: Postgres will fail if a value higher than what can fit in signed int64 is present in the query
@@ -55,15 +95,38 @@ class PaginationResponse(NamedTuple):
         }
 
 
+class KeysetPaginationResponse(NamedTuple):
+    """Keyset paginated response parameters."""
+
+    per_page: int
+    estimated_total: int
+    next_cursor: Cursor | None
+
+    def as_header(self) -> dict[str, str]:
+        """Convert the instance into a dictionary that can be inserted into a HTTP header."""
+        headers = {
+            "per-page": str(self.per_page),
+            "total": str(self.estimated_total),
+            "total-estimated": "true",
+        }
+        if self.next_cursor is not None:
+            headers["next-cursor"] = self.next_cursor.encode()
+        return headers
+
+
 _P = ParamSpec("_P")
 
 
 def paginate(
-    f: Callable[Concatenate[Request, _P], Coroutine[Any, Any, tuple[Sequence[Any], int]]],
+    f: Callable[
+        Concatenate[Request, _P],
+        Coroutine[Any, Any, tuple[Sequence[Any], int] | tuple[Sequence[Any], int, Cursor | None]],
+    ],
 ) -> Callable[Concatenate[Request, _P], Coroutine[Any, Any, JSONResponse]]:
     """Serializes the response to JSON and adds the required pagination headers to the response.
 
-    The handler should return first the list of items and then the total count from the DB.
+    The handler should return first the list of items and then the total count from the DB. Handlers that support
+    keyset pagination also return the cursor of the next page (see ``next_cursor``) as a third element.
     """
 
     @wraps(f)
@@ -89,9 +152,20 @@ def paginate(
         if per_page < 1 or per_page > 100:
             raise errors.ValidationError(message="Parameter 'per_page' must be between 1 and 100")
 
-        pagination_req = PaginationRequest(page, per_page)
+        # NOTE: Blank values have to be kept so that an empty cursor can request the first keyset page
+        cursor_parameter = cast(str | None, request.get_args(keep_blank_values=True).get("cursor"))
+        keyset = cursor_parameter is not None
+        cursor = Cursor.decode(cursor_parameter) if cursor_parameter else None
+
+        pagination_req = PaginationRequest(page, per_page, keyset=keyset, cursor=cursor)
         kwargs["pagination"] = pagination_req
-        items, db_count = await f(request, *args, **kwargs)
+        result = await f(request, *args, **kwargs)
+        items, db_count = result[0], result[1]
+        if keyset:
+            if len(result) < 3:
+                raise errors.ValidationError(message="The parameter 'cursor' is not supported for this listing.")
+            keyset_pagination = KeysetPaginationResponse(per_page, db_count, result[2])
+            return json(items, headers=keyset_pagination.as_header())
         total_pages = ceil(db_count / per_page)
 
         pagination = PaginationResponse(page, per_page, db_count, total_pages)
@@ -103,6 +177,77 @@ def paginate(
 _T = TypeVar("_T")
 
 
+def paginate_query(
+    stmt: Select[tuple[_T]],
+    req: PaginationRequest,
+    id_column: QueryableAttribute[Any] | ColumnElement[Any],
+    sort_column: QueryableAttribute[Any] | ColumnElement[Any] | None = None,
+    descending: bool = True,
+) -> Select[tuple[_T]]:
+    """Order a query by its sort key and restrict it to the requested page.
+
+    In keyset mode the rows following the cursor are selected by comparing the (sort value, id) key with the
+    cursor, so this can use an index instead of scanning and discarding all the preceding rows.
+    """
+    columns = [sort_column, id_column] if sort_column is not None else [id_column]
+    stmt = stmt.order_by(*[col.desc() if descending else col.asc() for col in columns]).limit(req.per_page)
+    if not req.keyset:
+        return stmt.offset(req.offset)
+    if req.cursor is None:
+        return stmt
+    cursor_id = literal(req.cursor.id, id_column.expression.type)
+    key: ColumnElement[Any]
+    cursor_key: ColumnElement[Any]
+    if sort_column is not None:
+        if req.cursor.sort_value is None:
+            raise errors.ValidationError(message="The provided 'cursor' does not match the requested listing.")
+        key = tuple_(sort_column, id_column)
+        cursor_key = tuple_(literal(req.cursor.sort_value, sort_column.expression.type), cursor_id)
+    else:
+        key, cursor_key = id_column.expression, cursor_id
+    return stmt.where(key < cursor_key if descending else key > cursor_key)
+
+
+def next_cursor(
+    req: PaginationRequest,
+    items: Sequence[_T],
+    id_key: Callable[[_T], ULID],
+    sort_key: Callable[[_T], datetime] | None = None,
+    segment_key: Callable[[_T], int] | None = None,
+) -> Cursor | None:
+    """Get the cursor for the page following the given items, if there can be one."""
+    if not req.keyset or len(items) < req.per_page:
+        return None
+    last = items[-1]
+    return Cursor(
+        id=id_key(last),
+        sort_value=sort_key(last) if sort_key else None,
+        segment=segment_key(last) if segment_key else 0,
+    )
+
+
+async def estimate_count(session: AsyncSession, stmt: Select[Any]) -> int:
+    """Estimate the number of rows a query returns from the query planner rather than with a COUNT(*) query.
+
+    Falls back to counting the rows if the parameters of the query cannot be rendered as literals.
+    """
+    stmt = stmt.limit(None).offset(None).order_by(None)
+    try:
+        compiled = stmt.compile(dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    except CompileError:
+        count = await session.scalar(select(func.count()).select_from(stmt.subquery()))
+        return count or 0
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")  # nosec B608
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = jsonlib.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (TypeError, KeyError, IndexError):
+        return 0
+
+
 async def paginate_queries(
     req: PaginationRequest, session: AsyncSession, stmts: list[tuple[Select[tuple[_T]], int]]
 ) -> list[_T]:
@@ -131,3 +276,29 @@ async def paginate_queries(
             output.extend(res[:num_required])
             return output
     return output
+
+
+async def paginate_queries_keyset(
+    req: PaginationRequest,
+    session: AsyncSession,
+    stmts: list[tuple[Select[tuple[_T]], QueryableAttribute[Any] | ColumnElement[Any]]],
+) -> list[tuple[_T, int]]:
+    """Paginate several different queries with keyset pagination as if they were part of a single table.
+
+    Every query should be ordered in ascending order by the ULID id column passed along with it. The returned items
+    are paired with the index of the query they come from, which has to be used as the segment of the next cursor.
+    Queries before the segment of the cursor are skipped without being run.
+    """
+    output: list[tuple[_T, int]] = []
+    start_segment = req.cursor.segment if req.cursor is not None else 0
+    for segment, (stmt, id_column) in enumerate(stmts):
+        if segment < start_segment:
+            continue
+        num_required = req.per_page - len(output)
+        if num_required <= 0:
+            break
+        if req.cursor is not None and segment == start_segment:
+            stmt = stmt.where(id_column > req.cursor.id)
+        res = await session.scalars(stmt.limit(num_required))
+        output.extend((item, segment) for item in res.all())
+    return output
@@ -3,8 +3,9 @@
 import logging
 from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
+from typing import Any
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from ulid import ULID
 
@@ -239,6 +240,53 @@ class OccurrenceRepository:
             occurrence_list = occurrences.all()
             return [occurrence.dump() for occurrence in occurrence_list]
 
+    async def get_occurrences_with_reservations(
+        self, status: models.OccurrenceState, due_for_activation: bool = False
+    ) -> list[tuple[models.Occurrence, models.CapacityReservation]]:
+        """Get occurrences in the given state together with their capacity reservation in a single query.
+
+        If due_for_activation is set, only occurrences whose activation time has passed are returned.
+        """
+
+        async with self.session_maker() as session:
+            query = (
+                select(schemas.OccurrenceORM, schemas.CapacityReservationORM)
+                .join(
+                    schemas.CapacityReservationORM,
+                    schemas.CapacityReservationORM.id == schemas.OccurrenceORM.reservation_id,
+                )
+                .where(schemas.OccurrenceORM.status == status)
+            )
+            if due_for_activation:
+                query = query.where(schemas.OccurrenceORM.activate_at_datetime <= datetime.now(UTC))
+
+            results = await session.execute(query)
+            return [(occurrence.dump(), reservation.dump()) for occurrence, reservation in results.tuples()]
+
+    async def update_occurrences(self, occurrence_patches: dict[ULID, models.OccurrencePatch]) -> None:
+        """Update multiple occurrences by ID in a single transaction."""
+
+        if not occurrence_patches:
+            return
+
+        values = []
+        for occurrence_id, patch in occurrence_patches.items():
+            value: dict[str, Any] = {"id": occurrence_id}
+            if patch.activate_at_datetime is not None:
+                value["activate_at_datetime"] = patch.activate_at_datetime
+            if patch.start_datetime is not None:
+                value["start_datetime"] = patch.start_datetime
+            if patch.end_datetime is not None:
+                value["end_datetime"] = patch.end_datetime
+            if patch.status is not None:
+                value["status"] = patch.status
+            if patch.deployment_name is not None:
+                value["deployment_name"] = patch.deployment_name
+            values.append(value)
+
+        async with self.session_maker() as session, session.begin():
+            await session.execute(update(schemas.OccurrenceORM), values)
+
     async def get_existing_occurrence_ids(self, occurrence_ids: list[ULID]) -> set[ULID]:
         """Return the subset of occurrence IDs that exist in the database."""
 
@@ -139,9 +139,12 @@ class CapacityReservationK8sClient:
         ):
             yield obj
 
-    async def list_sessions(self) -> AsyncGenerator[dict, None]:
-        """List all non-hibernated AmaltheaSession objects across all clusters, yielding relevant fields as dicts."""
-        async for s in self.__client.list(K8sObjectFilter(gvk=AMALTHEA_SESSION_GVK)):
+    async def list_sessions(self, skipped_clusters: set[ClusterId] | None = None) -> AsyncGenerator[dict, None]:
+        """List all non-hibernated AmaltheaSession objects across all clusters, yielding relevant fields as dicts.
+
+        The clusters whose sessions could not be listed are added to ``skipped_clusters`` if it is given.
+        """
+        async for s in self.__client.list(K8sObjectFilter(gvk=AMALTHEA_SESSION_GVK), skipped_clusters=skipped_clusters):
             session = AmaltheaSessionV1Alpha1.model_validate(s.manifest)
             if session.spec.hibernated:
                 continue
@@ -1,9 +1,14 @@
 """Task definitions."""
 
+import asyncio
 import random
+from collections import defaultdict
+from collections.abc import Coroutine
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from typing import Any
 
+from prometheus_client import Counter, Histogram
 from ulid import ULID
 
 from renku_data_services.app_config import logging
@@ -17,11 +22,24 @@ from renku_data_services.capacity_reservation.models import (
     OccurrenceState,
     ScaleDownBehavior,
 )
+from renku_data_services.k8s.constants import ClusterId
 from renku_data_services.k8s.models import K8sObject
 
 logger = logging.getLogger(__name__)
 
 
+_RECONCILIATION_DURATION = Histogram(
+    "capacity_reservation_reconciliation_duration_seconds",
+    "Duration of a capacity reservation reconciliation pass.",
+    ["task"],
+)
+_RECONCILIATION_K8S_FAILURES = Counter(
+    "capacity_reservation_reconciliation_k8s_failures_total",
+    "Number of failed Kubernetes operations during capacity reservation reconciliation.",
+    ["task"],
+)
+
+
 @dataclass(kw_only=True)
 class CapacityReservationTasks:
     """Task definitions for capacity reservations."""
@@ -29,113 +47,135 @@ class CapacityReservationTasks:
     occurrence_repo: OccurrenceRepository
     capacity_reservation_repo: CapacityReservationRepository
     k8s_client: CapacityReservationK8sClient
+    max_concurrent_k8s_operations: int = 10
+
+    async def _gather_bounded[T](self, operations: list[Coroutine[Any, Any, T]]) -> list[T | BaseException]:
+        """Run the operations concurrently, with at most max_concurrent_k8s_operations running at the same time."""
+        semaphore = asyncio.Semaphore(self.max_concurrent_k8s_operations)
+
+        async def _run(operation: Coroutine[Any, Any, T]) -> T:
+            async with semaphore:
+                return await operation
+
+        return await asyncio.gather(*(_run(op) for op in operations), return_exceptions=True)
 
     async def activate_pending_occurrences_task(self) -> None:
         """Activate pending capacity reservation occurrences."""
 
-        due_pending_occurrences = await self.occurrence_repo.get_occurrences_due_for_activation()
+        with _RECONCILIATION_DURATION.labels("activate").time():
+            due_pending_pairs = await self.occurrence_repo.get_occurrences_with_reservations(
+                status=OccurrenceState.PENDING, due_for_activation=True
+            )
 
-        if not due_pending_occurrences:
-            logger.debug("No pending capacity reservation occurrences are due for activation.")
-            return None
+            if not due_pending_pairs:
+                logger.debug("No pending capacity reservation occurrences are due for activation.")
+                return None
 
-        logger.info(f"Activating {len(due_pending_occurrences)} pending capacity reservation occurrence(s).")
+            logger.info(f"Activating {len(due_pending_pairs)} pending capacity reservation occurrence(s).")
 
-        for occurrence in due_pending_occurrences:
-            reservations = await self.capacity_reservation_repo.get_capacity_reservations_by_ids(
-                [occurrence.reservation_id]
+            results = await self._gather_bounded(
+                [self.k8s_client.create_placeholder_deployment(o, r) for o, r in due_pending_pairs]
             )
-            if not reservations:
-                logger.error(
-                    f"Could not find capacity reservation with id {occurrence.reservation_id} "
-                    f"for occurrence {occurrence.id}."
-                )
-                continue
-            reservation = reservations[0]
 
-            deployment_name = await self.k8s_client.create_placeholder_deployment(occurrence, reservation)
-            await self.occurrence_repo.update_occurrence(
-                occurrence.id,
-                OccurrencePatch(status=OccurrenceState.ACTIVE, deployment_name=deployment_name),
-            )
+            patches: dict[ULID, OccurrencePatch] = {}
+            for (occurrence, _), result in zip(due_pending_pairs, results, strict=True):
+                if isinstance(result, BaseException):
+                    _RECONCILIATION_K8S_FAILURES.labels("activate").inc()
+                    logger.error(f"Could not create placeholder deployment for occurrence {occurrence.id}: {result}")
+                    continue
+                patches[occurrence.id] = OccurrencePatch(status=OccurrenceState.ACTIVE, deployment_name=result)
+            await self.occurrence_repo.update_occurrences(patches)
 
     async def monitor_active_occurrences_task(self) -> None:
         """Monitor active capacity reservation occurrences, scaling up/down or deactivating as needed."""
 
-        active_occurrences = await self.occurrence_repo.get_occurrences_by_properties(status=OccurrenceState.ACTIVE)
-
-        if not active_occurrences:
-            logger.debug("No active capacity reservation occurrences to monitor.")
-            return None
-
-        logger.info(f"Monitoring {len(active_occurrences)} active capacity reservation occurrence(s).")
-
-        datetime_now = datetime.now(UTC)
-        expired_occurrences = [o for o in active_occurrences if o.end_datetime < datetime_now]
-        still_active_occurrences = [o for o in active_occurrences if o.end_datetime >= datetime_now]
-
-        for expired_occurrence in expired_occurrences:
-            logger.info(f"Deactivating occurrence {expired_occurrence.id} as its end time has passed.")
-            await self.occurrence_repo.update_occurrence(
-                expired_occurrence.id, OccurrencePatch(status=OccurrenceState.COMPLETED)
-            )
-            if expired_occurrence.deployment_name is None:
-                logger.warning(f"Expired occurrence {expired_occurrence.id} has no deployment name, skipping delete.")
-                continue
-            reservations = await self.capacity_reservation_repo.get_capacity_reservations_by_ids(
-                [expired_occurrence.reservation_id]
-            )
-            if not reservations:
-                logger.error(
-                    f"Could not find reservation for expired occurrence {expired_occurrence.id}, skipping delete."
-                )
-                continue
-            await self.k8s_client.delete_deployment(expired_occurrence.deployment_name, reservations[0])
-
-        if not still_active_occurrences:
-            logger.debug("No active capacity reservation occurrences to scale.")
-            return None
+        with _RECONCILIATION_DURATION.labels("monitor").time():
+            active_pairs = await self.occurrence_repo.get_occurrences_with_reservations(status=OccurrenceState.ACTIVE)
 
-        active_pairs: list[tuple[Occurrence, CapacityReservation]] = []
-        for occurrence in still_active_occurrences:
-            reservations = await self.capacity_reservation_repo.get_capacity_reservations_by_ids(
-                [occurrence.reservation_id]
-            )
-            if not reservations:
-                logger.error(
-                    f"Could not find capacity reservation with id {occurrence.reservation_id} "
-                    f"for occurrence {occurrence.id}."
-                )
-                continue
-            active_pairs.append((occurrence, reservations[0]))
+            if not active_pairs:
+                logger.debug("No active capacity reservation occurrences to monitor.")
+                return None
 
-        scalable_pairs = [
-            (o, r) for o, r in active_pairs if r.provisioning.scale_down_behavior != ScaleDownBehavior.NONE
-        ]
+            logger.info(f"Monitoring {len(active_pairs)} active capacity reservation occurrence(s).")
 
-        if not scalable_pairs:
-            logger.debug("No scalable capacity reservation occurrences to process.")
-            return None
+            datetime_now = datetime.now(UTC)
+            expired_pairs = [(o, r) for o, r in active_pairs if o.end_datetime < datetime_now]
+            still_active_pairs = [(o, r) for o, r in active_pairs if o.end_datetime >= datetime_now]
 
-        session_data = []
-        async for session in self.k8s_client.list_sessions():
-            session_data.append(session)
+            if expired_pairs:
+                await self._deactivate_expired_occurrences(expired_pairs)
 
-        project_template_map: dict[ULID, ULID | None] = {}
-        if any(r.project_template_id for _, r in scalable_pairs):
-            project_ids = [ULID.from_str(s["project_id"]) for s in session_data if s.get("project_id") is not None]
-            project_template_map = await self.occurrence_repo.get_project_template_ids(project_ids)
+            scalable_pairs = [
+                (o, r) for o, r in still_active_pairs if r.provisioning.scale_down_behavior != ScaleDownBehavior.NONE
+            ]
 
-        session_counts = _assign_sessions_to_occurrences(session_data, scalable_pairs, project_template_map)
+            if not scalable_pairs:
+                logger.debug("No scalable capacity reservation occurrences to process.")
+                return None
 
-        for occurrence, reservation in scalable_pairs:
-            count = session_counts.get(occurrence.id, 0)
-            target_replicas = calculate_target_replicas(reservation, occurrence, count, datetime_now)
+            session_data = []
+            skipped_clusters: set[ClusterId] = set()
+            async for session in self.k8s_client.list_sessions(skipped_clusters):
+                session_data.append(session)
+            if skipped_clusters:
+                # NOTE: Scaling on the sessions of some clusters only would scale down occurrences that are in use
+                logger.warning(
+                    f"The sessions of the clusters {sorted(skipped_clusters)} could not be listed, "
+                    "capacity reservation occurrences are not scaled until the next run."
+                )
+                return None
+
+            project_template_map: dict[ULID, ULID | None] = {}
+            if any(r.project_template_id for _, r in scalable_pairs):
+                project_ids = [ULID.from_str(s["project_id"]) for s in session_data if s.get("project_id") is not None]
+                project_template_map = await self.occurrence_repo.get_project_template_ids(project_ids)
+
+            session_counts = _assign_sessions_to_occurrences(session_data, scalable_pairs, project_template_map)
+
+            patch_operations = []
+            patched_occurrences = []
+            for occurrence, reservation in scalable_pairs:
+                count = session_counts.get(occurrence.id, 0)
+                target_replicas = calculate_target_replicas(reservation, occurrence, count, datetime_now)
+
+                if occurrence.deployment_name is None:
+                    logger.warning(f"Active occurrence {occurrence.id} has no deployment name, skipping patch.")
+                    continue
+                patch_operations.append(
+                    self.k8s_client.patch_deployment_replicas(occurrence.deployment_name, reservation, target_replicas)
+                )
+                patched_occurrences.append(occurrence)
+
+            results = await self._gather_bounded(patch_operations)
+            for occurrence, result in zip(patched_occurrences, results, strict=True):
+                if isinstance(result, BaseException):
+                    _RECONCILIATION_K8S_FAILURES.labels("monitor").inc()
+                    logger.error(f"Could not scale placeholder deployment for occurrence {occurrence.id}: {result}")
+
+    async def _deactivate_expired_occurrences(
+        self, expired_pairs: list[tuple[Occurrence, CapacityReservation]]
+    ) -> None:
+        """Mark expired occurrences as completed and delete their placeholder deployments."""
+        for expired_occurrence, _ in expired_pairs:
+            logger.info(f"Deactivating occurrence {expired_occurrence.id} as its end time has passed.")
+        await self.occurrence_repo.update_occurrences(
+            {o.id: OccurrencePatch(status=OccurrenceState.COMPLETED) for o, _ in expired_pairs}
+        )
 
-            if occurrence.deployment_name is None:
-                logger.warning(f"Active occurrence {occurrence.id} has no deployment name, skipping patch.")
+        delete_operations = []
+        deleted_occurrences = []
+        for expired_occurrence, reservation in expired_pairs:
+            if expired_occurrence.deployment_name is None:
+                logger.warning(f"Expired occurrence {expired_occurrence.id} has no deployment name, skipping delete.")
                 continue
-            await self.k8s_client.patch_deployment_replicas(occurrence.deployment_name, reservation, target_replicas)
+            delete_operations.append(self.k8s_client.delete_deployment(expired_occurrence.deployment_name, reservation))
+            deleted_occurrences.append(expired_occurrence)
+
+        results = await self._gather_bounded(delete_operations)
+        for occurrence, result in zip(deleted_occurrences, results, strict=True):
+            if isinstance(result, BaseException):
+                _RECONCILIATION_K8S_FAILURES.labels("monitor").inc()
+                logger.error(f"Could not delete placeholder deployment for occurrence {occurrence.id}: {result}")
 
     async def cleanup_orphaned_deployments_task(self) -> None:
         """Delete capacity reservation deployments whose occurrences no longer exist in the database."""
@@ -170,31 +210,32 @@ def _assign_sessions_to_occurrences(
     scalable_pairs: list[tuple[Occurrence, CapacityReservation]],
     project_template_map: dict[ULID, ULID | None],
 ) -> dict[ULID, int]:
-    """Assign sessions to occurrences based on matching criteria and return a count of sessions per occurrence."""
-    counts = {occurrence.id: 0 for occurrence, _ in scalable_pairs}
-    unmatched_sessions = session_data.copy()
+    """Assign sessions to occurrences based on matching criteria and return a count of sessions per occurrence.
 
-    for session in list(unmatched_sessions):
+    Sessions are first matched by the template of their project and then by their resource class.
+    """
+    counts = {occurrence.id: 0 for occurrence, _ in scalable_pairs}
+    pairs_by_template: dict[ULID, list[tuple[Occurrence, CapacityReservation]]] = defaultdict(list)
+    pairs_by_resource_class: dict[int, list[tuple[Occurrence, CapacityReservation]]] = defaultdict(list)
+    for occurrence, reservation in scalable_pairs:
+        if reservation.project_template_id is not None:
+            pairs_by_template[reservation.project_template_id].append((occurrence, reservation))
+        pairs_by_resource_class[reservation.resource_class_id].append((occurrence, reservation))
+
+    for session in session_data:
         if session.get("project_id"):
-            project_id = ULID.from_str(session["project_id"])
-            template_id = project_template_map.get(project_id)
+            template_id = project_template_map.get(ULID.from_str(session["project_id"]))
             if template_id is not None:
-                candidates = [
-                    (o, r)
-                    for o, r in scalable_pairs
-                    if r.project_template_id is not None and r.project_template_id == template_id
-                ]
+                candidates = pairs_by_template.get(template_id, [])
                 if len(candidates) == 1:
                     counts[candidates[0][0].id] += 1
-                    unmatched_sessions.remove(session)
+                    continue
 
-    for session in list(unmatched_sessions):
         rc_id = session.get("resource_class_id")
         if rc_id is not None:
-            candidates = [(o, r) for o, r in scalable_pairs if r.resource_class_id == rc_id]
+            candidates = pairs_by_resource_class.get(rc_id, [])
             if len(candidates) == 1:
                 counts[candidates[0][0].id] += 1
-                unmatched_sessions.remove(session)
             elif len(candidates) > 1:
                 logger.warning(
                     f"Session with project_id {session.get('project_id')} and "
@@ -202,6 +243,5 @@ def _assign_sessions_to_occurrences(
                 )
                 random_choice = random.choice(candidates)  # nosec B311
                 counts[random_choice[0].id] += 1
-                unmatched_sessions.remove(session)
 
     return counts
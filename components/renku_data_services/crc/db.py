@@ -24,6 +24,7 @@ from ulid import ULID
 import renku_data_services.base_models as base_models
 from renku_data_services import errors
 from renku_data_services.app_config import logging
+from renku_data_services.app_config.request_cache import request_memoized, user_key
 from renku_data_services.authz.authz import Authz, AuthzOperation
 from renku_data_services.authz.models import Change, Member, MembershipChange, Role, Scope
 from renku_data_services.base_models import RESET
@@ -46,6 +47,7 @@ from renku_data_services.crc.models import (
     SessionProtocol,
 )
 from renku_data_services.crc.orm import ClusterORM
+from renku_data_services.db_config.notifications import notify
 from renku_data_services.k8s.client_interfaces import PriorityClassClient, ResourceQuotaClient
 from renku_data_services.k8s.constants import DEFAULT_K8S_CLUSTER, ClusterId
 from renku_data_services.k8s.models import DeletePropagationPolicy, K8sPriorityClass
@@ -60,6 +62,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+CLUSTERS_CHANNEL = "clusters_updated"
+"""The Postgres notification channel used to signal that the cluster configurations changed."""
+
 
 class _Base:
     def __init__(self, session_maker: Callable[..., AsyncSession], quotas_repo: QuotaRepository, authz: Authz) -> None:
@@ -165,6 +170,7 @@ class ResourcePoolQueryRepository:
                 output.append(rp.dump(quota))
             return output
 
+    @request_memoized(lambda _, api_user, resource_class_id: (user_key(api_user), resource_class_id))
     async def get_resource_pool_from_class(
         self, api_user: base_models.APIUser, resource_class_id: int
     ) -> models.ResourcePool:
@@ -1108,7 +1114,7 @@ class MemberRepository(_Base):
 
         # Filter out platform admins; they have access via resource_pool_platform->is_admin
         # but should not appear in the user list.
-        admin_ids = set(await self.authz._get_admin_user_ids())
+        admin_ids = await self.authz.platform_admin_ids()
         user_ids = [uid for uid in user_ids if uid not in admin_ids]
 
         if keycloak_id:
@@ -1673,6 +1679,15 @@ class ClusterRepository:
     """Repository for cluster configurations."""
 
     session_maker: Callable[..., AsyncSession]
+    change_listeners: list[Callable[[], None]] = field(default_factory=list, repr=False)
+
+    def clusters_changed(self, _payload: str | None = None) -> None:
+        """Let the listeners (e.g. the cached cluster clients) know that the cluster configurations changed.
+
+        Called after a change made in this process and on notifications on `CLUSTERS_CHANNEL` for the others.
+        """
+        for listener in self.change_listeners:
+            listener()
 
     async def select_all(self, cluster_id: ULID | None = None) -> AsyncGenerator[SavedClusterSettings, Any]:
         """Get cluster configurations from the database."""
@@ -1714,8 +1729,11 @@ class ClusterRepository:
             session.add(cluster_orm)
             await session.flush()
             await session.refresh(cluster_orm)
+            result = cluster_orm.dump()
+            await notify(session, CLUSTERS_CHANNEL)
 
-            return cluster_orm.dump()
+        self.clusters_changed()
+        return result
 
     @_only_admins
     async def update(self, api_user: base_models.APIUser, cluster: ClusterPatch, cluster_id: ULID) -> ClusterSettings:
@@ -1779,8 +1797,11 @@ class ClusterRepository:
 
             await session.flush()
             await session.refresh(saved_cluster)
+            result = saved_cluster.dump()
+            await notify(session, CLUSTERS_CHANNEL)
 
-            return saved_cluster.dump()
+        self.clusters_changed()
+        return result
 
     async def get_cluster_id_for_resource_class(self, class_id: int) -> ClusterId | None:
         """Return the cluster ID for the resource pool containing the given resource class.
@@ -1819,6 +1840,9 @@ class ClusterRepository:
             cluster = r.one_or_none()
             if cluster is not None:
                 await session.delete(cluster)
+                await notify(session, CLUSTERS_CHANNEL)
+
+        self.clusters_changed()
 
 
 @dataclass
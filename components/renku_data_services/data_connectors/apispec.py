@@ -431,6 +431,10 @@ class DataConnectorLinksGetQuery(PaginationRequest):
 
 class DataConnectorsGetQuery(PaginationRequest):
     namespace: str = Field("", description="A namespace, used as a filter.")
+    cursor: str | None = Field(
+        None,
+        description="Opaque cursor for keyset pagination. When present (empty for the first page) the listing is paginated\nby key instead of by page number, the next page is requested with the value of the `next-cursor`\nresponse header and the `page` parameter is ignored.\n",
+    )
 
 
 class DataConnectorsGetParametersQuery(BaseAPISpec):
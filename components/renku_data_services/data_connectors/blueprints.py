@@ -16,7 +16,7 @@ from renku_data_services.base_api.auth import (
 from renku_data_services.base_api.blueprint import BlueprintFactoryResponse, CustomBlueprint
 from renku_data_services.base_api.etag import extract_if_none_match, if_match_required
 from renku_data_services.base_api.misc import validate_query
-from renku_data_services.base_api.pagination import PaginationRequest, paginate
+from renku_data_services.base_api.pagination import Cursor, PaginationRequest, next_cursor, paginate
 from renku_data_services.base_models.core import (
     DataConnectorInProjectPath,
     DataConnectorPath,
@@ -38,7 +38,6 @@ from renku_data_services.data_connectors.core import (
     transform_secrets_for_back_end,
     transform_secrets_for_front_end,
     update_deposit_status,
-    update_deposits_statuses,
     validate_data_connector_patch,
     validate_data_connector_secrets_patch,
     validate_deposit,
@@ -53,6 +52,7 @@ from renku_data_services.data_connectors.db import (
 )
 from renku_data_services.data_connectors.deposits.envidat import EnvidatClient
 from renku_data_services.data_connectors.deposits.zenodo import ZenodoAPIClient
+from renku_data_services.data_connectors.doi.cache import DOIMetadataCache
 from renku_data_services.k8s.client_interfaces import K8sClient, SecretClient
 from renku_data_services.k8s.clients import DepositUploadJobClient
 from renku_data_services.notebooks.data_sources import DataSourceRepository
@@ -77,6 +77,7 @@ class DataConnectorsBP(CustomBlueprint):
     data_service_base_url: str
     k8s_client: K8sClient
     deposit_config: DepositConfig
+    doi_metadata_cache: DOIMetadataCache
 
     def get_all(self) -> BlueprintFactoryResponse:
         """List data connectors."""
@@ -90,7 +91,7 @@ class DataConnectorsBP(CustomBlueprint):
             pagination: PaginationRequest,
             query: apispec.DataConnectorsGetQuery,
             validator: RCloneValidator,
-        ) -> tuple[list[dict[str, Any]], int]:
+        ) -> tuple[list[dict[str, Any]], int, Cursor | None]:
             ns_segments = query.namespace.split("/")
             ns: None | NamespacePath | ProjectPath
             if len(ns_segments) == 0 or (len(ns_segments) == 1 and len(ns_segments[0]) == 0):
@@ -108,13 +109,17 @@ class DataConnectorsBP(CustomBlueprint):
             data_connectors, total_num = await self.data_connector_repo.get_data_connectors(
                 user=user, pagination=pagination, namespace=ns
             )
-            return [
-                validate_and_dump(
-                    apispec.DataConnector,
-                    self._dump_data_connector(dc, validator=validator),
-                )
-                for dc in data_connectors
-            ], total_num
+            return (
+                [
+                    validate_and_dump(
+                        apispec.DataConnector,
+                        self._dump_data_connector(dc, validator=validator),
+                    )
+                    for dc in data_connectors
+                ],
+                total_num,
+                next_cursor(pagination, data_connectors, id_key=lambda dc: dc.id),
+            )
 
         return "/data_connectors", ["GET"], _get_all
 
@@ -127,7 +132,9 @@ class DataConnectorsBP(CustomBlueprint):
         async def _post(
             _: Request, user: base_models.APIUser, body: apispec.DataConnectorPost, validator: RCloneValidator
         ) -> JSONResponse:
-            data_connector = await validate_unsaved_data_connector(body, validator=validator)
+            data_connector = await validate_unsaved_data_connector(
+                body, validator=validator, doi_metadata_cache=self.doi_metadata_cache
+            )
             result = await self.data_connector_repo.insert_namespaced_data_connector(
                 user=user, data_connector=data_connector
             )
@@ -149,9 +156,14 @@ class DataConnectorsBP(CustomBlueprint):
         async def _post_global(
             _: Request, user: base_models.APIUser, body: apispec.GlobalDataConnectorPost, validator: RCloneValidator
         ) -> JSONResponse:
-            data_connector = await prevalidate_unsaved_global_data_connector(body, validator=validator)
+            data_connector = await prevalidate_unsaved_global_data_connector(
+                body, validator=validator, doi_metadata_cache=self.doi_metadata_cache
+            )
             result, inserted = await self.data_connector_repo.insert_global_data_connector(
-                user=user, prevalidated_dc=data_connector, validator=validator
+                user=user,
+                prevalidated_dc=data_connector,
+                validator=validator,
+                doi_metadata_cache=self.doi_metadata_cache,
             )
             return validated_json(
                 apispec.DataConnector,
@@ -849,13 +861,6 @@ class DataConnectorsBP(CustomBlueprint):
             deposits, total_num = await self.data_connector_repo.get_deposits(
                 user, data_connector_id=None, pagination=pagination
             )
-            deposits = await update_deposits_statuses(
-                user=user,
-                deposit_jobs=deposits,
-                dc_repo=self.data_connector_repo,
-                job_client=self.job_client,
-                namespace=self.deposit_config.namespace,
-            )
             return [
                 validate_and_dump(apispec.Deposit, serialize_deposit(i, self.deposit_config)) for i in deposits
             ], total_num
@@ -872,13 +877,6 @@ class DataConnectorsBP(CustomBlueprint):
             _: Request, user: base_models.AuthenticatedAPIUser, data_connector_id: ULID, pagination: PaginationRequest
         ) -> tuple[list[dict[str, Any]], int]:
             deposits, total_num = await self.data_connector_repo.get_deposits(user, data_connector_id, pagination)
-            deposits = await update_deposits_statuses(
-                user=user,
-                deposit_jobs=deposits,
-                dc_repo=self.data_connector_repo,
-                job_client=self.job_client,
-                namespace=self.deposit_config.namespace,
-            )
             return [
                 validate_and_dump(apispec.Deposit, serialize_deposit(i, self.deposit_config)) for i in deposits
             ], total_num
@@ -2,6 +2,10 @@
 
 from typing import Final
 
+from renku_data_services.k8s.models import GVK
 from renku_data_services.storage.constants import ENVIDAT_V1_PROVIDER
 
 ALLOWED_GLOBAL_DATA_CONNECTOR_PROVIDERS: Final[list[str]] = ["doi", ENVIDAT_V1_PROVIDER]
+
+DEPOSIT_JOB_GVK: Final[GVK] = GVK(kind="Job", version="v1", group="batch")
+DEPOSIT_ID_LABEL: Final[str] = "renku.io/deposit_id"
@@ -5,7 +5,7 @@ from __future__ import annotations
 import base64
 import contextlib
 import re
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Mapping
 from dataclasses import asdict
 from datetime import datetime
 from html.parser import HTMLParser
@@ -65,6 +65,7 @@ from renku_data_services.utils.core import get_openbis_pat
 
 if TYPE_CHECKING:
     from renku_data_services.data_connectors.db import DataConnectorRepository, DataConnectorSecretRepository
+    from renku_data_services.data_connectors.doi.cache import DOIMetadataCache
 
 sanitizer = kubernetes.client.ApiClient().sanitize_for_serialization
 
@@ -132,7 +133,9 @@ def validate_unsaved_storage_generic(
 
 
 async def validate_unsaved_storage_doi(
-    storage: apispec.CloudStorageCorePost, validator: RCloneValidator
+    storage: apispec.CloudStorageCorePost,
+    validator: RCloneValidator,
+    doi_metadata_cache: DOIMetadataCache | None = None,
 ) -> tuple[models.CloudStorageCore, DOI]:
     """Validate the storage configuration of an unsaved data connector."""
 
@@ -144,7 +147,7 @@ async def validate_unsaved_storage_doi(
         raise errors.ValidationError(message="Cannot find the doi in the storage configuration")
 
     doi = DOI(doi_str)
-    doi_host = await doi.resolve_host()
+    doi_host = await doi_metadata_cache.resolve_host(doi) if doi_metadata_cache else await doi.resolve_host()
 
     match doi_host:
         case "envidat.ch" | "www.envidat.ch":
@@ -170,7 +173,9 @@ async def validate_unsaved_storage_doi(
 
 
 async def validate_unsaved_data_connector(
-    body: apispec.DataConnectorPost, validator: RCloneValidator
+    body: apispec.DataConnectorPost,
+    validator: RCloneValidator,
+    doi_metadata_cache: DOIMetadataCache | None = None,
 ) -> models.UnsavedDataConnector:
     """Validate an unsaved data connector."""
 
@@ -179,7 +184,9 @@ async def validate_unsaved_data_connector(
         case apispec.CloudStorageCorePost() if body.storage.storage_type != "doi":
             storage = validate_unsaved_storage_generic(body.storage, validator=validator)
         case apispec.CloudStorageCorePost() if body.storage.storage_type == "doi":
-            storage, _ = await validate_unsaved_storage_doi(body.storage, validator=validator)
+            storage, _ = await validate_unsaved_storage_doi(
+                body.storage, validator=validator, doi_metadata_cache=doi_metadata_cache
+            )
         case apispec.CloudStorageUrlV2():
             storage = validate_unsaved_storage_url(body.storage, validator=validator)
         case _:
@@ -212,13 +219,17 @@ async def validate_unsaved_data_connector(
 
 
 async def prevalidate_unsaved_global_data_connector(
-    body: apispec.GlobalDataConnectorPost, validator: RCloneValidator
+    body: apispec.GlobalDataConnectorPost,
+    validator: RCloneValidator,
+    doi_metadata_cache: DOIMetadataCache | None = None,
 ) -> models.PrevalidatedGlobalDataConnector:
     """Pre-validate an unsaved data connector."""
     # TODO: allow admins to create global data connectors, e.g. s3://giab
     if isinstance(body.storage, apispec.CloudStorageUrlV2):
         raise errors.ValidationError(message="Global data connectors cannot be configured via a URL.")
-    storage, doi = await validate_unsaved_storage_doi(body.storage, validator=validator)
+    storage, doi = await validate_unsaved_storage_doi(
+        body.storage, validator=validator, doi_metadata_cache=doi_metadata_cache
+    )
     if storage.storage_type not in ALLOWED_GLOBAL_DATA_CONNECTOR_PROVIDERS:
         raise errors.ValidationError(message="Only doi storage type is allowed for global data connectors")
     if not storage.readonly:
@@ -235,7 +246,7 @@ async def prevalidate_unsaved_global_data_connector(
         storage.configuration["provider"] = rclone_metadata.provider
 
     slug = base_models.Slug.from_name(doi_uri).value
-    doi_metadata = await doi.metadata()
+    doi_metadata = await doi_metadata_cache.doi_metadata(doi) if doi_metadata_cache else await doi.metadata()
     return models.PrevalidatedGlobalDataConnector(
         data_connector=models.UnsavedGlobalDataConnector(
             name=doi_uri,
@@ -260,6 +271,7 @@ async def prevalidate_unsaved_global_data_connector(
 async def validate_unsaved_global_data_connector(
     prevalidated_dc: models.PrevalidatedGlobalDataConnector,
     validator: RCloneValidator,
+    doi_metadata_cache: DOIMetadataCache | None = None,
 ) -> models.UnsavedGlobalDataConnector:
     """Validate the data connector."""
     data_connector = prevalidated_dc.data_connector
@@ -279,11 +291,12 @@ async def validate_unsaved_global_data_connector(
         )
 
     # Fetch DOI metadata
+    fetch_metadata = doi_metadata_cache.dataset_metadata if doi_metadata_cache else get_dataset_metadata
     if rclone_metadata:
-        metadata = await get_dataset_metadata(rclone_metadata.provider, rclone_metadata.metadata_url)
+        metadata = await fetch_metadata(rclone_metadata.provider, rclone_metadata.metadata_url)
     elif data_connector.storage.storage_type == ENVIDAT_V1_PROVIDER:
         metadata_url = create_envidat_metadata_url(doi)
-        metadata = await get_dataset_metadata(ENVIDAT_V1_PROVIDER, metadata_url)
+        metadata = await fetch_metadata(ENVIDAT_V1_PROVIDER, metadata_url)
     else:
         metadata = None
 
@@ -1113,12 +1126,25 @@ def get_deposit_job_status(job: V1Job) -> models.DepositStatus:
         raise errors.ProgrammingError(
             message="Cannot get the status of a deposit job if the status property is fully missing."
         )
-    conditions = job.status.conditions or []
-    if (job.status.active or 0) > 0:
+    conditions = [(c.type, c.status) for c in job.status.conditions or []]
+    return _deposit_job_status(job.status.active or 0, conditions)
+
+
+def get_deposit_job_status_from_manifest(manifest: Mapping[str, Any]) -> models.DepositStatus | None:
+    """Returns the job status from a raw job manifest, None is returned if the job has no status yet."""
+    status = manifest.get("status")
+    if not status:
+        return None
+    conditions = [(c.get("type"), c.get("status")) for c in status.get("conditions") or []]
+    return _deposit_job_status(status.get("active") or 0, conditions)
+
+
+def _deposit_job_status(active: int, conditions: list[tuple[str | None, str | None]]) -> models.DepositStatus:
+    if active > 0:
         return models.DepositStatus.in_progress
-    elif any(c.type == "Complete" and c.status == "True" for c in conditions):
+    elif ("Complete", "True") in conditions:
         return models.DepositStatus.upload_complete
-    elif any(c.type == "Failed" and c.status == "True" for c in conditions):
+    elif ("Failed", "True") in conditions:
         return models.DepositStatus.failed
     else:
         return models.DepositStatus.in_progress
@@ -1150,23 +1176,6 @@ async def update_deposit_status(
     return deposit_job
 
 
-async def update_deposits_statuses(
-    user: base_models.AuthenticatedAPIUser,
-    deposit_jobs: list[models.DepositJob],
-    dc_repo: DataConnectorRepository,
-    job_client: DepositUploadJobClient,
-    namespace: str,
-) -> list[models.DepositJob]:
-    """Gets the deposits, the corresponding jobs and updates the status in the DB."""
-    output = []
-    for deposit_job in deposit_jobs:
-        dj = await update_deposit_status(
-            user=user, job=deposit_job, dc_repo=dc_repo, job_client=job_client, namespace=namespace
-        )
-        output.append(dj)
-    return output
-
-
 def validate_deposit_status_change(current: models.DepositStatus, new: models.DepositStatus) -> None:
     """Validate deposit status changes for the API."""
     match current, new:
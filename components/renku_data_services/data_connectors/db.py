@@ -2,13 +2,14 @@
 
 import random
 import string
+from collections import defaultdict
 from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
 from contextlib import suppress
 from datetime import UTC, datetime, timedelta
 from typing import TypeVar
 
 from cryptography.hazmat.primitives.asymmetric import rsa
-from sqlalchemy import ColumnExpressionArgument, Select, delete, func, or_, select
+from sqlalchemy import ColumnExpressionArgument, ScalarSelect, Select, delete, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from ulid import ULID
@@ -16,7 +17,7 @@ from ulid import ULID
 from renku_data_services import base_models, errors
 from renku_data_services.authz.authz import Authz, AuthzOperation, ResourceType
 from renku_data_services.authz.models import CheckPermissionItem, Scope
-from renku_data_services.base_api.pagination import PaginationRequest
+from renku_data_services.base_api.pagination import PaginationRequest, estimate_count, paginate_query
 from renku_data_services.base_models.core import (
     DataConnectorInProjectPath,
     DataConnectorPath,
@@ -26,14 +27,16 @@ from renku_data_services.base_models.core import (
     NamespaceSlug,
     ProjectPath,
     ProjectSlug,
+    ServiceAdminId,
 )
 from renku_data_services.data_connectors import apispec, models
 from renku_data_services.data_connectors import orm as schemas
 from renku_data_services.data_connectors.core import validate_unsaved_global_data_connector
+from renku_data_services.data_connectors.doi.cache import DOIMetadataCache
 from renku_data_services.data_connectors.doi.models import DOI
 from renku_data_services.k8s.constants import DEFAULT_K8S_CLUSTER
 from renku_data_services.namespace import orm as ns_schemas
-from renku_data_services.namespace.db import DataConnectorORM, GroupRepository
+from renku_data_services.namespace.db import GroupRepository
 from renku_data_services.namespace.models import ProjectNamespace
 from renku_data_services.project.db import ProjectRepository
 from renku_data_services.project.models import Project
@@ -89,14 +92,15 @@ class DataConnectorRepository:
             )
             if namespace:
                 stmt = _filter_by_namespace_slug(stmt, namespace)
-            stmt = stmt.limit(pagination.per_page).offset(pagination.offset)
-            stmt = stmt.order_by(schemas.DataConnectorORM.id.desc())
-            stmt_count = await restrict_by_read(select(func.count()).select_from(schemas.DataConnectorORM))
-            if namespace:
-                stmt_count = _filter_by_namespace_slug(stmt_count, namespace)
-            results = await session.scalars(stmt), await session.scalar(stmt_count)
-            data_connectors = results[0].all()
-            total_elements = results[1] or 0
+            if pagination.keyset:
+                total_elements = await estimate_count(session, stmt)
+            else:
+                stmt_count = await restrict_by_read(select(func.count()).select_from(schemas.DataConnectorORM))
+                if namespace:
+                    stmt_count = _filter_by_namespace_slug(stmt_count, namespace)
+                total_elements = await session.scalar(stmt_count) or 0
+            stmt = paginate_query(stmt, pagination, id_column=schemas.DataConnectorORM.id)
+            data_connectors = (await session.scalars(stmt)).all()
             return [dc.dump() for dc in data_connectors], total_elements
 
     async def get_data_connector(
@@ -378,6 +382,7 @@ class DataConnectorRepository:
         user: base_models.APIUser,
         prevalidated_dc: models.PrevalidatedGlobalDataConnector,
         validator: RCloneValidator | None,
+        doi_metadata_cache: DOIMetadataCache | None = None,
         *,
         session: AsyncSession | None = None,
     ) -> tuple[models.GlobalDataConnector, bool]:
@@ -408,7 +413,7 @@ class DataConnectorRepository:
             if validator is None:
                 raise RuntimeError("Could not validate global data connector")
             data_connector = await validate_unsaved_global_data_connector(
-                prevalidated_dc=prevalidated_dc, validator=validator
+                prevalidated_dc=prevalidated_dc, validator=validator, doi_metadata_cache=doi_metadata_cache
             )
 
         dc = await self._insert_data_connector(user=user, data_connector=data_connector, session=session)
@@ -995,9 +1000,11 @@ class DataConnectorRepository:
         )
 
         if doi:
-            stmt = stmt.where(schemas.DataConnectorToProjectLinkORM.data_connector.has(DataConnectorORM.doi == doi))
+            stmt = stmt.where(
+                schemas.DataConnectorToProjectLinkORM.data_connector.has(schemas.DataConnectorORM.doi == doi)
+            )
             stmt_count = stmt_count.where(
-                schemas.DataConnectorToProjectLinkORM.data_connector.has(DataConnectorORM.doi == doi)
+                schemas.DataConnectorToProjectLinkORM.data_connector.has(schemas.DataConnectorORM.doi == doi)
             )
 
         if pagination:
@@ -1374,3 +1381,49 @@ def _old_data_connector_slug_queries(
             return _dc_in_project(path)
         case _:
             raise errors.ProgrammingError(message="Got unknown data connector path type when resolving slugs.")
+
+
+class DepositStatusRepository:
+    """Repository for keeping the status of deposits in sync with their upload jobs."""
+
+    def __init__(self, session_maker: Callable[..., AsyncSession]) -> None:
+        self.session_maker = session_maker
+
+    async def update_deposit_statuses(
+        self, requested_by: InternalServiceAdmin, statuses: dict[ULID, models.DepositStatus]
+    ) -> list[ULID]:
+        """Update the status of many deposits at once, returns the IDs of the deposits that changed.
+
+        Only for internal use. Deposits that have been marked as complete by the user are never changed.
+        """
+        if requested_by.id != ServiceAdminId.k8s_watcher:
+            raise errors.ProgrammingError(message="Only the k8s_watcher admin is allowed to call this method.")
+        if len(statuses) == 0:
+            return []
+
+        deposit_ids_by_status: dict[models.DepositStatus, list[ULID]] = defaultdict(list)
+        for deposit_id, status in statuses.items():
+            deposit_ids_by_status[status].append(deposit_id)
+
+        def _status_id(status: models.DepositStatus) -> ScalarSelect[ULID]:
+            return (
+                select(schemas.DepositStatusORM.id)
+                .where(schemas.DepositStatusORM.status == status.value)
+                .scalar_subquery()
+            )
+
+        updated: list[ULID] = []
+        async with self.session_maker() as session, session.begin():
+            for status, deposit_ids in deposit_ids_by_status.items():
+                new_status_id = _status_id(status)
+                res = await session.scalars(
+                    update(schemas.DepositORM)
+                    .where(schemas.DepositORM.id.in_(deposit_ids))
+                    .where(schemas.DepositORM.status_id != new_status_id)
+                    .where(schemas.DepositORM.status_id != _status_id(models.DepositStatus.complete))
+                    .values(status_id=new_status_id)
+                    .returning(schemas.DepositORM.id)
+                    .execution_options(synchronize_session=False)
+                )
+                updated.extend(res)
+        return updated
@@ -0,0 +1,95 @@
+"""Keeping the status of deposits in sync with their upload jobs in k8s."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Any
+
+from ulid import ULID
+
+from renku_data_services.app_config import logging
+from renku_data_services.base_models.core import InternalServiceAdmin, ServiceAdminId
+from renku_data_services.data_connectors import models
+from renku_data_services.data_connectors.constants import DEPOSIT_ID_LABEL, DEPOSIT_JOB_GVK
+from renku_data_services.data_connectors.core import get_deposit_job_status_from_manifest
+from renku_data_services.data_connectors.db import DepositStatusRepository
+from renku_data_services.k8s.db import K8sDbCache
+from renku_data_services.k8s.models import K8sObjectFilter
+
+logger = logging.getLogger(__name__)
+
+deposit_status_admin_user = InternalServiceAdmin(id=ServiceAdminId.k8s_watcher)
+
+
+class DepositJobStatusWriter:
+    """Collects the status of deposit upload jobs from k8s events and writes them to the database in bulk.
+
+    Only the latest status of every deposit is kept between flushes, so a burst of events for the same job
+    results in a single update.
+    """
+
+    def __init__(
+        self,
+        deposit_status_repo: DepositStatusRepository,
+        k8s_cache: K8sDbCache,
+        flush_interval: timedelta = timedelta(seconds=5),
+        resync_interval: timedelta = timedelta(minutes=10),
+    ) -> None:
+        self.deposit_status_repo = deposit_status_repo
+        self.k8s_cache = k8s_cache
+        self.flush_interval = flush_interval
+        self.resync_interval = resync_interval
+        self.__pending: dict[ULID, models.DepositStatus] = {}
+
+    def record(self, manifest: Mapping[str, Any]) -> None:
+        """Record the latest status of a deposit upload job, jobs that are not deposit jobs are ignored."""
+        labels = (manifest.get("metadata") or {}).get("labels") or {}
+        deposit_id_raw = labels.get(DEPOSIT_ID_LABEL)
+        if deposit_id_raw is None:
+            return
+        try:
+            deposit_id = ULID.from_str(deposit_id_raw)
+        except ValueError:
+            logger.warning(f"Ignoring deposit upload job with invalid deposit ID {deposit_id_raw}")
+            return
+        status = get_deposit_job_status_from_manifest(manifest)
+        if status is None:
+            return
+        self.__pending[deposit_id] = status
+
+    async def flush(self) -> None:
+        """Write all recorded statuses to the database."""
+        if len(self.__pending) == 0:
+            return
+        pending, self.__pending = self.__pending, {}
+        try:
+            updated = await self.deposit_status_repo.update_deposit_statuses(deposit_status_admin_user, pending)
+        except Exception:
+            # NOTE: Statuses recorded while flushing are newer and take precedence
+            self.__pending = pending | self.__pending
+            raise
+        if len(updated) > 0:
+            logger.info(f"Updated the status of {len(updated)} deposits")
+
+    async def resync(self) -> None:
+        """Record the status of all deposit upload jobs in the k8s cache.
+
+        This catches up on status changes that happened while no events were received.
+        """
+        async for job in self.k8s_cache.list(K8sObjectFilter(gvk=DEPOSIT_JOB_GVK)):
+            self.record(job.manifest)
+
+    async def run(self) -> None:
+        """Periodically write the recorded statuses to the database."""
+        last_resync: datetime | None = None
+        while True:
+            try:
+                if last_resync is None or datetime.now() - last_resync >= self.resync_interval:
+                    await self.resync()
+                    last_resync = datetime.now()
+                await self.flush()
+            except Exception as e:
+                logger.error("Failed to update the status of deposits", exc_info=e)
+            await asyncio.sleep(self.flush_interval.total_seconds())
@@ -0,0 +1,134 @@
+"""Database backed cache for DOI resolution and dataset metadata."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import httpx
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from renku_data_services.app_config import logging
+from renku_data_services.data_connectors.doi import metadata
+from renku_data_services.data_connectors.doi.models import DOI, DOIMetadata, SchemaOrgDataset
+from renku_data_services.data_connectors.orm import DOIMetadataCacheORM
+
+logger = logging.getLogger(__name__)
+
+type _Fetch = Callable[[], Awaitable[dict[str, Any] | None]]
+
+
+class DOIMetadataCache:
+    """Caches DOI lookups in the database so that popular datasets are not resolved over and over.
+
+    Entries that were found are kept for ``ttl``, entries that do not exist upstream for ``negative_ttl``.
+    An expired entry that was found is still returned and refreshed in the background, an expired negative
+    entry is refreshed before returning. Lookups that fail (e.g. because the upstream service is down or too slow)
+    are not cached, but if there is a previous value it is kept and retried after ``negative_ttl``.
+    """
+
+    def __init__(
+        self,
+        session_maker: Callable[..., AsyncSession],
+        ttl: timedelta = timedelta(days=1),
+        negative_ttl: timedelta = timedelta(minutes=10),
+    ) -> None:
+        self.session_maker = session_maker
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.__refresh_tasks: dict[str, asyncio.Task[dict[str, Any] | None]] = {}
+
+    async def resolve_host(self, doi: DOI) -> str | None:
+        """Cached version of DOI.resolve_host."""
+
+        async def _fetch() -> dict[str, Any] | None:
+            host = await doi.resolve_host_or_raise()
+            return None if host is None else {"host": host}
+
+        value = await self.__get_or_fetch(f"host:{doi}", _fetch)
+        return None if value is None else str(value["host"])
+
+    async def doi_metadata(self, doi: DOI) -> SchemaOrgDataset | None:
+        """Cached version of DOI.metadata."""
+
+        async def _fetch() -> dict[str, Any] | None:
+            res = await doi.metadata_or_raise()
+            return None if res is None else res.model_dump(mode="json", by_alias=True)
+
+        value = await self.__get_or_fetch(f"schema_org:{doi}", _fetch)
+        if value is None:
+            return None
+        try:
+            return SchemaOrgDataset.model_validate(value)
+        except PydanticValidationError:
+            return None
+
+    async def dataset_metadata(self, provider: str, metadata_url: str) -> DOIMetadata | None:
+        """Cached version of get_dataset_metadata."""
+
+        async def _fetch() -> dict[str, Any] | None:
+            res = await metadata.get_dataset_metadata_or_raise(provider, metadata_url)
+            return None if res is None else asdict(res)
+
+        value = await self.__get_or_fetch(f"dataset:{provider}:{metadata_url}", _fetch)
+        return None if value is None else DOIMetadata(**value)
+
+    async def __get_or_fetch(self, key: str, fetch: _Fetch) -> dict[str, Any] | None:
+        async with self.session_maker() as session:
+            entry = await session.scalar(select(DOIMetadataCacheORM).where(DOIMetadataCacheORM.key == key))
+            cached = None if entry is None else (entry.value, entry.expires_at)
+
+        if cached is None:
+            return await self.__refresh(key, fetch)
+        value, expires_at = cached
+        if expires_at > datetime.now(UTC):
+            return value
+        if value is None:
+            return await self.__refresh(key, fetch)
+        self.__refresh_in_background(key, fetch, value)
+        return value
+
+    def __refresh_in_background(self, key: str, fetch: _Fetch, previous: dict[str, Any]) -> None:
+        if key in self.__refresh_tasks:
+            return
+
+        async def _refresh() -> dict[str, Any] | None:
+            try:
+                return await self.__refresh(key, fetch, previous)
+            except Exception as e:
+                logger.warning(f"Failed to refresh the cached DOI metadata for {key}", exc_info=e)
+                return None
+
+        task = asyncio.create_task(_refresh())
+        self.__refresh_tasks[key] = task
+        task.add_done_callback(lambda _: self.__refresh_tasks.pop(key, None))
+
+    async def __refresh(self, key: str, fetch: _Fetch, previous: dict[str, Any] | None = None) -> dict[str, Any] | None:
+        try:
+            value = await fetch()
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to fetch the DOI metadata for {key}: {e!r}")
+            if previous is not None:
+                # NOTE: The failure is not cached, the previous value is served until the next retry
+                retry_at = datetime.now(UTC) + self.negative_ttl
+                async with self.session_maker() as session, session.begin():
+                    await session.execute(
+                        update(DOIMetadataCacheORM).where(DOIMetadataCacheORM.key == key).values(expires_at=retry_at)
+                    )
+            return previous
+        now = datetime.now(UTC)
+        expires_at = now + (self.ttl if value is not None else self.negative_ttl)
+        stmt = insert(DOIMetadataCacheORM).values(key=key, value=value, fetched_at=now, expires_at=expires_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DOIMetadataCacheORM.key],
+            set_={"value": stmt.excluded.value, "fetched_at": now, "expires_at": expires_at},
+        )
+        async with self.session_maker() as session, session.begin():
+            await session.execute(stmt)
+        return value
@@ -11,6 +11,14 @@ from renku_data_services.storage.constants import ENVIDAT_V1_PROVIDER
 
 async def get_dataset_metadata(provider: str, metadata_url: str) -> models.DOIMetadata | None:
     """Retrieve DOI metadata."""
+    try:
+        return await get_dataset_metadata_or_raise(provider, metadata_url)
+    except httpx.HTTPError:
+        return None
+
+
+async def get_dataset_metadata_or_raise(provider: str, metadata_url: str) -> models.DOIMetadata | None:
+    """Like get_dataset_metadata, but only returns None if there is no metadata and raises httpx.HTTPError otherwise."""
     if provider == "invenio" or provider == "zenodo":
         return await _get_dataset_metadata_invenio(metadata_url)
     if provider == "dataverse":
@@ -23,15 +31,14 @@ async def get_dataset_metadata(provider: str, metadata_url: str) -> models.DOIMe
 async def _get_dataset_metadata_invenio(metadata_url: str) -> models.DOIMetadata | None:
     """Retrieve DOI metadata from the InvenioRDM API."""
     async with httpx.AsyncClient(timeout=5) as client:
-        try:
-            res = await client.get(url=metadata_url, follow_redirects=True, headers=[("accept", "application/json")])
-            if res.status_code >= 400:
-                return None
-            record = models.InvenioRecord.model_validate_json(res.content)
-        except httpx.HTTPError:
-            return None
-        except PydanticValidationError:
-            return None
+        res = await client.get(url=metadata_url, follow_redirects=True, headers=[("accept", "application/json")])
+    if res.status_code == 404:
+        return None
+    res.raise_for_status()
+    try:
+        record = models.InvenioRecord.model_validate_json(res.content)
+    except PydanticValidationError:
+        return None
 
     name = ""
     description = ""
@@ -47,15 +54,14 @@ async def _get_dataset_metadata_dataverse(metadata_url: str) -> models.DOIMetada
     """Retrieve DOI metadata from the Dataverse API."""
 
     async with httpx.AsyncClient(timeout=5) as client:
-        try:
-            res = await client.get(url=metadata_url, follow_redirects=True, headers=[("accept", "application/json")])
-            if res.status_code >= 400:
-                return None
-            response = models.DataverseDatasetResponse.model_validate_json(res.content)
-        except httpx.HTTPError:
-            return None
-        except PydanticValidationError:
-            return None
+        res = await client.get(url=metadata_url, follow_redirects=True, headers=[("accept", "application/json")])
+    if res.status_code == 404:
+        return None
+    res.raise_for_status()
+    try:
+        response = models.DataverseDatasetResponse.model_validate_json(res.content)
+    except PydanticValidationError:
+        return None
 
     if response.status != "OK":
         return None
@@ -129,12 +135,10 @@ async def _get_envidat_metadata(metadata_url: str) -> models.DOIMetadata | None:
     clnt = httpx.AsyncClient(follow_redirects=True, timeout=5)
     headers = {"accept": "application/json"}
     async with clnt:
-        try:
-            res = await clnt.get(metadata_url, headers=headers)
-        except httpx.HTTPError:
-            return None
-    if res.status_code != 200:
+        res = await clnt.get(metadata_url, headers=headers)
+    if res.status_code == 404:
         return None
+    res.raise_for_status()
     try:
         parsed_metadata = models.SchemaOrgDataset.model_validate_json(res.text)
     except PydanticValidationError:
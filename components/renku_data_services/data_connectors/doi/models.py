@@ -57,21 +57,31 @@ class DOI(str):
     async def resolve_host(self) -> str | None:
         """Resolves the DOI and returns the hostname of the url where the redirect leads."""
         try:
-            res = await _clnt.get(self.url)
+            return await self.resolve_host_or_raise()
         except httpx.HTTPError:
             return None
-        if res.status_code != 200:
+
+    async def resolve_host_or_raise(self) -> str | None:
+        """Like resolve_host, but only returns None if the DOI does not exist and raises httpx.HTTPError otherwise."""
+        res = await _clnt.get(self.url)
+        if res.status_code == 404:
             return None
+        res.raise_for_status()
         return res.url.host
 
     async def metadata(self) -> SchemaOrgDataset | None:
         """Get information about the publisher of the DOI."""
         try:
-            res = await _clnt.get(self.url, headers={"Accept": "application/vnd.schemaorg.ld+json"})
+            return await self.metadata_or_raise()
         except httpx.HTTPError:
             return None
-        if res.status_code != 200:
+
+    async def metadata_or_raise(self) -> SchemaOrgDataset | None:
+        """Like metadata, but only returns None if there is no metadata and raises httpx.HTTPError otherwise."""
+        res = await _clnt.get(self.url, headers={"Accept": "application/vnd.schemaorg.ld+json"})
+        if res.status_code == 404:
             return None
+        res.raise_for_status()
         try:
             output = SchemaOrgDataset.model_validate_json(res.text)
         except ValidationError:
@@ -332,3 +332,19 @@ class DepositORM(BaseORM):
                 updated_at=self.updated_at,
             ),
         )
+
+
+class DOIMetadataCacheORM(BaseORM):
+    """Cached responses from DOI resolution and dataset metadata lookups."""
+
+    __tablename__ = "doi_metadata_cache"
+
+    key: Mapped[str] = mapped_column("key", String(), primary_key=True)
+    """The kind of lookup and its parameters, e.g. 'host:10.5281/zenodo.123'."""
+
+    value: Mapped[dict[str, Any] | None] = mapped_column("value", JSONVariant, nullable=True)
+    """The cached result, None means that nothing was found (negative caching)."""
+
+    fetched_at: Mapped[datetime] = mapped_column("fetched_at", DateTime(timezone=True), nullable=False)
+
+    expires_at: Mapped[datetime] = mapped_column("expires_at", DateTime(timezone=True), nullable=False, index=True)
@@ -1,13 +1,63 @@
 """DB Configuration."""
 
 import os
+import time
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import Any, ClassVar
 
+from prometheus_client import Gauge, Histogram
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, PoolProxiedConnection
 
 from renku_data_services import errors
+from renku_data_services.app_config.instrumentation import instrument_engine
+
+_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a connection from the database connection pool.",
+    ["pool"],
+)
+_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Number of connections currently checked out of the database connection pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+
+class _InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long callers wait for a connection."""
+
+    pool_name: str = "primary"
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.monotonic()
+        try:
+            return super()._do_get()
+        finally:
+            _POOL_WAIT_SECONDS.labels(self.pool_name).observe(time.monotonic() - start)
+
+
+def _instrument_engine(engine: AsyncEngine, pool_name: str, slow_query_threshold_s: float) -> None:
+    """Label the pool of the engine, track checked out connections and record the executed statements."""
+    pool = engine.sync_engine.pool
+    if isinstance(pool, _InstrumentedQueuePool):
+        pool.pool_name = pool_name
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(
+        dbapi_connection: Any, connection_record: ConnectionPoolEntry, connection_proxy: PoolProxiedConnection
+    ) -> None:
+        _POOL_CHECKED_OUT.labels(pool_name).inc()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection: Any, connection_record: ConnectionPoolEntry) -> None:
+        _POOL_CHECKED_OUT.labels(pool_name).dec()
+
+    dependency = "postgres" if pool_name == "primary" else f"postgres_{pool_name}"
+    instrument_engine(engine, dependency, slow_query_threshold_s)
 
 
 @dataclass
@@ -20,7 +70,24 @@ class DBConfig:
     port: str = "5432"
     db_name: str = "renku"
     _async_engine: ClassVar[AsyncEngine | None] = field(default=None, repr=False, init=False)
+    _async_session_factory: ClassVar[async_sessionmaker[AsyncSession] | None] = field(
+        default=None, repr=False, init=False
+    )
+    _async_ro_engine: ClassVar[AsyncEngine | None] = field(default=None, repr=False, init=False)
+    _async_ro_session_factory: ClassVar[async_sessionmaker[AsyncSession] | None] = field(
+        default=None, repr=False, init=False
+    )
     pool_size: int = 4
+    max_overflow: int = 0
+    pool_timeout: float = 30.0
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+    statement_cache_size: int = 100
+    read_replica_host: str | None = None
+    read_replica_port: str | None = None
+    read_replica_pool_size: int | None = None
+    # Statements slower than this are logged, a value that is not positive disables the log
+    slow_query_threshold_s: float = 1.0
 
     @classmethod
     def from_env(cls) -> "DBConfig":
@@ -31,11 +98,26 @@ class DBConfig:
         pg_port = os.environ.get("DB_PORT")
         db_name = os.environ.get("DB_NAME")
         pool_size = int(os.environ.get("DB_POOL_SIZE", "4"))
+        max_overflow = int(os.environ.get("DB_POOL_MAX_OVERFLOW", "0"))
+        pool_timeout = float(os.environ.get("DB_POOL_TIMEOUT_S", "30"))
+        pool_recycle = int(os.environ.get("DB_POOL_RECYCLE_S", "-1"))
+        pool_pre_ping = os.environ.get("DB_POOL_PRE_PING", "false").lower() == "true"
+        statement_cache_size = int(os.environ.get("DB_STATEMENT_CACHE_SIZE", "100"))
+        read_replica_host = os.environ.get("DB_READ_REPLICA_HOST") or None
+        read_replica_port = os.environ.get("DB_READ_REPLICA_PORT") or None
+        read_replica_pool_size_raw = os.environ.get("DB_READ_REPLICA_POOL_SIZE")
+        read_replica_pool_size = int(read_replica_pool_size_raw) if read_replica_pool_size_raw else None
+        slow_query_threshold_s = float(os.environ.get("DB_SLOW_QUERY_THRESHOLD_S", "1"))
         pg_password = os.environ.get("DB_PASSWORD")
         if pg_password is None:
             raise errors.ConfigurationError(
                 message="Please provide a database password in the 'DB_PASSWORD' environment variable."
             )
+        if pool_size < 1 or max_overflow < 0 or pool_timeout <= 0:
+            raise errors.ConfigurationError(
+                message="'DB_POOL_SIZE' must be positive, 'DB_POOL_MAX_OVERFLOW' must not be negative "
+                "and 'DB_POOL_TIMEOUT_S' must be positive."
+            )
         config = cls(
             password=pg_password,
             host=pg_host or "localhost",
@@ -43,6 +125,15 @@ class DBConfig:
             port=pg_port or "5432",
             db_name=db_name or "renku",
             pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            statement_cache_size=statement_cache_size,
+            read_replica_host=read_replica_host,
+            read_replica_port=read_replica_port,
+            read_replica_pool_size=read_replica_pool_size,
+            slow_query_threshold_s=slow_query_threshold_s,
         )
         return config
 
@@ -52,6 +143,46 @@ class DBConfig:
             return f"postgresql+asyncpg://{self.user}:{self.password}@{self.host}:{self.port}/{self.db_name}"
         return f"postgresql+psycopg://{self.user}:{self.password}@{self.host}:{self.port}/{self.db_name}"
 
+    def read_replica_conn_url(self) -> str | None:
+        """Return the asynchronous connection url of the read replica, if one is configured."""
+        if self.read_replica_host is None:
+            return None
+        port = self.read_replica_port or self.port
+        return f"postgresql+asyncpg://{self.user}:{self.password}@{self.read_replica_host}:{port}/{self.db_name}"
+
+    def _create_engine(self, url: str, pool_size: int, pool_name: str) -> AsyncEngine:
+        engine = create_async_engine(
+            url,
+            poolclass=_InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=self.pool_pre_ping,
+            connect_args={"prepared_statement_cache_size": self.statement_cache_size},
+        )
+        _instrument_engine(engine, pool_name, self.slow_query_threshold_s)
+        return engine
+
+    def _session_factory(self) -> async_sessionmaker[AsyncSession]:
+        if DBConfig._async_session_factory is None:
+            if DBConfig._async_engine is None:
+                DBConfig._async_engine = self._create_engine(self.conn_url(), self.pool_size, "primary")
+            DBConfig._async_session_factory = async_sessionmaker(DBConfig._async_engine, expire_on_commit=False)
+        return DBConfig._async_session_factory
+
+    def _ro_session_factory(self) -> async_sessionmaker[AsyncSession]:
+        replica_url = self.read_replica_conn_url()
+        if replica_url is None:
+            return self._session_factory()
+        if DBConfig._async_ro_session_factory is None:
+            if DBConfig._async_ro_engine is None:
+                DBConfig._async_ro_engine = self._create_engine(
+                    replica_url, self.read_replica_pool_size or self.pool_size, "replica"
+                )
+            DBConfig._async_ro_session_factory = async_sessionmaker(DBConfig._async_ro_engine, expire_on_commit=False)
+        return DBConfig._async_ro_session_factory
+
     @property
     def async_session_maker(self) -> Callable[..., AsyncSession]:
         """A callable that opens a new async DB session bound to the current engine.
@@ -61,25 +192,40 @@ class DBConfig:
         repositories built once at app-construction time) always talk to whatever engine is
         current: disposing the engine via ``dispose_connection`` and pointing ``self`` at a
         different database (as the test suite does per test) is picked up transparently,
-        without rebuilding those callers.
+        without rebuilding those callers. The underlying ``async_sessionmaker`` is built once
+        per engine and reused across calls.
         """
         db = self
 
         def make_session(*args: Any, **kwargs: Any) -> AsyncSession:
-            if DBConfig._async_engine is None:
-                DBConfig._async_engine = create_async_engine(
-                    db.conn_url(),
-                    pool_size=db.pool_size,
-                    max_overflow=0,
-                )
-            return async_sessionmaker(DBConfig._async_engine, expire_on_commit=False)(*args, **kwargs)
+            return db._session_factory()(*args, **kwargs)
+
+        return make_session
+
+    @property
+    def async_ro_session_maker(self) -> Callable[..., AsyncSession]:
+        """A callable that opens a new async DB session meant for read-only queries.
+
+        Sessions are bound to the read replica when one is configured and to the primary
+        otherwise. Replicas can lag behind the primary, so this should only be used for reads
+        that tolerate slightly stale data and never for read-modify-write flows.
+        """
+        db = self
+
+        def make_session(*args: Any, **kwargs: Any) -> AsyncSession:
+            return db._ro_session_factory()(*args, **kwargs)
 
         return make_session
 
     @staticmethod
     async def dispose_connection() -> None:
-        """Dispose of the main database connection pool."""
+        """Dispose of the main and read replica database connection pools."""
 
+        DBConfig._async_session_factory = None
+        DBConfig._async_ro_session_factory = None
         if DBConfig._async_engine:
             await DBConfig._async_engine.dispose()
             DBConfig._async_engine = None
+        if DBConfig._async_ro_engine:
+            await DBConfig._async_ro_engine.dispose()
+            DBConfig._async_ro_engine = None
@@ -0,0 +1,89 @@
+"""Postgres LISTEN/NOTIFY helpers, used to invalidate in-process caches across workers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from renku_data_services.app_config import logging
+
+if TYPE_CHECKING:
+    from renku_data_services.db_config.config import DBConfig
+
+logger = logging.getLogger(__name__)
+
+
+async def notify(session: AsyncSession, channel: str, payload: str = "") -> None:
+    """Send a notification on a channel.
+
+    Postgres only delivers the notification when the transaction of the session commits.
+    """
+    await session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+
+
+class PgNotificationListener:
+    """Listens to Postgres notifications on a dedicated connection and dispatches them to callbacks.
+
+    Callbacks are called with the payload of the notification. When the connection is (re-)established callbacks
+    are called with ``None``, as notifications may have been missed while not connected.
+    """
+
+    def __init__(self, db_config: DBConfig, reconnect_delay: float = 1) -> None:
+        self.db_config = db_config
+        self.reconnect_delay = reconnect_delay
+        self.__callbacks: dict[str, list[Callable[[str | None], None]]] = {}
+
+    def subscribe(self, channel: str, callback: Callable[[str | None], None]) -> None:
+        """Register a callback for a channel, must be called before run."""
+        self.__callbacks.setdefault(channel, []).append(callback)
+
+    async def run(self) -> None:
+        """Listen to all subscribed channels until cancelled, reconnecting if the connection is lost."""
+        if not self.__callbacks:
+            return
+        while True:
+            try:
+                conn = await asyncpg.connect(
+                    host=self.db_config.host,
+                    port=int(self.db_config.port),
+                    user=self.db_config.user,
+                    password=self.db_config.password,
+                    database=self.db_config.db_name,
+                )
+            except (OSError, asyncpg.PostgresError) as err:
+                logger.warning(f"Cannot connect to the database to listen for notifications: {err}")
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            try:
+                await self.__listen(conn)
+                logger.warning("Lost the database connection used to listen for notifications, reconnecting.")
+            finally:
+                if not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def __listen(self, conn: asyncpg.Connection) -> None:
+        """Listen to all subscribed channels on the connection until it is closed."""
+        closed = asyncio.Event()
+        conn.add_termination_listener(lambda _: closed.set())
+        for channel in self.__callbacks:
+            await conn.add_listener(channel, self.__on_notification)
+        for channel in self.__callbacks:
+            self.__dispatch(channel, None)
+        await closed.wait()
+
+    def __on_notification(self, _conn: Any, _pid: int, channel: str, payload: str) -> None:
+        self.__dispatch(channel, payload)
+
+    def __dispatch(self, channel: str, payload: str | None) -> None:
+        for callback in self.__callbacks.get(channel, []):
+            try:
+                callback(payload)
+            except Exception as err:
+                logger.error(f"Error handling a notification on channel {channel}", exc_info=err)
@@ -1,21 +1,49 @@
 """Gitlab API."""
 
+import asyncio
+import time
 from dataclasses import dataclass, field
 from typing import Any, cast
 
 import httpx
+from prometheus_client import Counter
 
 from renku_data_services.base_models import APIUser, GitlabAccessLevel
 from renku_data_services.errors import errors
 from renku_data_services.utils.core import get_ssl_context
 
+_ACCESS_LEVEL_CACHE_REQUESTS = Counter(
+    "gitlab_access_level_cache_requests_total",
+    "Number of project access level lookups served from the cache or from Gitlab",
+    ["result"],
+)
+
 
 @dataclass(kw_only=True)
 class GitlabAPI:
-    """Adapter for interacting with the gitlab API."""
+    """Adapter for interacting with the gitlab API.
+
+    The access level of a user for a project is cached for ``cache_ttl_seconds``, so that repeated checks for the
+    same projects (e.g. when listing and then migrating projects) do not query Gitlab again.
+    """
 
     gitlab_url: str
     gitlab_graphql_url: str = field(init=False)
+    cache_ttl_seconds: float = 60
+    cache_max_entries: int = 10_000
+    chunk_size: int = 100
+    max_concurrent_requests: int = 4
+    client: httpx.AsyncClient = field(
+        default_factory=lambda: httpx.AsyncClient(
+            verify=get_ssl_context(),
+            timeout=10,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        ),
+        repr=False,
+    )
+    _cache: dict[tuple[str, str, GitlabAccessLevel], tuple[float, bool]] = field(
+        default_factory=dict, init=False, repr=False
+    )
 
     def __post_init__(self) -> None:
         """Sets the graphql url for gitlab."""
@@ -33,13 +61,58 @@ class GitlabAPI:
     ) -> list[str]:
         """Filter projects this user can access in gitlab with at least access level."""
 
-        if not user.access_token or not user.full_name:
+        if not user.access_token or not user.full_name or user.id is None:
             return []
+
+        accessible: dict[str, bool] = {}
+        missing: list[str] = []
+        now = time.monotonic()
+        for project_id in dict.fromkeys(project_ids):
+            cached = self._cache.get((user.id, project_id, min_access_level))
+            if cached is not None and cached[0] > now:
+                accessible[project_id] = cached[1]
+            else:
+                missing.append(project_id)
+        _ACCESS_LEVEL_CACHE_REQUESTS.labels("hit").inc(len(accessible))
+        _ACCESS_LEVEL_CACHE_REQUESTS.labels("miss").inc(len(missing))
+
+        if missing:
+            semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+            async def _fetch_chunk(chunk: list[str]) -> set[str]:
+                async with semaphore:
+                    return await self.__fetch_accessible_projects(user, chunk, min_access_level)
+
+            chunks = [missing[i : i + self.chunk_size] for i in range(0, len(missing), self.chunk_size)]
+            fetched = set().union(*await asyncio.gather(*[_fetch_chunk(chunk) for chunk in chunks]))
+            expires_at = time.monotonic() + self.cache_ttl_seconds
+            for project_id in missing:
+                accessible[project_id] = project_id in fetched
+                self.__cache_put((user.id, project_id, min_access_level), (expires_at, accessible[project_id]))
+
+        return [project_id for project_id in project_ids if accessible.get(project_id, False)]
+
+    def __cache_put(self, key: tuple[str, str, GitlabAccessLevel], value: tuple[float, bool]) -> None:
+        self._cache.pop(key, None)
+        self._cache[key] = value
+        if len(self._cache) > self.cache_max_entries:
+            # Drop expired entries first and then the oldest ones
+            now = time.monotonic()
+            for expired_key in [k for k, (expires_at, _) in self._cache.items() if expires_at <= now]:
+                del self._cache[expired_key]
+            while len(self._cache) > self.cache_max_entries:
+                del self._cache[next(iter(self._cache))]
+
+    async def __fetch_accessible_projects(
+        self, user: APIUser, project_ids: list[str], min_access_level: GitlabAccessLevel
+    ) -> set[str]:
+        """Query gitlab for the projects out of project_ids that the user can access with at least access level."""
         header = {"Authorization": f"Bearer {user.access_token}", "Content-Type": "application/json"}
         ids = ",".join(f'"gid://gitlab/Project/{id}"' for id in project_ids)
         query_body = f"""
                     pageInfo {{
                       hasNextPage
+                      endCursor
                     }}
                     nodes {{
                         id
@@ -66,8 +139,7 @@ class GitlabAPI:
         }
 
         async def _query_gitlab_graphql(body: dict[str, Any], header: dict[str, Any]) -> dict[str, Any]:
-            async with httpx.AsyncClient(verify=get_ssl_context(), timeout=5) as client:
-                resp = await client.post(self.gitlab_graphql_url, json=body, headers=header, timeout=10)
+            resp = await self.client.post(self.gitlab_graphql_url, json=body, headers=header)
             if resp.status_code != 200:
                 raise errors.BaseError(message=f"Error querying Gitlab api {self.gitlab_graphql_url}: {resp.text}")
             result = cast(dict[str, Any], resp.json())
@@ -77,11 +149,9 @@ class GitlabAPI:
             return result
 
         resp_body = await _query_gitlab_graphql(body, header)
-        result: list[str] = []
+        result: set[str] = set()
 
-        def _process_projects(
-            resp_body: dict[str, Any], min_access_level: GitlabAccessLevel, result: list[str]
-        ) -> None:
+        def _process_projects(resp_body: dict[str, Any], min_access_level: GitlabAccessLevel, result: set[str]) -> None:
             for project in resp_body["data"]["projects"]["nodes"]:
                 if min_access_level != GitlabAccessLevel.PUBLIC:
                     if not project["projectMembers"]["nodes"]:
@@ -94,7 +164,7 @@ class GitlabAPI:
                         )
                         if max_level < 30:
                             continue
-                result.append(project["id"].rsplit("/", maxsplit=1)[-1])
+                result.add(project["id"].rsplit("/", maxsplit=1)[-1])
 
         _process_projects(resp_body, min_access_level, result)
         page_info = resp_body["data"]["projects"]["pageInfo"]
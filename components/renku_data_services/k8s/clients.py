@@ -2,18 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import os
+import time
 from collections.abc import AsyncIterable, AsyncIterator, Callable
 from copy import deepcopy
-from typing import TypeVar
+from typing import Final, TypeVar, cast
 
 import httpx
 import kr8s
 from box import Box
 from kr8s.asyncio.objects import Pod
 from kubernetes import client
+from prometheus_client import Counter
 
+from renku_data_services.app_config import logging
+from renku_data_services.app_config.instrumentation import observe, record
 from renku_data_services.base_models import APIUser
 from renku_data_services.errors import errors
 from renku_data_services.k8s.client_interfaces import K8sClient, PriorityClassClient, ResourceQuotaClient, SecretClient
@@ -34,6 +39,8 @@ from renku_data_services.k8s.models import (
     K8sSecret,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class K8sResourceQuotaClient(ResourceQuotaClient):
     """Real k8s core API client that exposes the required functions."""
@@ -229,6 +236,12 @@ class K8sClusterClient(K8sClient):
         if _filter.user_id:
             label_selectors["renku.io/safe-username"] = _filter.user_id
 
+        # NOTE: Only the time spent waiting for the cluster is recorded, not the time the caller takes to consume the
+        # objects in between
+        waited = 0.0
+        failed = False
+        waiting = True
+        waiting_since = time.monotonic()
         try:
             res = self.__cluster.api.async_get(
                 _filter.gvk.kr8s_kind,
@@ -236,13 +249,23 @@ class K8sClusterClient(K8sClient):
                 label_selector=label_selectors,
                 namespace=_filter.namespace,
             )
-
             async for r in res:
+                waited += time.monotonic() - waiting_since
+                waiting = False
                 yield APIObjectInCluster(r, self.__cluster.id)
-
+                waiting = True
+                waiting_since = time.monotonic()
         except (kr8s.ServerError, kr8s.APITimeoutError, ValueError) as _e:
             # ValueError is generated when the kind does not exist on the cluster
+            failed = True
             return
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if waiting:
+                waited += time.monotonic() - waiting_since
+            record("kubernetes", "list", waited, failed)
 
     async def __get_api_object(self, meta: K8sObjectFilter) -> APIObjectInCluster | None:
         return await anext(aiter(self.__list(meta)), None)
@@ -250,12 +273,14 @@ class K8sClusterClient(K8sClient):
     async def create(self, obj: K8sObject, refresh: bool) -> K8sObject:
         """Create the k8s object, scoped or not."""
         api_obj = obj.to_api_object(self.__cluster.api)
-        await api_obj.create()
+        with observe("kubernetes", "create"):
+            await api_obj.create()
 
         # In some cases the service account does not have read rights, in which case we cannot call get(), and refresh()
         if refresh:
             # if refresh isn't called, status and timestamp will be blank
-            await api_obj.refresh()
+            with observe("kubernetes", "get"):
+                await api_obj.refresh()
         return obj.with_manifest(api_obj.to_dict())
 
     async def patch(self, meta: K8sObjectMeta, patch: K8sPatches) -> K8sObject:
@@ -269,8 +294,10 @@ class K8sClusterClient(K8sClient):
         if obj is None:
             raise errors.MissingResourceError(message=f"The k8s resource with metadata {meta} cannot be found.")
         patch_type = "json" if isinstance(patch, list) else None
-        await obj.obj.patch(patch, type=patch_type)
-        await obj.obj.refresh()
+        with observe("kubernetes", "patch"):
+            await obj.obj.patch(patch, type=patch_type)
+        with observe("kubernetes", "get"):
+            await obj.obj.refresh()
 
         return meta.with_manifest(obj.obj.to_dict())
 
@@ -281,7 +308,7 @@ class K8sClusterClient(K8sClient):
         obj = await self.__get_api_object(meta.to_filter())
         if obj is None:
             return
-        with contextlib.suppress(kr8s.NotFoundError):
+        with contextlib.suppress(kr8s.NotFoundError), observe("kubernetes", "delete"):
             await obj.obj.delete(propagation_policy=propagation_policy.value)
 
     async def get(self, meta: K8sObjectMeta) -> K8sObject | None:
@@ -414,22 +441,107 @@ async def empty_async_generator() -> AsyncIterator[T]:
         yield  # type: ignore[misc]
 
 
+class _ClusterCircuitBreaker:
+    """Keeps track of failures of a cluster to stop querying it for a while when it keeps failing."""
+
+    def __init__(self, failure_threshold: int, reset_timeout_s: float) -> None:
+        self.__failure_threshold = failure_threshold
+        self.__reset_timeout_s = reset_timeout_s
+        self.__failures = 0
+        self.__opened_at: float | None = None
+
+    def allow(self) -> bool:
+        """Whether the cluster can be queried, a single trial is allowed once the reset timeout has passed."""
+        if self.__opened_at is None:
+            return True
+        if time.monotonic() - self.__opened_at >= self.__reset_timeout_s:
+            # NOTE: Half-open, the next result decides whether the breaker closes or opens again
+            self.__opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        self.__failures = 0
+        self.__opened_at = None
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        self.__failures += 1
+        if self.__failures >= self.__failure_threshold:
+            self.__opened_at = time.monotonic()
+
+
+_STREAM_DONE: Final = object()
+_CLUSTER_ERRORS: Final = (TimeoutError, kr8s.ServerError, kr8s.APITimeoutError, httpx.HTTPError)
+
+_SKIPPED_CLUSTERS = Counter(
+    "k8s_list_skipped_clusters_total",
+    "Number of clusters whose objects were skipped when listing objects in several clusters.",
+    ["reason"],
+)
+
+
 class K8sClusterClientsPool(K8sClient):
-    """A wrapper around a pool of kr8s k8s clients."""
+    """A wrapper around a pool of kr8s k8s clients.
 
-    def __init__(self, clusters: Callable[[], AsyncIterable[K8sClusterClient]]) -> None:
+    Listing objects queries all the clusters concurrently and merges the results as they arrive, buffering at most
+    ``list_buffer_size`` objects that were not consumed yet. Waiting for the next object of a cluster is bounded by
+    a timeout and each cluster is guarded by a circuit breaker, so that one slow or unreachable cluster neither
+    delays nor breaks the results from the others. The cluster connections are cached and only re-read when they
+    are invalidated, when they get older than the refresh interval, or when an unknown cluster is requested.
+    """
+
+    def __init__(
+        self,
+        clusters: Callable[[], AsyncIterable[K8sClusterClient]],
+        cluster_timeout_s: float = 30,
+        clusters_refresh_interval_s: float = 300,
+        circuit_breaker_failure_threshold: int = 3,
+        circuit_breaker_reset_timeout_s: float = 60,
+        list_buffer_size: int = 1000,
+    ) -> None:
         self.__clusters = clusters
         self.__clients: dict[ClusterId, K8sClusterClient] = {}
-
-    async def __init_clients_if_needed(self) -> None:
-        if len(self.__clients) > 0 and os.environ.get("ALWAYS_READ_CLUSTERS") is None:
+        self.__clients_loaded_at: float | None = None
+        self.__clients_lock = asyncio.Lock()
+        self.__cluster_timeout_s = cluster_timeout_s
+        self.__clusters_refresh_interval_s = clusters_refresh_interval_s
+        self.__circuit_breaker_failure_threshold = circuit_breaker_failure_threshold
+        self.__circuit_breaker_reset_timeout_s = circuit_breaker_reset_timeout_s
+        self.__circuit_breakers: dict[ClusterId, _ClusterCircuitBreaker] = {}
+        self.__list_buffer_size = list_buffer_size
+
+    def invalidate(self, _payload: str | None = None) -> None:
+        """Mark the cached cluster connections as stale so that they are re-read on the next call."""
+        self.__clients_loaded_at = None
+
+    def __clients_are_fresh(self) -> bool:
+        if os.environ.get("ALWAYS_READ_CLUSTERS") is not None or self.__clients_loaded_at is None:
+            return False
+        return time.monotonic() - self.__clients_loaded_at < self.__clusters_refresh_interval_s
+
+    async def __init_clients_if_needed(self, force: bool = False) -> None:
+        if not force and self.__clients_are_fresh():
             return
-        async for cluster in self.__clusters():
-            self.__clients[cluster.get_cluster().id] = cluster
+        loaded_at = self.__clients_loaded_at
+        async with self.__clients_lock:
+            if self.__clients_loaded_at != loaded_at and self.__clients_are_fresh():
+                # NOTE: Another caller reloaded the clusters while we were waiting for the lock
+                return
+            clients: dict[ClusterId, K8sClusterClient] = {}
+            async for cluster in self.__clusters():
+                clients[cluster.get_cluster().id] = cluster
+            self.__clients = clients
+            self.__clients_loaded_at = time.monotonic()
 
     async def __get_client_or_die(self, cluster_id: ClusterId) -> K8sClusterClient:
         await self.__init_clients_if_needed()
         cluster_client = self.__clients.get(cluster_id)
+        if cluster_client is None:
+            # NOTE: The cluster may have been added since the clusters were last read
+            await self.__init_clients_if_needed(force=True)
+            cluster_client = self.__clients.get(cluster_id)
 
         if cluster_client is None:
             raise errors.MissingResourceError(
@@ -437,6 +549,15 @@ class K8sClusterClientsPool(K8sClient):
             )
         return cluster_client
 
+    def __circuit_breaker(self, cluster_id: ClusterId) -> _ClusterCircuitBreaker:
+        breaker = self.__circuit_breakers.get(cluster_id)
+        if breaker is None:
+            breaker = _ClusterCircuitBreaker(
+                self.__circuit_breaker_failure_threshold, self.__circuit_breaker_reset_timeout_s
+            )
+            self.__circuit_breakers[cluster_id] = breaker
+        return breaker
+
     async def cluster_by_id(self, cluster_id: ClusterId) -> ClusterConnection:
         """Return a cluster by its id."""
         client = await self.__get_client_or_die(cluster_id)
@@ -464,13 +585,106 @@ class K8sClusterClientsPool(K8sClient):
         client = await self.__get_client_or_die(meta.cluster)
         return await client.get(meta)
 
-    async def list(self, _filter: K8sObjectFilter) -> AsyncIterator[K8sObject]:
-        """List all k8s objects."""
+    async def __list_cluster(
+        self, cluster_client: K8sClusterClient, _filter: K8sObjectFilter, skipped_clusters: set[ClusterId] | None
+    ) -> AsyncIterator[K8sObject]:
+        """List the objects in one cluster.
+
+        When ``skipped_clusters`` is given, the remaining objects are skipped if the cluster is unavailable, fails or
+        is too slow, and the cluster is added to it. Otherwise, the error is raised.
+        """
+        cluster_id = cluster_client.get_cluster().id
+        breaker = self.__circuit_breaker(cluster_id)
+        if not breaker.allow():
+            if skipped_clusters is None:
+                raise errors.ThirdPartyAPIError(
+                    message=f"The cluster {cluster_id} is not available, it failed too many times recently."
+                )
+            logger.warning(f"Cluster {cluster_id} failed too many times recently, its results are skipped")
+            _SKIPPED_CLUSTERS.labels("unavailable").inc()
+            skipped_clusters.add(cluster_id)
+            return
+        objects = aiter(cluster_client.list(_filter))
+        num_listed = 0
+        try:
+            while True:
+                # NOTE: Only waiting for the cluster is timed, not the time the caller takes to consume the objects
+                obj = await asyncio.wait_for(anext(objects, _STREAM_DONE), self.__cluster_timeout_s)
+                if obj is _STREAM_DONE:
+                    break
+                yield cast(K8sObject, obj)
+                num_listed += 1
+        except _CLUSTER_ERRORS as err:
+            breaker.record_failure()
+            if skipped_clusters is None:
+                raise
+            if num_listed == 0:
+                logger.warning(f"Listing objects in cluster {cluster_id} failed, its results are skipped: {err!r}")
+            else:
+                logger.warning(
+                    f"Listing objects in cluster {cluster_id} failed after {num_listed} objects, "
+                    f"its remaining results are skipped: {err!r}"
+                )
+            _SKIPPED_CLUSTERS.labels("timeout" if isinstance(err, TimeoutError) else "error").inc()
+            skipped_clusters.add(cluster_id)
+            return
+        breaker.record_success()
+
+    async def __list_into_queue(
+        self,
+        cluster_client: K8sClusterClient,
+        _filter: K8sObjectFilter,
+        queue: asyncio.Queue[K8sObject | object],
+        skipped_clusters: set[ClusterId],
+    ) -> None:
+        try:
+            async for obj in self.__list_cluster(cluster_client, _filter, skipped_clusters):
+                await queue.put(obj)
+        except Exception as err:
+            # NOTE: Errors other than the ones of an unavailable cluster are raised to the caller
+            await queue.put(err)
+            return
+        await queue.put(_STREAM_DONE)
+
+    async def list(
+        self, _filter: K8sObjectFilter, *, skipped_clusters: set[ClusterId] | None = None
+    ) -> AsyncIterator[K8sObject]:
+        """List all k8s objects.
+
+        When a single cluster is requested or configured, errors from the cluster are raised. When listing several
+        clusters, the clusters that are unavailable, fail or are too slow are skipped and added to
+        ``skipped_clusters`` if it is given, so that callers can tell a partial result from a complete one.
+        """
         await self.__init_clients_if_needed()
-        cluster_clients = sorted(list(self.__clients.values()))
-        for c in cluster_clients:
-            async for r in c.list(_filter):
-                yield r
+        if _filter.cluster is not None:
+            cluster_client = self.__clients.get(_filter.cluster)
+            cluster_clients = [cluster_client] if cluster_client is not None else []
+        else:
+            cluster_clients = sorted(list(self.__clients.values()))
+
+        if len(cluster_clients) <= 1:
+            for c in cluster_clients:
+                async for r in self.__list_cluster(c, _filter, None):
+                    yield r
+            return
+
+        skipped = skipped_clusters if skipped_clusters is not None else set()
+        queue: asyncio.Queue[K8sObject | object] = asyncio.Queue(maxsize=self.__list_buffer_size)
+        tasks = [asyncio.create_task(self.__list_into_queue(c, _filter, queue, skipped)) for c in cluster_clients]
+        try:
+            remaining = len(tasks)
+            while remaining > 0:
+                item = await queue.get()
+                if item is _STREAM_DONE:
+                    remaining -= 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                yield cast(K8sObject, item)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def logs(self, meta: K8sObjectMeta, max_log_lines: int | None = None) -> dict[str, AsyncIterator[str]]:
         """Get the logs of a specific container in a specific pod."""
@@ -21,8 +21,13 @@ from renku_data_services.k8s.orm import K8sObjectORM
 class K8sDbCache:
     """Caching k8s objects in postgres."""
 
-    def __init__(self, session_maker: Callable[..., AsyncSession]) -> None:
+    def __init__(
+        self,
+        session_maker: Callable[..., AsyncSession],
+        read_session_maker: Callable[..., AsyncSession] | None = None,
+    ) -> None:
         self.__session_maker = session_maker
+        self.__read_session_maker = read_session_maker or session_maker
 
     @staticmethod
     def __get_where_clauses(_filter: K8sObjectFilter) -> Select[tuple[K8sObjectORM]]:
@@ -100,7 +105,7 @@ class K8sDbCache:
 
     async def list(self, _filter: K8sObjectFilter) -> AsyncIterable[K8sObject]:
         """List objects from the cache."""
-        async with self.__session_maker() as session, session.begin():
+        async with self.__read_session_maker() as session, session.begin():
             stmt = self.__get_where_clauses(_filter)
             async for res in await session.stream_scalars(stmt):
                 yield res.dump()
@@ -440,6 +440,8 @@ class APIObjectInCluster:
                 return labels.get("renku.io/safe-username", None)
             case "taskrun":
                 return DUMMY_TASK_RUN_USER_ID
+            case "job" if "renku.io/deposit_id" in labels:
+                return labels.get("renku.io/safe-username", None)
             case _:
                 return None
 
@@ -7,6 +7,7 @@ import contextlib
 from asyncio import CancelledError, Task
 from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
 import httpcore
 import httpx
@@ -15,6 +16,7 @@ from renku_data_services.app_config import logging
 from renku_data_services.base_models.core import APIUser, InternalServiceAdmin, ServiceAdminId
 from renku_data_services.base_models.metrics import MetricsService
 from renku_data_services.crc.db import ResourcePoolQueryRepository
+from renku_data_services.data_connectors.constants import DEPOSIT_JOB_GVK
 from renku_data_services.k8s.clients import K8sClusterClient
 from renku_data_services.k8s.constants import DEFAULT_K8S_CLUSTER, ClusterId
 from renku_data_services.k8s.db import K8sDbCache
@@ -24,6 +26,9 @@ from renku_data_services.notebooks.cr_amalthea_session import SessionType as Ama
 from renku_data_services.notebooks.crs import State
 from renku_data_services.notebooks.models import SessionType
 
+if TYPE_CHECKING:
+    from renku_data_services.data_connectors.deposit_status import DepositJobStatusWriter
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,6 +76,9 @@ class K8sWatcher:
                     raise e
             else:
                 objects_in_k8s[obj.name] = obj
+                if obj.user_id is None:
+                    # NOTE: Objects that do not belong to a user (e.g. jobs other than deposit jobs) are not cached
+                    continue
                 await self.__cache.upsert(obj)
 
         cache_iter = aiter(self.__cache.list(fltr))
@@ -261,11 +269,18 @@ async def __collect_session_metrics(
 
 
 def k8s_object_handler(
-    cache: K8sDbCache, metrics: MetricsService, rp_repo: ResourcePoolQueryRepository
+    cache: K8sDbCache,
+    metrics: MetricsService,
+    rp_repo: ResourcePoolQueryRepository,
+    deposit_status_writer: DepositJobStatusWriter | None = None,
 ) -> EventHandler:
     """Listens and to k8s events and updates the cache."""
 
     async def handler(obj: APIObjectInCluster, event_type: str) -> None:
+        if obj.user_id is None and event_type != "DELETED":
+            # NOTE: Objects that do not belong to a user (e.g. jobs other than deposit jobs) are not cached, but they
+            # are still removed on deletion in case they were cached before
+            return
         existing = await cache.get(obj.meta)
         if obj.user_id is not None:
             try:
@@ -275,6 +290,8 @@ def k8s_object_handler(
         if event_type == "DELETED":
             await cache.delete(obj.meta)
             return
+        if deposit_status_writer is not None and obj.meta.gvk == DEPOSIT_JOB_GVK:
+            deposit_status_writer.record(obj.obj.to_dict())
         k8s_object = obj.to_k8s_object()
         k8s_object.user_id = obj.user_id
         await cache.upsert(k8s_object)
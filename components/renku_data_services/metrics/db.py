@@ -31,6 +31,20 @@ class MetricsRepository:
             async for metrics in result:
                 yield metrics
 
+    async def process_unprocessed_metrics(self, process: Callable[[MetricsORM], bool], limit: int = 100) -> int:
+        """Process a batch of metrics events from the staging table and delete the ones processed successfully.
+
+        The events are locked while they are processed and events locked by others are skipped, so that several
+        processes can send the events without sending any of them twice. Returns the number of events processed.
+        """
+        async with self.session_maker() as session, session.begin():
+            stmt = select(MetricsORM).order_by(MetricsORM.id).limit(limit).with_for_update(skip_locked=True)
+            metrics = await session.scalars(stmt)
+            processed_ids = [metric.id for metric in metrics if process(metric)]
+            if processed_ids:
+                await session.execute(delete(MetricsORM).where(MetricsORM.id.in_(processed_ids)))
+        return len(processed_ids)
+
     async def delete_processed_metrics(self, metrics_ids: list[ULID]) -> None:
         """Delete metrics events from the staging table."""
         if not metrics_ids:
@@ -0,0 +1,100 @@
+"""partition resource_requests_log by week
+
+Revision ID: 8d2c4e6a1f90
+Revises: 3b8e1f5c2a47
+Create Date: 2026-10-18 14:21:37.518304
+
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8d2c4e6a1f90"
+down_revision = "3b8e1f5c2a47"
+branch_labels = None
+depends_on = None
+
+_indexes = {
+    "ix_uid_phase": ["uid", "phase"],
+    "ix_resource_pools_resource_requests_log_capture_date": ["capture_date"],
+    "ix_resource_pools_resource_requests_log_phase": ["phase"],
+    "ix_resource_pools_resource_requests_log_project_id": ["project_id"],
+    "ix_resource_pools_resource_requests_log_resource_class_id": ["resource_class_id"],
+    "ix_resource_pools_resource_requests_log_resource_pool_id": ["resource_pool_id"],
+    "ix_resource_pools_resource_requests_log_user_id": ["user_id"],
+}
+
+
+def _week_start(value: datetime) -> datetime:
+    value = value.astimezone(UTC)
+    return datetime(value.year, value.month, value.day, tzinfo=UTC) - timedelta(days=value.weekday())
+
+
+def _create_indexes() -> None:
+    for name, columns in _indexes.items():
+        op.create_index(name, "resource_requests_log", columns, unique=False, schema="resource_pools")
+
+
+def upgrade() -> None:
+    op.execute('ALTER TABLE "resource_pools"."resource_requests_log" RENAME TO "resource_requests_log_unpartitioned"')
+    op.execute(
+        'CREATE TABLE "resource_pools"."resource_requests_log" '
+        '(LIKE "resource_pools"."resource_requests_log_unpartitioned" INCLUDING DEFAULTS) '
+        "PARTITION BY RANGE (capture_date)"
+    )
+    op.execute(
+        'CREATE TABLE "resource_pools"."resource_requests_log_default" '
+        'PARTITION OF "resource_pools"."resource_requests_log" DEFAULT'
+    )
+
+    # Create weekly partitions for the existing data and the coming weeks
+    connection = op.get_bind()
+    oldest = connection.scalar(
+        sa.text('SELECT min(capture_date) FROM "resource_pools"."resource_requests_log_unpartitioned"')
+    )
+    now = datetime.now(UTC)
+    week = _week_start(oldest if oldest is not None else now)
+    while week <= now + timedelta(weeks=4):
+        op.execute(
+            f'CREATE TABLE "resource_pools"."resource_requests_log_p{week:%Y%m%d}" '
+            'PARTITION OF "resource_pools"."resource_requests_log" '
+            f"FOR VALUES FROM ('{week.isoformat()}') TO ('{(week + timedelta(weeks=1)).isoformat()}')"
+        )
+        week += timedelta(weeks=1)
+
+    op.execute(
+        'INSERT INTO "resource_pools"."resource_requests_log" '
+        'SELECT * FROM "resource_pools"."resource_requests_log_unpartitioned"'
+    )
+    op.drop_table("resource_requests_log_unpartitioned", schema="resource_pools")
+
+    # NOTE: The primary key of a partitioned table has to include the partition key
+    op.create_primary_key(
+        "resource_requests_log_pkey", "resource_requests_log", ["id", "capture_date"], schema="resource_pools"
+    )
+    _create_indexes()
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE "resource_pools"."resource_requests_log" RENAME TO "resource_requests_log_partitioned"')
+    for name in _indexes:
+        op.execute(f'ALTER INDEX "resource_pools"."{name}" RENAME TO "{name}_partitioned"')
+    op.execute(
+        'ALTER TABLE "resource_pools"."resource_requests_log_partitioned" '
+        'RENAME CONSTRAINT "resource_requests_log_pkey" TO "resource_requests_log_partitioned_pkey"'
+    )
+    op.execute(
+        'CREATE TABLE "resource_pools"."resource_requests_log" '
+        '(LIKE "resource_pools"."resource_requests_log_partitioned" INCLUDING DEFAULTS)'
+    )
+    op.execute(
+        'INSERT INTO "resource_pools"."resource_requests_log" '
+        'SELECT * FROM "resource_pools"."resource_requests_log_partitioned"'
+    )
+    # Dropping the partitioned table drops all of its partitions
+    op.drop_table("resource_requests_log_partitioned", schema="resource_pools")
+    op.create_primary_key("resource_requests_log_pkey", "resource_requests_log", ["id"], schema="resource_pools")
+    _create_indexes()
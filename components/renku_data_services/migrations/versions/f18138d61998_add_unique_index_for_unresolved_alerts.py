@@ -0,0 +1,44 @@
+"""add unique index for unresolved alerts
+
+Revision ID: f18138d61998
+Revises: 01k4dy9r2we4
+Create Date: 2026-10-18 09:12:40.318204
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f18138d61998"
+down_revision = "01k4dy9r2we4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NOTE: resolve all but the most recent duplicated unresolved alert so that the unique index can be created
+    op.execute("""
+        UPDATE notifications.alerts AS a
+        SET resolved_date = now()
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY user_id, event_type, coalesce(session_name, '') ORDER BY id DESC
+            ) AS rn
+            FROM notifications.alerts
+            WHERE resolved_date IS NULL
+        ) AS duplicates
+        WHERE a.id = duplicates.id AND duplicates.rn > 1
+    """)
+    op.create_index(
+        "ix_notifications_alerts_unresolved_unique",
+        "alerts",
+        ["user_id", "event_type", sa.text("coalesce(session_name, '')")],
+        unique=True,
+        schema="notifications",
+        postgresql_where=sa.text("resolved_date IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_alerts_unresolved_unique", table_name="alerts", schema="notifications")
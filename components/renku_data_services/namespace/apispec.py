@@ -100,6 +100,10 @@ class GroupsGetParametersQuery(BaseAPISpec):
     per_page: Optional[int] = Field(
         20, description="The number of results per page", ge=1, le=100
     )
+    cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for keyset pagination. When present (empty for the first page) the listing is paginated\nby key instead of by page number, the next page is requested with the value of the `next-cursor`\nresponse header and the `page` parameter is ignored.\n",
+    )
     direct_member: bool = False
 
 
@@ -110,6 +114,10 @@ class NamespacesGetParametersQuery(BaseAPISpec):
     per_page: Optional[int] = Field(
         20, description="The number of results per page", ge=1, le=100
     )
+    cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for keyset pagination. When present (empty for the first page) the listing is paginated\nby key instead of by page number, the next page is requested with the value of the `next-cursor`\nresponse header and the `page` parameter is ignored.\n",
+    )
     minimum_role: Optional[GroupRole] = None
     kinds: Optional[List[NamespaceKind]] = Field(
         None,
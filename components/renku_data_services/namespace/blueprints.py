@@ -11,14 +11,14 @@ from renku_data_services.authz.models import Change, Role, UnsavedMember
 from renku_data_services.base_api.auth import authenticate, only_authenticated, validate_path_user_id
 from renku_data_services.base_api.blueprint import BlueprintFactoryResponse, CustomBlueprint
 from renku_data_services.base_api.misc import validate_query
-from renku_data_services.base_api.pagination import PaginationRequest, paginate
+from renku_data_services.base_api.pagination import Cursor, PaginationRequest, next_cursor, paginate
 from renku_data_services.base_models.core import NamespaceSlug, ProjectPath, Slug
 from renku_data_services.base_models.metrics import MetricsService
 from renku_data_services.base_models.validation import validate_and_dump, validated_json
 from renku_data_services.errors import errors
 from renku_data_services.namespace import apispec, apispec_enhanced, models
 from renku_data_services.namespace.core import validate_group_patch
-from renku_data_services.namespace.db import GroupRepository
+from renku_data_services.namespace.db import GroupRepository, namespace_keyset_position
 
 
 @dataclass(kw_only=True)
@@ -40,13 +40,14 @@ class GroupsBP(CustomBlueprint):
             user: base_models.APIUser,
             pagination: PaginationRequest,
             query: apispec.GroupsGetParametersQuery,
-        ) -> tuple[list[dict], int]:
+        ) -> tuple[list[dict], int, Cursor | None]:
             groups, rec_count = await self.group_repo.get_groups(
                 user=user, pagination=pagination, direct_member=query.direct_member
             )
             return (
                 validate_and_dump(apispec.GroupResponseList, groups),
                 rec_count,
+                next_cursor(pagination, groups, id_key=lambda g: g.id),
             )
 
         return "/groups", ["GET"], _get_all
@@ -189,7 +190,7 @@ class GroupsBP(CustomBlueprint):
             user: base_models.APIUser,
             pagination: PaginationRequest,
             query: apispec.NamespacesGetParametersQuery,
-        ) -> tuple[list[dict], int]:
+        ) -> tuple[list[dict], int, Cursor | None]:
             minimum_role = Role.from_group_role(query.minimum_role) if query.minimum_role is not None else None
             if query.kinds:
                 kinds = [models.NamespaceKind(kind.value) for kind in query.kinds]
@@ -201,23 +202,35 @@ class GroupsBP(CustomBlueprint):
             nss, total_count = await self.group_repo.get_namespaces(
                 user=user, pagination=pagination, minimum_role=minimum_role, kinds=kinds
             )
-            return validate_and_dump(
-                apispec.NamespaceResponseList,
-                [
-                    dict(
-                        id=ns.id,
-                        name=ns.name,
-                        slug=ns.latest_slug
-                        if ns.latest_slug
-                        else (ns.path.second.value if isinstance(ns, models.ProjectNamespace) else ns.path.first.value),
-                        created_by=ns.created_by,
-                        creation_date=ns.creation_date,
-                        namespace_kind=apispec.NamespaceKind(ns.kind.value),
-                        path=ns.path.serialize(),
-                    )
-                    for ns in nss
-                ],
-            ), total_count
+            cursor = next_cursor(
+                pagination,
+                nss,
+                id_key=lambda ns: namespace_keyset_position(ns)[0],
+                segment_key=lambda ns: namespace_keyset_position(ns)[1],
+            )
+            return (
+                validate_and_dump(
+                    apispec.NamespaceResponseList,
+                    [
+                        dict(
+                            id=ns.id,
+                            name=ns.name,
+                            slug=ns.latest_slug
+                            if ns.latest_slug
+                            else (
+                                ns.path.second.value if isinstance(ns, models.ProjectNamespace) else ns.path.first.value
+                            ),
+                            created_by=ns.created_by,
+                            creation_date=ns.creation_date,
+                            namespace_kind=apispec.NamespaceKind(ns.kind.value),
+                            path=ns.path.serialize(),
+                        )
+                        for ns in nss
+                    ],
+                ),
+                total_count,
+                cursor,
+            )
 
         return "/namespaces", ["GET"], _get_namespaces
 
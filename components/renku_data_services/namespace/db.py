@@ -4,15 +4,17 @@ from __future__ import annotations
 
 import random
 import string
-from collections.abc import AsyncGenerator, AsyncIterable, Callable
+from collections.abc import AsyncGenerator, Callable, Collection, Sequence
 from contextlib import nullcontext
 from datetime import UTC, datetime
-from typing import Any, overload
+from typing import Any, cast, overload
 
-from sqlalchemy import Select, and_, delete, distinct, func, select, text
+from sqlalchemy import ColumnElement, Select, any_, delete, distinct, exists, func, insert, select, text, update
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import QueryableAttribute, joinedload, selectinload
 from sqlalchemy.sql.functions import count as sa_count
 from ulid import ULID
 
@@ -21,7 +23,13 @@ from renku_data_services import errors
 from renku_data_services.app_config import logging
 from renku_data_services.authz.authz import Authz, AuthzOperation, ResourceType, _AuthzConverter
 from renku_data_services.authz.models import CheckPermissionItem, Member, MembershipChange, Role, Scope, UnsavedMember
-from renku_data_services.base_api.pagination import PaginationRequest, paginate_queries
+from renku_data_services.base_api.pagination import (
+    PaginationRequest,
+    estimate_count,
+    paginate_queries,
+    paginate_queries_keyset,
+    paginate_query,
+)
 from renku_data_services.base_models.core import (
     DataConnectorInProjectPath,
     DataConnectorPath,
@@ -32,12 +40,11 @@ from renku_data_services.base_models.core import (
 )
 from renku_data_services.data_connectors import orm as dc_schemas
 from renku_data_services.data_connectors.models import DataConnector
-from renku_data_services.data_connectors.orm import DataConnectorORM
 from renku_data_services.namespace import models
 from renku_data_services.namespace import orm as schemas
 from renku_data_services.project.models import Project
 from renku_data_services.project.orm import ProjectORM
-from renku_data_services.search.db import GlobalDataConnector, SearchUpdatesRepo
+from renku_data_services.search.db import SearchUpdatesRepo
 from renku_data_services.search.decorators import update_search_document
 from renku_data_services.users import models as user_models
 from renku_data_services.users import orm as user_schemas
@@ -92,6 +99,42 @@ async def _upsert_old_entity_slug(session: AsyncSession, old_entity_slug: schema
     existing_old_slug.data_connector_id = old_entity_slug.data_connector_id
 
 
+def _pick_user_namespace_slug(
+    user_slug: str, taken: Collection[str], retry_enumerate: int = 0, retry_random: bool = False
+) -> str:
+    """Pick the user slug or a variation of it that is not one of the taken slugs."""
+    if user_slug not in taken:
+        return user_slug
+    if retry_enumerate:
+        for inc in range(1, retry_enumerate + 1):
+            slug = f"{user_slug}-{inc}"
+            if slug not in taken:
+                return slug
+    if retry_random:
+        suffix = "".join([random.choice(string.ascii_lowercase + string.digits) for _ in range(8)])  # nosec B311
+        slug = f"{user_slug}-{suffix}"
+        if slug not in taken:
+            return slug
+
+    raise errors.ValidationError(message=f"Cannot create generate a unique namespace slug for the user {user_slug}")
+
+
+_NAMESPACE_KEYSET_SEGMENTS = {
+    models.NamespaceKind.user: 0,
+    models.NamespaceKind.group: 1,
+    models.NamespaceKind.project: 2,
+}
+
+
+def namespace_keyset_position(
+    namespace: models.UserNamespace | models.GroupNamespace | models.ProjectNamespace,
+) -> tuple[ULID, int]:
+    """Get the key and the query segment of a namespace as used by the keyset pagination of namespaces."""
+    if isinstance(namespace, models.ProjectNamespace):
+        return namespace.underlying_resource_id, _NAMESPACE_KEYSET_SEGMENTS[namespace.kind]
+    return namespace.id, _NAMESPACE_KEYSET_SEGMENTS[namespace.kind]
+
+
 class GroupRepository:
     """Repository for groups."""
 
@@ -105,32 +148,94 @@ class GroupRepository:
         self.authz: Authz = group_authz
         self.search_updates_repo = search_updates_repo
 
+    async def generate_user_namespaces(self, batch_size: int = 500) -> int:
+        """Generate the namespaces of the users that do not have one, returns the number of namespaces generated.
+
+        The namespaces are generated in batches and each batch locks the namespaces table only while it is written.
+        The users of a batch get their namespace when it is committed, so an interrupted generation carries on with
+        the remaining users when it runs again. The batches follow the users that were selected, not the namespaces
+        that were inserted, so that users whose namespace could not be inserted do not stop the generation early.
+        """
+        num_generated = 0
+        after: str | None = None
+        while True:
+            stmt = (
+                select(user_schemas.UserORM.keycloak_id)
+                .where(~exists().where(schemas.NamespaceORM.user_id == user_schemas.UserORM.keycloak_id))
+                .order_by(user_schemas.UserORM.keycloak_id)
+                .limit(batch_size)
+            )
+            if after is not None:
+                stmt = stmt.where(user_schemas.UserORM.keycloak_id > after)
+            async with self.session_maker() as session:
+                user_ids = list(await session.scalars(stmt))
+            if not user_ids:
+                break
+            users = await self._generate_user_namespaces_batch(user_ids)
+            num_generated += len(users)
+            if len(user_ids) < batch_size:
+                break
+            after = user_ids[-1]
+        if num_generated > 0:
+            logger.info(f"Created {num_generated} user namespaces")
+        return num_generated
+
     @with_db_transaction
     @Authz.authz_change(AuthzOperation.insert_many, ResourceType.user_namespace)
     @update_search_document
-    async def generate_user_namespaces(self, *, session: AsyncSession | None = None) -> list[user_models.UserInfo]:
-        """Generate user namespaces if the user table has data and the namespaces table is empty."""
+    async def _generate_user_namespaces_batch(
+        self, user_ids: list[str], *, session: AsyncSession | None = None
+    ) -> list[user_models.UserInfo]:
+        """Generate the namespaces of the given users that still have none, the users are returned ordered by ID."""
         if not session:
             raise errors.ProgrammingError(message="A database session is required")
         # NOTE: lock to make sure another instance of the data service cannot insert/update but can read
-        output: list[user_models.UserInfo] = []
         await session.execute(text("LOCK TABLE common.namespaces IN EXCLUSIVE MODE"))
-        at_least_one_namespace = (await session.execute(select(schemas.NamespaceORM).limit(1))).one_or_none()
-        if at_least_one_namespace:
-            logger.info("Found at least one user namespace, skipping creation")
+        stmt = (
+            select(
+                user_schemas.UserORM.keycloak_id,
+                user_schemas.UserORM.email,
+                user_schemas.UserORM.first_name,
+                user_schemas.UserORM.last_name,
+            )
+            .where(user_schemas.UserORM.keycloak_id.in_(user_ids))
+            .where(~exists().where(schemas.NamespaceORM.user_id == user_schemas.UserORM.keycloak_id))
+            .order_by(user_schemas.UserORM.keycloak_id)
+        )
+        users = (await session.execute(stmt)).all()
+        if not users:
             return []
-        logger.info("Found zero user namespaces, will try to create them from users table")
-        res = await session.scalars(select(user_schemas.UserORM))
-        for user in res:
-            slug = base_models.Slug.from_user(user.email, user.first_name, user.last_name, user.keycloak_id)
-            ns = await self._insert_user_namespace(
-                session, user.keycloak_id, slug.value, retry_enumerate=10, retry_random=True
+
+        candidates = {
+            user.keycloak_id: base_models.Slug.from_user(
+                user.email, user.first_name, user.last_name, user.keycloak_id
+            ).value
+            for user in users
+        }
+        # NOTE: A single query finds all the existing slugs that the slugs of the batch can collide with
+        prefixes = [f"{slug}%" for slug in set(candidates.values())]
+        taken = set(
+            await session.scalars(
+                select(schemas.NamespaceORM.slug).where(schemas.NamespaceORM.slug.like(any_(array(prefixes))))
             )
-            logger.info(f"Creating user namespace {ns}")
-            user.namespace = ns
-            output.append(user.dump())
-        logger.info(f"Created {len(output)} user namespaces")
-        return output
+        )
+        rows: list[dict[str, Any]] = []
+        for user_id, user_slug in candidates.items():
+            slug = _pick_user_namespace_slug(user_slug, taken, retry_enumerate=10, retry_random=True)
+            taken.add(slug)
+            rows.append({"id": str(ULID()), "slug": slug, "user_id": user_id})
+        inserted_ids = await session.scalars(
+            pg_insert(schemas.NamespaceORM)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[schemas.NamespaceORM.slug])
+            .returning(schemas.NamespaceORM.id)
+        )
+        namespaces = await session.scalars(
+            select(schemas.NamespaceORM)
+            .where(schemas.NamespaceORM.id.in_(list(inserted_ids)))
+            .order_by(schemas.NamespaceORM.user_id)
+        )
+        return [ns.dump_user() for ns in namespaces]
 
     async def get_groups(
         self, user: base_models.APIUser, pagination: PaginationRequest, direct_member: bool = False
@@ -143,16 +248,17 @@ class GroupRepository:
             stmt = select(schemas.GroupORM)
             if direct_member:
                 stmt = stmt.where(schemas.GroupORM.id.in_(group_ids))
-            stmt = stmt.limit(pagination.per_page).offset(pagination.offset)
-            stmt = stmt.order_by(schemas.GroupORM.id.desc())
+            if pagination.keyset:
+                n_total_elements = await estimate_count(session, stmt)
+            stmt = paginate_query(stmt, pagination, id_column=schemas.GroupORM.id)
             result = await session.execute(stmt)
             groups_orm = result.scalars().all()
 
-            stmt_count = select(func.count()).select_from(schemas.GroupORM)
-            if direct_member:
-                stmt_count = stmt_count.where(schemas.GroupORM.id.in_(group_ids))
-            result = await session.execute(stmt_count)
-            n_total_elements = result.scalar() or 0
+            if not pagination.keyset:
+                stmt_count = select(func.count()).select_from(schemas.GroupORM)
+                if direct_member:
+                    stmt_count = stmt_count.where(schemas.GroupORM.id.in_(group_ids))
+                n_total_elements = (await session.execute(stmt_count)).scalar_one()
             return [g.dump() for g in groups_orm], n_total_elements
 
     async def get_all_groups(self, requested_by: base_models.APIUser) -> AsyncGenerator[models.Group, None]:
@@ -460,23 +566,36 @@ class GroupRepository:
             if not kinds or models.NamespaceKind.project in kinds:
                 project_ids = await self.authz.resources_with_permission(user, user.id, ResourceType.project, scope)
 
-            queries: list[tuple[Select[tuple[Any]], int]] = [
+            queries: list[tuple[Select[tuple[Any]], int, QueryableAttribute[ULID] | ColumnElement[ULID]]] = [
                 (
                     select(schemas.NamespaceORM)
                     .where(schemas.NamespaceORM.user_id.in_(user_ids))
                     .order_by(schemas.NamespaceORM.id),
                     len(user_ids),
+                    schemas.NamespaceORM.id,
                 ),
                 (
                     select(schemas.NamespaceORM)
                     .where(schemas.NamespaceORM.group_id.in_(group_ids))
                     .order_by(schemas.NamespaceORM.id),
                     len(group_ids),
+                    schemas.NamespaceORM.id,
+                ),
+                (
+                    select(ProjectORM).where(ProjectORM.id.in_(project_ids)).order_by(ProjectORM.id),
+                    len(project_ids),
+                    ProjectORM.id,
                 ),
-                (select(ProjectORM).where(ProjectORM.id.in_(project_ids)).order_by(ProjectORM.id), len(project_ids)),
             ]
 
-            results = await paginate_queries(pagination, session, queries)
+            results: Sequence[Any]
+            if pagination.keyset:
+                keyset_results = await paginate_queries_keyset(
+                    pagination, session, [(stmt, id_column) for stmt, _, id_column in queries]
+                )
+                results = [res for res, _ in keyset_results]
+            else:
+                results = await paginate_queries(pagination, session, [(stmt, cnt) for stmt, cnt, _ in queries])
             output: list[models.UserNamespace | models.GroupNamespace | models.ProjectNamespace] = []
             for res in results:
                 match res:
@@ -490,12 +609,20 @@ class GroupRepository:
                         )
             return output, len(group_ids) + len(user_ids) + len(project_ids)
 
-    async def _get_user_namespaces(self) -> AsyncGenerator[user_models.UserInfo, None]:
-        """Lists all user namespaces without regard for authorization or permissions, used for migrations."""
+    async def _get_user_namespaces(self, after: ULID | None = None) -> AsyncGenerator[user_models.UserInfo, None]:
+        """Lists all user namespaces without regard for authorization or permissions, used for migrations.
+
+        The namespaces are ordered by id, if after is given only the namespaces with a larger id are listed.
+        """
+        stmt = (
+            select(schemas.NamespaceORM)
+            .where(schemas.NamespaceORM.user_id.isnot(None))
+            .order_by(schemas.NamespaceORM.id)
+        )
+        if after is not None:
+            stmt = stmt.where(schemas.NamespaceORM.id > after)
         async with self.session_maker() as session, session.begin():
-            namespaces = await session.stream_scalars(
-                select(schemas.NamespaceORM).where(schemas.NamespaceORM.user_id.isnot(None))
-            )
+            namespaces = await session.stream_scalars(stmt)
             async for namespace in namespaces:
                 yield namespace.dump_user()
 
@@ -747,18 +874,53 @@ class GroupRepository:
                 raise errors.missing_or_unauthorized(ResourceType.project, project_id)
             return project_slug
 
-        async def _get_dcs_in_project(session: AsyncSession, project_id: ULID) -> AsyncIterable[DataConnectorORM]:
-            stmt = select(DataConnectorORM).where(
-                DataConnectorORM.slug.has(
-                    and_(
-                        schemas.EntitySlugORM.project_id == project_id,
-                        schemas.EntitySlugORM.data_connector_id.is_not(None),
+        async def _move_dcs_in_project(session: AsyncSession, project_id: ULID, new_namespace_id: ULID) -> None:
+            """Helper function to move all the data connectors owned by a project along with the project."""
+            dc_ids = cast(
+                list[ULID],
+                list(
+                    await session.scalars(
+                        select(schemas.EntitySlugORM.data_connector_id)
+                        .where(schemas.EntitySlugORM.project_id == project_id)
+                        .where(schemas.EntitySlugORM.data_connector_id.is_not(None))
                     )
+                ),
+            )
+            if not dc_ids:
+                return
+            # NOTE: Moving the data connectors requires the same permission as moving each of them on its own
+            items = [CheckPermissionItem(ResourceType.data_connector, dc_id, Scope.DELETE) for dc_id in dc_ids]
+            for item, allowed in await self.authz.has_permissions(user, items):
+                if not allowed:
+                    raise errors.missing_or_unauthorized(ResourceType.data_connector, item.resource_id)
+
+            # NOTE: The data connectors keep their slugs, so they cannot clash with each other in the new namespace
+            dc_slugs = select(
+                schemas.EntitySlugORM.slug,
+                schemas.EntitySlugORM.id,
+                schemas.EntitySlugORM.project_id,
+                schemas.EntitySlugORM.data_connector_id,
+            ).where(
+                schemas.EntitySlugORM.project_id == project_id,
+                schemas.EntitySlugORM.data_connector_id.is_not(None),
+                ~exists().where(
+                    schemas.EntitySlugOldORM.slug == schemas.EntitySlugORM.slug,
+                    schemas.EntitySlugOldORM.project_id == schemas.EntitySlugORM.project_id,
+                    schemas.EntitySlugOldORM.data_connector_id == schemas.EntitySlugORM.data_connector_id,
+                ),
+            )
+            await session.execute(
+                insert(schemas.EntitySlugOldORM).from_select(
+                    ["slug", "latest_slug_id", "project_id", "data_connector_id"], dc_slugs
                 )
             )
-            stream = await session.stream_scalars(stmt)
-            async for dc in stream:
-                yield dc
+            await session.execute(
+                update(schemas.EntitySlugORM)
+                .where(schemas.EntitySlugORM.project_id == project_id)
+                .where(schemas.EntitySlugORM.data_connector_id.is_not(None))
+                .values(namespace_id=new_namespace_id)
+                .execution_options(synchronize_session="fetch")
+            )
 
         async def _check_proj_slug_not_taken(
             session: AsyncSession, new_namespace: models.GroupNamespace | models.UserNamespace, new_slug: Slug
@@ -814,13 +976,7 @@ class GroupRepository:
                 await session.refresh(proj_slug)
             if project_ns_changed or project_slug_changed:
                 # move all data connectors from the project in the new namespace too
-                async for dc in _get_dcs_in_project(session, project.id):
-                    dc_model = dc.dump()
-                    if isinstance(dc_model, GlobalDataConnector):
-                        continue
-                    await self.move_data_connector(
-                        user, dc_model, new / base_models.DataConnectorSlug(dc_model.slug), session
-                    )
+                await _move_dcs_in_project(session, project.id, proj_slug.namespace_id)
 
     async def get_user_namespace(self, user_id: str) -> models.Namespace | None:
         """Get the namespace corresponding to a given user."""
@@ -839,30 +995,4 @@ class GroupRepository:
         nss = await session.scalars(
             select(schemas.NamespaceORM.slug).where(schemas.NamespaceORM.slug.startswith(user_slug))
         )
-        nslist = nss.all()
-        if user_slug not in nslist:
-            return user_slug
-        if retry_enumerate:
-            for inc in range(1, retry_enumerate + 1):
-                slug = f"{user_slug}-{inc}"
-                if slug not in nslist:
-                    return slug
-        if retry_random:
-            suffix = "".join([random.choice(string.ascii_lowercase + string.digits) for _ in range(8)])  # nosec B311
-            slug = f"{user_slug}-{suffix}"
-            if slug not in nslist:
-                return slug
-
-        raise errors.ValidationError(message=f"Cannot create generate a unique namespace slug for the user {user_slug}")
-
-    async def _insert_user_namespace(
-        self, session: AsyncSession, user_id: str, user_slug: str, retry_enumerate: int = 0, retry_random: bool = False
-    ) -> schemas.NamespaceORM:
-        """Insert a new namespace for the user and optionally retry different variations to avoid collisions."""
-        namespace = await self._create_user_namespace_slug(session, user_slug, retry_enumerate, retry_random)
-        slug = base_models.Slug.from_name(namespace)
-        ns = schemas.NamespaceORM(slug.value, user_id=user_id)
-        session.add(ns)
-        await session.flush()
-        await session.refresh(ns)
-        return ns
+        return _pick_user_namespace_slug(user_slug, nss.all(), retry_enumerate, retry_random)
@@ -13,6 +13,7 @@ import httpx
 from werkzeug.datastructures import WWWAuthenticate
 
 from renku_data_services.app_config import logging
+from renku_data_services.app_config.instrumentation import InstrumentedTransport
 from renku_data_services.errors import errors
 
 logger = logging.getLogger(__name__)
@@ -44,7 +45,11 @@ class ImageRepoDockerAPI:
     # NOTE: We need to follow redirects so that we can authenticate with the image repositories properly.
     # NOTE: If we do not use default_factory to create the client here requests will fail because it can happen
     # that the client gets created in the wrong asyncio loop.
-    client: httpx.AsyncClient = field(default_factory=lambda: httpx.AsyncClient(timeout=10, follow_redirects=True))
+    client: httpx.AsyncClient = field(
+        default_factory=lambda: httpx.AsyncClient(
+            timeout=10, follow_redirects=True, transport=InstrumentedTransport("registry")
+        )
+    )
     scheme: str = "https"
 
     def __post_init__(self) -> None:
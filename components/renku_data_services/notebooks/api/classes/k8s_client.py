@@ -13,6 +13,7 @@ from kr8s import NotFoundError, ServerError
 from kr8s.asyncio.objects import Pod, Secret, StatefulSet
 
 from renku_data_services.app_config import logging
+from renku_data_services.app_config.request_cache import request_memoized, user_key
 from renku_data_services.base_models import APIUser
 from renku_data_services.crc.db import ResourcePoolRepository
 from renku_data_services.errors import errors
@@ -160,6 +161,7 @@ class NotebookK8sClient(SecretClient):
 
         return None
 
+    @request_memoized(lambda _: ())
     async def namespace(self) -> str:
         """Current namespace of the main cluster."""
         client = await self.__client.cluster_by_id(self.cluster_id())
@@ -170,6 +172,7 @@ class NotebookK8sClient(SecretClient):
         """Cluster id of the main cluster."""
         return DEFAULT_K8S_CLUSTER
 
+    @request_memoized(lambda _, class_id, api_user: (class_id, user_key(api_user)))
     async def cluster_by_class_id(self, class_id: int | None, api_user: APIUser) -> ClusterConnection:
         """Return the cluster associated with the given resource class id."""
         cluster_id = self.cluster_id()
@@ -182,6 +182,7 @@ class NotebooksConfig:
                 kinds_to_cache=[AMALTHEA_SESSION_GVK, BUILD_RUN_GVK, TASK_RUN_GVK],
             )
         )
+        cluster_rp.change_listeners.append(client.invalidate)
         secrets_client = K8sSecretClient(client)
 
         authz = Authz(authz_config)
@@ -9,7 +9,7 @@ from collections.abc import AsyncIterator, Mapping, Sequence
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from pathlib import PurePosixPath
-from typing import Protocol, TypeVar, cast
+from typing import Any, Protocol, TypeVar, cast
 from urllib.parse import urljoin, urlparse
 
 import httpx
@@ -20,6 +20,7 @@ from ulid import ULID
 from yaml import safe_dump
 
 from renku_data_services.app_config import logging
+from renku_data_services.app_config.instrumentation import InstrumentedTransport
 from renku_data_services.authn.renku import RenkuSelfTokenMint
 from renku_data_services.base_models import RESET, AnonymousAPIUser, APIUser, AuthenticatedAPIUser, ResetType
 from renku_data_services.base_models.metrics import MetricsService
@@ -39,6 +40,7 @@ from renku_data_services.data_connectors.db import (
 )
 from renku_data_services.data_connectors.models import DataConnectorSecret, DataConnectorWithSecrets
 from renku_data_services.errors import ValidationError, errors
+from renku_data_services.k8s.constants import ClusterId
 from renku_data_services.k8s.models import ClusterConnection, K8sSecret, sanitizer
 from renku_data_services.notebooks import apispec
 from renku_data_services.notebooks.api.amalthea_patches import git_proxy, init_containers
@@ -361,50 +363,29 @@ async def patch_data_sources(
     return SessionExtraResources(secrets=secrets)
 
 
-async def request_dc_secret_creation(
-    user: AuthenticatedAPIUser | AnonymousAPIUser,
-    nb_config: NotebooksConfig,
+def _dc_secret_creation_requests(
     manifest: AmaltheaSessionV1Alpha1,
     dc_secrets: dict[str, list[DataConnectorSecret]],
-) -> None:
-    """Request the specified data connector secrets to be created by the secret service."""
-    if isinstance(user, AnonymousAPIUser):
-        return
-    owner_reference = {
-        "apiVersion": manifest.apiVersion,
-        "kind": manifest.kind,
-        "name": manifest.metadata.name,
-        "uid": manifest.metadata.uid,
-    }
-    secrets_url = nb_config.user_secrets.secrets_storage_service_url + "/api/secrets/kubernetes"
-    headers = {"Authorization": f"bearer {user.access_token}"}
-
-    cluster_id = None
-    namespace = await nb_config.k8s_v2_client.namespace()
-    if (cluster := await nb_config.k8s_v2_client.cluster_by_class_id(manifest.resource_class_id(), user)) is not None:
-        cluster_id = cluster.id
-        namespace = cluster.namespace
-
+    owner_reference: dict[str, str],
+    namespace: str,
+    cluster_id: ClusterId | None,
+) -> list[dict[str, Any]]:
+    """Get the secret service requests for the specified data connector secrets."""
+    requests = []
     for s_id, secrets in dc_secrets.items():
         if len(secrets) == 0:
             continue
-        request_data = {
-            "name": f"{manifest.metadata.name}-ds-{s_id.lower()}-secrets",
-            "namespace": namespace,
-            "secret_ids": [str(secret.secret_id) for secret in secrets],
-            "owner_references": [owner_reference],
-            "key_mapping": {str(secret.secret_id): secret.name for secret in secrets},
-            "cluster_id": str(cluster_id),
-        }
-        async with httpx.AsyncClient(timeout=10) as client:
-            res = await client.post(secrets_url, headers=headers, json=request_data)
-            if res.status_code >= 300 or res.status_code < 200:
-                raise errors.ProgrammingError(
-                    message=f"The secret for data connector with {s_id} could not be "
-                    f"successfully created, the status code was {res.status_code}."
-                    "Please contact a Renku administrator.",
-                    detail=res.text,
-                )
+        requests.append(
+            {
+                "name": f"{manifest.metadata.name}-ds-{s_id.lower()}-secrets",
+                "namespace": namespace,
+                "secret_ids": [str(secret.secret_id) for secret in secrets],
+                "owner_references": [owner_reference],
+                "key_mapping": {str(secret.secret_id): secret.name for secret in secrets},
+                "cluster_id": str(cluster_id),
+            }
+        )
+    return requests
 
 
 def get_launcher_env_variables(launcher: SessionLauncher, launch_request: SessionLaunchRequest) -> list[SessionEnvItem]:
@@ -430,29 +411,53 @@ def verify_launcher_env_variable_overrides(launcher: SessionLauncher, launch_req
         raise errors.ValidationError(message=message)
 
 
-async def request_session_secret_creation(
+def _session_secret_creation_request(
+    manifest: AmaltheaSessionV1Alpha1,
+    session_secrets: list[SessionSecret],
+    owner_reference: dict[str, str],
+    namespace: str,
+    cluster_id: ClusterId | None,
+) -> dict[str, Any] | None:
+    """Get the secret service request for the specified user session secrets."""
+    if not session_secrets:
+        return None
+    key_mapping: dict[str, list[str]] = dict()
+    for s in session_secrets:
+        secret_id = str(s.secret_id)
+        if secret_id not in key_mapping:
+            key_mapping[secret_id] = list()
+        key_mapping[secret_id].append(s.secret_slot.filename)
+
+    return {
+        "name": f"{manifest.metadata.name}-secrets",
+        "namespace": namespace,
+        "secret_ids": [str(s.secret_id) for s in session_secrets],
+        "owner_references": [owner_reference],
+        "key_mapping": key_mapping,
+        "cluster_id": str(cluster_id),
+    }
+
+
+async def request_secrets_creation(
     user: AuthenticatedAPIUser | AnonymousAPIUser,
     nb_config: NotebooksConfig,
     manifest: AmaltheaSessionV1Alpha1,
     session_secrets: list[SessionSecret],
+    dc_secrets: dict[str, list[DataConnectorSecret]],
 ) -> None:
-    """Request the specified user session secrets to be created by the secret service."""
+    """Request the user session and data connector secrets to be created by the secret service in one call."""
     if isinstance(user, AnonymousAPIUser):
         return
-    if not session_secrets:
-        return
+    if manifest.metadata.uid is None:
+        raise errors.ProgrammingError(
+            message=f"Cannot create the secrets of session {manifest.metadata.name} before the session is created."
+        )
     owner_reference = {
         "apiVersion": manifest.apiVersion,
         "kind": manifest.kind,
         "name": manifest.metadata.name,
         "uid": manifest.metadata.uid,
     }
-    key_mapping: dict[str, list[str]] = dict()
-    for s in session_secrets:
-        secret_id = str(s.secret_id)
-        if secret_id not in key_mapping:
-            key_mapping[secret_id] = list()
-        key_mapping[secret_id].append(s.secret_slot.filename)
 
     cluster_id = None
     namespace = await nb_config.k8s_v2_client.namespace()
@@ -460,25 +465,33 @@ async def request_session_secret_creation(
         cluster_id = cluster.id
         namespace = cluster.namespace
 
-    request_data = {
-        "name": f"{manifest.metadata.name}-secrets",
-        "namespace": namespace,
-        "secret_ids": [str(s.secret_id) for s in session_secrets],
-        "owner_references": [owner_reference],
-        "key_mapping": key_mapping,
-        "cluster_id": str(cluster_id),
-    }
-    secrets_url = nb_config.user_secrets.secrets_storage_service_url + "/api/secrets/kubernetes"
+    requests = _dc_secret_creation_requests(manifest, dc_secrets, owner_reference, namespace, cluster_id)
+    session_request = _session_secret_creation_request(
+        manifest, session_secrets, owner_reference, namespace, cluster_id
+    )
+    if session_request is not None:
+        requests.insert(0, session_request)
+    if not requests:
+        return
+
+    secrets_url = nb_config.user_secrets.secrets_storage_service_url + "/api/secrets/kubernetes/batch"
     headers = {"Authorization": f"bearer {user.access_token}"}
-    async with httpx.AsyncClient(timeout=10) as client:
-        res = await client.post(secrets_url, headers=headers, json=request_data)
-        if res.status_code >= 300 or res.status_code < 200:
-            raise errors.ProgrammingError(
-                message="The session secrets could not be successfully created, "
-                f"the status code was {res.status_code}."
-                "Please contact a Renku administrator.",
-                detail=res.text,
-            )
+    async with httpx.AsyncClient(timeout=10, transport=InstrumentedTransport("secrets_storage")) as client:
+        res = await client.post(secrets_url, headers=headers, json={"secrets": requests})
+    if res.status_code >= 300 or res.status_code < 200:
+        raise errors.ProgrammingError(
+            message="The session secrets could not be successfully created, "
+            f"the status code was {res.status_code}."
+            "Please contact a Renku administrator.",
+            detail=res.text,
+        )
+    failed = [result for result in res.json().get("results", []) if result.get("error") is not None]
+    if failed:
+        raise errors.ProgrammingError(
+            message=f"The secrets {', '.join(result['name'] for result in failed)} could not be successfully "
+            "created. Please contact a Renku administrator.",
+            detail=res.text,
+        )
 
 
 def resources_patch_from_resource_class(
@@ -1230,9 +1243,8 @@ async def start_session(
         raise errors.ProgrammingError(message="Could not start the amalthea session") from err
     else:
         try:
-            await request_session_secret_creation(user, nb_config, session, session_secrets)
             data_connector_secrets = session_extras.data_connector_secrets or dict()
-            await request_dc_secret_creation(user, nb_config, session, data_connector_secrets)
+            await request_secrets_creation(user, nb_config, session, session_secrets, data_connector_secrets)
         except Exception:
             await nb_config.k8s_v2_client.delete_session(server_name, user.id)
             raise
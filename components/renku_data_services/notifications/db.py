@@ -3,7 +3,8 @@
 from collections.abc import Callable
 from datetime import UTC, datetime
 
-from sqlalchemy import select
+from sqlalchemy import func, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from ulid import ULID
 
@@ -220,32 +221,74 @@ class NotificationsRepository:
     ) -> None:
         """Process firing and resolved alerts from an Alertmanager webhook.
 
-        Firing alerts are created or updated. Resolved alerts are matched and marked as resolved.
+        The whole payload is processed in one transaction. Firing alerts are upserted with a single multi-row insert
+        which relies on the unique index over unresolved alerts, so that redelivered payloads are idempotent. Resolved
+        alerts are matched by their properties and marked as resolved with a single update.
         """
-        for alert in firing_alerts:
-            try:
-                await self.create_or_update_alert(user=user, alert=alert)
-            except Exception as e:
-                logger.warning("Failed to create/update alert: %s. Error: %s", alert, e)
-
-        for alert in resolved_alerts:
-            try:
-                matching_alerts = await self.get_alerts_by_properties(
-                    requested_by=user,
-                    alert_id=None,
-                    user_id=alert.user_id,
-                    session_name=alert.session_name,
-                    title=alert.title,
-                    message=alert.message,
-                    created_at=None,
-                    resolved_date=None,
+        if user.id is None:
+            raise errors.UnauthorizedError(message="You do not have the required permissions for this operation.")
+        if not user.is_admin and self.alertmanager_webhook_role not in user.roles:
+            raise errors.ForbiddenError(message="You do not have the required permissions for this operation.")
+        if not firing_alerts and not resolved_alerts:
+            return
+
+        async with self.session_maker() as session, session.begin():
+            if firing_alerts:
+                await self.__upsert_firing_alerts(session, firing_alerts)
+            if resolved_alerts:
+                resolved_keys = {
+                    (alert.user_id, alert.session_name or "", alert.title, alert.message) for alert in resolved_alerts
+                }
+                await session.execute(
+                    update(schemas.AlertORM)
+                    .where(schemas.AlertORM.resolved_date.is_(None))
+                    .where(
+                        tuple_(
+                            schemas.AlertORM.user_id,
+                            func.coalesce(schemas.AlertORM.session_name, ""),
+                            schemas.AlertORM.title,
+                            schemas.AlertORM.message,
+                        ).in_(list(resolved_keys))
+                    )
+                    .values(resolved_date=datetime.now(UTC))
                 )
 
-                for matching_alert in matching_alerts:
-                    patch = models.AlertPatch(resolved=True)
-                    try:
-                        await self.update_alert(user=user, alert_id=matching_alert.id, patch=patch)
-                    except Exception as e:
-                        logger.warning("Failed to resolve alert %s: %s", matching_alert.id, e)
-            except Exception as e:
-                logger.warning("Failed to process resolved alert: %s. Error: %s", alert, e)
+    async def __upsert_firing_alerts(self, session: AsyncSession, firing_alerts: list[models.UnsavedAlert]) -> None:
+        user_ids = {alert.user_id for alert in firing_alerts}
+        existing_user_ids = set(
+            await session.scalars(select(UserORM.keycloak_id).where(UserORM.keycloak_id.in_(user_ids)))
+        )
+
+        # NOTE: Postgres cannot update the same row twice in one upsert, so only the last occurrence of an alert is kept
+        alerts: dict[tuple[str, str, str], models.UnsavedAlert] = {}
+        for alert in firing_alerts:
+            if alert.user_id not in existing_user_ids:
+                logger.warning("User with ID '%s' does not exist, skipping alert creation.", alert.user_id)
+                continue
+            alerts[(alert.user_id, alert.event_type, alert.session_name or "")] = alert
+        if not alerts:
+            return
+
+        stmt = insert(schemas.AlertORM).values(
+            [
+                {
+                    "title": alert.title,
+                    "message": alert.message,
+                    "event_type": alert.event_type,
+                    "user_id": alert.user_id,
+                    "session_name": alert.session_name,
+                }
+                for alert in alerts.values()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            # NOTE: the conflict target has to match the expression of the unique index literally
+            index_elements=[
+                schemas.AlertORM.user_id,
+                schemas.AlertORM.event_type,
+                func.coalesce(schemas.AlertORM.session_name, literal_column("''")),
+            ],
+            index_where=schemas.AlertORM.resolved_date.is_(None),
+            set_={"title": stmt.excluded.title, "message": stmt.excluded.message},
+        )
+        await session.execute(stmt)
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, MetaData, String, func, text
+from sqlalchemy import DateTime, ForeignKey, Index, MetaData, String, func, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, MappedAsDataclass, mapped_column
 from ulid import ULID
 
@@ -23,6 +23,18 @@ class AlertORM(BaseORM):
     """The alerts."""
 
     __tablename__ = "alerts"
+    __table_args__ = (
+        # NOTE: there can be at most one unresolved alert per user, event type and session, this is what
+        # makes upserting alerts from the Alertmanager webhook idempotent
+        Index(
+            "ix_notifications_alerts_unresolved_unique",
+            "user_id",
+            "event_type",
+            text("coalesce(session_name, '')"),
+            unique=True,
+            postgresql_where=text("resolved_date IS NULL"),
+        ),
+    )
 
     id: Mapped[ULID] = mapped_column(
         "id", ULIDType, primary_key=True, server_default=text("generate_ulid()"), init=False
@@ -190,10 +190,18 @@ class PlatformUrlRedirectBP(CustomBlueprint):
         """Get a specific redirect config."""
 
         @authenticate(self.authenticator)
-        async def _get_url_redirect_config(_: Request, user: base_models.APIUser, url: str) -> JSONResponse:
+        @extract_if_none_match
+        async def _get_url_redirect_config(
+            _: Request, user: base_models.APIUser, url: str, etag: str | None
+        ) -> HTTPResponse:
             source_url = urllib.parse.unquote(url)
             redirect = await self.url_redirect_repo.get_redirect_config_by_source_url(user=user, source_url=source_url)
-            return validated_json(apispec.UrlRedirectPlan, redirect)
+
+            if redirect.etag == etag:
+                return empty(status=304)
+
+            headers = {"ETag": redirect.etag}
+            return validated_json(apispec.UrlRedirectPlan, redirect, headers=headers)
 
         return "/platform/redirects/<url>", ["GET"], _get_url_redirect_config
 
@@ -1,5 +1,6 @@
 """Adapters for platform config database classes."""
 
+import time
 from collections.abc import Callable
 
 from sqlalchemy import func, select
@@ -8,21 +9,46 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from renku_data_services import base_models, errors
 from renku_data_services.authz.authz import Authz
 from renku_data_services.base_api.pagination import PaginationRequest
+from renku_data_services.db_config.notifications import notify
 from renku_data_services.platform import models
 from renku_data_services.platform import orm as schemas
 
+PLATFORM_CONFIG_CHANNEL = "platform_config_updated"
+"""The Postgres notification channel used to signal that the platform configuration changed."""
+
+URL_REDIRECTS_CHANNEL = "url_redirects_updated"
+"""The Postgres notification channel used to signal that URL redirects changed."""
+
 
 class PlatformRepository:
-    """Repository for the platform config."""
+    """Repository for the platform config.
+
+    The configuration is cached in-process. The cache is invalidated by notifications on `PLATFORM_CONFIG_CHANNEL`
+    and expires after ``cache_ttl_seconds`` in case a notification was missed.
+    """
 
     def __init__(
         self,
         session_maker: Callable[..., AsyncSession],
+        cache_ttl_seconds: float = 60,
     ):
         self.session_maker = session_maker
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.__cached_config: tuple[float, models.PlatformConfig] | None = None
+        self.__cache_generation = 0
+
+    def invalidate_cache(self, _payload: str | None = None) -> None:
+        """Drop the cached platform configuration."""
+        self.__cached_config = None
+        self.__cache_generation += 1
 
     async def get_or_create_config(self) -> models.PlatformConfig:
         """Get the platform configuration from the database or create it if it does not exist yet."""
+        cached = self.__cached_config
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        generation = self.__cache_generation
         async with self.session_maker() as session, session.begin():
             config = await session.scalar(select(schemas.PlatformConfigORM))
             if config is None:
@@ -30,7 +56,11 @@ class PlatformRepository:
                 session.add(config)
                 await session.flush()
                 await session.refresh(config)
-            return config.dump()
+            result = config.dump()
+        # NOTE: Do not cache a configuration that may have been changed while it was being read
+        if generation == self.__cache_generation:
+            self.__cached_config = (time.monotonic() + self.cache_ttl_seconds, result)
+        return result
 
     async def update_config(
         self, user: base_models.APIUser, etag: str, patch: models.PlatformConfigPatch
@@ -56,20 +86,55 @@ class PlatformRepository:
 
             await session.flush()
             await session.refresh(config)
+            await notify(session, PLATFORM_CONFIG_CHANNEL)
+            result = config.dump()
 
-            return config.dump()
+        self.invalidate_cache()
+        return result
 
 
 class UrlRedirectRepository:
-    """Repository for URL redirects."""
+    """Repository for URL redirects.
+
+    Lookups by source URL are cached in-process, including URLs without a redirect. The cache is invalidated by
+    notifications on `URL_REDIRECTS_CHANNEL` and entries expire after ``cache_ttl_seconds`` in case a notification
+    was missed.
+    """
 
     def __init__(
         self,
         session_maker: Callable[..., AsyncSession],
         authz: Authz,
+        cache_ttl_seconds: float = 60,
+        cache_max_entries: int = 10_000,
     ) -> None:
         self.session_maker = session_maker
         self.authz = authz
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_max_entries = cache_max_entries
+        self.__cache: dict[str, tuple[float, models.UrlRedirectConfig | None]] = {}
+        self.__cache_generation = 0
+
+    def invalidate_cache(self, _payload: str | None = None) -> None:
+        """Drop all cached redirects."""
+        self.__cache.clear()
+        self.__cache_generation += 1
+
+    async def __get_cached_redirect_config(self, source_url: str) -> models.UrlRedirectConfig | None:
+        cached = self.__cache.get(source_url)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        generation = self.__cache_generation
+        async with self.session_maker() as session:
+            url_redirect_orm = await self._get_redirect_config_by_source_url(session, source_url)
+            result = url_redirect_orm.dump() if url_redirect_orm is not None else None
+        if generation == self.__cache_generation:
+            self.__cache.pop(source_url, None)
+            self.__cache[source_url] = (time.monotonic() + self.cache_ttl_seconds, result)
+            while len(self.__cache) > self.cache_max_entries:
+                del self.__cache[next(iter(self.__cache))]
+        return result
 
     async def _get_redirect_config_by_source_url(
         self, session: AsyncSession, source_url: str
@@ -106,14 +171,12 @@ class UrlRedirectRepository:
         if user.id is None:
             raise errors.UnauthorizedError(message="You do not have the required permissions for this operation.")
 
-        async with self.session_maker() as session:
-            url_redirect_orm = await self._get_redirect_config_by_source_url(session, source_url)
-
-            if not url_redirect_orm:
-                raise errors.MissingResourceError(
-                    message=f"A redirect for '{source_url}' does not exist or you do not have access to it."
-                )
-            return url_redirect_orm.dump()
+        url_redirect = await self.__get_cached_redirect_config(source_url)
+        if url_redirect is None:
+            raise errors.MissingResourceError(
+                message=f"A redirect for '{source_url}' does not exist or you do not have access to it."
+            )
+        return url_redirect
 
     async def create_redirect_config(
         self, user: base_models.APIUser, post: models.UnsavedUrlRedirectConfig
@@ -136,7 +199,11 @@ class UrlRedirectRepository:
             session.add(redirect_orm)
             await session.flush()
             await session.refresh(redirect_orm)
-            return redirect_orm.dump()
+            await notify(session, URL_REDIRECTS_CHANNEL)
+            result = redirect_orm.dump()
+
+        self.invalidate_cache()
+        return result
 
     async def delete_redirect_config(
         self, user: base_models.APIUser, etag: str, source_url: str
@@ -160,10 +227,13 @@ class UrlRedirectRepository:
                 raise errors.ConflictError(message=f"Current ETag is {current_etag}, not {etag}.")
 
             await session.delete(existing)
-            return models.UrlRedirectUpdateConfig(
-                source_url=source_url,
-                target_url=None,
-            )
+            await notify(session, URL_REDIRECTS_CHANNEL)
+
+        self.invalidate_cache()
+        return models.UrlRedirectUpdateConfig(
+            source_url=source_url,
+            target_url=None,
+        )
 
     async def update_redirect_config(
         self, user: base_models.APIUser, etag: str, patch: models.UrlRedirectUpdateConfig
@@ -189,4 +259,8 @@ class UrlRedirectRepository:
                 session.add(existing)
                 await session.flush()
                 await session.refresh(existing)
-            return existing.dump()
+                await notify(session, URL_REDIRECTS_CHANNEL)
+            result = existing.dump()
+
+        self.invalidate_cache()
+        return result
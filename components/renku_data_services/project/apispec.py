@@ -206,6 +206,10 @@ class ProjectGetQuery(PaginationRequest):
         False,
         description="A flag to filter projects where the user is a direct member.",
     )
+    cursor: str | None = Field(
+        None,
+        description="Opaque cursor for keyset pagination. When present (empty for the first page) the listing is paginated\nby key instead of by page number, the next page is requested with the value of the `next-cursor`\nresponse header and the `page` parameter is ignored.\n",
+    )
 
 
 class ProjectMigrationList(RootModel[list[ProjectMigrationInfo]]):
@@ -18,7 +18,7 @@ from renku_data_services.base_api.auth import (
 from renku_data_services.base_api.blueprint import BlueprintFactoryResponse, CustomBlueprint
 from renku_data_services.base_api.etag import extract_if_none_match, if_match_required
 from renku_data_services.base_api.misc import validate_query
-from renku_data_services.base_api.pagination import PaginationRequest, paginate
+from renku_data_services.base_api.pagination import Cursor, PaginationRequest, next_cursor, paginate
 from renku_data_services.base_models.core import Slug
 from renku_data_services.base_models.metrics import MetricsService, ProjectCreationType
 from renku_data_services.base_models.validation import validate_and_dump, validated_json
@@ -66,11 +66,14 @@ class ProjectsBP(CustomBlueprint):
         @paginate
         async def _get_all(
             _: Request, user: base_models.APIUser, pagination: PaginationRequest, query: apispec.ProjectGetQuery
-        ) -> tuple[list[dict[str, Any]], int]:
+        ) -> tuple[list[dict[str, Any]], int, Cursor | None]:
             projects, total_num = await self.project_repo.get_projects(
                 user=user, pagination=pagination, namespace=query.namespace, direct_member=query.direct_member
             )
-            return [validate_and_dump(apispec.Project, self._dump_project(p)) for p in projects], total_num
+            cursor = next_cursor(
+                pagination, projects, id_key=lambda p: p.id, sort_key=lambda p: p.updated_at or p.creation_date
+            )
+            return [validate_and_dump(apispec.Project, self._dump_project(p)) for p in projects], total_num, cursor
 
         return "/projects", ["GET"], _get_all
 
@@ -18,9 +18,10 @@ from ulid import ULID
 
 import renku_data_services.base_models as base_models
 from renku_data_services import errors
+from renku_data_services.app_config.request_cache import request_memoized, user_key
 from renku_data_services.authz.authz import Authz, AuthzOperation, ResourceType, _AuthzConverter
 from renku_data_services.authz.models import CheckPermissionItem, Member, MembershipChange, Scope, Visibility
-from renku_data_services.base_api.pagination import PaginationRequest
+from renku_data_services.base_api.pagination import PaginationRequest, estimate_count, paginate_query
 from renku_data_services.base_models import RESET, ProjectPath, ProjectSlug
 from renku_data_services.base_models.core import Slug
 from renku_data_services.data_connectors import orm as dc_schemas
@@ -53,8 +54,10 @@ class ProjectRepository:
         group_repo: GroupRepository,
         search_updates_repo: SearchUpdatesRepo,
         authz: Authz,
+        read_session_maker: Callable[..., AsyncSession] | None = None,
     ) -> None:
         self.session_maker = session_maker
+        self.read_session_maker = read_session_maker or session_maker
         self.group_repo: GroupRepository = group_repo
         self.search_updates_repo: SearchUpdatesRepo = search_updates_repo
         self.authz = authz
@@ -72,24 +75,29 @@ class ProjectRepository:
         else:
             project_ids = await self.authz.resources_with_permission(user, user.id, ResourceType.project, Scope.READ)
 
-        async with self.session_maker() as session:
+        async with self.read_session_maker() as session:
             stmt = select(schemas.ProjectORM)
             stmt = stmt.where(schemas.ProjectORM.id.in_(project_ids))
             if namespace:
                 stmt = _filter_projects_by_namespace_slug(stmt, namespace)
 
-            stmt = stmt.order_by(coalesce(schemas.ProjectORM.updated_at, schemas.ProjectORM.creation_date).desc())
-
-            stmt = stmt.limit(pagination.per_page).offset(pagination.offset)
-
-            stmt_count = (
-                select(func.count()).select_from(schemas.ProjectORM).where(schemas.ProjectORM.id.in_(project_ids))
+            if pagination.keyset:
+                total_elements = await estimate_count(session, stmt)
+            else:
+                stmt_count = (
+                    select(func.count()).select_from(schemas.ProjectORM).where(schemas.ProjectORM.id.in_(project_ids))
+                )
+                if namespace:
+                    stmt_count = _filter_projects_by_namespace_slug(stmt_count, namespace)
+                total_elements = await session.scalar(stmt_count) or 0
+
+            stmt = paginate_query(
+                stmt,
+                pagination,
+                id_column=schemas.ProjectORM.id,
+                sort_column=coalesce(schemas.ProjectORM.updated_at, schemas.ProjectORM.creation_date),
             )
-            if namespace:
-                stmt_count = _filter_projects_by_namespace_slug(stmt_count, namespace)
-            results = await session.scalars(stmt), await session.scalar(stmt_count)
-            projects_orm = results[0].all()
-            total_elements = results[1] or 0
+            projects_orm = (await session.scalars(stmt)).all()
             return [p.dump() for p in projects_orm], total_elements
 
     async def get_all_projects(self, requested_by: base_models.APIUser) -> AsyncGenerator[models.Project, None]:
@@ -102,6 +110,9 @@ class ProjectRepository:
             async for project in projects:
                 yield project.dump()
 
+    @request_memoized(
+        lambda _, user, project_id, with_documentation=False: (user_key(user), project_id, with_documentation)
+    )
     async def get_project(
         self, user: base_models.APIUser, project_id: ULID, with_documentation: bool = False
     ) -> models.Project:
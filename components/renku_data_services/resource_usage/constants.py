@@ -4,3 +4,9 @@ from typing import Final
 
 ACTIVE_PHASES: Final[list[str]] = ["Running", "Bound"]
 """Indicates which phase values are considered active and consuming resources and budget."""
+
+RESOURCE_REQUESTS_LOG_PARTITION_PREFIX: Final[str] = "resource_requests_log_p"
+"""The name prefix of the weekly partitions of the resource requests log, followed by the start date as YYYYMMDD."""
+
+RESOURCE_REQUESTS_LOG_DEFAULT_PARTITION: Final[str] = "resource_requests_log_default"
+"""The partition of the resource requests log that holds rows for which no weekly partition exists."""
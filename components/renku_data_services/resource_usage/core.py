@@ -6,7 +6,7 @@ from typing import Protocol
 
 from renku_data_services import errors
 from renku_data_services.app_config import logging
-from renku_data_services.k8s.client_interfaces import K8sClient
+from renku_data_services.k8s.clients import K8sClusterClientsPool
 from renku_data_services.k8s.constants import DEFAULT_K8S_CLUSTER, ClusterId
 from renku_data_services.k8s.models import GVK, K8sObject, K8sObjectFilter, K8sObjectMeta
 from renku_data_services.resource_usage import apispec
@@ -50,7 +50,7 @@ class ResourceRequestsFetchProto(Protocol):
 class ResourceRequestsFetch(ResourceRequestsFetchProto):
     """Get resource request data."""
 
-    def __init__(self, k8s_client: K8sClient) -> None:
+    def __init__(self, k8s_client: K8sClusterClientsPool) -> None:
         self._client = k8s_client
 
     async def _get_node(
@@ -92,7 +92,8 @@ class ResourceRequestsFetch(ResourceRequestsFetchProto):
         )
         pvc_filter = K8sObjectFilter(gvk=GVK(kind="PersistentVolumeClaim", version="v1"))
         node_cache: dict[str, ResourceDataFacade] = {}
-        async for pod in self._client.list(pod_filter):
+        skipped_clusters: set[ClusterId] = set()
+        async for pod in self._client.list(pod_filter, skipped_clusters=skipped_clusters):
             obj = ResourceDataFacade(obj=pod)
             node_obj: ResourceDataFacade | None = None
             try:
@@ -105,12 +106,18 @@ class ResourceRequestsFetch(ResourceRequestsFetchProto):
             await self._amend_session_fallback(pod.cluster, obj, rreq)
             yield rreq
 
-        async for pvc in self._client.list(pvc_filter):
+        async for pvc in self._client.list(pvc_filter, skipped_clusters=skipped_clusters):
             obj = ResourceDataFacade(obj=pvc)
             rreq = ResourcesRequest.from_pvc(obj, pvc.cluster, date, capture_interval)
             await self._amend_session_fallback(pvc.cluster, obj, rreq)
             yield rreq
 
+        if skipped_clusters:
+            logger.warning(
+                f"The resource requests of the clusters {sorted(skipped_clusters)} could not be listed, "
+                f"their usage is not recorded for {date}"
+            )
+
     async def _amend_session_fallback(
         self, cluster_id: ClusterId | None, obj: ResourceDataFacade, rreq: ResourcesRequest
     ) -> None:
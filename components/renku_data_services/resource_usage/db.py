@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import AsyncGenerator, AsyncIterator, Callable, Generator, Iterable, Sequence
-from datetime import timedelta
+from datetime import UTC, datetime, timedelta
 from itertools import islice
 from typing import Any
 
@@ -13,7 +13,11 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from renku_data_services.app_config import logging
-from renku_data_services.resource_usage.constants import ACTIVE_PHASES
+from renku_data_services.resource_usage.constants import (
+    ACTIVE_PHASES,
+    RESOURCE_REQUESTS_LOG_DEFAULT_PARTITION,
+    RESOURCE_REQUESTS_LOG_PARTITION_PREFIX,
+)
 from renku_data_services.resource_usage.model import (
     Credit,
     ResourceClassCostWithPool,
@@ -32,16 +36,27 @@ from renku_data_services.utils.sqlalchemy import CreditType, get_postgres_error_
 logger = logging.getLogger(__file__)
 
 
+def _week_start(value: datetime) -> datetime:
+    """Return the start (monday at midnight UTC) of the week of the given timestamp."""
+    value = value.astimezone(UTC)
+    return datetime(value.year, value.month, value.day, tzinfo=UTC) - timedelta(days=value.weekday())
+
+
 class ResourceRequestsRepo:
     """Repository for resource requests data."""
 
-    def __init__(self, session_maker: Callable[..., AsyncSession]) -> None:
+    def __init__(
+        self,
+        session_maker: Callable[..., AsyncSession],
+        read_session_maker: Callable[..., AsyncSession] | None = None,
+    ) -> None:
         self.session_maker = session_maker
+        self.read_session_maker = read_session_maker or session_maker
 
     async def find_all(self, chunk_size: int = 100) -> AsyncIterator[ResourceRequestsLogORM]:
         """Select all log records."""
         stmt = sa.select(ResourceRequestsLogORM).order_by(ResourceRequestsLogORM.capture_date.desc())
-        async with self.session_maker() as session:
+        async with self.read_session_maker() as session:
             result = await session.stream(stmt.execution_options(yield_per=chunk_size))
             async for e in result.scalars():
                 yield e
@@ -84,6 +99,100 @@ class ResourceRequestsRepo:
                     session.add_all(vals)
                     await session.flush()
 
+    async def create_partitions(self, weeks_ahead: int = 4, now: datetime | None = None) -> list[str]:
+        """Create the missing weekly partitions of the log from the current week up to weeks_ahead weeks ahead.
+
+        Rows that ended up in the default partition because their weekly partition did not exist yet are moved to
+        the new partition. Returns the names of the created partitions.
+        """
+        now = now or datetime.now(UTC)
+        created: list[str] = []
+        week = _week_start(now)
+        while week <= now + timedelta(weeks=weeks_ahead):
+            name = f"{RESOURCE_REQUESTS_LOG_PARTITION_PREFIX}{week:%Y%m%d}"
+            params = {"start": week, "end": week + timedelta(weeks=1)}
+            async with self.session_maker() as session, session.begin():
+                exists = await session.scalar(sa.text("select to_regclass(:name)"), {"name": f"resource_pools.{name}"})
+                if exists is None:
+                    # NOTE: The partition is filled and attached in one transaction, attaching checks that no row
+                    # for its range is left in the default partition.
+                    await session.execute(
+                        sa.text(
+                            f'create table "resource_pools"."{name}" '
+                            '(like "resource_pools"."resource_requests_log" including defaults)'
+                        )
+                    )
+                    await session.execute(
+                        sa.text(f"""
+                        with moved as (
+                          delete from "resource_pools"."{RESOURCE_REQUESTS_LOG_DEFAULT_PARTITION}"
+                          where capture_date >= :start and capture_date < :end
+                          returning *
+                        )
+                        insert into "resource_pools"."{name}" select * from moved
+                        """),  # nosec B608
+                        params,
+                    )
+                    await session.execute(
+                        sa.text(
+                            'alter table "resource_pools"."resource_requests_log" '
+                            f'attach partition "resource_pools"."{name}" '
+                            f"for values from ('{params['start'].isoformat()}') to ('{params['end'].isoformat()}')"
+                        )
+                    )
+                    created.append(name)
+            week += timedelta(weeks=1)
+        if created:
+            logger.info(f"Created resource requests log partitions {created}")
+        return created
+
+    async def drop_partitions_before(self, cutoff: datetime) -> list[str]:
+        """Detach and drop the weekly partitions of the log that only contain rows captured before the cutoff.
+
+        Rows before the cutoff in the default partition are deleted as well. Returns the names of the dropped
+        partitions.
+        """
+        stmt = sa.text("""
+        select c.relname
+        from pg_inherits i
+        join pg_class c on c.oid = i.inhrelid
+        where i.inhparent = 'resource_pools.resource_requests_log'::regclass
+        """)
+        async with self.session_maker() as session:
+            partitions = list(await session.scalars(stmt))
+
+        dropped: list[str] = []
+        for name in sorted(partitions):
+            if not name.startswith(RESOURCE_REQUESTS_LOG_PARTITION_PREFIX):
+                continue
+            try:
+                start = datetime.strptime(name.removeprefix(RESOURCE_REQUESTS_LOG_PARTITION_PREFIX), "%Y%m%d")
+            except ValueError:
+                continue
+            if start.replace(tzinfo=UTC) + timedelta(weeks=1) > cutoff:
+                continue
+            async with self.session_maker() as session, session.begin():
+                await session.execute(
+                    sa.text(
+                        'alter table "resource_pools"."resource_requests_log" '
+                        f'detach partition "resource_pools"."{name}"'
+                    )
+                )
+                await session.execute(sa.text(f'drop table "resource_pools"."{name}"'))
+            dropped.append(name)
+
+        async with self.session_maker() as session, session.begin():
+            await session.execute(
+                sa.text(
+                    f'delete from "resource_pools"."{RESOURCE_REQUESTS_LOG_DEFAULT_PARTITION}" '
+                    "where capture_date < :cutoff"
+                ),  # nosec B608
+                {"cutoff": cutoff},
+            )
+        if dropped:
+            logger.info(f"Dropped resource requests log partitions {dropped}")
+        return dropped
+
     async def _get_all_costs(self, session: AsyncSession, ids: set[int]) -> dict[int, Credit]:
         stmt = sa.select(ResourceClassCostORM.id, ResourceClassCostORM.cost).where(ResourceClassCostORM.id.in_(ids))
         rows = await session.execute(stmt)
@@ -271,7 +380,7 @@ class ResourceRequestsRepo:
             user_id, capture_date::date, gpu_slice
         """  # nosec: B608
 
-        async with self.session_maker() as session:
+        async with self.read_session_maker() as session:
             query = sa.text(stmt).execution_options(yield_per=chunk_size)
             result = await session.stream(query, params)
 
@@ -39,12 +39,16 @@ class BaseORM(MappedAsDataclass, DeclarativeBase):
 
 
 class ResourceRequestsLogORM(BaseORM):
-    """Table for recording resource requests."""
+    """Table for recording resource requests.
+
+    The table is partitioned by week on the capture date, see `ResourceRequestsRepo.create_partitions`.
+    """
 
     __tablename__ = "resource_requests_log"
     __table_args__ = (
-        Index("ix_uid_phase", "uid", "phase"),
-    )  # uid and phase used in calculating corrected intervals and view
+        Index("ix_uid_phase", "uid", "phase"),  # uid and phase used in calculating corrected intervals and view
+        {"postgresql_partition_by": "RANGE (capture_date)"},
+    )
 
     id: Mapped[ULID] = mapped_column(
         "id", ULIDType, primary_key=True, server_default=text("generate_ulid()"), init=False
@@ -72,8 +76,10 @@ class ResourceRequestsLogORM(BaseORM):
     phase: Mapped[str] = mapped_column("phase", String(), nullable=False, index=True)
     """The k8s uid of the pod."""
 
-    capture_date: Mapped[datetime] = mapped_column("capture_date", DateTime(timezone=True), nullable=False, index=True)
-    """The timestamp the values were captured."""
+    capture_date: Mapped[datetime] = mapped_column(
+        "capture_date", DateTime(timezone=True), nullable=False, index=True, primary_key=True
+    )
+    """The timestamp the values were captured, the primary key of a partitioned table has to include it."""
 
     capture_interval: Mapped[timedelta] = mapped_column("capture_interval", Interval(), nullable=False)
     """The configured capture interval for that point."""
@@ -14,9 +14,9 @@ from renku_data_services.base_api.blueprint import BlueprintFactoryResponse, Cus
 from renku_data_services.base_api.misc import validate_query
 from renku_data_services.base_models.metrics import MetricsService
 from renku_data_services.search.apispec import SearchQuery
+from renku_data_services.search.cache import SearchCache
 from renku_data_services.search.reprovision import SearchReprovision
 from renku_data_services.search.solr_user_query import UsernameResolve
-from renku_data_services.search.user_query_parser import QueryParser
 from renku_data_services.solr.solr_client import SolrClientConfig
 
 logger = logging.getLogger(__name__)
@@ -32,6 +32,7 @@ class SearchBP(CustomBlueprint):
     authz: Authz
     username_resolve: UsernameResolve
     metrics: MetricsService
+    search_cache: SearchCache
 
     def post(self) -> BlueprintFactoryResponse:
         """Start a new reprovisioning."""
@@ -81,19 +82,26 @@ class SearchBP(CustomBlueprint):
         async def _query(_: Request, user: base_models.APIUser, query: SearchQuery) -> HTTPResponse | JSONResponse:
             per_page = query.per_page
             offset = (query.page - 1) * per_page
-            uq = await QueryParser.parse(query.q)
+            uq = await self.search_cache.parse(query.q)
             logger.debug(f"Running search query: {query}")
 
-            result = await core.query(
-                self.authz.client,
-                self.username_resolve,
-                self.solr_config,
-                uq,
-                user,
-                per_page,
-                offset,
-                include_counts=query.include_counts,
-            )
+            # Anonymous users only see public entities, so their results can be shared
+            anonymous = user.id is None or not (user.is_admin or user.is_authenticated)
+            result_key = self.search_cache.result_key(query.q, per_page, offset, query.include_counts)
+            result = self.search_cache.get_result(result_key) if anonymous else None
+            if result is None:
+                result = await core.query(
+                    self.authz.client,
+                    self.username_resolve,
+                    self.solr_config,
+                    uq,
+                    user,
+                    per_page,
+                    offset,
+                    include_counts=query.include_counts,
+                )
+                if anonymous:
+                    self.search_cache.put_result(result_key, result)
             await self.metrics.search_queried(user)
             return json(
                 result.model_dump(by_alias=True, exclude_none=True, mode="json"),
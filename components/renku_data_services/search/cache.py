@@ -0,0 +1,68 @@
+"""In-process caches for the search API."""
+
+from __future__ import annotations
+
+import time
+
+from renku_data_services.search import apispec
+from renku_data_services.search.user_query import UserQuery
+from renku_data_services.search.user_query_parser import QueryParser
+
+SEARCH_INDEX_UPDATED_CHANNEL = "search_index_updated"
+"""The Postgres notification channel used to signal that documents were committed to the search index."""
+
+type SearchResultKey = tuple[str, int, int, bool]
+
+
+class SearchCache:
+    """Caches parsed user queries and the results of anonymous searches.
+
+    Parsing a query only depends on the query string, so parsed queries are kept until they are evicted. Results
+    are only cached for anonymous users, whose results are the same for everyone as they only contain public
+    entities. They are kept for ``result_ttl_seconds`` at most and dropped whenever the search index is updated.
+    """
+
+    def __init__(self, result_ttl_seconds: float = 10, max_parsed_queries: int = 1000, max_results: int = 1000) -> None:
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_parsed_queries = max_parsed_queries
+        self.max_results = max_results
+        self.__parsed: dict[str, UserQuery] = {}
+        self.__results: dict[SearchResultKey, tuple[float, apispec.SearchResult]] = {}
+
+    async def parse(self, q: str) -> UserQuery:
+        """Parse a user query, returning a cached result for a query that was parsed before."""
+        key = q.strip()
+        uq = self.__parsed.pop(key, None)
+        if uq is None:
+            uq = await QueryParser.parse(key)
+        self.__parsed[key] = uq
+        while len(self.__parsed) > self.max_parsed_queries:
+            del self.__parsed[next(iter(self.__parsed))]
+        return uq
+
+    @staticmethod
+    def result_key(q: str, limit: int, offset: int, include_counts: bool) -> SearchResultKey:
+        """The key of the result of an anonymous search."""
+        return (q.strip(), limit, offset, include_counts)
+
+    def get_result(self, key: SearchResultKey) -> apispec.SearchResult | None:
+        """Return a cached search result if there is one that has not expired."""
+        entry = self.__results.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self.__results[key]
+            return None
+        return result
+
+    def put_result(self, key: SearchResultKey, result: apispec.SearchResult) -> None:
+        """Cache the result of an anonymous search."""
+        self.__results.pop(key, None)
+        self.__results[key] = (time.monotonic() + self.result_ttl_seconds, result)
+        while len(self.__results) > self.max_results:
+            del self.__results[next(iter(self.__results))]
+
+    def invalidate(self, _payload: str | None = None) -> None:
+        """Drop all cached search results, called when the search index is updated."""
+        self.__results.clear()
@@ -1,7 +1,7 @@
 """Database operations for search."""
 
 import json
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from datetime import datetime
 from textwrap import dedent
 from typing import Any, cast
@@ -12,8 +12,10 @@ from ulid import ULID
 
 from renku_data_services.base_models.core import Slug
 from renku_data_services.data_connectors.models import DataConnector, GlobalDataConnector
+from renku_data_services.db_config.notifications import notify
 from renku_data_services.namespace.models import Group
 from renku_data_services.project.models import Project
+from renku_data_services.search.cache import SEARCH_INDEX_UPDATED_CHANNEL
 from renku_data_services.search.models import DeleteDoc, Entity
 from renku_data_services.search.orm import RecordState, SearchUpdatesORM
 from renku_data_services.solr.entity_documents import DataConnector as DataConnectorDoc
@@ -185,6 +187,30 @@ class SearchUpdatesRepo:
                 raise Exception(f"Inserting {entity} did not result in returning an id.")
             return cast(ULID, ULID.from_str(el.id))  # huh? mypy wants this cast
 
+    async def upsert_many(self, entities: Sequence[Entity], started_at: datetime | None = None) -> None:
+        """Add many entity documents to the staging table in one statement.
+
+        Entities that already exist are updated, same as in ``upsert``.
+        """
+        if not entities:
+            return
+        started = started_at if started_at is not None else datetime.now()
+        params = [self.__make_params(entity, started) for entity in entities]
+        async with self.session_maker() as session, session.begin():
+            await session.execute(
+                text(
+                    dedent("""\
+                  INSERT INTO events.search_updates
+                    (entity_id, entity_type, created_at, payload)
+                  VALUES
+                    (:entity_id, :entity_type, :created_at, :payload)
+                  ON CONFLICT ("entity_id") DO UPDATE
+                  SET created_at = excluded.created_at, payload = excluded.payload
+                """)
+                ),
+                params,
+            )
+
     async def insert(self, entity: Entity, started_at: datetime | None) -> ULID:
         """Insert a entity document into the staging table.
 
@@ -252,7 +278,7 @@ class SearchUpdatesRepo:
             await session.execute(stmt)
 
     async def mark_processed(self, ids: list[ULID]) -> None:
-        """Remove processed rows."""
+        """Remove processed rows and notify that the search index changed."""
         async with self.session_maker() as session, session.begin():
             stmt = (
                 delete(SearchUpdatesORM)
@@ -260,6 +286,7 @@ class SearchUpdatesRepo:
                 .where(SearchUpdatesORM.id.in_(ids))
             )
             await session.execute(stmt)
+            await notify(session, SEARCH_INDEX_UPDATED_CHANNEL)
 
     async def mark_reset(self, ids: list[ULID]) -> None:
         """Mark these rows as open so they can be processed."""
@@ -65,12 +65,19 @@ def update_search_document(
             case ProjectUpdate() as p:
                 await self.search_updates_repo.upsert(p.new)
 
+                if p.old.path != p.new.path:
+                    # NOTE: The paths of the data connectors owned by the project changed too
+                    data_connectors = await session.scalars(
+                        select(DataConnectorORM)
+                        .join(EntitySlugORM, EntitySlugORM.data_connector_id == DataConnectorORM.id)
+                        .where(EntitySlugORM.project_id == p.new.id)
+                    )
+                    await self.search_updates_repo.upsert_many([dc.dump() for dc in data_connectors])
+
             case DeletedProject() as p:
                 record = DeleteDoc.project(p.id)
                 dcs = [DeleteDoc.data_connector(id) for id in p.data_connectors]
-                await self.search_updates_repo.upsert(record)
-                for d in dcs:
-                    await self.search_updates_repo.upsert(d)
+                await self.search_updates_repo.upsert_many([record, *dcs])
 
             case UserInfo() as u:
                 await self.search_updates_repo.upsert(u)
@@ -93,33 +100,28 @@ def update_search_document(
                     namespace = namespaces.scalar_one_or_none()
 
                     if namespace:
-                        projects = await session.execute(
+                        projects = await session.scalars(
                             select(ProjectORM)
                             .join(EntitySlugORM, EntitySlugORM.project_id == ProjectORM.id)
                             .where(EntitySlugORM.namespace_id == namespace.id)
                             .where(EntitySlugORM.project_id.is_not(None))
+                            .where(EntitySlugORM.data_connector_id.is_(None))
                         )
-                        for project in projects.scalars().all():
-                            if project:
-                                await self.search_updates_repo.upsert(project.dump())
-
-                        data_connectors = await session.execute(
+                        data_connectors = await session.scalars(
                             select(DataConnectorORM)
                             .join(EntitySlugORM, EntitySlugORM.data_connector_id == DataConnectorORM.id)
                             .where(EntitySlugORM.namespace_id == namespace.id)
                             .where(EntitySlugORM.data_connector_id.is_not(None))
                         )
-                        for data_connector in data_connectors.scalars().all():
-                            if data_connector:
-                                await self.search_updates_repo.upsert(data_connector.dump())
+                        await self.search_updates_repo.upsert_many(
+                            [project.dump() for project in projects] + [dc.dump() for dc in data_connectors]
+                        )
 
             case DeletedGroup() as g:
                 record = DeleteDoc.group(g.id)
                 dcs = [DeleteDoc.data_connector(id) for id in g.data_connectors]
                 prs = [DeleteDoc.project(id) for id in g.projects]
-                await self.search_updates_repo.upsert(record)
-                for d in dcs + prs:
-                    await self.search_updates_repo.upsert(d)
+                await self.search_updates_repo.upsert_many([record, *dcs, *prs])
 
             case DataConnector() as dc:
                 await self.search_updates_repo.upsert(dc)
@@ -138,8 +140,7 @@ def update_search_document(
                 match result:
                     case [UserInfo(), *_] as els:
                         users = cast(list[UserInfo], els)
-                        for u in users:
-                            await self.search_updates_repo.upsert(u)
+                        await self.search_updates_repo.upsert_many(users)
 
             case _:
                 error = errors.ProgrammingError(
@@ -80,3 +80,30 @@ class K8sSecret(BaseAPISpec):
         min_length=26,
         pattern="^[0-7][0-9A-HJKMNP-TV-Z]{25}$",
     )
+
+
+class K8sSecretBatchItemResult(BaseAPISpec):
+    name: str = Field(
+        ...,
+        description="The name of the k8s secret to create",
+        examples=["john-doe-session-57-secret"],
+    )
+    status_code: int = Field(
+        ...,
+        description="The HTTP status code that creating this k8s secret on its own would have returned",
+        examples=[201],
+    )
+    error: Optional[ErrorResponse] = None
+
+
+class K8sSecretBatch(BaseAPISpec):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    secrets: List[K8sSecret] = Field(
+        ..., description="The k8s secrets to create", min_length=1
+    )
+
+
+class K8sSecretBatchResult(BaseAPISpec):
+    results: List[K8sSecretBatchItemResult]
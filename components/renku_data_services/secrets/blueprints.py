@@ -7,12 +7,18 @@ from sanic import Request, json
 from sanic.response import JSONResponse
 from sanic_ext import validate
 
-from renku_data_services import base_models
+from renku_data_services import base_models, errors
 from renku_data_services.base_api.auth import authenticate, only_authenticated
 from renku_data_services.base_api.blueprint import BlueprintFactoryResponse, CustomBlueprint
+from renku_data_services.base_models.validation import validated_json
 from renku_data_services.k8s.client_interfaces import SecretClient
 from renku_data_services.secrets import apispec
-from renku_data_services.secrets.core import create_or_patch_secret, validate_secret
+from renku_data_services.secrets.core import (
+    create_or_patch_secret,
+    create_or_patch_secrets,
+    validate_secret,
+    validate_secrets,
+)
 from renku_data_services.secrets.db import LowLevelUserSecretsRepo
 
 
@@ -44,3 +50,38 @@ class K8sSecretsBP(CustomBlueprint):
             return json(result.name, 201)
 
         return "/kubernetes", ["POST"], _post
+
+    def post_batch(self) -> BlueprintFactoryResponse:
+        """Create several K8s secrets from user secrets in one request."""
+
+        @authenticate(self.authenticator)
+        @only_authenticated
+        @validate(json=apispec.K8sSecretBatch)
+        async def _post_batch(_: Request, user: base_models.APIUser, body: apispec.K8sSecretBatch) -> JSONResponse:
+            secrets = await validate_secrets(
+                user=user,
+                bodies=body.secrets,
+                secrets_repo=self.user_secrets_repo,
+                secret_service_private_key=self.secret_service_private_key,
+                previous_secret_service_private_key=self.previous_secret_service_private_key,
+            )
+            created = iter(
+                await create_or_patch_secrets(self.client, [s for s in secrets if not isinstance(s, errors.BaseError)])
+            )
+            results = []
+            for request, secret in zip(body.secrets, secrets, strict=True):
+                result = secret if isinstance(secret, errors.BaseError) else next(created)
+                if isinstance(result, errors.BaseError):
+                    error = apispec.Error(
+                        code=result.code, message=result.message, detail=result.detail, trace_id=result.trace_id
+                    )
+                    results.append(
+                        apispec.K8sSecretBatchItemResult(
+                            name=request.name, status_code=result.status_code, error=apispec.ErrorResponse(error=error)
+                        )
+                    )
+                else:
+                    results.append(apispec.K8sSecretBatchItemResult(name=result.name, status_code=201))
+            return validated_json(apispec.K8sSecretBatchResult, {"results": results})
+
+        return "/kubernetes/batch", ["POST"], _post_batch
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from base64 import b64encode
 
 import kr8s
@@ -17,7 +18,7 @@ from renku_data_services.k8s.constants import DEFAULT_K8S_CLUSTER, ClusterId
 from renku_data_services.k8s.models import K8sSecret, sanitizer
 from renku_data_services.secrets import apispec
 from renku_data_services.secrets.db import LowLevelUserSecretsRepo
-from renku_data_services.secrets.models import OwnerReference
+from renku_data_services.secrets.models import OwnerReference, Secret
 from renku_data_services.utils.cryptography import (
     decrypt_rsa,
     decrypt_string,
@@ -34,17 +35,74 @@ async def validate_secret(
     previous_secret_service_private_key: rsa.RSAPrivateKey | None,
 ) -> K8sSecret:
     """Creates a single k8s secret from a list of user secrets stored in the DB."""
-    cluster_id = ClusterId(ULID.from_str(body.cluster_id)) if body.cluster_id is not None else DEFAULT_K8S_CLUSTER
+    [result] = await validate_secrets(
+        user=user,
+        bodies=[body],
+        secrets_repo=secrets_repo,
+        secret_service_private_key=secret_service_private_key,
+        previous_secret_service_private_key=previous_secret_service_private_key,
+    )
+    if isinstance(result, errors.BaseError):
+        raise result
+    return result
 
-    owner_references = []
-    if body.owner_references:
-        owner_references = [OwnerReference.from_dict(o) for o in body.owner_references]
-    secret_ids = [ULID.from_str(id.root) for id in body.secret_ids]
 
-    secrets = await secrets_repo.get_secrets_by_ids(requested_by=user, secret_ids=secret_ids)
-    found_secret_ids = {str(s.id) for s in secrets}
-    requested_secret_ids = set(map(str, secret_ids))
-    missing_secret_ids = requested_secret_ids - found_secret_ids
+async def validate_secrets(
+    user: base_models.APIUser,
+    bodies: list[apispec.K8sSecret],
+    secrets_repo: LowLevelUserSecretsRepo,
+    secret_service_private_key: rsa.RSAPrivateKey,
+    previous_secret_service_private_key: rsa.RSAPrivateKey | None,
+) -> list[K8sSecret | errors.BaseError]:
+    """Creates k8s secrets from lists of user secrets stored in the DB.
+
+    The user secrets of all the k8s secrets are loaded in a single query and each one is decrypted only once, even
+    when it is used by several k8s secrets. Errors are returned in place of the k8s secret they refer to.
+    """
+    requested_secret_ids = {str(ULID.from_str(id.root)) for body in bodies for id in body.secret_ids}
+    secrets = await secrets_repo.get_secrets_by_ids(
+        requested_by=user, secret_ids=[ULID.from_str(id) for id in requested_secret_ids]
+    )
+    secrets_by_id = {str(s.id): s for s in secrets}
+
+    key_mappings: list[dict[str, list[str]] | None | errors.BaseError] = []
+    for body in bodies:
+        try:
+            key_mappings.append(_validate_key_mapping(body, secrets_by_id))
+        except errors.BaseError as e:
+            key_mappings.append(e)
+
+    decrypted_values = await _decrypt_secrets(
+        user, list(secrets_by_id.values()), secret_service_private_key, previous_secret_service_private_key
+    )
+
+    results: list[K8sSecret | errors.BaseError] = []
+    for body, key_mapping in zip(bodies, key_mappings, strict=True):
+        if isinstance(key_mapping, errors.BaseError):
+            results.append(key_mapping)
+            continue
+        decrypted_secrets = {}
+        decryption_error: errors.BaseError | None = None
+        for id in body.secret_ids:
+            secret_id = str(ULID.from_str(id.root))
+            decrypted_value = decrypted_values[secret_id]
+            if isinstance(decrypted_value, errors.BaseError):
+                decryption_error = decrypted_value
+                break
+            keys = key_mapping[secret_id] if key_mapping else [secrets_by_id[secret_id].default_filename]
+            for key in keys:
+                decrypted_secrets[key] = b64encode(decrypted_value).decode()
+        if decryption_error is not None:
+            results.append(decryption_error)
+            continue
+        results.append(_build_k8s_secret(body, decrypted_secrets))
+    return results
+
+
+def _validate_key_mapping(body: apispec.K8sSecret, secrets_by_id: dict[str, Secret]) -> dict[str, list[str]] | None:
+    """Check that all requested secrets exist and that the key mapping is valid."""
+    requested_secret_ids = {str(ULID.from_str(id.root)) for id in body.secret_ids}
+    missing_secret_ids = requested_secret_ids - secrets_by_id.keys()
     if len(missing_secret_ids) > 0:
         raise errors.MissingResourceError(message=f"Couldn't find secrets with ids {', '.join(missing_secret_ids)}")
 
@@ -63,34 +121,68 @@ async def validate_secret(
         if len(all_keys) != len(set(all_keys)):
             raise errors.ValidationError(message="Key mapping values are not unique")
 
-    decrypted_secrets = {}
+    return key_mapping_with_lists_only
+
+
+def _decrypt_secret(
+    user_id: str,
+    secret: Secret,
+    secret_service_private_key: rsa.RSAPrivateKey,
+    previous_secret_service_private_key: rsa.RSAPrivateKey | None,
+) -> bytes:
     try:
-        for secret in secrets:
-            try:
-                decryption_key = decrypt_rsa(secret_service_private_key, secret.encrypted_key)
-            except ValueError:
-                if previous_secret_service_private_key is not None:
-                    # If we're rotating keys right now, try the old key
-                    decryption_key = decrypt_rsa(previous_secret_service_private_key, secret.encrypted_key)
-                else:
-                    raise
-
-            decrypted_value = decrypt_string(decryption_key, user.id, secret.encrypted_value).encode()  # type: ignore
-
-            keys = (
-                key_mapping_with_lists_only[str(secret.id)]
-                if key_mapping_with_lists_only
-                else [secret.default_filename]
+        decryption_key = decrypt_rsa(secret_service_private_key, secret.encrypted_key)
+    except ValueError:
+        if previous_secret_service_private_key is not None:
+            # If we're rotating keys right now, try the old key
+            decryption_key = decrypt_rsa(previous_secret_service_private_key, secret.encrypted_key)
+        else:
+            raise
+
+    return decrypt_string(decryption_key, user_id, secret.encrypted_value).encode()
+
+
+async def _decrypt_secrets(
+    user: base_models.APIUser,
+    secrets: list[Secret],
+    secret_service_private_key: rsa.RSAPrivateKey,
+    previous_secret_service_private_key: rsa.RSAPrivateKey | None,
+) -> dict[str, bytes | errors.BaseError]:
+    """Decrypt the user secrets, returning the decrypted value or the error for each secret ID.
+
+    The key derivation is CPU bound, so the secrets are decrypted in worker threads to avoid blocking the event loop.
+    """
+    results = await asyncio.gather(
+        *(
+            asyncio.to_thread(
+                _decrypt_secret,
+                user.id,  # type: ignore
+                secret,
+                secret_service_private_key,
+                previous_secret_service_private_key,
             )
-            for key in keys:
-                decrypted_secrets[key] = b64encode(decrypted_value).decode()
-    except Exception as e:
-        # don't wrap the error, we don't want secrets accidentally leaking.
-        raise errors.SecretDecryptionError(message=f"An error occurred decrypting secrets: {str(type(e))}") from None
+            for secret in secrets
+        ),
+        return_exceptions=True,
+    )
+    decrypted: dict[str, bytes | errors.BaseError] = {}
+    for secret, result in zip(secrets, results, strict=True):
+        if isinstance(result, BaseException):
+            # don't wrap the error, we don't want secrets accidentally leaking.
+            decrypted[str(secret.id)] = errors.SecretDecryptionError(
+                message=f"An error occurred decrypting secrets: {str(type(result))}"
+            )
+        else:
+            decrypted[str(secret.id)] = result
+    return decrypted
+
+
+def _build_k8s_secret(body: apispec.K8sSecret, decrypted_secrets: dict[str, str]) -> K8sSecret:
+    cluster_id = ClusterId(ULID.from_str(body.cluster_id)) if body.cluster_id is not None else DEFAULT_K8S_CLUSTER
 
     owner_refs = []
-    if owner_references:
-        owner_refs = [o.to_k8s() for o in owner_references]
+    if body.owner_references:
+        owner_refs = [OwnerReference.from_dict(o).to_k8s() for o in body.owner_references]
 
     v1_secret = k8s_client.V1Secret(
         data=decrypted_secrets,
@@ -128,3 +220,25 @@ async def create_or_patch_secret(client: SecretClient, secret: K8sSecret) -> K8s
         # don't wrap the error, we don't want secrets accidentally leaking.
         raise errors.SecretCreationError(message=f"An error occurred creating secrets: {str(type(e))}") from None
     return result
+
+
+async def create_or_patch_secrets(
+    client: SecretClient, secrets: list[K8sSecret], max_concurrency: int = 10
+) -> list[K8sSecret | errors.BaseError]:
+    """Create or patch several secrets concurrently, returning the result or the error for each secret."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _create_or_patch(secret: K8sSecret) -> K8sSecret:
+        async with semaphore:
+            return await create_or_patch_secret(client, secret)
+
+    results = await asyncio.gather(*(_create_or_patch(secret) for secret in secrets), return_exceptions=True)
+    output: list[K8sSecret | errors.BaseError] = []
+    for result in results:
+        if isinstance(result, errors.BaseError) or not isinstance(result, BaseException):
+            output.append(result)
+        else:
+            output.append(
+                errors.SecretCreationError(message=f"An error occurred creating secrets: {str(type(result))}")
+            )
+    return output
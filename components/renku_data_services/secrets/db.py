@@ -65,19 +65,20 @@ class LowLevelUserSecretsRepo:
         """
         if requested_by.id != ServiceAdminId.secrets_rotation:
             raise errors.ProgrammingError(message="Only secrets_rotation admin is allowed to call this method.")
-        offset = 0
+        last_id: ULID | None = None
         while True:
             async with self.session_maker() as session, session.begin():
-                result = await session.execute(
-                    select(SecretORM).limit(batch_size).offset(offset).order_by(SecretORM.id)
-                )
+                stmt = select(SecretORM).order_by(SecretORM.id).limit(batch_size)
+                if last_id is not None:
+                    stmt = stmt.where(SecretORM.id > last_id)
+                result = await session.execute(stmt)
                 secrets = [(s.dump(), cast(str, s.user_id)) for s in result.scalars()]
                 if len(secrets) == 0:
                     break
 
                 yield secrets
 
-                offset += batch_size
+                last_id = secrets[-1][0].id
 
     async def update_secret_values(self, requested_by: InternalServiceAdmin, secrets: list[Secret]) -> None:
         """Update multiple secret values at once.
@@ -14,6 +14,7 @@ from ulid import ULID
 import renku_data_services.base_models as base_models
 from renku_data_services import errors
 from renku_data_services.app_config import logging
+from renku_data_services.app_config.request_cache import request_memoized, user_key
 from renku_data_services.authz.authz import Authz, ResourceType
 from renku_data_services.authz.models import Scope
 from renku_data_services.base_models.core import RESET
@@ -395,6 +396,7 @@ class SessionRepository(SessionEnvironmentRepositoryProtocol):
             launcher = res.all()
             return [item.dump() for item in launcher]
 
+    @request_memoized(lambda _, user, launcher_id: (user_key(user), launcher_id))
     async def get_launcher(self, user: base_models.APIUser, launcher_id: ULID) -> models.SessionLauncher:
         """Get one session launcher from the database."""
         async with self.session_maker() as session:
@@ -26,6 +26,7 @@ from pydantic import (
 )
 
 from renku_data_services.app_config import logging
+from renku_data_services.app_config.instrumentation import InstrumentedTransport
 from renku_data_services.errors.errors import BaseError
 from renku_data_services.solr.solr_schema import CoreSchema, FieldName, SchemaCommandList
 
@@ -640,7 +641,9 @@ class DefaultSolrClient(SolrClient):
         url_parsed[2] = urljoin(url_parsed[2], f"/solr/{cfg.core}")
         burl = urlunparse(url_parsed)
         bauth = BasicAuth(username=cfg.user.username, password=cfg.user.password) if cfg.user is not None else None
-        self.delegate = AsyncClient(auth=bauth, base_url=burl, timeout=cfg.timeout)
+        self.delegate = AsyncClient(
+            auth=bauth, base_url=burl, timeout=cfg.timeout, transport=InstrumentedTransport("solr")
+        )
 
     def __repr__(self) -> str:
         return f"DefaultSolrClient(delegate={self.delegate}, config={self.config})"
@@ -783,7 +786,9 @@ class DefaultSolrAdminClient(SolrAdminClient):
     def __init__(self, cfg: SolrClientConfig):
         self.__config = cfg
         bauth = BasicAuth(username=cfg.user.username, password=cfg.user.password) if cfg.user is not None else None
-        self.delegate = AsyncClient(auth=bauth, base_url=self.config.base_url, timeout=cfg.timeout)
+        self.delegate = AsyncClient(
+            auth=bauth, base_url=self.config.base_url, timeout=cfg.timeout, transport=InstrumentedTransport("solr")
+        )
 
     @property
     def config(self) -> SolrClientConfig:
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
-import tempfile
-from collections.abc import Generator
+import time
+from collections.abc import Generator, Iterator, Mapping
+from functools import cache, cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, NamedTuple, Union, cast
 
@@ -15,6 +17,7 @@ from renku_data_services import errors
 from renku_data_services.app_config import logging
 from renku_data_services.storage.constants import BLOCKED_OPTIONS, BLOCKED_STORAGES, ENVIDAT_V1_PROVIDER
 from renku_data_services.storage.rclone_patches import apply_patches
+from renku_data_services.storage.rclone_rc import RCloneRCError, RCloneRCPool
 
 logger = logging.getLogger(__name__)
 
@@ -34,21 +37,20 @@ class ConnectionResult(NamedTuple):
 class RCloneValidator:
     """Class for validating RClone configs."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        rc_pool: RCloneRCPool | None = None,
+        connection_test_timeout: float = 30,
+        connection_cache_ttl: float = 30,
+    ) -> None:
         """Initialize with contained schema file."""
-        spec = RCloneValidator._get_spec()
-
-        apply_patches(spec)
+        self.rc_pool = rc_pool or RCloneRCPool()
+        self.connection_test_timeout = connection_test_timeout
+        self.connection_cache_ttl = connection_cache_ttl
+        self.__connection_cache: dict[str, tuple[float, ConnectionResult]] = {}
 
-        self.providers: dict[str, RCloneProviderSchema] = {}
-
-        for provider_config in spec:
-            try:
-                provider_schema = RCloneProviderSchema.model_validate(provider_config)
-                self.providers[provider_schema.prefix] = provider_schema
-            except ValidationError:
-                logger.error("Couldn't load RClone config: %s", provider_config)
-                raise
+        # NOTE: The schema index is shared by all validators in the process, it is only loaded once
+        self.providers: Mapping[str, RCloneProviderSchema] = _get_schema_index()
 
     def validate(self, configuration: Union[RCloneConfig, dict[str, Any]], keep_sensitive: bool = False) -> None:
         """Validates an RClone config."""
@@ -60,8 +62,7 @@ class RCloneValidator:
         self, configuration: Union[RCloneConfig, dict[str, Any]], sensitive_data: dict[str, str]
     ) -> None:
         """Validates whether the provided sensitive data is marked as sensitive in the rclone schema."""
-        sensitive_options = self.get_provider(configuration).sensitive_options
-        sensitive_options_name_lookup = [o.name for o in sensitive_options]
+        sensitive_options_name_lookup = self.get_provider(configuration).sensitive_option_names
         sensitive_data_counter = 0
         for key, value in sensitive_data.items():
             if len(value) > 0 and key in sensitive_options_name_lookup:
@@ -97,6 +98,20 @@ class RCloneValidator:
         except errors.ValidationError as e:
             return ConnectionResult(False, str(e))
 
+        # NOTE: Obscured values differ on every call, so the key is derived from the original configuration.
+        # Only a digest is kept, the secrets in the configuration are never stored.
+        cache_key = hashlib.sha256(
+            json.dumps(
+                [configuration, source_path, user.id if user is not None and data_source_repo is not None else None],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+        now = time.monotonic()
+        cached = self.__connection_cache.get(cache_key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
         # Obscure configuration and transform if needed
         obscured_config = await self.obscure_config(self.get_real_configuration(configuration))
         transformed_config = self.inject_default_values(self.transform_polybox_switchdriver_config(obscured_config))
@@ -110,32 +125,27 @@ class RCloneValidator:
             if with_oauth2_config is not None:
                 transformed_config = with_oauth2_config
 
-        with tempfile.NamedTemporaryFile(mode="w+", delete=False, encoding="utf-8") as f:
-            config = "\n".join(f"{k}={v}" for k, v in transformed_config.items())
-            f.write(f"[temp]\n{config}")
-            f.close()
-            args = [
-                "lsf",
-                "--low-level-retries=1",  # Connection tests should fail fast.
-                "--retries=1",  # Connection tests should fail fast.
-                "--config",
-                f.name,
-                f"temp:{source_path}",
-            ]
-            # Handle SFTP retries, see https://github.com/SwissDataScienceCenter/renku-data-services/issues/893
-            storage_type = cast(str, configuration.get("type"))
-            if storage_type == "sftp":
-                args.extend(["--low-level-retries", "1"])
-            logger.debug(f"Execute: rclone {" ".join(args)}")
-            proc = await asyncio.create_subprocess_exec(
-                "rclone",
-                *args,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            _, error = await proc.communicate()
-            success = proc.returncode == 0
-        return ConnectionResult(success=success, error=error.decode())
+        params = {"fs": self.__rc_fs(transformed_config), "remote": source_path, "_config": {"LowLevelRetries": 1}}
+        try:
+            await self.rc_pool.call("operations/list", params, timeout=self.connection_test_timeout)
+        except TimeoutError:
+            return ConnectionResult(False, f"The connection test timed out after {self.connection_test_timeout}s.")
+        except RCloneRCError as e:
+            result = ConnectionResult(False, str(e))
+        else:
+            result = ConnectionResult(True, "")
+
+        if len(self.__connection_cache) >= 1000:
+            self.__connection_cache = {k: v for k, v in self.__connection_cache.items() if v[0] > now}
+        self.__connection_cache[cache_key] = (time.monotonic() + self.connection_cache_ttl, result)
+        return result
+
+    @staticmethod
+    def __rc_fs(configuration: Union[RCloneConfig, dict[str, Any]]) -> dict[str, str]:
+        """Convert a configuration to an on-the-fly remote for the rclone remote control API."""
+        fs = {k: str(v).lower() if isinstance(v, bool) else str(v) for k, v in configuration.items()}
+        fs["_name"] = "temp"
+        return fs
 
     async def obscure_config(
         self, configuration: Union[RCloneConfig, dict[str, Any]]
@@ -190,34 +200,20 @@ class RCloneValidator:
         # Obscure configuration and transform if needed
         obscured_config = await self.obscure_config(configuration)
 
-        with tempfile.NamedTemporaryFile(mode="w+", delete=False, encoding="utf-8") as f:
-            config = "\n".join(f"{k}={v}" for k, v in obscured_config.items())
-            f.write(f"[temp]\n{config}")
-            f.close()
-            proc = await asyncio.create_subprocess_exec(
-                "rclone",
-                "backend",
-                "metadata",
-                "--config",
-                f.name,
-                "temp:",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await proc.communicate()
-            success = proc.returncode == 0
-        if success:
-            metadata = RCloneDOIMetadata.model_validate_json(stdout.decode().strip())
-            return metadata
-        return None
+        params = {"command": "metadata", "fs": self.__rc_fs(obscured_config)}
+        try:
+            res = await self.rc_pool.call("backend/command", params, timeout=self.connection_test_timeout)
+        except (TimeoutError, RCloneRCError):
+            return None
+        return RCloneDOIMetadata.model_validate(res.get("result"))
 
     def inject_default_values(self, config: Union[RCloneConfig, dict[str, Any]]) -> Union[RCloneConfig, dict[str, Any]]:
         """Adds default values for required options that are not provided in the config."""
         provider = self.get_provider(config)
         cfg_provider: str | None = config.get("provider")
 
-        for opt in provider.options:
-            if not opt.required or not opt.default or opt.name in config or not opt.matches_provider(cfg_provider):
+        for opt in provider.default_options:
+            if opt.name in config or not opt.matches_provider(cfg_provider):
                 continue
 
             match opt.default:
@@ -288,6 +284,48 @@ class RCloneValidator:
         return spec
 
 
+class RCloneSchemaIndex(Mapping[str, "RCloneProviderSchema"]):
+    """Index of the rclone providers by prefix.
+
+    The patched schema is kept as plain json and providers are only parsed into `RCloneProviderSchema` objects
+    the first time they are looked up, as most requests only ever touch a handful of storage types.
+    """
+
+    def __init__(self, spec: list[dict[str, Any]]) -> None:
+        self.__spec = {provider_config["Prefix"]: provider_config for provider_config in spec}
+        self.__providers: dict[str, RCloneProviderSchema] = {}
+
+    def __getitem__(self, prefix: str) -> RCloneProviderSchema:
+        provider_schema = self.__providers.get(prefix)
+        if provider_schema is not None:
+            return provider_schema
+        provider_config = self.__spec[prefix]
+        try:
+            provider_schema = RCloneProviderSchema.model_validate(provider_config)
+        except ValidationError:
+            logger.error("Couldn't load RClone config: %s", provider_config)
+            raise
+        self.__providers[prefix] = provider_schema
+        return provider_schema
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__spec)
+
+    def __len__(self) -> int:
+        return len(self.__spec)
+
+    def __contains__(self, prefix: object) -> bool:
+        return prefix in self.__spec
+
+
+@cache
+def _get_schema_index() -> RCloneSchemaIndex:
+    """Load and patch the rclone schema once per process."""
+    spec = RCloneValidator._get_spec()
+    apply_patches(spec)
+    return RCloneSchemaIndex(spec)
+
+
 class RCloneTriState(BaseModel):
     """Represents a Tristate of true|false|unset."""
 
@@ -405,26 +443,45 @@ class RCloneProviderSchema(BaseModel):
     hide: bool = Field(validation_alias="Hide")
     metadata_info: dict[str, Any] | None = Field(validation_alias="MetadataInfo")
 
-    @property
+    @cached_property
+    def options_by_name(self) -> dict[str, list[RCloneOption]]:
+        """Returns the options of this provider by name.
+
+        Some options have several entries with the same name that apply to different providers.
+        """
+        options: dict[str, list[RCloneOption]] = {}
+        for option in self.options:
+            options.setdefault(option.name, []).append(option)
+        return options
+
+    @cached_property
     def required_options(self) -> list[RCloneOption]:
         """Returns all required options for this provider."""
         return [o for o in self.options if o.required and not o.default]
 
-    @property
+    @cached_property
+    def default_options(self) -> list[RCloneOption]:
+        """Returns all required options for this provider that have a default value."""
+        return [o for o in self.options if o.required and o.default]
+
+    @cached_property
     def sensitive_options(self) -> list[RCloneOption]:
         """Returns all sensitive options for this provider."""
         return [o for o in self.options if o.is_sensitive]
 
-    @property
+    @cached_property
+    def sensitive_option_names(self) -> frozenset[str]:
+        """Returns the names of all sensitive options for this provider."""
+        return frozenset(o.name for o in self.sensitive_options)
+
+    @cached_property
     def password_options(self) -> list[RCloneOption]:
         """Returns all password options for this provider."""
         return [o for o in self.options if o.is_password]
 
     def get_option_for_provider(self, name: str, provider: str | None) -> RCloneOption | None:
         """Get an RClone option matching a provider."""
-        for option in self.options:
-            if option.name != name:
-                continue
+        for option in self.options_by_name.get(name, []):
             if option.matches_provider(provider):
                 return option
 
@@ -509,9 +566,7 @@ class RCloneProviderSchema(BaseModel):
         """Get private field descriptions for storage."""
         provider: str | None = configuration.get("provider")
 
-        for option in self.options:
-            if not option.is_sensitive:
-                continue
+        for option in self.sensitive_options:
             if not option.matches_provider(provider):
                 continue
             if option.name not in configuration:
@@ -0,0 +1,156 @@
+"""A pool of long-lived rclone remote control daemons.
+
+Instead of starting a new rclone process for every connection test, requests are sent to a small number of
+``rclone rcd`` daemons over their HTTP remote control API, listening on unix sockets in a private directory.
+Remotes are passed to every call as on-the-fly JSON configurations, so no config files are written.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import itertools
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from renku_data_services.app_config import logging
+
+logger = logging.getLogger(__name__)
+
+_running_processes: set[asyncio.subprocess.Process] = set()
+
+
+@atexit.register
+def _kill_running_processes() -> None:
+    """Make sure that no daemons outlive the python process."""
+    for proc in _running_processes:
+        if proc.returncode is None:
+            proc.kill()
+
+
+class RCloneRCError(Exception):
+    """An error returned by the rclone remote control API."""
+
+
+class RCloneRCDaemon:
+    """A single ``rclone rcd`` process."""
+
+    def __init__(self, socket_path: Path, startup_timeout: float = 10) -> None:
+        self.socket_path = socket_path
+        self.startup_timeout = startup_timeout
+        self.__proc: asyncio.subprocess.Process | None = None
+        self.__client: httpx.AsyncClient | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the daemon process is up."""
+        return self.__proc is not None and self.__proc.returncode is None
+
+    async def start(self) -> None:
+        """Start the daemon and wait until it accepts requests."""
+        self.socket_path.unlink(missing_ok=True)
+        self.__proc = await asyncio.create_subprocess_exec(
+            "rclone",
+            "rcd",
+            f"--rc-addr=unix://{self.socket_path}",
+            "--rc-no-auth",
+            # An empty config path makes rclone use an in-memory configuration
+            "--config=",
+            # Do not keep remotes (and their credentials) around for longer than needed
+            "--fs-cache-expire-duration=1m",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        _running_processes.add(self.__proc)
+        self.__client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(uds=str(self.socket_path)), base_url="http://rclone"
+        )
+        async with asyncio.timeout(self.startup_timeout):
+            while True:
+                if not self.running:
+                    raise RCloneRCError("The rclone daemon exited during startup.")
+                try:
+                    await self.call("rc/noop", {})
+                except (httpx.TransportError, RCloneRCError):
+                    await asyncio.sleep(0.05)
+                else:
+                    break
+
+    async def call(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
+        """Call a remote control method."""
+        if self.__client is None:
+            raise RCloneRCError("The rclone daemon has not been started.")
+        res = await self.__client.post(f"/{method}", json=params)
+        try:
+            body: dict[str, Any] = res.json()
+        except ValueError:
+            body = {}
+        if res.status_code != 200:
+            raise RCloneRCError(str(body.get("error") or res.text))
+        return body
+
+    async def stop(self) -> None:
+        """Stop the daemon."""
+        if self.__client is not None:
+            await self.__client.aclose()
+            self.__client = None
+        if self.__proc is not None:
+            if self.__proc.returncode is None:
+                self.__proc.kill()
+                await self.__proc.wait()
+            _running_processes.discard(self.__proc)
+            self.__proc = None
+        self.socket_path.unlink(missing_ok=True)
+
+
+class RCloneRCPool:
+    """A small pool of rclone daemons with a cap on concurrent requests.
+
+    Daemons are started lazily on first use and restarted if they die.
+    """
+
+    def __init__(self, size: int = 2, max_concurrency: int = 8) -> None:
+        self.size = size
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+        self.__lock = asyncio.Lock()
+        self.__daemons: list[RCloneRCDaemon] = []
+        self.__next_daemon = itertools.cycle(range(size))
+        self.__socket_dir: Path | None = None
+
+    async def call(self, method: str, params: dict[str, Any], timeout: float) -> dict[str, Any]:
+        """Call a remote control method on one of the daemons.
+
+        Raises TimeoutError if the call does not complete within timeout seconds.
+        """
+        async with self.__semaphore, asyncio.timeout(timeout):
+            daemon = await self.__get_daemon()
+            return await daemon.call(method, params)
+
+    async def close(self) -> None:
+        """Stop all daemons."""
+        async with self.__lock:
+            for daemon in self.__daemons:
+                await daemon.stop()
+            self.__daemons = []
+            if self.__socket_dir is not None:
+                shutil.rmtree(self.__socket_dir, ignore_errors=True)
+                self.__socket_dir = None
+
+    async def __get_daemon(self) -> RCloneRCDaemon:
+        async with self.__lock:
+            if self.__socket_dir is None:
+                # NOTE: mkdtemp creates the directory readable only by the current user, which is what protects
+                # the unauthenticated sockets
+                self.__socket_dir = Path(tempfile.mkdtemp(prefix="rclone-rcd-"))
+            while len(self.__daemons) < self.size:
+                self.__daemons.append(RCloneRCDaemon(self.__socket_dir / f"rcd-{len(self.__daemons)}.sock"))
+            daemon = self.__daemons[next(self.__next_daemon)]
+            if not daemon.running:
+                logger.info(f"Starting rclone daemon at {daemon.socket_path}")
+                await daemon.stop()
+                await daemon.start()
+            return daemon
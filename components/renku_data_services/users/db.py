@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import json
 import secrets
+import time
 from abc import abstractmethod
-from collections.abc import AsyncGenerator, Callable, Collection, Mapping
+from collections.abc import AsyncGenerator, Callable, Collection, Iterable, Mapping
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import Any, Protocol, cast
@@ -20,6 +22,7 @@ from renku_data_services.base_api.auth import APIUser, only_authenticated
 from renku_data_services.base_models.core import InternalServiceAdmin, ServiceAdminId
 from renku_data_services.base_models.metrics import MetricsService, UserIdentity
 from renku_data_services.base_models.nel import Nel
+from renku_data_services.db_config.notifications import notify
 from renku_data_services.errors import errors
 from renku_data_services.namespace.db import GroupRepository
 from renku_data_services.namespace.orm import NamespaceORM
@@ -49,6 +52,8 @@ from renku_data_services.utils.cryptography import (
 
 logger = logging.getLogger(__name__)
 
+USERNAMES_CHANNEL = "usernames_updated"
+
 
 class UsernameResolver(Protocol):
     """Resolve usernames to their ids."""
@@ -82,6 +87,76 @@ class DbUsernameResolver(UsernameResolver, Protocol):
             return ret
 
 
+class UsernameCache:
+    """A bounded in-process cache of username (i.e. user namespace slug) to user id mappings.
+
+    Usernames that do not exist are cached as well, so that repeated searches for unknown names do not hit the
+    database. Changes invalidate the affected entries directly and notify the other processes on `USERNAMES_CHANNEL`,
+    e.g. when the background users sync adds a user. Entries expire after ``ttl_seconds`` in case a notification was
+    missed.
+    """
+
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 10_000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.__entries: dict[str, tuple[float, str | None]] = {}
+
+    def get_many(self, names: Iterable[str]) -> tuple[dict[str, str], list[str]]:
+        """Return the cached user ids and the names that are not cached."""
+        now = time.monotonic()
+        found: dict[str, str] = {}
+        missing: list[str] = []
+        for name in names:
+            entry = self.__entries.get(name)
+            if entry is None or entry[0] <= now:
+                missing.append(name)
+            elif entry[1] is not None:
+                found[name] = entry[1]
+        return found, missing
+
+    def put_many(self, names: Iterable[str], user_ids: Mapping[str, str]) -> None:
+        """Cache the resolved user ids, names that are not in user_ids are cached as not existing."""
+        expires_at = time.monotonic() + self.ttl_seconds
+        for name in names:
+            self.__entries.pop(name, None)
+            self.__entries[name] = (expires_at, user_ids.get(name))
+        if len(self.__entries) > self.max_entries:
+            now = time.monotonic()
+            for expired in [k for k, (expires, _) in self.__entries.items() if expires <= now]:
+                del self.__entries[expired]
+            while len(self.__entries) > self.max_entries:
+                del self.__entries[next(iter(self.__entries))]
+
+    def invalidate_names(self, names: Iterable[str]) -> None:
+        """Remove the given usernames from the cache."""
+        for name in names:
+            self.__entries.pop(name, None)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Remove all usernames that resolve to the given user."""
+        for name in [k for k, (_, v) in self.__entries.items() if v == user_id]:
+            del self.__entries[name]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self.__entries.clear()
+
+    def invalidate(self, payload: str | None = None) -> None:
+        """Remove the entries named in a notification on `USERNAMES_CHANNEL`, or all entries if there is none."""
+        if payload is None:
+            self.clear()
+            return
+        change = json.loads(payload)
+        self.invalidate_names(change.get("names", []))
+        if change.get("user_id") is not None:
+            self.invalidate_user(change["user_id"])
+
+    @staticmethod
+    async def notify(session: AsyncSession, names: Iterable[str] = (), user_id: str | None = None) -> None:
+        """Notify all processes to invalidate the given usernames once the transaction of the session commits."""
+        await notify(session, USERNAMES_CHANNEL, json.dumps({"names": list(names), "user_id": user_id}))
+
+
 @dataclass
 class UserRepo(DbUsernameResolver):
     """An adapter for accessing users from the database."""
@@ -92,6 +167,7 @@ class UserRepo(DbUsernameResolver):
     encryption_key: bytes | None = field(repr=False)
     metrics: MetricsService
     authz: Authz
+    username_cache: UsernameCache = field(default_factory=UsernameCache)
 
     def __post_init__(self) -> None:
         self._users_sync = UsersSync(self.session_maker, self.group_repo, self, self.metrics, self.authz)
@@ -100,6 +176,16 @@ class UserRepo(DbUsernameResolver):
         """Create a db session."""
         return self.session_maker()
 
+    async def resolve_usernames(self, names: Nel[str]) -> dict[str, str]:
+        """Resolve usernames to their user ids, only querying the database for names that are not cached."""
+        result, missing = self.username_cache.get_many(names)
+        missing_nel = Nel.from_list(missing)
+        if missing_nel is not None:
+            resolved = await DbUsernameResolver.resolve_usernames(self, missing_nel)
+            self.username_cache.put_many(missing_nel, resolved)
+            result.update(resolved)
+        return result
+
     async def initialize(self, kc_api: IKeycloakAPI) -> None:
         """Do a total sync of users from Keycloak if there is nothing in the DB."""
         users = await self._get_users()
@@ -226,6 +312,8 @@ class UserRepo(DbUsernameResolver):
             logger.info(f"User with ID {user_id} was not found.")
             return None
         await session.execute(delete(UserORM).where(UserORM.keycloak_id == user_id))
+        self.username_cache.invalidate_user(user_id)
+        await UsernameCache.notify(session, user_id=user_id)
         logger.info(f"User with ID {user_id} was removed from the database.")
         logger.info(f"User namespace with ID {user_id} was removed from the authorization database.")
         return DeletedUser(id=user_id)
@@ -340,6 +428,9 @@ class UsersSync:
         new_user.namespace.user = new_user
         session.add(new_user)
         await session.flush()
+        # The new username may have been cached as not existing
+        self.user_repo.username_cache.invalidate_names([slug.value])
+        await UsernameCache.notify(session, names=[slug.value])
 
         # Send the new user's identity for metrics
         result = new_user.dump()
@@ -237,6 +237,7 @@ async def bootstrap_admins(
         )
     )
     await authz.client.WriteRelationships(WriteRelationshipsRequest(updates=rels))
+    authz.invalidate_admin_cache()
 
 
 @pytest_asyncio.fixture(scope="session")
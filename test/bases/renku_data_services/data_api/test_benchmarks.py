@@ -0,0 +1,133 @@
+"""Benchmarks of API scenarios against the Postgres, SpiceDB and Solr test stack.
+
+The data is seeded through the API, the number of entities is set with the `BENCHMARK_NUM_PROJECTS` environment
+variable. Kubernetes objects are served from the database cache, so no cluster is needed. Run them with
+`make benchmarks`, see the `benchmarks` target for how results are stored and compared.
+"""
+
+import asyncio
+import os
+from typing import Any
+
+import pytest
+from box import Box
+from pytest_benchmark.fixture import BenchmarkFixture
+from sanic_testing.testing import SanicASGITestClient
+
+from renku_data_services.data_api.dependencies import DependencyManager
+from renku_data_services.k8s.constants import DEFAULT_K8S_CLUSTER
+from renku_data_services.k8s.db import K8sDbCache
+from renku_data_services.k8s.models import GVK, K8sObject, K8sObjectFilter
+from renku_data_services.migrations.core import run_migrations_for_app
+from renku_data_services.users.models import UserInfo
+
+pytestmark = pytest.mark.benchmarks
+
+NUM_PROJECTS = int(os.environ.get("BENCHMARK_NUM_PROJECTS", "200"))
+SESSION_GVK = GVK(kind="AmaltheaSession", version="v1alpha1", group="amalthea.dev")
+
+
+def _run(event_loop: asyncio.AbstractEventLoop, benchmark: BenchmarkFixture, f: Any, rounds: int = 20) -> Any:
+    return benchmark.pedantic(lambda: event_loop.run_until_complete(f()), rounds=rounds, warmup_rounds=2)
+
+
+@pytest.fixture
+def seeded_projects(
+    sanic_client: SanicASGITestClient,
+    create_project,
+    event_loop: asyncio.AbstractEventLoop,
+) -> list[dict[str, Any]]:
+    async def _seed() -> list[dict[str, Any]]:
+        projects = []
+        for i in range(NUM_PROJECTS):
+            visibility = "public" if i % 2 == 0 else "private"
+            projects.append(
+                await create_project(
+                    sanic_client, f"Benchmark project {i}", visibility=visibility, keywords=["benchmark", f"k{i % 10}"]
+                )
+            )
+        return projects
+
+    return event_loop.run_until_complete(_seed())
+
+
+def test_get_projects(
+    sanic_client: SanicASGITestClient,
+    seeded_projects: list[dict[str, Any]],
+    user_headers: dict[str, str],
+    event_loop: asyncio.AbstractEventLoop,
+    benchmark: BenchmarkFixture,
+) -> None:
+    async def _get_projects() -> None:
+        _, response = await sanic_client.get("/api/data/projects", params={"per_page": 50}, headers=user_headers)
+        assert response.status_code == 200, response.text
+        assert len(response.json) == 50
+
+    _run(event_loop, benchmark, _get_projects)
+
+
+def test_get_project_by_slug(
+    sanic_client: SanicASGITestClient,
+    seeded_projects: list[dict[str, Any]],
+    user_headers: dict[str, str],
+    event_loop: asyncio.AbstractEventLoop,
+    benchmark: BenchmarkFixture,
+) -> None:
+    project = seeded_projects[-1]
+    url = f"/api/data/namespaces/{project['namespace']}/projects/{project['slug']}"
+
+    async def _get_project() -> None:
+        _, response = await sanic_client.get(url, headers=user_headers)
+        assert response.status_code == 200, response.text
+
+    _run(event_loop, benchmark, _get_project)
+
+
+def test_search(
+    sanic_client_with_solr: SanicASGITestClient,
+    seeded_projects: list[dict[str, Any]],
+    search_reprovision,
+    search_query,
+    app_manager_instance: DependencyManager,
+    regular_user: UserInfo,
+    event_loop: asyncio.AbstractEventLoop,
+    benchmark: BenchmarkFixture,
+) -> None:
+    event_loop.run_until_complete(search_reprovision(app_manager_instance))
+
+    async def _search() -> None:
+        result = await search_query(sanic_client_with_solr, "benchmark keyword:k1 sort:score-desc", regular_user)
+        assert result.pagingInfo.totalResult > 0
+
+    _run(event_loop, benchmark, _search)
+
+
+def test_k8s_cache_sync(
+    app_manager_instance: DependencyManager,
+    regular_user: UserInfo,
+    event_loop: asyncio.AbstractEventLoop,
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Upsert the sessions of a user in the cache, as the k8s watcher does, and list them."""
+    run_migrations_for_app("common")
+    cache = K8sDbCache(app_manager_instance.config.db.async_session_maker)
+    sessions = [
+        K8sObject(
+            name=f"benchmark-session-{i}",
+            namespace="renku",
+            cluster=DEFAULT_K8S_CLUSTER,
+            gvk=SESSION_GVK,
+            manifest=Box({"metadata": {"name": f"benchmark-session-{i}", "labels": {"benchmark": "true"}}}),
+            user_id=regular_user.id,
+        )
+        for i in range(NUM_PROJECTS)
+    ]
+    _filter = K8sObjectFilter(gvk=SESSION_GVK, user_id=regular_user.id, label_selector={"benchmark": "true"})
+
+    async def _sync() -> None:
+        for session in sessions:
+            await cache.upsert(session)
+        listed = [obj async for obj in cache.list(_filter)]
+        assert len(listed) == len(sessions)
+
+    _run(event_loop, benchmark, _sync, rounds=5)
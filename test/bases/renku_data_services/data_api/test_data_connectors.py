@@ -1,16 +1,20 @@
 import warnings
 from dataclasses import dataclass
+from datetime import timedelta
 from typing import TYPE_CHECKING
 
+import httpx
 import pytest
 from httpx import Response
 from sanic_testing.testing import SanicASGITestClient
 
 from renku_data_services.authz.models import Visibility
 from renku_data_services.base_models.core import NamespacePath, ProjectPath
+from renku_data_services.data_api.dependencies import DependencyManager
 from renku_data_services.data_connectors import core
 from renku_data_services.data_connectors.apispec import CloudStorageCorePost, GlobalDataConnectorPost
-from renku_data_services.data_connectors.doi.models import DOIMetadata
+from renku_data_services.data_connectors.doi.cache import DOIMetadataCache
+from renku_data_services.data_connectors.doi.models import DOI, DOIMetadata
 from renku_data_services.namespace.models import NamespaceKind
 from renku_data_services.storage.rclone import RCloneDOIMetadata, RCloneValidator
 from renku_data_services.users.models import UserInfo
@@ -2708,3 +2712,56 @@ async def test_get_all_dc_links(
     assert res.status_code == 200, res.text
     assert len(res.json) == 2
     assert p2["id"] not in [i["id"] for i in res.json]
+
+
+@pytest.mark.asyncio
+async def test_doi_metadata_cache(
+    sanic_client: SanicASGITestClient, app_manager_instance: DependencyManager, monkeypatch: "MonkeyPatch"
+) -> None:
+    calls: list[str] = []
+    hosts: dict[str, str | None] = {"10.5281/zenodo.1": "zenodo.org", "10.5281/zenodo.2": None}
+
+    async def _resolve_host(self: DOI) -> str | None:
+        calls.append(str(self))
+        return hosts[str(self)]
+
+    monkeypatch.setattr(DOI, "resolve_host_or_raise", _resolve_host)
+    cache = DOIMetadataCache(session_maker=app_manager_instance.config.db.async_session_maker)
+
+    assert await cache.resolve_host(DOI("10.5281/zenodo.1")) == "zenodo.org"
+    assert await cache.resolve_host(DOI("10.5281/zenodo.1")) == "zenodo.org"
+    assert calls == ["10.5281/zenodo.1"]
+
+    # Negative results are cached as well
+    assert await cache.resolve_host(DOI("10.5281/zenodo.2")) is None
+    assert await cache.resolve_host(DOI("10.5281/zenodo.2")) is None
+    assert calls == ["10.5281/zenodo.1", "10.5281/zenodo.2"]
+
+    # Expired negative results are refreshed right away
+    hosts["10.5281/zenodo.3"] = None
+    expiring_cache = DOIMetadataCache(
+        session_maker=app_manager_instance.config.db.async_session_maker, negative_ttl=timedelta(0)
+    )
+    assert await expiring_cache.resolve_host(DOI("10.5281/zenodo.3")) is None
+    hosts["10.5281/zenodo.3"] = "zenodo.org"
+    assert await expiring_cache.resolve_host(DOI("10.5281/zenodo.3")) == "zenodo.org"
+
+
+@pytest.mark.asyncio
+async def test_doi_metadata_cache_does_not_cache_failures(
+    sanic_client: SanicASGITestClient, app_manager_instance: DependencyManager, monkeypatch: "MonkeyPatch"
+) -> None:
+    calls: list[str] = []
+
+    async def _resolve_host(self: DOI) -> str | None:
+        calls.append(str(self))
+        if len(calls) == 1:
+            raise httpx.ConnectTimeout("doi.org is too slow")
+        return "zenodo.org"
+
+    monkeypatch.setattr(DOI, "resolve_host_or_raise", _resolve_host)
+    cache = DOIMetadataCache(session_maker=app_manager_instance.config.db.async_session_maker)
+
+    assert await cache.resolve_host(DOI("10.5281/zenodo.4")) is None
+    assert await cache.resolve_host(DOI("10.5281/zenodo.4")) == "zenodo.org"
+    assert calls == ["10.5281/zenodo.4", "10.5281/zenodo.4"]
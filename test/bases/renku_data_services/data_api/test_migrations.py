@@ -943,3 +943,35 @@ async def test_migration_cd424c01676e_resource_pool_authz(
         and row.relationship.subject.object.object_id in seeded["prohibited_user_ids"]
     ]
     assert len(prohibited) == seeded["no_default_access_count"]
+
+
+@pytest.mark.asyncio
+async def test_migration_to_f18138d61998_resolves_duplicate_alerts(
+    app_manager_instance: DependencyManager, admin_user: UserInfo
+) -> None:
+    run_migrations_for_app("common", "01k4dy9r2we4")
+    async with app_manager_instance.config.db.async_session_maker() as session, session.begin():
+        await session.execute(sa.text("INSERT into users.users(keycloak_id) VALUES ('alert-user')"))
+        for session_name in ["'session-1'", "'session-1'", "'session-2'", "NULL", "NULL"]:
+            await session.execute(
+                sa.text(
+                    "INSERT into notifications.alerts(title, message, event_type, user_id, session_name) "
+                    f"VALUES ('title', 'message', 'event', 'alert-user', {session_name})"  # nosec B608
+                )
+            )
+    run_migrations_for_app("common", "f18138d61998")
+    async with app_manager_instance.config.db.async_session_maker() as session, session.begin():
+        unresolved = (
+            await session.execute(
+                sa.text("SELECT session_name FROM notifications.alerts WHERE resolved_date IS NULL ORDER BY id")
+            )
+        ).all()
+    assert sorted(str(row.session_name) for row in unresolved) == ["None", "session-1", "session-2"]
+    with pytest.raises(IntegrityError):
+        async with app_manager_instance.config.db.async_session_maker() as session, session.begin():
+            await session.execute(
+                sa.text(
+                    "INSERT into notifications.alerts(title, message, event_type, user_id, session_name) "
+                    "VALUES ('title', 'message', 'event', 'alert-user', 'session-2')"
+                )
+            )
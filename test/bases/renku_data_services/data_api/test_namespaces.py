@@ -1,6 +1,7 @@
 import contextlib
 
 import pytest
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
 
 from renku_data_services.authz.models import Visibility
@@ -25,6 +26,7 @@ from renku_data_services.errors.errors import ConflictError, MissingResourceErro
 from renku_data_services.namespace.models import UnsavedGroup
 from renku_data_services.project.models import Project, ProjectPatch, UnsavedProject
 from renku_data_services.users.models import UserInfo
+from renku_data_services.users.orm import UserORM
 
 
 @pytest.mark.asyncio
@@ -119,6 +121,29 @@ async def test_list_namespaces_pagination(sanic_client, user_headers) -> None:
     assert response.headers.get("total-pages") == "2"
 
 
+@pytest.mark.asyncio
+async def test_list_namespaces_cursor_pagination(sanic_client, user_headers) -> None:
+    for idx in range(1, 7):
+        payload = {"name": f"Group {idx}", "slug": f"group-{idx}"}
+        _, response = await sanic_client.post("/api/data/groups", headers=user_headers, json=payload)
+        assert response.status_code == 201, response.text
+
+    slugs: list[str] = []
+    cursor = ""
+    while True:
+        _, response = await sanic_client.get(
+            "/api/data/namespaces", headers=user_headers, params={"per_page": 2, "cursor": cursor}
+        )
+        assert response.status_code == 200, response.text
+        assert response.headers.get("total") == "7"
+        slugs.extend(ns["slug"] for ns in response.json)
+        if "next-cursor" not in response.headers:
+            break
+        cursor = response.headers["next-cursor"]
+
+    assert slugs == ["user.doe"] + [f"group-{idx}" for idx in range(1, 7)]
+
+
 @pytest.mark.asyncio
 async def test_list_namespaces_all_groups_are_public(sanic_client, user_headers, member_1_headers) -> None:
     payload = {
@@ -645,3 +670,26 @@ async def test_avoiding_slug_conflicts_with_updates(
             await app_manager_instance.data_connector_repo.update_data_connector(user, dc2.id, path2_patch, dc2.etag)
         else:
             raise AssertionError("No update was performed")
+
+
+@pytest.mark.asyncio
+async def test_generate_user_namespaces_in_batches(
+    sanic_client, app_manager_instance: DependencyManager, regular_user: UserInfo
+) -> None:
+    taken_slug = regular_user.namespace.path.serialize()
+    users = [{"keycloak_id": f"batch-user-{i}", "email": "batch.user@example.com"} for i in range(5)]
+    users.append({"keycloak_id": "batch-user-taken", "email": f"{taken_slug}@example.com"})
+    async with app_manager_instance.config.db.async_session_maker() as session, session.begin():
+        await session.execute(insert(UserORM).values(users))
+
+    num_generated = await app_manager_instance.group_repo.generate_user_namespaces(batch_size=2)
+
+    assert num_generated == len(users)
+    slugs = []
+    for user in users:
+        namespace = await app_manager_instance.group_repo.get_user_namespace(user["keycloak_id"])
+        assert namespace is not None
+        slugs.append(namespace.path.serialize())
+    assert set(slugs[:5]) == {"batch.user", "batch.user-1", "batch.user-2", "batch.user-3", "batch.user-4"}
+    assert slugs[5] == f"{taken_slug}-1"
+    assert await app_manager_instance.group_repo.generate_user_namespaces(batch_size=2) == 0
@@ -0,0 +1,68 @@
+from typing import Any
+
+import pytest
+from sanic_testing.testing import SanicASGITestClient
+
+from renku_data_services.users.models import UserInfo
+
+
+def _alertmanager_alert(status: str, user_id: str, session_name: str, description: str) -> dict[str, Any]:
+    return {
+        "status": status,
+        "labels": {"safe_username": user_id, "statefulset": session_name, "alertname": "SessionMemoryHigh"},
+        "annotations": {"title": "Memory usage is high", "description": description},
+        "startsAt": "2026-01-01T00:00:00Z",
+    }
+
+
+def _alertmanager_webhook(status: str, alerts: list[dict[str, Any]]) -> dict[str, Any]:
+    return {"version": "4", "groupKey": "{}:{}", "status": status, "alerts": alerts}
+
+
+@pytest.mark.asyncio
+async def test_alertmanager_webhook_is_idempotent(
+    sanic_client: SanicASGITestClient,
+    admin_headers: dict[str, str],
+    user_headers: dict[str, str],
+    regular_user: UserInfo,
+) -> None:
+    firing = _alertmanager_webhook(
+        "firing",
+        [
+            _alertmanager_alert("firing", regular_user.id, "session-1", "first"),
+            _alertmanager_alert("firing", regular_user.id, "session-2", "first"),
+            _alertmanager_alert("firing", "does-not-exist", "session-3", "first"),
+        ],
+    )
+    for _ in range(2):
+        _, res = await sanic_client.post("/api/data/webhooks/alertmanager", headers=admin_headers, json=firing)
+        assert res.status_code == 200, res.text
+
+    _, res = await sanic_client.get("/api/data/alerts", headers=user_headers)
+    assert res.status_code == 200, res.text
+    assert {alert["session_name"] for alert in res.json} == {"session-1", "session-2"}
+
+    # A new firing notification for the same session updates the existing alert
+    updated = _alertmanager_webhook("firing", [_alertmanager_alert("firing", regular_user.id, "session-1", "second")])
+    _, res = await sanic_client.post("/api/data/webhooks/alertmanager", headers=admin_headers, json=updated)
+    assert res.status_code == 200, res.text
+
+    _, res = await sanic_client.get("/api/data/alerts", headers=user_headers)
+    assert res.status_code == 200, res.text
+    alerts = {alert["session_name"]: alert for alert in res.json}
+    assert len(alerts) == 2
+    assert alerts["session-1"]["message"] == "second"
+
+    resolved = _alertmanager_webhook(
+        "resolved",
+        [
+            _alertmanager_alert("resolved", regular_user.id, "session-1", "second"),
+            _alertmanager_alert("resolved", regular_user.id, "session-2", "first"),
+        ],
+    )
+    _, res = await sanic_client.post("/api/data/webhooks/alertmanager", headers=admin_headers, json=resolved)
+    assert res.status_code == 200, res.text
+
+    _, res = await sanic_client.get("/api/data/alerts", headers=user_headers)
+    assert res.status_code == 200, res.text
+    assert res.json == []
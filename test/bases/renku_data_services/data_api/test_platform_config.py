@@ -424,3 +424,35 @@ async def test_patch_authz_config(
         json=dict(name="test-project", namespace=regular_user.namespace.path.serialize()),
     )
     assert res.status_code == 201, (res.status_code, res.text)
+
+
+@pytest.mark.asyncio
+async def test_get_redirect_cache_and_etag(sanic_client: SanicASGITestClient, admin_headers: dict[str, str]) -> None:
+    encoded_url = urllib.parse.quote_plus("/projects/ns/cached-slug")
+    # The missing redirect gets cached
+    _, res = await sanic_client.get(f"/api/data/platform/redirects/{encoded_url}")
+    assert res.status_code == 404, res.text
+
+    payload = {"source_url": "/projects/ns/cached-slug", "target_url": f"/p/{DUMMY_ULID}"}
+    _, res = await sanic_client.post("/api/data/platform/redirects", headers=admin_headers, json=payload)
+    assert res.status_code == 201, res.text
+    etag = res.json["etag"]
+
+    _, res = await sanic_client.get(f"/api/data/platform/redirects/{encoded_url}")
+    assert res.status_code == 200, res.text
+    assert res.headers["ETag"] == etag
+
+    _, res = await sanic_client.get(f"/api/data/platform/redirects/{encoded_url}", headers={"If-None-Match": etag})
+    assert res.status_code == 304, res.text
+
+    _, res = await sanic_client.get("/api/data/platform/config")
+    config_etag = res.headers["ETag"]
+    _, res = await sanic_client.get("/api/data/platform/config", headers={"If-None-Match": config_etag})
+    assert res.status_code == 304, res.text
+
+    headers = merge_headers(admin_headers, {"If-Match": config_etag})
+    _, res = await sanic_client.patch("/api/data/platform/config", headers=headers, json={"incident_banner": "Hi"})
+    assert res.status_code == 200, res.text
+    _, res = await sanic_client.get("/api/data/platform/config", headers={"If-None-Match": config_etag})
+    assert res.status_code == 200, res.text
+    assert res.json.get("incident_banner") == "Hi"
@@ -288,6 +288,38 @@ async def test_get_all_projects_with_pagination(create_project, sanic_client, us
     assert response.json == snapshot(exclude=props("id", "creation_date", "updated_at", "etag"))
 
 
+@pytest.mark.asyncio
+async def test_get_all_projects_with_cursor_pagination(create_project, sanic_client, user_headers) -> None:
+    for i in range(1, 8):
+        await create_project(sanic_client, f"Project {i}")
+
+    names: list[str] = []
+    parameters: dict[str, str | int] = {"per_page": 3, "cursor": ""}
+    for _ in range(3):
+        _, response = await sanic_client.get("/api/data/projects", headers=user_headers, params=parameters)
+
+        assert response.status_code == 200, response.text
+        assert response.headers["per-page"] == "3"
+        assert response.headers["total-estimated"] == "true"
+        assert "page" not in response.headers
+        names.extend(p["name"] for p in response.json)
+        if "next-cursor" not in response.headers:
+            break
+        parameters["cursor"] = response.headers["next-cursor"]
+
+    assert len(names) == 7
+    assert set(names) == {f"Project {i}" for i in range(1, 8)}
+    assert "next-cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_cursor_pagination_with_invalid_cursor(sanic_client, user_headers) -> None:
+    parameters = {"cursor": "not-a-cursor"}
+    _, response = await sanic_client.get("/api/data/projects", headers=user_headers, params=parameters)
+
+    assert response.status_code == 422, response.text
+
+
 @pytest.mark.asyncio
 async def test_default_pagination(create_project, sanic_client, user_headers) -> None:
     # Create some projects
@@ -1960,3 +1992,38 @@ async def test_changing_project_namespace_with_data_connectors_moves_data_connec
     )
     assert res.status_code == 200, res.text
     assert res.json["namespace"] == f"{group['slug']}/{project['slug']}"
+
+
+@pytest.mark.asyncio
+async def test_changing_project_namespace_and_slug_moves_all_data_connectors(
+    sanic_client,
+    user_headers,
+    create_project,
+    create_data_connector_and_link_project,
+    create_group,
+) -> None:
+    group = await create_group(sanic_client, "group")
+    project = await create_project(sanic_client, "Project")
+    project_id = project["id"]
+    dc_namespace = f"{project['namespace']}/{project['slug']}"
+    data_connectors = []
+    for i in range(3):
+        data_connector, _ = await create_data_connector_and_link_project(
+            f"Data Connector {i}", project_id=project_id, namespace=dc_namespace
+        )
+        data_connectors.append(data_connector)
+    _, res = await sanic_client.patch(
+        f"/api/data/projects/{project_id}",
+        headers={"If-Match": project["etag"], **user_headers},
+        json={"namespace": group["slug"], "slug": "new_slug"},
+    )
+    assert res.status_code == 200, res.text
+
+    for data_connector in data_connectors:
+        _, res = await sanic_client.get(
+            f"/api/data/namespaces/{group['slug']}/projects/new_slug/data_connectors/{data_connector['slug']}",
+            headers=user_headers,
+        )
+        assert res.status_code == 200, res.text
+        assert res.json["id"] == data_connector["id"]
+        assert res.json["namespace"] == f"{group['slug']}/new_slug"
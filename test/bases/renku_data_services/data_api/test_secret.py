@@ -457,6 +457,83 @@ async def test_secret_encryption_decryption_with_key_mapping(
     assert response.json["error"]["message"] == "Key mapping values are not unique"
 
 
+@pytest.mark.asyncio
+@pytest.mark.xdist_group("sessions")
+async def test_secret_encryption_decryption_batch(
+    sanic_client: SanicASGITestClient,
+    secrets_sanic_client: SanicASGITestClient,
+    secrets_storage_app_manager: SecretsDependencyManager,
+    user_headers,
+    create_secret,
+    cluster: KindCluster,
+) -> None:
+    """Test creating several k8s secrets from user secrets in one request to the secret service."""
+    secret1 = await create_secret("secret-1", "value-1", default_filename="secret-1")
+    secret1_id = secret1["id"]
+    secret2 = await create_secret("secret-2", "value-2", default_filename="secret-2")
+    secret2_id = secret2["id"]
+    owner_references = [
+        {
+            "apiVersion": "amalthea.dev/v1alpha1",
+            "kind": "JupyterServer",
+            "name": "renku-1234",
+            "uid": "c9328118-8d32-41b4-b9bd-1437880c95a2",
+        }
+    ]
+
+    payload = {
+        "secrets": [
+            {
+                "name": "test-secret-batch-1",
+                "namespace": "default",
+                "secret_ids": [secret1_id, secret2_id],
+                "owner_references": owner_references,
+            },
+            {
+                "name": "test-secret-batch-2",
+                "namespace": "default",
+                "secret_ids": [secret1_id],
+                "owner_references": owner_references,
+                "key_mapping": {secret1_id: "access_key_id"},
+            },
+            {
+                "name": "test-secret-batch-3",
+                "namespace": "default",
+                "secret_ids": [str(ULID())],
+                "owner_references": owner_references,
+            },
+        ]
+    }
+
+    _, response = await secrets_sanic_client.post("/api/secrets/kubernetes/batch", headers=user_headers, json=payload)
+    assert response.status_code == 200, response.text
+    results = response.json["results"]
+    assert [r["name"] for r in results] == ["test-secret-batch-1", "test-secret-batch-2", "test-secret-batch-3"]
+    assert [r["status_code"] for r in results] == [201, 201, 404]
+    assert "error" not in results[0]
+    assert results[2]["error"]["error"]["message"].startswith("Couldn't find secrets with ids")
+
+    _, response = await sanic_client.get("/api/data/user/secret_key", headers=user_headers)
+    assert response.status_code == 200
+    secret_key = response.json["secret_key"]
+
+    for name, expected in [
+        ("test-secret-batch-1", {"secret-1": "value-1", "secret-2": "value-2"}),
+        ("test-secret-batch-2", {"access_key_id": "value-1"}),
+    ]:
+        k8s_secret: K8sSecret = await secrets_storage_app_manager.secret_client.patch_secret(
+            K8sObjectMeta(
+                name=name, namespace="default", cluster=DEFAULT_K8S_CLUSTER, gvk=GVK(kind="Secret", version="v1")
+            ),
+            {"metadata": {"annotations": {"test-annotation": "test"}}},
+        )
+        secrets = k8s_secret.manifest.get("data", {})
+        decrypted = {
+            key: decrypt_string(secret_key.encode(), "user", b64decode(value)) for key, value in secrets.items()
+        }
+        assert decrypted == expected
+
+
 @pytest.mark.asyncio
 async def test_single_secret_rotation():
     """Test rotating secrets."""
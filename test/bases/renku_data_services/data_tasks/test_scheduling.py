@@ -0,0 +1,72 @@
+"""Tests for the scheduling module."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from renku_data_services.data_tasks.scheduling import Cron, Interval, TaskScheduler, TaskSpec
+from renku_data_services.db_config import DBConfig
+from renku_data_services.errors import errors
+
+
+@pytest.mark.parametrize(
+    "expression,after,expected",
+    [
+        ("*/15 * * * *", datetime(2026, 10, 18, 10, 7, tzinfo=UTC), datetime(2026, 10, 18, 10, 15, tzinfo=UTC)),
+        ("*/15 * * * *", datetime(2026, 10, 18, 10, 15, tzinfo=UTC), datetime(2026, 10, 18, 10, 30, tzinfo=UTC)),
+        ("15 3 * * *", datetime(2026, 10, 18, 10, 0, tzinfo=UTC), datetime(2026, 10, 19, 3, 15, tzinfo=UTC)),
+        ("0 3 * * 1", datetime(2026, 10, 18, 12, 0, tzinfo=UTC), datetime(2026, 10, 19, 3, 0, tzinfo=UTC)),
+        ("0 0 29 2 *", datetime(2026, 3, 1, tzinfo=UTC), datetime(2028, 2, 29, tzinfo=UTC)),
+        ("0 0 31 12 *", datetime(2026, 10, 18, tzinfo=UTC), datetime(2026, 12, 31, tzinfo=UTC)),
+        # Either the day of month or the day of week has to match if both are restricted
+        ("0 0 1 * 7", datetime(2026, 10, 18, 12, 0, tzinfo=UTC), datetime(2026, 10, 25, tzinfo=UTC)),
+        ("30 8-10/2,17 * * *", datetime(2026, 10, 18, 9, 0, tzinfo=UTC), datetime(2026, 10, 18, 10, 30, tzinfo=UTC)),
+    ],
+)
+def test_cron_next_run(expression: str, after: datetime, expected: datetime) -> None:
+    assert Cron(expression).next_run(after) == expected
+
+
+@pytest.mark.parametrize(
+    "expression", ["* * * *", "60 * * * *", "* * 0 * *", "5-1 * * * *", "*/0 * * * *", "a * * * *", "0 0 31 2 *"]
+)
+def test_cron_invalid_expression(expression: str) -> None:
+    with pytest.raises(errors.ConfigurationError):
+        Cron(expression)
+
+
+def test_interval_jitter() -> None:
+    now = datetime(2026, 10, 18, tzinfo=UTC)
+    schedule = Interval(period=timedelta(minutes=10), jitter=timedelta(minutes=1))
+    for _ in range(20):
+        assert now <= schedule.first_run(now) <= now + timedelta(minutes=1)
+        assert now + timedelta(minutes=10) <= schedule.next_run(now) <= now + timedelta(minutes=11)
+
+
+@pytest.mark.asyncio
+async def test_task_runs_on_one_replica_at_a_time(db_instance: DBConfig) -> None:
+    runs: list[int] = []
+    done = asyncio.Event()
+
+    async def _task(replica: int) -> None:
+        runs.append(replica)
+        await done.wait()
+
+    def _replica(replica: int) -> asyncio.Task[None]:
+        scheduler = TaskScheduler(
+            db_instance.async_session_maker,
+            lock_retry_interval=timedelta(seconds=0.1),
+            lock_check_interval=timedelta(seconds=0.1),
+        )
+        [(_, tf)] = scheduler.definitions({"test": TaskSpec(lambda: _task(replica))}).tasks
+        return asyncio.create_task(tf())
+
+    replicas = [_replica(0), _replica(1)]
+    await asyncio.sleep(1)
+    assert len(runs) == 1
+
+    # The other replica takes over once the task finishes
+    done.set()
+    await asyncio.wait_for(asyncio.gather(*replicas), timeout=5)
+    assert sorted(runs) == [0, 1]
@@ -2,7 +2,7 @@ import json
 import re
 from collections.abc import Callable
 from dataclasses import asdict
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Union
 from uuid import uuid4
 
@@ -773,6 +773,63 @@ async def test_fixing_project_group_namespace_relations(
     await dm.project_repo.get_project(user2_api, project.id)
 
 
+@pytest.mark.asyncio
+async def test_reconcile_only_changed_project_namespace_relations(
+    get_app_manager: Callable[..., DependencyManager], admin_user: APIUser
+):
+    user1 = UserInfo(
+        id="user-1-id",
+        first_name="John",
+        last_name="Doe",
+        email="john.doe@gmail.com",
+        namespace=UserNamespace(
+            id=ULID(),
+            created_by="user-1-id",
+            underlying_resource_id="user-1-id",
+            path=NamespacePath.from_strings("john.doe"),
+        ),
+    )
+    user1_api = APIUser(is_admin=False, id=user1.id, access_token="access_token")
+    kc_api = DummyKeycloakAPI(users=get_kc_users([user1]))
+    dm = get_app_manager(kc_api)
+    await dm.syncer.users_sync(kc_api)
+    group = await dm.group_repo.insert_group(
+        user1_api, GroupPostRequest(name="group1", slug="group1", description=None)
+    )
+    project = await dm.project_repo.insert_project(
+        user1_api,
+        UnsavedProject(name="project1", slug="project1", namespace="group1", created_by=user1.id, visibility="private"),
+    )
+    correct = Relationship(
+        resource=_AuthzConverter.project(project.id),
+        relation=_Relation.project_namespace.value,
+        subject=SubjectReference(object=_AuthzConverter.group(group.id)),
+    )
+    wrong = Relationship(
+        resource=_AuthzConverter.project(project.id),
+        relation=_Relation.project_namespace.value,
+        subject=SubjectReference(object=_AuthzConverter.group("random")),
+    )
+    break_relation = WriteRelationshipsRequest(
+        updates=[
+            RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=correct),
+            RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=wrong),
+        ]
+    )
+    reconciler = dm.project_namespace_reconciler
+    reconciler.watermark_overlap = timedelta(0)
+
+    await dm.authz.client.WriteRelationships(break_relation)
+    # The first run verifies all projects
+    assert await reconciler.reconcile_changed_in_db() == 2
+
+    await dm.authz.client.WriteRelationships(break_relation)
+    # The project did not change in the database since the last run
+    assert await reconciler.reconcile_changed_in_db() == 0
+    assert await reconciler.reconcile([str(project.id)]) == 2
+    assert await reconciler.reconcile([str(project.id)]) == 0
+
+
 @pytest.mark.asyncio
 async def test_migrate_groups_make_all_public(get_app_manager: Callable[..., DependencyManager], admin_user: APIUser):
     admin_user_info = UserInfo(
@@ -0,0 +1,102 @@
+"""Microbenchmarks of the CPU bound hot paths, they do not need any service to run.
+
+Run them with `make benchmarks`, see the `benchmarks` target for how results are stored and compared.
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from pytest_benchmark.fixture import BenchmarkFixture
+from ulid import ULID
+
+from renku_data_services.base_models.validation import validate_and_dump
+from renku_data_services.project import apispec as project_apispec
+from renku_data_services.search.user_query_parser import QueryParser
+from renku_data_services.storage.rclone import RCloneValidator
+from renku_data_services.utils.cryptography import decrypt_rsa, decrypt_string, encrypt_rsa, encrypt_string
+
+pytestmark = pytest.mark.benchmarks
+
+NUM_PROJECTS = 100
+
+
+def _project(i: int) -> dict[str, Any]:
+    """A project as dumped by the projects blueprint."""
+    now = datetime.now(UTC).isoformat()
+    return dict(
+        id=str(ULID()),
+        name=f"Project {i}",
+        namespace="some-user",
+        slug=f"project-{i}",
+        creation_date=now,
+        created_by="some-user-id",
+        updated_at=now,
+        repositories=[f"https://gitlab.example.com/some-user/project-{i}.git"],
+        visibility="public",
+        description="A project used for benchmarking " * 5,
+        etag="9EE498F9D565D0C41E511377425F32F3",
+        keywords=["benchmark", "renku", f"keyword-{i}"],
+        template_id=None,
+        is_template=False,
+        secrets_mount_directory="/secrets",
+    )
+
+
+def test_serialize_projects(benchmark: BenchmarkFixture) -> None:
+    projects = [_project(i) for i in range(NUM_PROJECTS)]
+
+    result = benchmark(lambda: [validate_and_dump(project_apispec.Project, p) for p in projects])
+
+    assert len(result) == NUM_PROJECTS
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "my project",
+        "type:Project visibility:public created>today-7d sort:score-desc",
+        "name:analysis,climate keyword:ml,data role:owner,editor createdBy:some-user namespace:some-group text",
+    ],
+)
+def test_parse_search_query(benchmark: BenchmarkFixture, query: str) -> None:
+    result = benchmark(QueryParser.parse_raw, query)
+
+    assert result is not None
+
+
+def test_validate_rclone_config(benchmark: BenchmarkFixture) -> None:
+    validator = RCloneValidator()
+    config = {
+        "type": "s3",
+        "provider": "AWS",
+        "region": "eu-central-1",
+        "access_key_id": "some-access-key",
+        "secret_access_key": "some-secret-key",
+        "endpoint": "https://s3.eu-central-1.amazonaws.com",
+    }
+
+    benchmark(validator.validate, config, keep_sensitive=True)
+
+
+def test_encrypt_decrypt_secret(benchmark: BenchmarkFixture) -> None:
+    password = b"some-encryption-password"
+    salt = "some-user-id"
+
+    def _round_trip() -> str:
+        return decrypt_string(password, salt, encrypt_string(password, salt, "some secret value"))
+
+    # NOTE: Deriving the key is deliberately slow, a few rounds are enough
+    result = benchmark.pedantic(_round_trip, rounds=5, iterations=1)
+
+    assert result == "some secret value"
+
+
+def test_encrypt_decrypt_rsa(benchmark: BenchmarkFixture) -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_key = private_key.public_key()
+
+    result = benchmark(lambda: decrypt_rsa(private_key, encrypt_rsa(public_key, b"some secret value")))
+
+    assert result == b"some secret value"
@@ -0,0 +1,95 @@
+"""Tests for the app_config.instrumentation module."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from renku_data_services.app_config.instrumentation import (
+    InstrumentedTransport,
+    fingerprint,
+    instrument_grpc_client,
+    normalize_statement,
+    observe,
+    set_route,
+)
+
+
+def _calls(dependency: str, operation: str, route: str) -> float:
+    labels = {"dependency": dependency, "operation": operation, "route": route}
+    return REGISTRY.get_sample_value("dependency_call_duration_seconds_count", labels) or 0
+
+
+def _errors(dependency: str, operation: str, route: str) -> float:
+    labels = {"dependency": dependency, "operation": operation, "route": route}
+    return REGISTRY.get_sample_value("dependency_call_errors_total", labels) or 0
+
+
+def test_statement_fingerprint() -> None:
+    statement = "SELECT projects.id, anon_1.x \nFROM projects WHERE projects.id IN ($1::VARCHAR, $2::VARCHAR) LIMIT $3"
+    normalized = "SELECT projects.id, anon_1.x FROM projects WHERE projects.id IN (...) LIMIT ?"
+    assert normalize_statement(statement) == normalized
+    assert fingerprint(statement) == fingerprint(
+        "SELECT projects.id, anon_1.x FROM projects WHERE projects.id IN ($1::VARCHAR) LIMIT 10"
+    )
+    assert fingerprint("SELECT a FROM t WHERE name = 'x'") == fingerprint("SELECT a FROM t WHERE name = 'it''s'")
+    assert fingerprint("SELECT a FROM t") != fingerprint("SELECT b FROM t")
+
+
+def test_observe_records_calls_per_route() -> None:
+    set_route("test_route")
+    before = _calls("test", "call", "test_route")
+    before_errors = _errors("test", "call", "test_route")
+
+    with observe("test", "call"):
+        pass
+    with pytest.raises(ValueError), observe("test", "call"):
+        raise ValueError()
+
+    assert _calls("test", "call", "test_route") == before + 2
+    assert _errors("test", "call", "test_route") == before_errors + 1
+    set_route(None)
+    with observe("test", "call"):
+        pass
+    assert _calls("test", "call", "background") >= 1
+
+
+class _Client:
+    async def Check(self, value: int) -> int:
+        return value
+
+    async def __stream(self, count: int) -> AsyncIterator[int]:
+        for i in range(count):
+            yield i
+
+    def Lookup(self, count: int) -> AsyncIterator[int]:
+        return self.__stream(count)
+
+
+@pytest.mark.asyncio
+async def test_grpc_client_records_calls() -> None:
+    set_route("grpc_route")
+    client = instrument_grpc_client(_Client(), "test_grpc")
+
+    assert await client.Check(3) == 3
+    assert [i async for i in client.Lookup(3)] == [0, 1, 2]
+
+    assert _calls("test_grpc", "Check", "grpc_route") == 1
+    assert _calls("test_grpc", "Lookup", "grpc_route") == 1
+
+
+@pytest.mark.asyncio
+async def test_transport_records_requests() -> None:
+    set_route("http_route")
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0)
+        return httpx.Response(200)
+
+    transport = InstrumentedTransport("test_http", httpx.MockTransport(_handler))
+    async with httpx.AsyncClient(transport=transport) as client:
+        await client.get("http://example.com")
+
+    assert _calls("test_http", "GET", "http_route") == 1
@@ -0,0 +1,87 @@
+"""Tests for the app_config.request_cache module."""
+
+import asyncio
+
+import pytest
+
+from renku_data_services.app_config.request_cache import (
+    clear_request_cache,
+    end_request_cache,
+    request_memoized,
+    start_request_cache,
+    user_key,
+)
+from renku_data_services.base_models import APIUser
+
+
+class _Repository:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    @request_memoized(lambda _, user, item_id: (user_key(user), item_id))
+    async def get_item(self, user: APIUser, item_id: int) -> str:
+        self.calls += 1
+        await asyncio.sleep(0)
+        if item_id < 0:
+            raise ValueError("missing")
+        return f"{user.id}-{item_id}"
+
+
+@pytest.mark.asyncio
+async def test_lookups_are_memoized_within_a_request() -> None:
+    repo = _Repository()
+    user = APIUser(id="user-1", roles=["some-role"])
+
+    await repo.get_item(user, 1)
+    await repo.get_item(user, 1)
+    assert repo.calls == 2, "lookups outside of a request are not memoized"
+
+    start_request_cache()
+    results = await asyncio.gather(*[repo.get_item(user, 1) for _ in range(3)], repo.get_item(user=user, item_id=1))
+    assert results == ["user-1-1"] * 4
+    assert repo.calls == 3
+    await repo.get_item(user, 2)
+    await repo.get_item(APIUser(id="user-2"), 1)
+    assert repo.calls == 5
+
+    clear_request_cache()
+    await repo.get_item(user, 1)
+    assert repo.calls == 6
+
+    end_request_cache()
+    await repo.get_item(user, 1)
+    assert repo.calls == 7
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_memoized() -> None:
+    repo = _Repository()
+    user = APIUser(id="user-1")
+    start_request_cache()
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await repo.get_item(user, -1)
+    assert repo.calls == 2
+
+    end_request_cache()
+
+
+@pytest.mark.asyncio
+async def test_tasks_outliving_the_request_are_not_memoized() -> None:
+    repo = _Repository()
+    user = APIUser(id="user-1")
+    start_request_cache()
+    proceed = asyncio.Event()
+
+    async def _background() -> None:
+        await proceed.wait()
+        await repo.get_item(user, 1)
+        await repo.get_item(user, 1)
+
+    task = asyncio.create_task(_background())
+    end_request_cache()
+    proceed.set()
+    await task
+
+    assert repo.calls == 2
@@ -144,6 +144,7 @@ async def bootstrap_admins(app_manager_instance: DependencyManager, event_loop)
             )
         )
     await authz.client.WriteRelationships(WriteRelationshipsRequest(updates=rels))
+    authz.invalidate_admin_cache()
 
 
 @pytest.mark.asyncio
@@ -670,7 +671,6 @@ async def test_resource_pool_member_relationships_subject_types(app_manager_inst
 
 
 _ADD_DELETE_BASE = 9100
-_UNDO_BASE = 9110
 _VISIBILITY_BASE = 9120
 _LOOKUP_BASE = 9130
 _CLEANUP_BASE = 9140
@@ -722,24 +722,6 @@ async def test_resource_pool_add_delete_authz(
     await _assert_pool_access(authz, pool_id, admin_use=False, admin_write=False, user_use=False, anon_use=False)
 
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize("public_pool", [True, False], ids=["public", "private"])
-async def test_resource_pool_add_undo(
-    app_manager_instance: DependencyManager, bootstrap_admins, public_pool: bool
-) -> None:
-    """Applying the undo payload from _add_resource_pool fully reverses creation."""
-    authz = app_manager_instance.authz
-    pool_id = _UNDO_BASE + int(public_pool)
-
-    change = authz._add_resource_pool(SimpleNamespace(id=pool_id, public=public_pool))
-    await authz.client.WriteRelationships(change.apply)
-    await _assert_pool_access(authz, pool_id, user_use=public_pool, anon_use=public_pool)
-
-    # Undo — simulates DB-rollback recovery path
-    await authz.client.WriteRelationships(change.undo)
-    await _assert_pool_access(authz, pool_id, admin_use=False, admin_write=False, user_use=False, anon_use=False)
-
-
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "initial_public,new_public",
@@ -773,10 +755,6 @@ async def test_resource_pool_visibility_update(
 
     if initial_public == new_public:
         assert len(vis_change.apply.updates) == 0, "No-op transition should produce no apply ops"
-        assert len(vis_change.undo.updates) == 0, (
-            f"No-op transition ({initial_public}->{new_public}) produced "
-            f"{len(vis_change.undo.updates)} undo op(s) that would corrupt state on rollback"
-        )
 
 
 @pytest.mark.asyncio
@@ -934,3 +912,26 @@ async def test_resource_pool_no_indirect_inheritance(app_manager_instance: Depen
     ]
     await authz.client.WriteRelationships(WriteRelationshipsRequest(updates=updates))
     assert not await authz.has_permission(APIUser(id=user_id), ResourceType.resource_pool, pool_id, Scope.READ)
+
+
+@pytest.mark.asyncio
+async def test_platform_admin_cache(app_manager_instance: DependencyManager, bootstrap_admins) -> None:
+    authz = app_manager_instance.authz
+    assert await authz.is_platform_admin(admin_user)
+    assert not await authz.is_platform_admin(regular_user1)
+    assert not await authz.is_platform_admin(anon_user)
+
+    assert regular_user1.id is not None
+    await authz.client.WriteRelationships(authz._add_admin(regular_user1.id).apply)
+    assert await authz.is_platform_admin(regular_user1)
+    # NOTE: The cache is only refreshed when invalidated, e.g. by a notification from the admin sync
+    sub = SubjectReference(object=_AuthzConverter.user(regular_user1.id))
+    relationship = Relationship(resource=_AuthzConverter.platform(), relation="admin", subject=sub)
+    await authz.client.WriteRelationships(
+        WriteRelationshipsRequest(
+            updates=[RelationshipUpdate(operation=RelationshipUpdate.OPERATION_DELETE, relationship=relationship)]
+        )
+    )
+    assert await authz.is_platform_admin(regular_user1)
+    authz.invalidate_admin_cache()
+    assert not await authz.is_platform_admin(regular_user1)
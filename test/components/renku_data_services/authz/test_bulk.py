@@ -0,0 +1,56 @@
+from collections.abc import AsyncIterator
+
+import pytest
+from authzed.api.v1 import Relationship, RelationshipFilter, RelationshipUpdate, SubjectReference
+from ulid import ULID
+
+from renku_data_services.authz.authz import _AuthzConverter, _Relation
+from renku_data_services.authz.bulk import AuthzBulkSync, BulkSyncItem, BulkSyncSource
+from renku_data_services.base_models.core import ResourceType
+from renku_data_services.data_api.dependencies import DependencyManager
+from renku_data_services.migrations.core import run_migrations_for_app
+
+
+def _public_group_source(group_ids: list[str], seen: list[str | None], fail_at: int | None = None) -> BulkSyncSource:
+    async def _source(after: str | None) -> AsyncIterator[BulkSyncItem]:
+        seen.append(after)
+        for i, group_id in enumerate(group_ids):
+            if after is not None and group_id <= after:
+                continue
+            if fail_at is not None and i >= fail_at:
+                raise RuntimeError("interrupted")
+            relationship = Relationship(
+                resource=_AuthzConverter.group(ULID.from_str(group_id)),
+                relation=_Relation.public_viewer.value,
+                subject=SubjectReference(object=_AuthzConverter.all_users()),
+            )
+            update = RelationshipUpdate(operation=RelationshipUpdate.OPERATION_TOUCH, relationship=relationship)
+            yield group_id, [update]
+
+    return _source
+
+
+@pytest.mark.asyncio
+async def test_bulk_write_resumes_from_checkpoint(app_manager_instance: DependencyManager) -> None:
+    run_migrations_for_app("common")
+    bulk_sync = AuthzBulkSync(
+        app_manager_instance.authz, app_manager_instance.config.db.async_session_maker, batch_size=2, page_size=2
+    )
+    group_ids = sorted(str(ULID()) for _ in range(5))
+    seen: list[str | None] = []
+
+    with pytest.raises(RuntimeError):
+        await bulk_sync.write("test", _public_group_source(group_ids, seen, fail_at=3))
+    assert await bulk_sync.get_checkpoint("test") == group_ids[1]
+
+    progress = await bulk_sync.write("test", _public_group_source(group_ids, seen))
+    assert seen == [None, group_ids[1]]
+    assert progress.resumed_from == group_ids[1]
+    assert progress.items == 3
+    assert progress.requests == 2
+    assert await bulk_sync.get_checkpoint("test") is None
+
+    relationships = bulk_sync.read(
+        RelationshipFilter(resource_type=ResourceType.group.value, optional_relation=_Relation.public_viewer.value)
+    )
+    assert set(group_ids) <= {r.relationship.resource.object_id async for r in relationships}
@@ -0,0 +1,126 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from authzed.api.v1 import (
+    Consistency,
+    ReadRelationshipsRequest,
+    Relationship,
+    RelationshipFilter,
+    RelationshipUpdate,
+    SubjectReference,
+    WriteRelationshipsRequest,
+    ZedToken,
+)
+from sqlalchemy import select, update
+from ulid import ULID
+
+from renku_data_services.authz.authz import _AuthzConverter, _Relation
+from renku_data_services.authz.orm import AuthzOutboxORM
+from renku_data_services.authz.outbox import AuthzOutbox, last_written_zed_token
+from renku_data_services.base_models.core import ResourceType
+from renku_data_services.data_api.dependencies import DependencyManager
+from renku_data_services.migrations.core import run_migrations_for_app
+
+
+def _public_group_request(
+    group_id: ULID, operation: RelationshipUpdate.Operation.ValueType
+) -> WriteRelationshipsRequest:
+    relationship = Relationship(
+        resource=_AuthzConverter.group(group_id),
+        relation=_Relation.public_viewer.value,
+        subject=SubjectReference(object=_AuthzConverter.all_users()),
+    )
+    return WriteRelationshipsRequest(updates=[RelationshipUpdate(operation=operation, relationship=relationship)])
+
+
+@pytest.mark.asyncio
+async def test_outbox_writes_committed_entries_in_order(app_manager_instance: DependencyManager) -> None:
+    run_migrations_for_app("common")
+    session_maker = app_manager_instance.config.db.async_session_maker
+    outbox = AuthzOutbox(app_manager_instance.authz, session_maker, retention=timedelta(0))
+    touched, removed, rolled_back = ULID(), ULID(), ULID()
+
+    async with session_maker() as session, session.begin():
+        await outbox.add(session, _public_group_request(touched, RelationshipUpdate.OPERATION_TOUCH))
+        await outbox.add(session, _public_group_request(removed, RelationshipUpdate.OPERATION_TOUCH))
+    async with session_maker() as session, session.begin():
+        # NOTE: Updating the same relationship again has to go in a separate request
+        last_id = await outbox.add(session, _public_group_request(removed, RelationshipUpdate.OPERATION_DELETE))
+    async with session_maker() as session:
+        await session.begin()
+        await outbox.add(session, _public_group_request(rolled_back, RelationshipUpdate.OPERATION_TOUCH))
+        await session.rollback()
+
+    assert await outbox.write_pending() == 3
+    assert await outbox.write_pending() == 0
+    async with session_maker() as session:
+        zed_token = await session.scalar(select(AuthzOutboxORM.zed_token).where(AuthzOutboxORM.id == last_id))
+    assert zed_token is not None
+
+    request = ReadRelationshipsRequest(
+        consistency=Consistency(at_least_as_fresh=ZedToken(token=zed_token)),
+        relationship_filter=RelationshipFilter(
+            resource_type=ResourceType.group.value, optional_relation=_Relation.public_viewer.value
+        ),
+    )
+    responses = app_manager_instance.authz.client.ReadRelationships(request)
+    group_ids = {r.relationship.resource.object_id async for r in responses}
+    assert str(touched) in group_ids
+    assert str(removed) not in group_ids
+    assert str(rolled_back) not in group_ids
+
+    assert await outbox.remove_written() >= 3
+    async with session_maker() as session:
+        assert await session.get(AuthzOutboxORM, last_id) is None
+
+
+@pytest.mark.asyncio
+async def test_outbox_does_not_write_past_entries_claimed_by_another_writer(
+    app_manager_instance: DependencyManager,
+) -> None:
+    run_migrations_for_app("common")
+    session_maker = app_manager_instance.config.db.async_session_maker
+    outbox = AuthzOutbox(app_manager_instance.authz, session_maker)
+    await outbox.write_pending()
+
+    async with session_maker() as session, session.begin():
+        first_id = await outbox.add(session, _public_group_request(ULID(), RelationshipUpdate.OPERATION_TOUCH))
+        last_id = await outbox.add(session, _public_group_request(ULID(), RelationshipUpdate.OPERATION_TOUCH))
+    assert first_id is not None and last_id is not None
+
+    async with session_maker() as session, session.begin():
+        await session.execute(
+            update(AuthzOutboxORM)
+            .where(AuthzOutboxORM.id == first_id)
+            .values(claimed_until=datetime.now(UTC) + timedelta(minutes=1))
+        )
+    assert await outbox.write_pending() == 0
+    with pytest.raises(TimeoutError):
+        await outbox.wait_until_written(last_id, timeout=timedelta(seconds=0.5))
+
+    async with session_maker() as session, session.begin():
+        # NOTE: The claim of a writer that died expires
+        await session.execute(
+            update(AuthzOutboxORM)
+            .where(AuthzOutboxORM.id == first_id)
+            .values(claimed_until=datetime.now(UTC) - timedelta(seconds=1))
+        )
+    zed_token = await outbox.wait_until_written(last_id)
+    assert zed_token is not None
+    assert await outbox.write_pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_outbox_write_after_commit_returns_the_token(app_manager_instance: DependencyManager) -> None:
+    run_migrations_for_app("common")
+    session_maker = app_manager_instance.config.db.async_session_maker
+    authz = app_manager_instance.authz
+
+    async with session_maker() as session:
+        async with session.begin():
+            entry_id = await AuthzOutbox.add(session, _public_group_request(ULID(), RelationshipUpdate.OPERATION_TOUCH))
+        assert entry_id is not None
+        zed_token = await AuthzOutbox.write_after_commit(authz, session, entry_id)
+
+    assert zed_token is not None
+    assert last_written_zed_token() == zed_token
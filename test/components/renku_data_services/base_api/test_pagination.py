@@ -0,0 +1,49 @@
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import Column, MetaData, String, Table, select
+from sqlalchemy.dialects import postgresql
+from ulid import ULID
+
+from renku_data_services import errors
+from renku_data_services.base_api.pagination import Cursor, PaginationRequest, estimate_count, next_cursor
+
+
+def test_cursor_round_trip() -> None:
+    cursor = Cursor(id=ULID(), sort_value=datetime(2024, 5, 1, 12, 30, tzinfo=UTC), segment=2)
+
+    assert Cursor.decode(cursor.encode()) == cursor
+
+
+def test_cursor_without_sort_value_round_trip() -> None:
+    cursor = Cursor(id=ULID())
+
+    assert Cursor.decode(cursor.encode()) == cursor
+
+
+@pytest.mark.parametrize("token", ["", "abc", "W10", "WyJub3QtYS11bGlkIiwgbnVsbCwgMF0"])
+def test_invalid_cursor(token: str) -> None:
+    with pytest.raises(errors.ValidationError):
+        Cursor.decode(token)
+
+
+def test_next_cursor() -> None:
+    ids = [ULID() for _ in range(3)]
+
+    assert next_cursor(PaginationRequest(1, 3), ids, id_key=lambda i: i) is None
+    assert next_cursor(PaginationRequest(1, 4, keyset=True), ids, id_key=lambda i: i) is None
+    assert next_cursor(PaginationRequest(1, 3, keyset=True), ids, id_key=lambda i: i) == Cursor(id=ids[-1])
+
+
+@pytest.mark.asyncio
+async def test_estimate_count_falls_back_to_counting_when_literals_cannot_be_rendered() -> None:
+    table = Table("items", MetaData(), Column("id", String), Column("data", postgresql.JSONB))
+    stmt = select(table.c.id).where(table.c.data.contains({"kind": "dataset"}))
+    session: Any = MagicMock()
+    session.get_bind.return_value.dialect = postgresql.asyncpg.dialect()
+    session.scalar = AsyncMock(return_value=3)
+
+    assert await estimate_count(session, stmt) == 3
+    session.connection.assert_not_called()
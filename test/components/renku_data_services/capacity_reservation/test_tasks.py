@@ -0,0 +1,90 @@
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from ulid import ULID
+
+from renku_data_services.capacity_reservation.models import (
+    CapacityReservation,
+    Occurrence,
+    OccurrenceState,
+    ProvisioningConfig,
+    RecurrenceConfig,
+    RecurrenceType,
+)
+from renku_data_services.capacity_reservation.tasks import CapacityReservationTasks, _assign_sessions_to_occurrences
+
+
+def _pair(resource_class_id: int, project_template_id: ULID | None = None) -> tuple[Occurrence, CapacityReservation]:
+    now = datetime.now(UTC)
+    reservation = CapacityReservation(
+        id=ULID(),
+        name="course",
+        resource_class_id=resource_class_id,
+        project_template_id=project_template_id,
+        recurrence=RecurrenceConfig(type=RecurrenceType.ONCE, start_date=date.today(), end_date=date.today()),
+        provisioning=ProvisioningConfig(placeholder_count=2, lead_time_minutes=10),
+    )
+    occurrence = Occurrence(
+        id=ULID(),
+        reservation_id=reservation.id,
+        activate_at_datetime=now,
+        start_datetime=now,
+        end_datetime=now + timedelta(hours=1),
+        status=OccurrenceState.ACTIVE,
+    )
+    return occurrence, reservation
+
+
+def test_assign_sessions_to_occurrences() -> None:
+    template_id = ULID()
+    project_id = ULID()
+    by_template = _pair(1, template_id)
+    by_class = _pair(2)
+    shared_1 = _pair(3)
+    shared_2 = _pair(3)
+    sessions = [
+        {"project_id": str(project_id), "resource_class_id": 1},
+        {"project_id": str(ULID()), "resource_class_id": 2},
+        {"project_id": None, "resource_class_id": 2},
+        {"project_id": None, "resource_class_id": 3},
+        {"project_id": None, "resource_class_id": 4},
+    ]
+
+    counts = _assign_sessions_to_occurrences(
+        sessions, [by_template, by_class, shared_1, shared_2], {project_id: template_id}
+    )
+
+    assert counts[by_template[0].id] == 1
+    assert counts[by_class[0].id] == 2
+    assert counts[shared_1[0].id] + counts[shared_2[0].id] == 1
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_limits_concurrency() -> None:
+    tasks = CapacityReservationTasks(
+        occurrence_repo=MagicMock(),
+        capacity_reservation_repo=MagicMock(),
+        k8s_client=MagicMock(),
+        max_concurrent_k8s_operations=2,
+    )
+    running = 0
+    max_running = 0
+
+    async def _operation(i: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if i == 3:
+            raise ValueError("failed")
+        return i
+
+    results = await tasks._gather_bounded([_operation(i) for i in range(6)])
+
+    assert max_running == 2
+    assert results[:3] == [0, 1, 2]
+    assert isinstance(results[3], ValueError)
+    assert results[4:] == [4, 5]
@@ -106,6 +106,7 @@ async def setup_users(app_manager_instance: DependencyManager) -> SetupData:
         )
     ]
     await authz.client.WriteRelationships(WriteRelationshipsRequest(updates=rels))
+    authz.invalidate_admin_cache()
 
     return SetupData(admin, admin_info, user1, user1_info, user2, user2_info, app_manager_instance)
 
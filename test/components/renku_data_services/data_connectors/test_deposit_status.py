@@ -0,0 +1,54 @@
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from ulid import ULID
+
+from renku_data_services.data_connectors.core import get_deposit_job_status_from_manifest
+from renku_data_services.data_connectors.deposit_status import DepositJobStatusWriter
+from renku_data_services.data_connectors.models import DepositStatus
+
+
+def _job_manifest(deposit_id: ULID | None, status: dict[str, Any] | None) -> dict[str, Any]:
+    labels = {"renku.io/safe-username": "user"}
+    if deposit_id is not None:
+        labels["renku.io/deposit_id"] = str(deposit_id)
+    manifest: dict[str, Any] = {"metadata": {"name": "job", "labels": labels}}
+    if status is not None:
+        manifest["status"] = status
+    return manifest
+
+
+@pytest.mark.parametrize(
+    ("status", "expected"),
+    [
+        (None, None),
+        ({"active": 1}, DepositStatus.in_progress),
+        ({"conditions": [{"type": "Complete", "status": "True"}]}, DepositStatus.upload_complete),
+        ({"conditions": [{"type": "Failed", "status": "True"}]}, DepositStatus.failed),
+        ({"conditions": [{"type": "Failed", "status": "False"}]}, DepositStatus.in_progress),
+    ],
+)
+def test_get_deposit_job_status_from_manifest(status: dict[str, Any] | None, expected: DepositStatus | None) -> None:
+    assert get_deposit_job_status_from_manifest(_job_manifest(ULID(), status)) == expected
+
+
+@pytest.mark.asyncio
+async def test_deposit_job_status_writer_flushes_latest_status_in_bulk() -> None:
+    repo = MagicMock()
+    repo.update_deposit_statuses = AsyncMock(return_value=[])
+    writer = DepositJobStatusWriter(deposit_status_repo=repo, k8s_cache=MagicMock())
+    deposit_1 = ULID()
+    deposit_2 = ULID()
+
+    writer.record(_job_manifest(deposit_1, {"active": 1}))
+    writer.record(_job_manifest(deposit_1, {"conditions": [{"type": "Complete", "status": "True"}]}))
+    writer.record(_job_manifest(deposit_2, {"conditions": [{"type": "Failed", "status": "True"}]}))
+    writer.record(_job_manifest(None, {"active": 1}))
+    writer.record(_job_manifest(ULID(), None))
+    await writer.flush()
+    await writer.flush()
+
+    repo.update_deposit_statuses.assert_awaited_once()
+    _, statuses = repo.update_deposit_statuses.await_args.args
+    assert statuses == {deposit_1: DepositStatus.upload_complete, deposit_2: DepositStatus.failed}
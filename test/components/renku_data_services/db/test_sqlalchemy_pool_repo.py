@@ -848,6 +848,7 @@ async def _bootstrap_admin(authz, admin_user: base_models.APIUser) -> None:
         )
     )
     await authz.client.WriteRelationships(WriteRelationshipsRequest(updates=rels))
+    authz.invalidate_admin_cache()
 
 
 @pytest.mark.asyncio
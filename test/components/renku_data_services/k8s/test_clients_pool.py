@@ -0,0 +1,177 @@
+import asyncio
+from collections.abc import AsyncIterable
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from box import Box
+from ulid import ULID
+
+from renku_data_services.errors import errors
+from renku_data_services.k8s.clients import K8sClusterClient, K8sClusterClientsPool
+from renku_data_services.k8s.constants import ClusterId
+from renku_data_services.k8s.models import GVK, ClusterConnection, K8sObject, K8sObjectFilter
+
+POD_GVK = GVK(kind="Pod", version="v1")
+
+
+class FakeClusterClient(K8sClusterClient):
+    def __init__(self, names: list[str], delay: float = 0, fail: bool = False, error: Exception | None = None) -> None:
+        super().__init__(ClusterConnection(id=ClusterId(ULID()), namespace="default", api=MagicMock()))
+        self.names = names
+        self.delay = delay
+        self.error = error if error is not None else httpx.ConnectError("cluster is unreachable") if fail else None
+        self.calls = 0
+
+    def __lt__(self, other: K8sClusterClient) -> bool:
+        return self.get_cluster().id < other.get_cluster().id
+
+    async def list(self, _filter: K8sObjectFilter) -> AsyncIterable[K8sObject]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        for name in self.names:
+            yield K8sObject(name, "default", self.get_cluster().id, POD_GVK, Box())
+
+
+def make_pool(clients: list[FakeClusterClient], **kwargs) -> K8sClusterClientsPool:
+    async def clusters() -> AsyncIterable[K8sClusterClient]:
+        for client in clients:
+            yield client
+
+    return K8sClusterClientsPool(clusters, **kwargs)
+
+
+async def test_list_merges_all_clusters() -> None:
+    pool = make_pool([FakeClusterClient(["a1", "a2"]), FakeClusterClient(["b1"])])
+
+    names = {obj.name async for obj in pool.list(K8sObjectFilter(gvk=POD_GVK))}
+
+    assert names == {"a1", "a2", "b1"}
+
+
+async def test_list_skips_slow_and_failing_clusters() -> None:
+    slow = FakeClusterClient(["s1"], delay=5)
+    failing = FakeClusterClient(["f1"], fail=True)
+    pool = make_pool([FakeClusterClient(["a1"]), slow, failing], cluster_timeout_s=0.1)
+
+    skipped_clusters: set[ClusterId] = set()
+    names = {obj.name async for obj in pool.list(K8sObjectFilter(gvk=POD_GVK), skipped_clusters=skipped_clusters)}
+
+    assert names == {"a1"}
+    assert skipped_clusters == {slow.get_cluster().id, failing.get_cluster().id}
+
+
+async def test_list_raises_unexpected_errors_of_a_cluster() -> None:
+    pool = make_pool([FakeClusterClient(["a1"]), FakeClusterClient(["b1"], error=TypeError("bug"))])
+
+    with pytest.raises(TypeError):
+        _ = [obj async for obj in pool.list(K8sObjectFilter(gvk=POD_GVK))]
+
+
+async def test_list_cleans_up_when_the_consumer_stops_early() -> None:
+    pool = make_pool(
+        [FakeClusterClient([f"a{i}" for i in range(10)]), FakeClusterClient([f"b{i}" for i in range(10)], delay=0.1)],
+        list_buffer_size=1,
+    )
+
+    objects = pool.list(K8sObjectFilter(gvk=POD_GVK))
+    async for _ in objects:
+        break
+    await objects.aclose()
+
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+async def test_list_with_a_small_buffer() -> None:
+    pool = make_pool(
+        [FakeClusterClient([f"a{i}" for i in range(10)]), FakeClusterClient([f"b{i}" for i in range(10)])],
+        list_buffer_size=1,
+    )
+
+    names = set()
+    async for obj in pool.list(K8sObjectFilter(gvk=POD_GVK)):
+        await asyncio.sleep(0.01)
+        names.add(obj.name)
+
+    assert len(names) == 20
+
+
+async def test_slow_consumer_does_not_time_out_clusters() -> None:
+    pool = make_pool(
+        [FakeClusterClient(["a1", "a2", "a3"]), FakeClusterClient(["b1", "b2", "b3"])],
+        cluster_timeout_s=0.05,
+        list_buffer_size=1,
+    )
+
+    names = set()
+    async for obj in pool.list(K8sObjectFilter(gvk=POD_GVK)):
+        await asyncio.sleep(0.1)
+        names.add(obj.name)
+
+    assert len(names) == 6
+
+
+async def test_single_cluster_is_bounded_by_timeout_and_circuit_breaker() -> None:
+    slow = FakeClusterClient(["s1"], delay=5)
+    pool = make_pool(
+        [slow, FakeClusterClient(["a1"])],
+        cluster_timeout_s=0.1,
+        circuit_breaker_failure_threshold=1,
+        circuit_breaker_reset_timeout_s=3600,
+    )
+    _filter = K8sObjectFilter(gvk=POD_GVK, cluster=slow.get_cluster().id)
+
+    with pytest.raises(TimeoutError):
+        _ = [obj async for obj in pool.list(_filter)]
+    with pytest.raises(errors.ThirdPartyAPIError):
+        _ = [obj async for obj in pool.list(_filter)]
+
+    assert slow.calls == 1
+
+
+async def test_only_configured_cluster_raises_errors() -> None:
+    pool = make_pool([FakeClusterClient(["f1"], fail=True)])
+
+    with pytest.raises(httpx.ConnectError):
+        _ = [obj async for obj in pool.list(K8sObjectFilter(gvk=POD_GVK))]
+
+
+async def test_circuit_breaker_stops_querying_failing_cluster() -> None:
+    failing = FakeClusterClient(["f1"], fail=True)
+    pool = make_pool(
+        [FakeClusterClient(["a1"]), failing],
+        circuit_breaker_failure_threshold=2,
+        circuit_breaker_reset_timeout_s=3600,
+    )
+
+    for _ in range(4):
+        _ = [obj async for obj in pool.list(K8sObjectFilter(gvk=POD_GVK))]
+
+    assert failing.calls == 2
+
+
+async def test_clusters_are_cached_until_invalidated() -> None:
+    clients = [FakeClusterClient(["a1"])]
+    pool = make_pool(clients)
+
+    assert {obj.name async for obj in pool.list(K8sObjectFilter(gvk=POD_GVK))} == {"a1"}
+    clients.append(FakeClusterClient(["b1"]))
+    assert {obj.name async for obj in pool.list(K8sObjectFilter(gvk=POD_GVK))} == {"a1"}
+
+    pool.invalidate()
+
+    assert {obj.name async for obj in pool.list(K8sObjectFilter(gvk=POD_GVK))} == {"a1", "b1"}
+
+
+async def test_unknown_cluster_triggers_reload() -> None:
+    clients = [FakeClusterClient(["a1"])]
+    pool = make_pool(clients)
+    await pool.cluster_by_id(clients[0].get_cluster().id)
+    new_client = FakeClusterClient(["b1"])
+    clients.append(new_client)
+
+    cluster = await pool.cluster_by_id(new_client.get_cluster().id)
+
+    assert cluster.id == new_client.get_cluster().id
@@ -307,3 +307,33 @@ async def test_record_resource_requests_grouping(app_manager_instance: Dependenc
     assert rec.runtime_hour == total_runtime
     assert rec.gpu_hours is None
     assert rec.disk_hours is None
+
+
+@pytest.mark.asyncio
+async def test_resource_requests_log_partitions(app_manager_instance: DependencyManager) -> None:
+    run_migrations_for_app("common")
+    repo = ResourceRequestsRepo(app_manager_instance.config.db.async_session_maker)
+    now = datetime(2040, 3, 14, 10, 0, 0, tzinfo=UTC)  # a thursday
+    await repo.insert_many(
+        [make_resources_request(date=now + timedelta(days=i), cpu_request=0.5, uid=f"uid{i}") for i in range(0, 8)]
+    )
+
+    created = await repo.create_partitions(weeks_ahead=1, now=now)
+    assert created == ["resource_requests_log_p20400312", "resource_requests_log_p20400319"]
+    assert await repo.create_partitions(weeks_ahead=1, now=now) == []
+
+    async with app_manager_instance.config.db.async_session_maker() as session:
+        stmt = sa.text("""
+        select tableoid::regclass::text, count(*) from resource_pools.resource_requests_log group by 1
+        """)
+        counts = {name: count for name, count in await session.execute(stmt)}
+    assert counts == {
+        "resource_pools.resource_requests_log_p20400312": 5,
+        "resource_pools.resource_requests_log_p20400319": 3,
+    }
+
+    dropped = await repo.drop_partitions_before(datetime(2040, 3, 19, tzinfo=UTC))
+    assert dropped == ["resource_requests_log_p20400312"]
+    async with app_manager_instance.config.db.async_session_maker() as session:
+        remaining = await session.scalar(sa.text("select count(*) from resource_pools.resource_requests_log"))
+    assert remaining == 3
@@ -0,0 +1,44 @@
+"""Tests for the search caches."""
+
+import pytest
+
+from renku_data_services.search import apispec
+from renku_data_services.search.cache import SearchCache
+from renku_data_services.search.user_query_parser import QueryParser
+
+
+def _result(total: int) -> apispec.SearchResult:
+    return apispec.SearchResult(
+        items=[],
+        facets=apispec.FacetData(entityType=apispec.MapEntityTypeInt({}), keywords=apispec.MapEntityTypeInt({})),
+        pagingInfo=apispec.PageWithTotals(page=apispec.PageDef(limit=10, offset=0), totalPages=1, totalResult=total),
+    )
+
+
+@pytest.mark.asyncio
+async def test_parse_is_cached() -> None:
+    cache = SearchCache(max_parsed_queries=2)
+    q1 = await cache.parse("type:project hello ")
+    assert q1 == await QueryParser.parse("type:project hello")
+    assert await cache.parse("type:project hello") is q1
+
+    await cache.parse("a")
+    await cache.parse("b")
+    assert await cache.parse("type:project hello") is not q1
+
+
+def test_results_expire_and_are_invalidated() -> None:
+    cache = SearchCache()
+    key = cache.result_key("hello", 10, 0, False)
+    assert cache.get_result(key) is None
+
+    cache.put_result(key, _result(1))
+    assert cache.get_result(cache.result_key(" hello", 10, 0, False)) == _result(1)
+    assert cache.get_result(cache.result_key("hello", 10, 10, False)) is None
+
+    cache.invalidate()
+    assert cache.get_result(key) is None
+
+    cache = SearchCache(result_ttl_seconds=0)
+    cache.put_result(key, _result(1))
+    assert cache.get_result(key) is None
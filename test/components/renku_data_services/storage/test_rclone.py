@@ -1,9 +1,13 @@
 """Tests for the rclone module."""
 
 from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
 
 from renku_data_services.storage.constants import STORAGE_CONFIG
 from renku_data_services.storage.rclone import RCloneValidator
+from renku_data_services.storage.rclone_rc import RCloneRCError
 
 
 def test_validate_switch_s3_no_endpoint() -> None:
@@ -62,3 +66,43 @@ def test_storage_config_no_unknown() -> None:
     storage_types = set(storage.get("Prefix") for storage in spec)
     for key in STORAGE_CONFIG:
         assert key in storage_types, f"Unknown storage type {key} in STORAGE_CONFIG."
+
+
+@pytest.mark.asyncio
+async def test_connection_test_results_are_cached() -> None:
+    pool = MagicMock()
+    pool.call = AsyncMock(side_effect=RCloneRCError("access denied"))
+    validator = RCloneValidator(rc_pool=pool)
+    cfg = {"type": "s3", "provider": "AWS", "region": "us-east-1"}
+
+    first = await validator.test_connection(cfg, "bucket")
+    second = await validator.test_connection(dict(cfg), "bucket")
+    assert not first.success
+    assert first == second
+    pool.call.assert_awaited_once()
+    method, params = pool.call.await_args.args
+    assert method == "operations/list"
+    assert params["fs"]["_name"] == "temp"
+    assert params["remote"] == "bucket"
+
+    # A different configuration is tested again
+    await validator.test_connection({**cfg, "region": "eu-west-1"}, "bucket")
+    assert pool.call.await_count == 2
+
+
+def test_schema_index_is_shared_and_indexed() -> None:
+    validator = RCloneValidator()
+    assert validator.providers is RCloneValidator().providers
+    assert "s3" in validator.providers
+    assert "does-not-exist" not in validator.providers
+
+    s3 = validator.providers["s3"]
+    assert validator.providers["s3"] is s3
+    assert s3.sensitive_option_names == {o.name for o in s3.options if o.is_sensitive}
+    for name, options in s3.options_by_name.items():
+        assert options == [o for o in s3.options if o.name == name]
+    endpoint = s3.get_option_for_provider("endpoint", "Switch")
+    assert endpoint is not None
+    assert endpoint.matches_provider("Switch")
+    assert s3.get_option_for_provider("does-not-exist", "AWS") is None
+    assert len(validator.asdict()) == len(validator.providers)
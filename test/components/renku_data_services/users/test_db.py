@@ -1,5 +1,6 @@
 """Tests for database users."""
 
+import json
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import cast
@@ -7,10 +8,10 @@ from typing import cast
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from renku_data_services.base_models.core import APIUser
+from renku_data_services.base_models.core import APIUser, InternalServiceAdmin, ServiceAdminId
 from renku_data_services.base_models.nel import Nel
 from renku_data_services.migrations.core import run_migrations_for_app
-from renku_data_services.users.db import DbUsernameResolver, UserRepo
+from renku_data_services.users.db import DbUsernameResolver, UsernameCache, UserRepo
 from renku_data_services.users.models import UserInfo
 
 
@@ -41,3 +42,48 @@ async def test_username_resolve(app_manager_instance) -> None:
     assert data.get(_username(user_info1)) == user_info1.id
     assert data.get(_username(user_info2)) == user_info2.id
     assert len(data) == 2
+
+
+@pytest.mark.asyncio
+async def test_username_resolve_cache(app_manager_instance) -> None:
+    run_migrations_for_app("common")
+    user_repo: UserRepo = app_manager_instance.kc_user_repo
+    user_repo.username_cache.clear()
+    user1 = APIUser(id="id-345", first_name="Tadej", last_name="Pogacar")
+    user_info1 = cast(UserInfo, await user_repo.get_or_create_user(user1, str(user1.id)))
+
+    # Cache the user and a name that does not exist yet
+    data = await user_repo.resolve_usernames(Nel.of(_username(user_info1), "jonas.vingegaard"))
+    assert data == {_username(user_info1): user_info1.id}
+    assert user_repo.username_cache.get_many([_username(user_info1), "jonas.vingegaard"]) == (data, [])
+
+    # Creating a user with a cached name invalidates it
+    user2 = APIUser(id="id-456", first_name="Jonas", last_name="Vingegaard", email="jonas.vingegaard@example.com")
+    user_info2 = cast(UserInfo, await user_repo.get_or_create_user(user2, str(user2.id)))
+    data = await user_repo.resolve_usernames(Nel.of(_username(user_info2)))
+    assert data == {_username(user_info2): user_info2.id}
+
+    # Removing a user invalidates its name
+    await user_repo.remove_user(InternalServiceAdmin(id=ServiceAdminId.migrations), user_info1.id)
+    assert user_repo.username_cache.get_many([_username(user_info1)]) == ({}, [_username(user_info1)])
+    assert await user_repo.resolve_usernames(Nel.of(_username(user_info1))) == {}
+
+
+def test_username_cache_expiry_and_size() -> None:
+    cache = UsernameCache(ttl_seconds=0)
+    cache.put_many(["a"], {"a": "id-a"})
+    assert cache.get_many(["a"]) == ({}, ["a"])
+
+    cache = UsernameCache(max_entries=2)
+    cache.put_many(["a", "b", "c"], {"a": "id-a", "c": "id-c"})
+    assert cache.get_many(["a", "b", "c"]) == ({"c": "id-c"}, ["a"])
+
+
+def test_username_cache_invalidate_from_notification() -> None:
+    cache = UsernameCache()
+    cache.put_many(["a", "b", "c"], {"a": "id-a", "b": "id-b"})
+    cache.invalidate(json.dumps({"names": ["a"], "user_id": "id-b"}))
+    assert cache.get_many(["a", "b", "c"]) == ({}, ["a", "b"])
+
+    cache.invalidate(None)
+    assert cache.get_many(["c"]) == ({}, ["c"])
@@ -148,3 +148,35 @@ async def test_gitlab_user(monkeypatch) -> None:
         user, ["1", "2", "3"], min_access_level=base_models.GitlabAccessLevel.ADMIN
     )
     assert len(projects) == 1
+
+
+@pytest.mark.asyncio
+async def test_gitlab_access_level_is_cached_and_chunked(monkeypatch) -> None:
+    import renku_data_services.base_models as base_models
+
+    def _response(ids: list[str]) -> httpx.Response:
+        nodes = [{"id": f"gid://gitlab/Project/{i}", "projectMembers": {"nodes": []}} for i in ids]
+        return httpx.Response(
+            200, json={"data": {"projects": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": nodes}}}
+        )
+
+    post = MagicMock(side_effect=[_response(["1", "2"]), _response(["3"]), _response(["4"])])
+
+    async def _post(*args, **kwargs) -> httpx.Response:
+        return post(*args, **kwargs)
+
+    gitlab_client = GitlabAPI(gitlab_url="https://gitlab.url.com", chunk_size=2)
+    monkeypatch.setattr(gitlab_client.client, "post", _post)
+    user = base_models.APIUser(is_admin=False, id="21", access_token="xxxxxx", full_name="John Doe")  # nosec: B106
+
+    projects = await gitlab_client.filter_projects_by_access_level(
+        user, ["1", "2", "3"], min_access_level=base_models.GitlabAccessLevel.PUBLIC
+    )
+    assert projects == ["1", "2", "3"]
+    assert post.call_count == 2
+
+    projects = await gitlab_client.filter_projects_by_access_level(
+        user, ["3", "2", "4"], min_access_level=base_models.GitlabAccessLevel.PUBLIC
+    )
+    assert projects == ["3", "2", "4"]
+    assert post.call_count == 3
@@ -247,6 +247,11 @@ async def app_manager(
 @pytest_asyncio.fixture
 async def app_manager_instance(app_manager, db_instance, authz_instance) -> AsyncGenerator[DependencyManager, None]:
     app_manager.metrics.reset_mock()
+    # NOTE: Every test gets a fresh database, so nothing cached in-process can be reused
+    app_manager.kc_user_repo.username_cache.clear()
+    app_manager.platform_repo.invalidate_cache()
+    app_manager.url_redirect_repo.invalidate_cache()
+    app_manager.authz.invalidate_admin_cache()
     yield app_manager
 
 
@@ -37,7 +37,9 @@ from renku_data_services.data_api.dependencies import DependencyManager
 from renku_data_services.data_connectors.db import DataConnectorRepository, DataConnectorSecretRepository
 from renku_data_services.data_connectors.deposits.envidat import EnvidatClient
 from renku_data_services.data_connectors.deposits.zenodo import ZenodoAPIClient
+from renku_data_services.data_connectors.doi.cache import DOIMetadataCache
 from renku_data_services.db_config.config import DBConfig
+from renku_data_services.db_config.notifications import PgNotificationListener
 from renku_data_services.git.gitlab import DummyGitlabAPI
 from renku_data_services.k8s.clients import (
     DepositUploadJobClient,
@@ -68,6 +70,7 @@ from renku_data_services.repositories.db import GitRepositoriesRepository
 from renku_data_services.repositories.git_url import GitUrl, GitUrlError
 from renku_data_services.resource_usage.core import ResourceUsageService
 from renku_data_services.resource_usage.db import ResourceRequestsRepo
+from renku_data_services.search.cache import SearchCache
 from renku_data_services.search.db import SearchUpdatesRepo
 from renku_data_services.search.reprovision import SearchReprovision
 from renku_data_services.secrets.db import LowLevelUserSecretsRepo, UserSecretsRepo
@@ -340,6 +343,9 @@ class TestDependencyManager(DependencyManager):
             secret_service_public_key=config.secrets.public_key,
             authz=authz,
         )
+        doi_metadata_cache = DOIMetadataCache(session_maker=config.db.async_session_maker)
+        # NOTE: Do not cache search results, the tests update the index and search again right away
+        search_cache = SearchCache(result_ttl_seconds=0)
         search_reprovisioning = SearchReprovision(
             search_updates_repo=search_updates_repo,
             reprovisioning_repo=reprovisioning_repo,
@@ -403,6 +409,9 @@ class TestDependencyManager(DependencyManager):
             platform_repo=platform_repo,
             data_connector_repo=data_connector_repo,
             data_connector_secret_repo=data_connector_secret_repo,
+            doi_metadata_cache=doi_metadata_cache,
+            search_cache=search_cache,
+            db_notifications=PgNotificationListener(config.db),
             cluster_repo=cluster_repo,
             data_source_repo=data_source_repo,
             image_check_repo=image_check_repo,